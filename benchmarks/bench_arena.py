@@ -0,0 +1,78 @@
+"""AST de objetos x AST em arena (`src/arena.py`): memória retida, percurso
+completo dos nós e execução, em programas gerados com ~1M de declarações.
+
+    python -m benchmarks.bench_arena [declarações]
+"""
+import os
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+
+from benchmarks.common import SAMPLE_BLOCK, best_time, generate_source
+from src.arena import ArenaInterpreter, ArenaProgram
+from src.ast_nodes import BinaryExpression, IfStatement, RepeatStatement
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+
+STATEMENTS_PER_BLOCK = 9 # Declarações (em qualquer nível) em cada SAMPLE_BLOCK
+
+
+def measure(build):
+    """Resultado de `build()` e a memória (bytes) retida por ele."""
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def walk_objects(program):
+    """Percorre a AST de objetos em pré-ordem, como `ArenaProgram.walk`."""
+    stack = list(reversed(program.statements))
+    count = 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        node_type = type(node)
+        if node_type is BinaryExpression:
+            stack += (node.right, node.left)
+        elif node_type is IfStatement:
+            stack.extend(reversed([node.condition, *node.then_block, *(node.else_block or ())]))
+        elif node_type is RepeatStatement:
+            stack.extend(reversed([node.times, *node.body]))
+        else:
+            for name in ('right', 'value', 'steps', 'expression'):
+                child = getattr(node, name, None)
+                if child is not None and not isinstance(child, (int, str)):
+                    stack.append(child)
+    return count
+
+
+def run(interpreter, program):
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        interpreter.interpret(program)
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    block_size = len(SAMPLE_BLOCK.format(n=0))
+    source = generate_source(statements // STATEMENTS_PER_BLOCK * block_size)
+    program, object_bytes = measure(lambda: Parser(Lexer(source).tokenize()).parse())
+    arena, arena_bytes = measure(lambda: ArenaProgram.from_program(program))
+    nodes = len(arena)
+    print(f"fonte: {len(source) / 2**20:.1f} MiB, nós: {nodes}")
+    print(f"AST de objetos: {object_bytes / 2**20:7.1f} MiB ({object_bytes / nodes:5.1f} bytes/nó)")
+    print(f"AST em arena:   {arena_bytes / 2**20:7.1f} MiB ({arena_bytes / nodes:5.1f} bytes/nó)")
+
+    assert walk_objects(program) == sum(1 for _ in arena.walk()) == nodes
+    walk_object = best_time(lambda: walk_objects(program), repeat=1)
+    walk_arena = best_time(lambda: sum(1 for _ in arena.walk()), repeat=1)
+    print(f"percurso: objetos {walk_object:.2f}s, arena {walk_arena:.2f}s")
+    run_object = best_time(lambda: run(Interpreter(), program), repeat=1)
+    run_arena = best_time(lambda: run(ArenaInterpreter(), arena), repeat=1)
+    print(f"execução: objetos {run_object:.2f}s, arena {run_arena:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Execução em lote (`src/batch.py`) de um corpus gerado, com 1, 2, 4, ...
+processos até o número de CPUs: arquivos por segundo e aceleração em
+relação a um processo.
+
+    python -m benchmarks.bench_batch [arquivos] [bytes por arquivo]
+"""
+import os
+import sys
+import tempfile
+
+from benchmarks.common import best_time, generate_source
+from src.batch import run_batch
+
+
+def write_corpus(directory, files, size):
+    paths = []
+    for n in range(files):
+        path = os.path.join(directory, f"missao_{n:05d}.robo")
+        with open(path, "w") as file:
+            file.write(generate_source(size))
+        paths.append(path)
+    return paths
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 8 * 1024
+    cpus = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= cpus:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cpus:
+        jobs.append(cpus)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, files, size)
+        print(f"{files} arquivos de ~{size} bytes, {cpus} CPUs")
+        serial = None
+        for count in jobs:
+            elapsed = best_time(lambda: list(run_batch(paths, jobs=count)))
+            serial = serial or elapsed
+            print(f"  {count:3d} processos: {elapsed:.3f}s ({files / elapsed:,.0f} arquivos/s, {serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
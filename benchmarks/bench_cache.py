@@ -0,0 +1,31 @@
+"""Latência de partida a frio (análise léxica + sintática) x a quente (AST lida
+do `__roboscache__`) em scripts grandes.
+
+    python -m benchmarks.bench_cache [tamanho_em_MB ...]
+"""
+import sys
+import tempfile
+
+from benchmarks.common import best_time, generate_source
+from src.cache import ASTCache, _dumps
+from src.parallel_lexer import tokenize_parallel
+from src.parser import Parser
+
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [0.5, 2, 8]
+    print(f"{'fonte':>8} {'entrada':>8} {'frio':>8} {'quente':>8} {'ganho':>6}")
+    for size_mb in sizes:
+        source = generate_source(int(size_mb * 1024 * 1024))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ASTCache(directory)
+            cold = best_time(lambda: Parser(tokenize_parallel(source)).parse(), repeat=2)
+            program = Parser(tokenize_parallel(source)).parse()
+            cache.store(source, program)
+            entry = len(_dumps(program))
+            warm = best_time(lambda: cache.load(source), repeat=2)
+        print(f"{len(source) / 2**20:>6.1f}MB {entry / 2**20:>6.2f}MB {cold:>7.2f}s {warm:>7.2f}s {cold / warm:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
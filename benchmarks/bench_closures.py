@@ -0,0 +1,58 @@
+"""Vazão dos motores de execução em laços `REPETIR` aninhados, com destaque
+para o motor de closures (`src/closures.py`).
+
+    python -m benchmarks.bench_closures [repetições do laço interno]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.closures import ClosureInterpreter
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.stack_interpreter import StackInterpreter
+from src.vm import VirtualMachine
+
+ENGINES = {"tree": Interpreter, "stack": StackInterpreter, "vm": VirtualMachine, "closure": ClosureInterpreter}
+
+# Cada repetição interna executa 4 declarações (SET, SE, um SET do SE, MOVER)
+NESTED = '''
+VAR n = 0;
+VAR soma = 0;
+REPETIR 100 VEZES {{
+    REPETIR {inner} VEZES {{
+        SET n = n + 1;
+        SE (n > 10) ENTAO {{ SET soma = soma + n * 2; }} SENAO {{ SET soma = soma - 1; }}
+        MOVER FRENTE 1;
+    }}
+    GIRAR DIREITA;
+}}
+'''
+
+
+def run(engine, program, simulation_output):
+    interpreter = engine()
+    interpreter.simulation_output = simulation_output
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        interpreter.interpret(program)
+
+
+def main():
+    inner = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    program = Parser(Lexer(NESTED.format(inner=inner)).tokenize()).parse()
+    statements = 100 * (inner * 4 + 2) + 2
+    print(f"declarações executadas: {statements}")
+    for simulation_output in (False, True):
+        print("com eventos" if simulation_output else "sem eventos")
+        baseline = None
+        for name, engine in ENGINES.items():
+            elapsed = best_time(lambda: run(engine, program, simulation_output))
+            baseline = baseline or elapsed
+            print(f"  {name:>7}: {elapsed:.3f}s, {statements / elapsed / 1e6:.2f} M declarações/s "
+                  f"({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compilação antecipada para Python (`src/codegen.py`).
+
+Mede a vazão do motor 'aot' nos laços aninhados de `bench_closures` e a
+partida de um script grande: análises + otimização + geração de código (frio)
+x código lido do `CodeCache` (quente).
+
+    python -m benchmarks.bench_codegen [repetições do laço interno] [tamanho_em_MB]
+"""
+import sys
+import tempfile
+
+from benchmarks.bench_closures import NESTED, run
+from benchmarks.common import best_time, generate_source
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter, CodeCache, compile_program
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import optimize
+from src.parallel_lexer import tokenize_parallel
+from src.parser import Parser
+from src.vm import VirtualMachine
+
+ENGINES = {"tree": Interpreter, "vm": VirtualMachine, "closure": ClosureInterpreter, "aot": AOTInterpreter}
+
+
+def main():
+    inner = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    size_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+    program = Parser(Lexer(NESTED.format(inner=inner)).tokenize()).parse()
+    statements = 100 * (inner * 4 + 2) + 2
+    print(f"declarações executadas: {statements}")
+    for simulation_output in (False, True):
+        print("com eventos" if simulation_output else "sem eventos")
+        baseline = None
+        for name, engine in ENGINES.items():
+            elapsed = best_time(lambda: run(engine, program, simulation_output))
+            baseline = baseline or elapsed
+            print(f"  {name:>7}: {elapsed:.3f}s, {statements / elapsed / 1e6:.2f} M declarações/s "
+                  f"({baseline / elapsed:.2f}x)")
+
+    source = generate_source(int(size_mb * 1024 * 1024))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CodeCache(directory)
+        cold = best_time(lambda: compile_program(optimize(Parser(tokenize_parallel(source)).parse())), repeat=2)
+        cache.store(source, compile_program(optimize(Parser(tokenize_parallel(source)).parse())))
+        warm = best_time(lambda: cache.load(source), repeat=2)
+    print(f"partida ({len(source) / 2**20:.1f}MB): frio {cold:.2f}s, quente {warm:.3f}s ({cold / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
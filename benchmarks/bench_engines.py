@@ -0,0 +1,57 @@
+"""Motores de execução: `Interpreter` (recursivo) x `StackInterpreter` (pilha
+explícita), em laços aninhados e em blocos muito aninhados.
+
+    python -m benchmarks.bench_engines [profundidade]
+"""
+import io
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.stack_interpreter import StackInterpreter
+
+ENGINES = {"tree": Interpreter, "stack": StackInterpreter}
+
+# Laços aninhados com corpos curtos: o custo de entrar em cada bloco domina
+LOOPS = '''
+VAR n = 0;
+REPETIR 200 VEZES {
+    REPETIR 50 VEZES {
+        SE (n > -1) ENTAO { SE (n > -2) ENTAO { SET n = n + 1; } }
+    }
+}
+'''
+
+
+def nested(depth):
+    return ('VAR n = 0;' + 'SE (n == 0) ENTAO { REPETIR 1 VEZES {' * depth
+            + 'SET n = n + 1;' + '} }' * depth)
+
+
+def run(engine, program):
+    with redirect_stdout(io.StringIO()):
+        engine().interpret(program)
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    program = Parser(Lexer(LOOPS).tokenize()).parse()
+    for name, engine in ENGINES.items():
+        print(f"laços aninhados, {name:>5}: {best_time(lambda: run(engine, program)):.3f}s")
+
+    tokens = Lexer(nested(depth)).tokenize()
+    parse = best_time(lambda: Parser(tokens).parse(), repeat=1)
+    program = Parser(tokens).parse()
+    print(f"aninhamento {depth}: análise {parse:.2f}s")
+    for name, engine in ENGINES.items():
+        try:
+            print(f"aninhamento {depth}, {name:>5}: {best_time(lambda: run(engine, program), repeat=1):.3f}s")
+        except RecursionError:
+            print(f"aninhamento {depth}, {name:>5}: RecursionError")
+
+
+if __name__ == "__main__":
+    main()
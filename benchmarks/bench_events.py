@@ -0,0 +1,53 @@
+"""Custo da saída da simulação por sink (`src/events.py`) em um laço que
+produz um evento por declaração; a saída vai para /dev/null.
+
+    python -m benchmarks.bench_events [repetições]
+"""
+import os
+import sys
+
+from benchmarks.common import best_time
+from src.closures import ClosureInterpreter
+from src.events import MemorySink, NDJSONSink, NullSink, TextSink
+from src.lexer import Lexer
+from src.parser import Parser
+
+EVENTS = '''
+VAR i = 0;
+REPETIR {times} VEZES {{
+    SET i = i + 1;
+    MOVER FRENTE 1;
+    GIRAR DIREITA;
+    IMPRIMIR i;
+}}
+'''
+
+
+def run(program, make_sink):
+    with open(os.devnull, "w") as devnull:
+        events = make_sink(devnull)
+        ClosureInterpreter(events).interpret(program)
+        events.flush()
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    program = Parser(Lexer(EVENTS.format(times=times)).tokenize()).parse()
+    sinks = {
+        "texto, linha a linha": lambda stream: TextSink(stream, buffer_lines=0),
+        "texto, em blocos": lambda stream: TextSink(stream),
+        "ndjson, em blocos": lambda stream: NDJSONSink(stream),
+        "memória": lambda stream: MemorySink(),
+        "texto, só IMPRIMIR (--quiet)": lambda stream: TextSink(stream, simulation=False),
+        "null": lambda stream: NullSink(),
+    }
+    print(f"{times * 4} eventos (closure)")
+    baseline = None
+    for name, make_sink in sinks.items():
+        elapsed = best_time(lambda: run(program, make_sink))
+        baseline = baseline or elapsed
+        print(f"  {name:>30}: {elapsed:.3f}s ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Frota de robôs: N `Interpreter`s separados contra um `FleetInterpreter`
+(`src/fleet.py`), em passos de robô por segundo (declarações executadas,
+somadas sobre os robôs).
+
+    python -m benchmarks.bench_fleet [robôs...]
+"""
+import sys
+
+from benchmarks.common import best_time
+from src.events import NullSink
+from src.fleet import FleetInterpreter
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+
+# Os robôs se dividem pela posição inicial: os de x < 50 andam para leste,
+# os demais carregam um objeto para o norte
+WAREHOUSE = '''
+VAR entregas = 0;
+REPETIR 20 VEZES {
+    SE (robot_x < 50) ENTAO {
+        GIRAR DIREITA;
+        MOVER FRENTE robot_x / 10 + 1;
+        GIRAR ESQUERDA;
+    } SENAO {
+        PEGAR;
+        MOVER FRENTE 2;
+    }
+    SE (has_object) ENTAO {
+        SOLTAR;
+        SET entregas = entregas + 1;
+    }
+    MOVER TRAS 1;
+}
+'''
+
+
+def start(size):
+    return [robot % 100 for robot in range(size)], [robot // 100 for robot in range(size)]
+
+
+def run_interpreters(program, size):
+    for x, y in zip(*start(size)):
+        interpreter = Interpreter(NullSink())
+        interpreter.robot_x, interpreter.robot_y = x, y
+        interpreter.interpret(program)
+
+
+def run_fleet(program, size):
+    xs, ys = start(size)
+    fleet = FleetInterpreter(size, x=xs, y=ys)
+    fleet.interpret(program)
+    return fleet
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [100, 1_000, 10_000]
+    program = Parser(Lexer(WAREHOUSE).tokenize()).parse()
+    for size in sizes:
+        steps = run_fleet(program, size).steps
+        separate = best_time(lambda: run_interpreters(program, size))
+        fleet = best_time(lambda: run_fleet(program, size))
+        print(f"{size} robôs, {steps} passos de robô")
+        print(f"  {size} Interpreters: {separate:.3f}s ({steps / separate:,.0f} passos/s)")
+        print(f"  FleetInterpreter: {fleet:.3f}s ({steps / fleet:,.0f} passos/s, {separate / fleet:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Nós e bytes da AST sem e com hash-consing (`Parser(..., hash_cons=True)`),
+nos programas de `exemplos/` e em scripts sintéticos grandes.
+
+    python -m benchmarks.bench_hash_cons [tamanho_em_MB ...]
+"""
+import glob
+import sys
+import tracemalloc
+
+from benchmarks.common import best_time, generate_source
+from src.lexer import Lexer
+from src.ast_nodes import children
+from src.parser import Parser
+
+
+def count_nodes(program):
+    """Número de nós distintos (por identidade) alcançáveis a partir do programa."""
+    seen = set()
+    stack = list(program.statements)
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.extend(children(node))
+    return len(seen)
+
+
+def measure(source, hash_cons):
+    """AST, nós distintos e bytes retidos (AST, tokens referenciados e tabela de posições)."""
+    tracemalloc.start()
+    parser = Parser(Lexer(source).tokenize(), hash_cons)
+    program = parser.parse()
+    parser.tokens = None
+    del parser._canonical, parser._shared # Só usados durante a análise
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return program, count_nodes(program), retained
+
+
+def report(name, source):
+    _, nodes, size = measure(source, False)
+    _, shared_nodes, shared_size = measure(source, True)
+    print(f"{name:<28} {nodes:>9} {shared_nodes:>9} {size / 1024:>9.0f}K {shared_size / 1024:>9.0f}K"
+          f" {100 * (1 - shared_size / size):>5.1f}%")
+
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 8]
+    print(f"{'programa':<28} {'nós':>9} {'nós (hc)':>9} {'bytes':>10} {'bytes (hc)':>10} {'econ.':>6}")
+    for path in sorted(glob.glob("exemplos/*.robo")):
+        with open(path) as file:
+            report(path, file.read())
+    for size_mb in sizes:
+        source = generate_source(int(size_mb * 1024 * 1024))
+        report(f"sintético {size_mb:g}MB", source)
+        tokens = Lexer(source).tokenize()
+        plain = best_time(lambda: Parser(tokens).parse(), repeat=1)
+        shared = best_time(lambda: Parser(tokens, hash_cons=True).parse(), repeat=1)
+        print(f"  análise: {plain:.2f}s sem, {shared:.2f}s com hash-consing")
+
+
+if __name__ == "__main__":
+    main()
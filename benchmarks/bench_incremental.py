@@ -0,0 +1,45 @@
+"""Latência edição -> AST: `IncrementalSession.edit` x reanálise completa.
+
+    python -m benchmarks.bench_incremental [linhas]
+"""
+import sys
+import time
+
+from benchmarks.common import best_time, generate_source
+from src.incremental import IncrementalSession
+from src.lexer import Lexer
+from src.parser import Parser
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = generate_source(lines * 26) # ~26 caracteres por linha no trecho gerado
+    print(f"fonte: {source.count(chr(10))} linhas, {len(source) / 2**20:.1f}MB")
+
+    full = best_time(lambda: Parser(Lexer(source).tokenize()).parse(), repeat=1)
+    print(f"reanálise completa:          {full * 1000:9.1f}ms")
+
+    session = IncrementalSession(source)
+    middle = source.index("VAR passos_", len(source) // 2)
+    value = source.index("=", middle) + 2
+    samples = []
+    for i in range(20):
+        # Troca o valor de um VAR no meio do arquivo (mesmo número de linhas)
+        end = source.index(";", value)
+        start = time.perf_counter()
+        session.edit(value, end, str(1000 + i))
+        samples.append(time.perf_counter() - start)
+        source = session.source
+    print(f"edição de VAR (mediana):     {sorted(samples)[len(samples) // 2] * 1000:9.1f}ms")
+
+    samples = []
+    for _ in range(5):
+        # Insere uma linha nova: os tokens seguintes mudam de linha
+        start = time.perf_counter()
+        session.edit(middle, middle, "GIRAR DIREITA;\n")
+        samples.append(time.perf_counter() - start)
+    print(f"inserção de linha (mediana): {sorted(samples)[len(samples) // 2] * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Compara a vazão (MB/s) do Lexer por expressão regular mestre com a versão
+original caractere a caractere.
+
+    python -m benchmarks.bench_lexer [tamanho_em_MB ...]
+"""
+import sys
+
+from benchmarks.common import best_time, generate_source
+from src.lexer import Lexer
+
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 4]
+    print(f"{'tamanho':>10} {'tokens':>10} {'char a char':>14} {'regex':>14} {'ganho':>7}")
+    for size_mb in sizes:
+        source = generate_source(int(size_mb * 1024 * 1024))
+        megabytes = len(source.encode("utf-8")) / (1024 * 1024)
+        n_tokens = len(Lexer(source).tokenize())
+        legacy = best_time(lambda: Lexer(source).tokenize_char_by_char(), repeat=1)
+        regex = best_time(lambda: Lexer(source).tokenize())
+        print(f"{megabytes:>8.1f}MB {n_tokens:>10} {megabytes / legacy:>10.2f}MB/s "
+              f"{megabytes / regex:>10.2f}MB/s {legacy / regex:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Reaproveitamento de expressões (`src/licm.py`) em um laço cujo corpo
+recalcula expressões invariantes e repetidas: cada motor roda o programa
+otimizado sem e com o reaproveitamento.
+
+    python -m benchmarks.bench_licm [repetições]
+"""
+import sys
+
+from benchmarks.bench_closures import run
+from benchmarks.common import best_time
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import optimize
+from src.parser import Parser
+from src.resolver import resolve
+from src.typechecker import check_types
+from src.vm import VirtualMachine
+
+ENGINES = {"tree": Interpreter, "vm": VirtualMachine, "closure": ClosureInterpreter, "aot": AOTInterpreter}
+
+INVARIANT = '''
+VAR largura = 12;
+VAR altura = 7;
+VAR margem = 3;
+VAR total = 0;
+REPETIR {times} VEZES {{
+    SET total = total + (largura * altura - margem * 2) / (margem + 1);
+    SE ((largura + margem) * (altura + margem) > total) ENTAO {{
+        SET total = total + (largura + margem) * (altura + margem) - largura * altura;
+    }}
+    SET total = total - robot_x * largura + robot_y * altura;
+}}
+'''
+
+
+def checked(source, licm):
+    program = optimize(Parser(Lexer(source).tokenize()).parse(), licm)
+    assert resolve(program) == [] and check_types(program) == []
+    return program
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = INVARIANT.format(times=times)
+    plain = checked(source, False)
+    hoisted = checked(source, True)
+    print(f"laço com expressões invariantes, {times} repetições")
+    for name, engine in ENGINES.items():
+        before = best_time(lambda: run(engine, plain, False))
+        after = best_time(lambda: run(engine, hoisted, False))
+        print(f"  {name:>7}: sem licm {before:.3f}s, com licm {after:.3f}s ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
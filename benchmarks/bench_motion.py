@@ -0,0 +1,47 @@
+"""Laços só de movimento: passo a passo e em forma fechada (`src/motion.py`).
+
+    python -m benchmarks.bench_motion [repetições]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import optimize
+from src.parser import Parser
+
+MOTION = '''
+VAR lado = 3;
+REPETIR {n} VEZES {{
+    MOVER FRENTE 1;
+    GIRAR DIREITA;
+    REPETIR lado VEZES {{ MOVER TRAS 2; MOVER FRENTE lado; }}
+}}
+IMPRIMIR robot_x + robot_y;
+'''
+
+
+def run(program, simulation_output):
+    interpreter = Interpreter()
+    interpreter.simulation_output = simulation_output
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        interpreter.interpret(program)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    program = Parser(Lexer(MOTION.format(n=n)).tokenize()).parse()
+    optimized = optimize(program)
+    events = best_time(lambda: run(optimized, True), repeat=1)
+    plain = best_time(lambda: run(program, False), repeat=1)
+    closed = best_time(lambda: run(optimized, False))
+    print(f"repetições: {n}")
+    print(f"passo a passo, com eventos: {events:.3f}s")
+    print(f"passo a passo, sem eventos: {plain:.3f}s")
+    print(f"forma fechada, sem eventos: {closed * 1000:.3f}ms ({plain / closed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
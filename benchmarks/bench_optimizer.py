@@ -0,0 +1,52 @@
+"""Execução de scripts com laços, sem e com o otimizador (`src/optimizer.py`).
+
+    python -m benchmarks.bench_optimizer [repetições]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import optimize
+from src.parser import Parser
+
+# Laço com expressões constantes, condições fixas e laços vazios no corpo
+LOOP = '''
+VAR x = 0;
+VAR rotulo = "";
+REPETIR {n} VEZES {{
+    SET x = x + (10 * 4) / 2 - 3 * (2 + 1);
+    SE (1 == 1) ENTAO {{
+        SET rotulo = "passo" + " " + "atual";
+    }} SENAO {{
+        IMPRIMIR "nunca";
+    }}
+    SE (x > 100 * 100) ENTAO {{ SET x = 0; }}
+    REPETIR 0 VEZES {{ GIRAR DIREITA; }}
+    REPETIR 2 * 2 VEZES {{ SE (0) ENTAO {{ PEGAR; }} }}
+    MOVER FRENTE 60 / 10 - 5;
+}}
+'''
+
+
+def run(program):
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        Interpreter().interpret(program)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    program = Parser(Lexer(LOOP.format(n=n)).tokenize()).parse()
+    optimized = optimize(program)
+    plain = best_time(lambda: run(program))
+    fast = best_time(lambda: run(optimized))
+    print(f"repetições: {n}")
+    print(f"sem otimizador: {plain:.3f}s")
+    print(f"com otimizador: {fast:.3f}s ({plain / fast:.2f}x)")
+    print(f"otimização: {best_time(lambda: optimize(program)) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Compara o Lexer serial com `tokenize_parallel` em fontes de vários MB.
+
+    python -m benchmarks.bench_parallel_lexer [tamanho_em_MB] [processos ...]
+"""
+import os
+import sys
+
+from benchmarks.common import best_time, generate_source
+from src.lexer import Lexer
+from src.parallel_lexer import tokenize_parallel
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 16
+    worker_counts = [int(arg) for arg in sys.argv[2:]] or sorted({2, os.cpu_count() or 1})
+    source = generate_source(int(size_mb * 1024 * 1024))
+    megabytes = len(source.encode("utf-8")) / (1024 * 1024)
+    serial = best_time(lambda: Lexer(source).tokenize(), repeat=1)
+    print(f"fonte: {megabytes:.1f}MB, CPUs: {os.cpu_count()}")
+    print(f"{'serial':>12}: {serial:6.2f}s {megabytes / serial:8.2f}MB/s")
+    for workers in worker_counts:
+        elapsed = best_time(lambda: tokenize_parallel(source, workers=workers, threshold=0), repeat=1)
+        print(f"{workers:>3} processos: {elapsed:6.2f}s {megabytes / elapsed:8.2f}MB/s {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Tempo de análise de expressões: gramática descendente recursiva (uma chamada
+por nível de precedência) x análise por precedência com pilha explícita.
+
+    python -m benchmarks.bench_parser [linhas]
+"""
+import sys
+
+from benchmarks.common import best_time
+from src.ast_nodes import BinaryExpression, Identifier, NumberLiteral, StringLiteral, UnaryExpression
+from src.lexer import Lexer, TokenType
+from src.parser import Parser
+
+
+class RecursiveParser(Parser):
+    """Parser com a gramática de expressões descendente recursiva original."""
+
+    def _expression(self):
+        return self._comparison()
+
+    def _comparison(self):
+        node = self._additive()
+        while self.current_token.type in (
+            TokenType.IGUAL, TokenType.DIFERENTE, TokenType.MENOR,
+            TokenType.MAIOR, TokenType.MENOR_IGUAL, TokenType.MAIOR_IGUAL
+        ):
+            op = self.current_token
+            self._advance()
+            node = BinaryExpression(node, op, self._additive())
+        return node
+
+    def _additive(self):
+        node = self._multiplicative()
+        while self.current_token.type in (TokenType.OP_SOMA, TokenType.OP_SUB):
+            op = self.current_token
+            self._advance()
+            node = BinaryExpression(node, op, self._multiplicative())
+        return node
+
+    def _multiplicative(self):
+        node = self._unary()
+        while self.current_token.type in (TokenType.OP_MULT, TokenType.OP_DIV):
+            op = self.current_token
+            self._advance()
+            node = BinaryExpression(node, op, self._unary())
+        return node
+
+    def _unary(self):
+        if self.current_token.type in (TokenType.OP_SOMA, TokenType.OP_SUB):
+            op = self.current_token
+            self._advance()
+            return UnaryExpression(op, self._unary())
+        return self._primary()
+
+    def _primary(self):
+        token = self.current_token
+        if token.type == TokenType.NUMERO_INTEIRO:
+            self._eat(TokenType.NUMERO_INTEIRO)
+            return NumberLiteral(token)
+        elif token.type == TokenType.STRING:
+            self._eat(TokenType.STRING)
+            return StringLiteral(token)
+        elif token.type == TokenType.IDENTIFICADOR:
+            self._eat(TokenType.IDENTIFICADOR)
+            return Identifier(token)
+        elif token.type == TokenType.PARENTESE_ESQ:
+            self._eat(TokenType.PARENTESE_ESQ)
+            expr = self._expression()
+            self._eat(TokenType.PARENTESE_DIR)
+            return expr
+        else:
+            self._error(f"Erro sintático: Expressão primária inesperada: '{token.value}' na linha {token.line}, coluna {token.column}.")
+
+
+EXPRESSION_BLOCK = '''VAR a{n} = {n};
+SET a{n} = a{n} * 2 + (a{n} - 1) / 3 - -a{n};
+IMPRIMIR "valor: " + a{n} * (1 + 2 * (3 + 4));
+SE (a{n} + 1 >= 10 * 2) ENTAO {{ MOVER FRENTE a{n} / 2 + 1; }}
+REPETIR (a{n} - a{n}) + 1 VEZES {{ SET a{n} = a{n} == 1; }}
+'''
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    source = "".join(EXPRESSION_BLOCK.format(n=n) for n in range(lines // 5))
+    tokens = Lexer(source).tokenize()
+    assert repr(RecursiveParser(tokens).parse()) == repr(Parser(tokens).parse())
+    recursive = best_time(lambda: RecursiveParser(tokens).parse())
+    stack = best_time(lambda: Parser(tokens).parse())
+    print(f"tokens: {len(tokens)}")
+    print(f"recursivo: {recursive:.3f}s")
+    print(f"pilha:     {stack:.3f}s ({recursive / stack:.2f}x)")
+
+    depth = 100_000
+    nested = Lexer("IMPRIMIR " + "(" * depth + "1" + ")" * depth + " + " + "-" * depth + "x;").tokenize()
+    print(f"aninhamento {depth}: {best_time(lambda: Parser(nested).parse(), repeat=1):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Variáveis por índice (`src/resolver.py`) x `Environment` no `Interpreter`,
+em `exemplos/espiral_recursiva.robo` com mais voltas no laço externo.
+
+    python -m benchmarks.bench_resolver [voltas do laço externo]
+"""
+import os
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.resolver import resolve
+from src.stack_interpreter import StackInterpreter
+
+
+def run(engine, program):
+    interpreter = engine()
+    interpreter.simulation_output = False
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        interpreter.interpret(program)
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with open("exemplos/espiral_recursiva.robo") as f:
+        source = f.read().replace("VAR num_giros = 4;", f"VAR num_giros = {turns};")
+    plain = Parser(Lexer(source).tokenize()).parse()
+    resolved = Parser(Lexer(source).tokenize()).parse()
+    assert resolve(resolved) == []
+    print(f"espiral_recursiva com {turns} voltas")
+    for name, engine in (("tree", Interpreter), ("stack", StackInterpreter)):
+        before = best_time(lambda: run(engine, plain))
+        after = best_time(lambda: run(engine, resolved))
+        print(f"  {name:>5}: Environment {before:.3f}s, índices {after:.3f}s ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Robôs concorrentes no asyncio (`src/scheduler.py`): custo das trocas de
+robô em relação a executar os mesmos programas um após o outro com o
+`Interpreter`, e memória por robô.
+
+    python -m benchmarks.bench_scheduler [robôs] [ações por robô]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from src.events import NullSink
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.scheduler import ROUND_ROBIN, TIME_SLICED, Scheduler
+
+PATROL = '''
+VAR voltas = 0;
+REPETIR {rounds} VEZES {{
+    MOVER FRENTE 2;
+    GIRAR DIREITA;
+    SE (robot_x > 10) ENTAO {{ PEGAR; }} SENAO {{ SOLTAR; }}
+    SET voltas = voltas + 1;
+}}
+'''
+
+
+def run_sequential(program, robots):
+    for _ in range(robots):
+        Interpreter(NullSink()).interpret(program)
+
+
+def run_scheduled(program, robots, fairness):
+    scheduler = Scheduler(fairness)
+    for _ in range(robots):
+        scheduler.add(program)
+    asyncio.run(scheduler.run())
+    return scheduler
+
+
+def main():
+    robots = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    actions = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    program = Parser(Lexer(PATROL.format(rounds=actions // 3)).tokenize()).parse()
+    total = robots * (actions // 3) * 3
+    print(f"{robots} robôs, {total} ações")
+
+    start = time.perf_counter()
+    run_sequential(program, robots)
+    sequential = time.perf_counter() - start
+    print(f"  Interpreter, um após o outro: {sequential:.3f}s")
+    for fairness in (ROUND_ROBIN, TIME_SLICED):
+        start = time.perf_counter()
+        scheduler = run_scheduled(program, robots, fairness)
+        elapsed = time.perf_counter() - start
+        print(f"  {fairness}: {elapsed:.3f}s, {scheduler.switches} trocas, "
+              f"{(elapsed - sequential) / total * 1e6:.2f} µs a mais por ação")
+
+    tracemalloc.start()
+    run_scheduled(program, robots, ROUND_ROBIN)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  memória: pico de {peak / 2**20:.1f} MiB ({peak / robots / 1024:.1f} KiB por robô)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Tempo até a primeira ação e pico de memória (RSS): modo completo x `--stream`,
+em scripts planos de MOVER/GIRAR.
+
+Cada medição roda em um processo separado, para que o pico de RSS seja o do
+próprio pipeline.
+
+    python -m benchmarks.bench_streaming [linhas ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import generate_flat_source
+
+# Programa executado no processo filho: mede o instante em que a primeira
+# declaração começa a executar e o pico de RSS ao final.
+CHILD = r'''
+import io, resource, sys, time
+from contextlib import redirect_stdout
+from src.lexer import Lexer
+from src.parser import Parser, StreamParser
+from src.interpreter import Interpreter
+
+path, mode = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+first = []
+interpreter = Interpreter()
+visit = interpreter.visit
+def timed_visit(node):
+    if not first:
+        first.append(time.perf_counter() - start)
+    interpreter.visit = visit
+    return visit(node)
+interpreter.visit = timed_visit
+with open(path) as file, open('/dev/null', 'w') as devnull, redirect_stdout(devnull):
+    if mode == 'stream':
+        interpreter.interpret_statements(StreamParser(Lexer.from_file(file).iter_tokens()).iter_statements())
+    else:
+        interpreter.interpret(Parser(Lexer(file.read()).tokenize()).parse())
+total = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(f"{first[0]:.4f} {total:.2f} {rss:.0f}")
+'''
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 400_000]
+    print(f"{'linhas':>8} {'modo':>9} {'1a ação':>9} {'total':>8} {'pico RSS':>9}")
+    for lines in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".robo", delete=False) as tmp:
+            tmp.write(generate_flat_source(lines * 15))
+        try:
+            for mode in ("completo", "stream"):
+                output = subprocess.run([sys.executable, "-c", CHILD, tmp.name, mode],
+                                        capture_output=True, text=True, check=True).stdout
+                first, total, rss = output.split()
+                print(f"{lines:>8} {mode:>9} {float(first) * 1000:>7.1f}ms {float(total):>7.2f}s {rss:>7}MB")
+        finally:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Varredura de parâmetros de `exemplos/espiral_recursiva.robo`: um
+`python main.py` por variante (arquivo editado) contra `src/sweep.py`, que
+analisa o programa uma vez, em variantes por segundo.
+
+    python -m benchmarks.bench_sweep [variantes] [variantes com main.py]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.sweep import grid, run_sweep
+
+SCRIPT = "exemplos/espiral_recursiva.robo"
+
+
+def variants(count):
+    sizes = range(1, count // 8 + 2)
+    return grid({"tamanho_passo": sizes, "num_giros": range(1, 9)})[:count]
+
+
+def run_main(source, overrides, directory):
+    """Executa uma variante como antes: grava o script editado e chama o main.py."""
+    for name, value in overrides.items():
+        start = source.index(f"VAR {name} = ")
+        end = source.index(";", start)
+        source = f"{source[:start]}VAR {name} = {value}{source[end:]}"
+    path = os.path.join(directory, "variante.robo")
+    with open(path, "w") as file:
+        file.write(source)
+    subprocess.run([sys.executable, "main.py", path, "--quiet", "--no-cache"], check=True, stdout=subprocess.DEVNULL)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    main_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with open(SCRIPT) as file:
+        source = file.read()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        for overrides in variants(main_count):
+            run_main(source, overrides, directory)
+        separate = main_count / (time.perf_counter() - start)
+    print(f"main.py por variante: {separate:,.1f} variantes/s ({main_count} variantes)")
+
+    for jobs in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        program = Parser(Lexer(source).tokenize()).parse()
+        records = sum(1 for _ in run_sweep(program, variants(count), jobs=jobs))
+        rate = records / (time.perf_counter() - start)
+        print(f"varredura, {jobs} processos: {rate:,.0f} variantes/s ({records} variantes, {rate / separate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
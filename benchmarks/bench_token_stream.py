@@ -0,0 +1,44 @@
+"""Memória por token: lista de `Token` x `TokenStream` compacto.
+
+    python -m benchmarks.bench_token_stream [tamanho_em_MB]
+"""
+import sys
+import tracemalloc
+
+from benchmarks.common import best_time, generate_source
+from src.lexer import Lexer
+from src.parser import Parser
+from src.token_stream import TokenStream
+
+
+def measure(build):
+    """Memória retida (bytes) pelo objeto construído por `build()`."""
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    source = generate_source(int(size_mb * 1024 * 1024))
+    tokens, list_bytes = measure(lambda: Lexer(source).tokenize())
+    stream, stream_bytes = measure(lambda: TokenStream(source))
+    n = len(tokens)
+    print(f"tokens: {n}")
+    print(f"list[Token]: {list_bytes / n:7.1f} bytes/token ({list_bytes / 2**20:.1f} MiB)")
+    print(f"TokenStream: {stream_bytes / n:7.1f} bytes/token ({stream_bytes / 2**20:.1f} MiB)")
+    print(f"economia:    {(list_bytes - stream_bytes) / n:7.1f} bytes/token")
+    del tokens
+
+    lex_list = best_time(lambda: Lexer(source).tokenize(), repeat=1)
+    lex_stream = best_time(lambda: TokenStream(source), repeat=1)
+    parse_list = best_time(lambda: Parser(Lexer(source).tokenize()).parse(), repeat=1) - lex_list
+    parse_stream = best_time(lambda: Parser(stream).parse(), repeat=1)
+    print(f"lexer:  lista {lex_list:.2f}s, stream {lex_stream:.2f}s")
+    print(f"parser: lista {parse_list:.2f}s, stream {parse_stream:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
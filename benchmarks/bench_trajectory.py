@@ -0,0 +1,83 @@
+"""Trajetória gravada como texto (`[Simulação] ...`) e como arquivo binário
+(`src/trajectory.py`): tempo de gravação, tamanho e tempo de releitura da
+posição final.
+
+    python -m benchmarks.bench_trajectory [repetições]
+"""
+import os
+import re
+import sys
+import tempfile
+
+from benchmarks.common import best_time
+from src.closures import ClosureInterpreter
+from src.events import TextSink
+from src.lexer import Lexer
+from src.parser import Parser
+from src.trajectory import Trajectory, TrajectoryRecorder
+
+PATH = '''
+VAR lado = 1;
+REPETIR {times} VEZES {{
+    REPETIR 20 VEZES {{ MOVER FRENTE 1; }}
+    GIRAR DIREITA;
+    MOVER FRENTE lado;
+    GIRAR DIREITA;
+    REPETIR 20 VEZES {{ MOVER FRENTE 1; }}
+    GIRAR ESQUERDA;
+    MOVER FRENTE lado;
+    GIRAR ESQUERDA;
+}}
+'''
+
+_POSITION = re.compile(r"-> \((-?\d+),(-?\d+)\)")
+
+
+def record_text(program, path):
+    with open(path, "w") as file:
+        events = TextSink(file)
+        ClosureInterpreter(events).interpret(program)
+        events.flush()
+
+
+def record_binary(program, path):
+    with TrajectoryRecorder(path) as recorder:
+        ClosureInterpreter(recorder).interpret(program)
+
+
+def read_text(path):
+    position = None
+    with open(path) as file:
+        for line in file:
+            match = _POSITION.search(line)
+            if match:
+                position = (int(match[1]), int(match[2]))
+    return position
+
+
+def read_binary(path):
+    with Trajectory(path) as trajectory:
+        return trajectory.final_state()[:2]
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    program = Parser(Lexer(PATH.format(times=times)).tokenize()).parse()
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "trajetoria.txt")
+        binary_path = os.path.join(directory, "trajetoria.rtj")
+        text_time = best_time(lambda: record_text(program, text_path))
+        binary_time = best_time(lambda: record_binary(program, binary_path))
+        assert read_text(text_path) == read_binary(binary_path)
+        text_read = best_time(lambda: read_text(text_path))
+        binary_read = best_time(lambda: read_binary(binary_path))
+        text_size = os.path.getsize(text_path)
+        binary_size = os.path.getsize(binary_path)
+    print(f"{times * 46} eventos")
+    print(f"  gravação: texto {text_time:.3f}s, binário {binary_time:.3f}s ({text_time / binary_time:.2f}x)")
+    print(f"  tamanho:  texto {text_size} bytes, binário {binary_size} bytes ({text_size / binary_size:.0f}x menor)")
+    print(f"  leitura:  texto {text_read:.3f}s, binário {binary_read:.4f}s ({text_read / binary_read:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
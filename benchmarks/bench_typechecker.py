@@ -0,0 +1,48 @@
+"""Caminhos especializados pelos tipos inferidos (`src/typechecker.py`) em um
+laço com muita aritmética: cada motor roda o programa sem e com a inferência.
+
+    python -m benchmarks.bench_typechecker [repetições]
+"""
+import sys
+
+from benchmarks.bench_closures import run
+from benchmarks.common import best_time
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.resolver import resolve
+from src.typechecker import check_types
+from src.vm import VirtualMachine
+
+ENGINES = {"tree": Interpreter, "vm": VirtualMachine, "closure": ClosureInterpreter, "aot": AOTInterpreter}
+
+ARITHMETIC = '''
+VAR i = 0;
+VAR soma = 0;
+VAR passo = 1;
+REPETIR {times} VEZES {{
+    SET i = i + 1;
+    SET soma = soma + i * 2 + passo;
+    SE (i + passo > soma) ENTAO {{ SET passo = passo + 1; }}
+    MOVER FRENTE passo + 1;
+}}
+'''
+
+
+def main():
+    times = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = ARITHMETIC.format(times=times)
+    untyped = Parser(Lexer(source).tokenize()).parse()
+    typed = Parser(Lexer(source).tokenize()).parse()
+    assert resolve(untyped) == [] and resolve(typed) == [] and check_types(typed) == []
+    print(f"laço aritmético com {times} repetições")
+    for name, engine in ENGINES.items():
+        before = best_time(lambda: run(engine, untyped, False))
+        after = best_time(lambda: run(engine, typed, False))
+        print(f"  {name:>7}: sem tipos {before:.3f}s, com tipos {after:.3f}s ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
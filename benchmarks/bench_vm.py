@@ -0,0 +1,53 @@
+"""Motor 'vm' (bytecode, `src/vm.py`) x `Interpreter` nos scripts de `exemplos/`
+ampliados: cada script roda `n` vezes dentro de um `REPETIR`, com os `VAR`
+trocados por `SET` (as variáveis são declaradas uma única vez, antes do laço).
+
+    python -m benchmarks.bench_vm [repetições]
+"""
+import glob
+import os
+import re
+import sys
+from contextlib import redirect_stdout
+
+from benchmarks.common import best_time
+from src.bytecode import compile_program
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.vm import VirtualMachine
+
+_VAR = re.compile(r'\bVAR\s+(\w+)\s*=', re.IGNORECASE)
+
+
+def scale(source, n):
+    names = dict.fromkeys(_VAR.findall(source))
+    declarations = "".join(f"VAR {name} = 0;\n" for name in names)
+    body = _VAR.sub(r"SET \1 =", source)
+    return f"{declarations}REPETIR {n} VEZES {{\n{body}\n}}\n"
+
+
+def run(engine, program, simulation_output):
+    interpreter = engine()
+    interpreter.simulation_output = simulation_output
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        interpreter.interpret(program)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    print(f"repetições de cada script: {n}")
+    for path in sorted(glob.glob(os.path.join("exemplos", "*.robo"))):
+        with open(path) as file:
+            program = Parser(Lexer(scale(file.read(), n)).tokenize()).parse()
+        print(os.path.basename(path))
+        for simulation_output in (True, False):
+            tree = best_time(lambda: run(Interpreter, program, simulation_output))
+            vm = best_time(lambda: run(VirtualMachine, program, simulation_output))
+            label = "com eventos" if simulation_output else "sem eventos"
+            print(f"  {label}: tree {tree:.3f}s, vm {vm:.3f}s ({tree / vm:.2f}x)")
+    print(f"compilação (último script): {best_time(lambda: compile_program(program)) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
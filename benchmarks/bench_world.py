@@ -0,0 +1,82 @@
+"""Mundo com milhões de objetos (`src/world.py`): tempo de carga do arquivo,
+consultas na posição do robô e `MOVER` longo com obstáculos, pelo índice
+ordenado (`free_steps`) contra uma verificação célula a célula.
+
+    python -m benchmarks.bench_world [objetos]
+"""
+import os
+import random
+import sys
+import tempfile
+
+from benchmarks.common import best_time
+from src.events import NullSink
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.parser import Parser
+from src.world import World
+
+SIDE = 2_000 # Os objetos e obstáculos ficam em um quadrado de SIDE x SIDE
+QUERIES = 1_000_000
+MOVES = 10_000
+
+# Vai e volta na diagonal, sempre com caminhos de ~SIDE células
+PROGRAM = '''
+REPETIR {times} VEZES {{
+    MOVER FRENTE 1990; GIRAR DIREITA; MOVER FRENTE 1;
+    GIRAR DIREITA; MOVER FRENTE 1990; GIRAR ESQUERDA; MOVER FRENTE 1; GIRAR ESQUERDA;
+}}
+'''
+
+
+def scan_free_steps(world, x, y, dx, dy, steps):
+    """Passos livres, célula por célula."""
+    obstacles = world.obstacles
+    for step in range(1, steps + 1):
+        if (x + dx * step, y + dy * step) in obstacles:
+            return step - 1
+    return steps
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    generator = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mundo.txt")
+        with open(path, "w") as file:
+            file.writelines(f"objeto {generator.randrange(SIDE)} {generator.randrange(SIDE)}\n"
+                            for _ in range(count))
+            # Poucos obstáculos, fora do caminho do programa (x >= 1000, y < 0)
+            file.writelines(f"obstaculo {generator.randrange(1_000, SIDE)} {-generator.randrange(1, SIDE)}\n"
+                            for _ in range(count // 1_000))
+        size = os.path.getsize(path)
+        load_time = best_time(lambda: World.load(path), repeat=1)
+        world = World.load(path)
+    print(f"carga: {count:,} objetos e {count // 1_000:,} obstáculos ({size / 2 ** 20:.0f} MiB) "
+          f"em {load_time:.2f}s ({count / load_time:,.0f} objetos/s)")
+
+    cells = [(generator.randrange(SIDE), generator.randrange(SIDE)) for _ in range(QUERIES)]
+    lookup = best_time(lambda: [world.objects_at(x, y) for x, y in cells])
+    print(f"consulta na posição do robô: {lookup / QUERIES * 1e9:.0f} ns")
+
+    moves = [(generator.randrange(1_000, SIDE), -generator.randrange(SIDE), *generator.choice(
+              ((0, 1), (1, 0), (0, -1), (-1, 0)))) for _ in range(MOVES)]
+    world.free_steps(0, 0, 1, 0, 1) # Monta o índice
+    indexed = best_time(lambda: [world.free_steps(x, y, dx, dy, SIDE) for x, y, dx, dy in moves])
+    scanned = best_time(lambda: [scan_free_steps(world, x, y, dx, dy, SIDE) for x, y, dx, dy in moves])
+    print(f"MOVER de até {SIDE} passos: índice {indexed / MOVES * 1e6:.1f} µs, "
+          f"célula a célula {scanned / MOVES * 1e6:.1f} µs ({scanned / indexed:.0f}x)")
+
+    program = Parser(Lexer(PROGRAM.format(times=100)).tokenize()).parse()
+    def run(world):
+        interpreter = Interpreter(NullSink())
+        interpreter.world = world
+        interpreter.interpret(program)
+    free = best_time(lambda: run(None))
+    in_world = best_time(lambda: run(world))
+    print(f"programa com 400 MOVERs longos: sem mundo {free * 1e3:.2f} ms, "
+          f"no mundo {in_world * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
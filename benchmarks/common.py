@@ -0,0 +1,61 @@
+"""Utilitários compartilhados pelos benchmarks de `benchmarks/`.
+
+Os scripts são executados a partir da raiz do repositório, por exemplo:
+
+    python -m benchmarks.bench_lexer
+"""
+import time
+
+# Trecho representativo de um script gerado: comandos de movimento, variáveis,
+# comentários, strings e um laço com condicional.
+SAMPLE_BLOCK = '''// trecho gerado automaticamente
+VAR passos_{n} = {n};
+MOVER FRENTE 10;
+GIRAR DIREITA;
+MOVER TRAS passos_{n} + 2 * 3;
+IMPRIMIR "Posicao: " + robot_x + ", " + robot_y;
+REPETIR 2 VEZES {{
+    SE (robot_x >= 10) ENTAO {{
+        GIRAR ESQUERDA;
+    }} SENAO {{
+        MOVER FRENTE 1;
+    }}
+}}
+'''
+
+
+def generate_source(target_bytes: int) -> str:
+    """Gera um programa RoboScript válido com aproximadamente `target_bytes` bytes."""
+    parts = []
+    size = 0
+    n = 0
+    while size < target_bytes:
+        block = SAMPLE_BLOCK.format(n=n)
+        parts.append(block)
+        size += len(block)
+        n += 1
+    return "".join(parts)
+
+
+# Comandos planos, como os emitidos por planejadores de missão: não criam
+# variáveis, então o estado do programa não cresce com o tamanho do arquivo.
+FLAT_BLOCK = '''MOVER FRENTE 10;
+GIRAR DIREITA;
+MOVER TRAS 3;
+GIRAR ESQUERDA;
+'''
+
+
+def generate_flat_source(target_bytes: int) -> str:
+    """Gera um programa só com MOVER/GIRAR com aproximadamente `target_bytes` bytes."""
+    return FLAT_BLOCK * max(target_bytes // len(FLAT_BLOCK), 1)
+
+
+def best_time(func, repeat: int = 3) -> float:
+    """Menor tempo (em segundos) entre `repeat` execuções de `func()`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -1,28 +1,288 @@
+import argparse
+import csv
+import json
+import math
 import sys
+import time
+from collections import Counter
 from src.lexer import Lexer
-from src.parser import Parser
+from src.parallel_lexer import tokenize_parallel
+from src.parser import Parser, StreamParser
 from src.interpreter import Interpreter
+from src.stack_interpreter import StackInterpreter
+from src.cache import ASTCache, cache_dir_for
+from src.optimizer import Optimizer
+from src.resolver import resolve
+from src.typechecker import check_types
+from src.vm import VirtualMachine
+from src.closures import ClosureInterpreter
+from src.bytecode import compile_program, disassemble
+from src.codegen import AOTInterpreter, CodeCache, generate_code
+from src.scheduler import AsyncInterpreter
+from src.events import SINKS, NullSink, TeeSink
+from src.trajectory import TrajectoryRecorder
+from src.batch import find_scripts, run_batch, summarize, write_csv, write_json
+from src.world import World
+from src.sweep import CHUNK_VARIANTS, FIELDS as SWEEP_FIELDS, grid, parse_value, read_csv, run_sweep
 
-def main():
-    if len(sys.argv) < 2:
-        print("Uso: python3 main.py <caminho/para/seu/arquivo.robo>")
+# Motores de execução disponíveis para --engine
+ENGINES = {
+    "tree": Interpreter,
+    "stack": StackInterpreter,
+    "vm": VirtualMachine,
+    "closure": ClosureInterpreter,
+    "aot": AOTInterpreter,
+    "async": AsyncInterpreter,
+}
+
+# Motores que consultam o mundo de --world nos movimentos (ver src/world.py)
+WORLD_ENGINES = ("tree", "stack", "async")
+
+def parse_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="main.py",
+        usage="python3 main.py <caminho/para/seu/arquivo.robo> [opções]",
+        description="Interpretador RoboScript.",
+    )
+    arg_parser.add_argument("file_path", metavar="arquivo", help="arquivo .robo a executar")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="lê, analisa e executa o arquivo declaração por declaração, "
+                                 "com memória limitada (a execução começa antes do fim da leitura)")
+    arg_parser.add_argument("--chunk-size", type=int, default=64 * 1024,
+                            help="tamanho dos blocos lidos no modo --stream (padrão: 65536 caracteres)")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree",
+                            help="motor de execução: 'tree' (recursivo, padrão), 'stack' "
+                                 "(pilha explícita, para blocos muito aninhados), 'vm' (bytecode) "
+                                 "'closure' (AST compilada em closures) ou 'aot' (programa compilado "
+                                 "para código Python, guardado em cache) ou 'async' (corrotina do asyncio que "
+                                 "cede a vez a cada ação, ver src/scheduler.py)")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="não lê nem grava a AST em cache no diretório __roboscache__")
+    arg_parser.add_argument("--no-optimize", action="store_true",
+                            help="executa a AST sem dobra de constantes nem remoção de ramos mortos")
+    arg_parser.add_argument("--no-licm", action="store_true",
+                            help="não reaproveita expressões invariantes em laços nem subexpressões "
+                                 "repetidas (otimização ligada por padrão)")
+    arg_parser.add_argument("--quiet", action="store_true",
+                            help="não mostra os eventos da simulação, só a saída de IMPRIMIR")
+    arg_parser.add_argument("--events", choices=SINKS, default="text",
+                            help="formato dos eventos: 'text' (padrão), 'ndjson' (um objeto JSON por "
+                                 "linha) ou 'null' (descarta todos, inclusive IMPRIMIR)")
+    arg_parser.add_argument("--trajectory", metavar="ARQUIVO",
+                            help="grava a trajetória do robô em ARQUIVO, em formato binário compacto "
+                                 "(ver src/trajectory.py)")
+    arg_parser.add_argument("--fleet", type=int, metavar="N",
+                            help="executa o programa para N robôs de uma vez, com NumPy (ver src/fleet.py); "
+                                 "os robôs começam em uma grade quadrada a partir de (0,0) e só o resumo "
+                                 "da execução é mostrado")
+    arg_parser.add_argument("--world", metavar="ARQUIVO",
+                            help="lê os objetos e obstáculos do mundo de ARQUIVO (ver src/world.py): PEGAR "
+                                 "retira um objeto da posição do robô, SOLTAR coloca um e MOVER para antes "
+                                 "de um obstáculo (motores " + ", ".join(WORLD_ENGINES) + ")")
+    arg_parser.add_argument("--disassemble", action="store_true",
+                            help="mostra o bytecode do programa (o mesmo executado por --engine vm) sem executá-lo")
+    return arg_parser.parse_args(argv)
+
+def parse_batch_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        usage="python3 main.py batch <arquivos ou diretórios...> [opções]",
+        description="Executa muitos scripts RoboScript em vários processos e grava um resumo "
+                    "com o estado final, a situação e os tempos de cada um.",
+    )
+    arg_parser.add_argument("paths", metavar="caminho", nargs="+",
+                            help="arquivos .robo ou diretórios (percorridos recursivamente)")
+    arg_parser.add_argument("--jobs", "-j", type=int, default=None,
+                            help="número de processos (padrão: número de CPUs)")
+    arg_parser.add_argument("--chunk-size", type=int, default=None,
+                            help="arquivos enviados de uma vez a cada processo (padrão: automático)")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree", help="motor de execução")
+    arg_parser.add_argument("--no-optimize", action="store_true", help="executa a AST sem otimizações")
+    arg_parser.add_argument("--no-licm", action="store_true",
+                            help="não reaproveita expressões invariantes em laços nem subexpressões repetidas")
+    arg_parser.add_argument("--format", choices=("json", "csv"), default="json", help="formato do resumo")
+    arg_parser.add_argument("--output", "-o", metavar="ARQUIVO",
+                            help="grava o resumo em ARQUIVO (padrão: saída padrão)")
+    return arg_parser.parse_args(argv)
+
+def run_batch_command(argv):
+    """`main.py batch`: executa os scripts em paralelo (ver src/batch.py); encerra com 1 se algum falhar."""
+    args = parse_batch_args(argv)
+    scripts = find_scripts(args.paths)
+    start = time.perf_counter()
+    records = list(run_batch(scripts, ENGINES[args.engine], args.jobs, args.chunk_size,
+                             optimize=not args.no_optimize, licm=not args.no_licm))
+    elapsed = time.perf_counter() - start
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            write_json(records, output, elapsed)
+        else:
+            write_csv(records, output)
+    finally:
+        if args.output:
+            output.close()
+    summary = summarize(records, elapsed)
+    print(f"[Lote] {summary['files']} arquivos, {summary['ok']} ok, {summary['failed']} com erro, "
+          f"em {elapsed:.3f}s", file=sys.stderr)
+    if summary["failed"]:
+        sys.exit(1)
+
+def parse_sweep_args(argv):
+    arg_parser = argparse.ArgumentParser(
+        prog="main.py sweep",
+        usage="python3 main.py sweep <arquivo.robo> [--set NOME=VALORES ...] [--csv ARQUIVO] [opções]",
+        description="Executa o mesmo programa com valores diferentes nas declarações VAR de nível superior, "
+                    "analisando o arquivo uma única vez, e mostra o estado final de cada variante.",
+    )
+    arg_parser.add_argument("file_path", metavar="arquivo", help="arquivo .robo")
+    arg_parser.add_argument("--set", dest="values", action="append", default=[], metavar="NOME=VALORES",
+                            help="valores de uma variável, separados por vírgula ('a,b,c') ou em um intervalo "
+                                 "de inteiros ('1..50'); as variáveis formam uma grade com todas as combinações")
+    arg_parser.add_argument("--csv", metavar="ARQUIVO",
+                            help="variantes em um CSV, uma por linha, com os nomes das variáveis no cabeçalho "
+                                 "(combinadas com a grade de --set)")
+    arg_parser.add_argument("--jobs", "-j", type=int, default=None,
+                            help="número de processos (padrão: número de CPUs)")
+    arg_parser.add_argument("--chunk-size", type=int, default=CHUNK_VARIANTS,
+                            help=f"variantes enviadas de uma vez a cada processo (padrão: {CHUNK_VARIANTS})")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree", help="motor de execução")
+    arg_parser.add_argument("--no-optimize", action="store_true", help="executa a AST sem otimizações")
+    arg_parser.add_argument("--no-licm", action="store_true",
+                            help="não reaproveita expressões invariantes em laços nem subexpressões repetidas")
+    arg_parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson",
+                            help="formato dos resultados, escritos à medida que as variantes terminam")
+    arg_parser.add_argument("--output", "-o", metavar="ARQUIVO",
+                            help="grava os resultados em ARQUIVO (padrão: saída padrão)")
+    return arg_parser.parse_args(argv)
+
+def sweep_values(text):
+    """Nome e valores de um --set: 'nome=a,b,c' ou 'nome=1..50'."""
+    name, separator, values = text.partition("=")
+    if not separator or not name.strip():
+        print(f"Erro: --set espera NOME=VALORES, recebeu '{text}'.")
         sys.exit(1)
+    first, dots, last = values.partition("..")
+    if dots and isinstance(parse_value(first), int) and isinstance(parse_value(last), int):
+        return name.strip(), range(parse_value(first), parse_value(last) + 1)
+    return name.strip(), [parse_value(value) for value in values.split(",")]
 
-    file_path = sys.argv[1]
-    
+def run_sweep_command(argv):
+    """`main.py sweep`: executa as variantes em paralelo (ver src/sweep.py)."""
+    args = parse_sweep_args(argv)
     try:
-        with open(file_path, 'r') as file:
+        with open(args.file_path, 'r') as file:
             source_code = file.read()
     except FileNotFoundError:
-        print(f"Erro: Arquivo '{file_path}' não encontrado.")
+        print(f"Erro: Arquivo '{args.file_path}' não encontrado.")
         sys.exit(1)
+    ast = parse_source(source_code)
+    variants = grid(dict(sweep_values(text) for text in args.values))
+    if args.csv:
+        variants = [{**row, **variant} for row in read_csv(args.csv) for variant in variants]
 
-    print(f"--- Executando RoboScript: {file_path} ---")
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    names = list(dict.fromkeys(name for variant in variants for name in variant))
+    writer = None
+    if args.format == "csv":
+        writer = csv.writer(output)
+        writer.writerow((*SWEEP_FIELDS[:1], *names, *SWEEP_FIELDS[1:]))
+    counts = Counter()
+    start = time.perf_counter()
+    try:
+        for record in run_sweep(ast, variants, ENGINES[args.engine], args.jobs, args.chunk_size,
+                                optimize=not args.no_optimize, licm=not args.no_licm):
+            overrides = variants[record[0]]
+            counts[record[1]] += 1
+            if writer:
+                writer.writerow((record[0], *(overrides.get(name, "") for name in names), *record[1:]))
+            else:
+                output.write(json.dumps({"variant": record[0], "overrides": overrides,
+                                         **dict(zip(SWEEP_FIELDS[1:], record[1:]))}, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            output.close()
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"[Varredura] {total} variantes, {counts['ok']} ok, {total - counts['ok']} com erro, em {elapsed:.3f}s "
+          f"({total / elapsed if elapsed else 0:,.0f} variantes/s)", file=sys.stderr)
 
-    # Análise Léxica
-    lexer = Lexer(source_code)
+def make_sink(args):
+    """Sink dos eventos da execução conforme --events, --quiet e --trajectory (ver src/events.py)."""
+    events = NullSink() if args.events == "null" else SINKS[args.events](simulation=not args.quiet)
+    if args.trajectory:
+        return TeeSink(events, TrajectoryRecorder(args.trajectory))
+    return events
+
+def run_stream(file, chunk_size, engine, optimizer=None, events=None, world=None):
+    """Executa cada declaração de nível superior assim que ela é analisada."""
+    lexer = Lexer.from_file(file, chunk_size)
+    statements = StreamParser(lexer.iter_tokens()).iter_statements()
+    interpreter = engine(events)
+    interpreter.world = world
+    events = interpreter.events
+    while True:
+        try:
+            statement = next(statements, None)
+        except Exception as e:
+            stage = "Léxico" if str(e).startswith("Erro léxico") else "Sintático"
+            events.flush()
+            print(f"Erro {stage}: {e}")
+            sys.exit(1)
+        if statement is None:
+            break
+        try:
+            for optimized in optimizer.optimize_statement(statement) if optimizer else (statement,):
+                interpreter.visit(optimized)
+        except Exception as e:
+            events.flush()
+            print(f"Erro de Execução: {e}")
+            sys.exit(1)
+    events.flush()
+    print("--- Execução Concluída ---")
+
+def run_fleet(ast, size):
+    """Executa o programa para `size` robôs (modo --fleet) e mostra o resumo."""
     try:
-        tokens = lexer.tokenize()
+        from src.fleet import FleetInterpreter
+    except ImportError:
+        print("Erro: o modo --fleet requer o NumPy (pip install numpy).")
+        sys.exit(1)
+    side = math.isqrt(max(size - 1, 0)) + 1 # Lado da grade das posições iniciais
+    fleet = FleetInterpreter(size, x=[robot % side for robot in range(size)],
+                             y=[robot // side for robot in range(size)])
+    start = time.perf_counter()
+    fleet.interpret(ast)
+    elapsed = time.perf_counter() - start
+    print(f"[Frota] {size} robôs, {fleet.steps} passos de robô em {elapsed:.3f}s "
+          f"({fleet.steps / elapsed if elapsed else 0:,.0f} passos/s)")
+    errors = Counter(error for error in fleet.errors if error is not None)
+    if errors:
+        print(f"[Frota] {sum(errors.values())} robôs pararam com erro:")
+        for error, count in errors.most_common():
+            print(f"  {count}x {error}")
+    print("--- Execução Concluída ---")
+
+def load_world(args):
+    """Mundo de --world (None sem a opção); encerra o programa se ele não puder ser usado."""
+    if args.world is None:
+        return None
+    if args.engine not in WORLD_ENGINES or args.fleet is not None:
+        print(f"Erro: --world só é suportado pelos motores {', '.join(WORLD_ENGINES)}, sem --fleet.")
+        sys.exit(1)
+    try:
+        return World.load(args.world)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de mundo '{args.world}' não encontrado.")
+    except Exception as e:
+        print(f"Erro: {e}")
+    sys.exit(1)
+
+def parse_source(source_code):
+    """Análise léxica e sintática completas; encerra o programa em caso de erro."""
+    # Análise Léxica (em paralelo para fontes muito grandes)
+    try:
+        tokens = tokenize_parallel(source_code)
         # for token in tokens:
         #     print(token)
     except Exception as e:
@@ -38,13 +298,92 @@ def main():
     except Exception as e:
         print(f"Erro Sintático: {e}")
         sys.exit(1)
+    return ast
+
+def check_program(ast):
+    """Resolve as variáveis e infere os tipos (ver src/resolver.py e src/typechecker.py);
+    encerra o programa se houver erros semânticos ou de tipo."""
+    errors = [f"Erro Semântico: {error}" for error in resolve(ast)]
+    errors += [f"Erro de Tipo: {error}" for error in check_types(ast)]
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(1)
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python3 main.py <caminho/para/seu/arquivo.robo>")
+        sys.exit(1)
+    if sys.argv[1] == "batch":
+        run_batch_command(sys.argv[2:])
+        return
+    if sys.argv[1] == "sweep":
+        run_sweep_command(sys.argv[2:])
+        return
+
+    args = parse_args(sys.argv[1:])
+    file_path = args.file_path
+
+    try:
+        file = open(file_path, 'r')
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{file_path}' não encontrado.")
+        sys.exit(1)
+    world = load_world(args)
+
+    print(f"--- Executando RoboScript: {file_path} ---")
+
+    if args.stream:
+        with file:
+            run_stream(file, args.chunk_size, ENGINES[args.engine],
+                       None if args.no_optimize else Optimizer(licm=not args.no_licm), make_sink(args), world)
+        return
+
+    with file:
+        source_code = file.read()
+
+    # Com --engine aot, o código compilado em cache dispensa as análises e a geração de código
+    code_cache = None
+    generated = None
+    if args.engine == "aot" and not args.no_cache and not args.disassemble and not args.fleet:
+        code_cache = CodeCache(cache_dir_for(file_path), optimized=not args.no_optimize,
+                               licm=not args.no_licm)
+        generated = code_cache.load(source_code)
+
+    if generated is None:
+        cache = None if args.no_cache else ASTCache(cache_dir_for(file_path))
+        ast = cache.load(source_code) if cache else None
+        if ast is None:
+            ast = parse_source(source_code)
+            if cache:
+                cache.store(source_code, ast)
+        if not args.no_optimize:
+            ast = Optimizer(licm=not args.no_licm).optimize(ast)
+        check_program(ast)
+        if args.disassemble:
+            print(disassemble(compile_program(ast)))
+            return
+        if args.fleet is not None:
+            run_fleet(ast, args.fleet)
+            return
+        if code_cache:
+            generated = generate_code(ast)
+            if generated is not None:
+                code_cache.store(source_code, generated)
 
     # Interpretação
-    interpreter = Interpreter()
+    events = make_sink(args)
+    interpreter = ENGINES[args.engine](events)
+    interpreter.world = world
     try:
-        interpreter.interpret(ast)
+        if generated is not None:
+            interpreter.execute(generated)
+        else:
+            interpreter.interpret(ast)
+        events.flush()
         print("--- Execução Concluída ---")
     except Exception as e:
+        events.flush()
         print(f"Erro de Execução: {e}")
         sys.exit(1)
 
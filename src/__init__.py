@@ -0,0 +1 @@
+__version__ = "1.0.0" # Incrementar ao mudar a gramática ou os nós da AST (invalida o __roboscache__)
@@ -0,0 +1,443 @@
+"""AST achatada em arrays contíguos (arena).
+
+Na AST de objetos (`src/ast_nodes.py`), cada nó é um objeto no heap que ainda
+guarda seu `Token` completo. `ArenaProgram` guarda os mesmos nós em colunas
+de arrays tipados, indexadas pelo número do nó:
+
+* `kinds`   -- tipo do nó (`NUMBER`, `BINARY`, `MOVE`, ...);
+* `ops`     -- código do operador ou da direção (`TokenType.value`);
+* `a`, `b`, `c` -- filhos e valores, conforme o tipo (tabela abaixo);
+* `lines`, `columns` -- posição do token do nó, para as mensagens de erro.
+
+Os blocos (corpo do programa, ENTAO, SENAO, REPETIR) são fatias de
+`block_items`, o array com os índices das declarações: o bloco `k` vai de
+`block_starts[k]` a `block_starts[k] + block_lengths[k]`. O bloco 0 é o
+programa. Strings, nomes de variáveis e inteiros que não cabem em 64 bits
+ficam em `constants`, sem repetição.
+
+    tipo        a                       b                   c
+    NUMBER      valor (ou constante)    1 se constante
+    STRING      constante
+    IDENTIFIER  constante (nome)
+    BINARY      esquerdo                direito
+    UNARY       operando
+    VAR / SET   constante (nome)        valor
+    MOVE        passos
+    PRINT       expressão
+    IF          condição                bloco ENTAO         bloco SENAO (-1 se não houver)
+    REPEAT      vezes                   bloco do corpo
+"""
+from array import array
+
+from src.ast_nodes import (
+    Program, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral,
+    Identifier, VarDeclaration, AssignmentStatement, MoveStatement, RotateStatement,
+    PickUpStatement, DropStatement, PrintStatement, IfStatement, RepeatStatement,
+    MotionBlock, CachedExpression, ClearCache
+)
+from src import events
+from src.interpreter import Interpreter
+from src.lexer import TokenType
+
+# Tipos de nó
+(NUMBER, STRING, IDENTIFIER, BINARY, UNARY, VAR, SET, MOVE, ROTATE,
+ PICKUP, DROP, PRINT, IF, REPEAT) = range(14)
+
+# Nome da classe da AST de objetos correspondente a cada tipo (usado nos visit_*)
+KIND_NAMES = (
+    'NumberLiteral', 'StringLiteral', 'Identifier', 'BinaryExpression', 'UnaryExpression',
+    'VarDeclaration', 'AssignmentStatement', 'MoveStatement', 'RotateStatement',
+    'PickUpStatement', 'DropStatement', 'PrintStatement', 'IfStatement', 'RepeatStatement',
+)
+
+_KINDS = {
+    NumberLiteral: NUMBER, StringLiteral: STRING, Identifier: IDENTIFIER,
+    BinaryExpression: BINARY, UnaryExpression: UNARY, VarDeclaration: VAR,
+    AssignmentStatement: SET, MoveStatement: MOVE, RotateStatement: ROTATE,
+    PickUpStatement: PICKUP, DropStatement: DROP, PrintStatement: PRINT,
+    IfStatement: IF, RepeatStatement: REPEAT,
+}
+
+# Nós criados pelo otimizador (src/optimizer.py e src/licm.py), sem forma na arena
+_OPTIMIZER_NODES = (MotionBlock, CachedExpression, ClearCache)
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class ArenaProgram:
+    def __init__(self):
+        self.kinds = array('B')
+        self.ops = array('B')
+        self.a = array('q')
+        self.b = array('i')
+        self.c = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.block_items = array('i')
+        self.block_starts = array('i')
+        self.block_lengths = array('i')
+        self.constants = []
+        self._constant_index = {}
+
+    def __len__(self):
+        """Número de nós."""
+        return len(self.kinds)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados pelos arrays (sem contar `constants`)."""
+        return sum(column.itemsize * len(column) for column in (
+            self.kinds, self.ops, self.a, self.b, self.c, self.lines, self.columns,
+            self.block_items, self.block_starts, self.block_lengths))
+
+    def block(self, block_id: int):
+        """Índices das declarações do bloco, como fatia de `block_items`."""
+        start = self.block_starts[block_id]
+        return self.block_items[start:start + self.block_lengths[block_id]]
+
+    @property
+    def statements(self):
+        """Declarações de nível superior (bloco 0)."""
+        return self.block(0)
+
+    def position(self, node: int) -> tuple[int, int]:
+        """Linha e coluna do token do nó."""
+        return self.lines[node], self.columns[node]
+
+    def children(self, node: int) -> list[int]:
+        """Filhos do nó, na ordem do código-fonte (declarações dos blocos incluídas)."""
+        kind = self.kinds[node]
+        if kind == BINARY:
+            return [self.a[node], self.b[node]]
+        if kind == UNARY or kind == MOVE or kind == PRINT:
+            return [self.a[node]]
+        if kind == VAR or kind == SET:
+            return [self.b[node]]
+        if kind == IF:
+            children = [self.a[node], *self.block(self.b[node])]
+            if self.c[node] >= 0:
+                children.extend(self.block(self.c[node]))
+            return children
+        if kind == REPEAT:
+            return [self.a[node], *self.block(self.b[node])]
+        return []
+
+    def walk(self):
+        """Percorre todos os nós em pré-ordem, sem recursão."""
+        kinds, a, b, c = self.kinds, self.a, self.b, self.c
+        block = self.block
+        stack = list(reversed(self.statements))
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            yield node
+            kind = kinds[node]
+            if kind <= IDENTIFIER or kind == ROTATE or kind == PICKUP or kind == DROP:
+                continue
+            if kind == BINARY:
+                push(b[node])
+                push(a[node])
+            elif kind == VAR or kind == SET:
+                push(b[node])
+            elif kind == IF:
+                if c[node] >= 0:
+                    stack.extend(reversed(block(c[node])))
+                stack.extend(reversed(block(b[node])))
+                push(a[node])
+            elif kind == REPEAT:
+                stack.extend(reversed(block(b[node])))
+                push(a[node])
+            else: # UNARY, MOVE, PRINT
+                push(a[node])
+
+    # --- Conversão a partir da AST de objetos ---
+    @classmethod
+    def from_program(cls, program: Program) -> "ArenaProgram":
+        """Converte a AST de objetos, sem recursão (qualquer profundidade)."""
+        arena = cls()
+        arena.block_starts.append(0) # O bloco 0 (programa) é preenchido no fim
+        arena.block_lengths.append(0)
+        results = [] # Índices dos nós já convertidos, filhos antes dos pais
+        stack = [(program, False)]
+        while stack:
+            node, children_done = stack.pop()
+            node_type = type(node)
+            if not children_done:
+                stack.append((node, True))
+                if node_type is BinaryExpression:
+                    stack += ((node.right, False), (node.left, False))
+                elif node_type is UnaryExpression:
+                    stack.append((node.right, False))
+                elif node_type is VarDeclaration or node_type is AssignmentStatement:
+                    stack.append((node.value, False))
+                elif node_type is MoveStatement:
+                    stack.append((node.steps, False))
+                elif node_type is PrintStatement:
+                    stack.append((node.expression, False))
+                elif node_type is IfStatement:
+                    children = [node.condition, *node.then_block, *(node.else_block or ())]
+                    stack.extend((child, False) for child in reversed(children))
+                elif node_type is RepeatStatement:
+                    children = [node.times, *node.body]
+                    stack.extend((child, False) for child in reversed(children))
+                elif node_type is Program:
+                    stack.extend((child, False) for child in reversed(node.statements))
+                elif node_type in _OPTIMIZER_NODES:
+                    raise Exception(f"Nó do otimizador não suportado pela arena: {node_type.__name__}. "
+                                    f"Converta o programa antes de otimizá-lo.")
+                elif node_type not in _KINDS:
+                    raise Exception(f"Nó não suportado pela arena: {node_type.__name__}")
+                continue
+            if node_type is Program:
+                arena._fill_block(0, results, len(node.statements))
+            else:
+                results.append(arena._add(node, node_type, results))
+        return arena
+
+    def _add(self, node, node_type, results) -> int:
+        """Acrescenta um nó cujos filhos já estão no fim de `results`."""
+        kind = _KINDS[node_type]
+        a = b = 0
+        c = -1
+        op = 0
+        token = node.token
+        if kind == NUMBER:
+            a = node.value
+            if not _INT64_MIN <= a <= _INT64_MAX:
+                a, b = self._constant(a), 1
+        elif kind == STRING:
+            a = self._constant(node.value)
+        elif kind == IDENTIFIER:
+            a = self._constant(node.name)
+        elif kind == BINARY:
+            b = results.pop()
+            a = results.pop()
+            op = node.operator.type.value
+        elif kind == UNARY:
+            a = results.pop()
+            op = node.operator.type.value
+        elif kind == VAR or kind == SET:
+            a = self._constant(node.name.value)
+            b = results.pop()
+        elif kind == MOVE:
+            a = results.pop()
+            op = node.direction.type.value
+        elif kind == ROTATE:
+            op = node.direction.type.value
+        elif kind == PRINT:
+            a = results.pop()
+        elif kind == IF:
+            if node.else_block is not None:
+                c = self._new_block(results, len(node.else_block))
+            b = self._new_block(results, len(node.then_block))
+            a = results.pop()
+        elif kind == REPEAT:
+            b = self._new_block(results, len(node.body))
+            a = results.pop()
+
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        self.lines.append(token.line if token else 0)
+        self.columns.append(token.column if token else 0)
+        return index
+
+    def _new_block(self, results, count) -> int:
+        block_id = len(self.block_starts)
+        self.block_starts.append(0)
+        self.block_lengths.append(0)
+        self._fill_block(block_id, results, count)
+        return block_id
+
+    def _fill_block(self, block_id, results, count):
+        """Move as `count` últimas declarações de `results` para o bloco."""
+        self.block_starts[block_id] = len(self.block_items)
+        self.block_lengths[block_id] = count
+        if count:
+            self.block_items.extend(results[-count:])
+            del results[-count:]
+
+    def _constant(self, value) -> int:
+        key = (type(value), value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+
+class ArenaVisitor:
+    """Visitor sobre um `ArenaProgram`: `visit(node)` chama `visit_<Classe>(node)`
+    pelo tipo do nó, com os mesmos nomes de classe da AST de objetos."""
+
+    def __init__(self, program: ArenaProgram):
+        self.program = program
+        self._dispatch = [getattr(self, 'visit_' + name, self.generic_visit) for name in KIND_NAMES]
+
+    def visit(self, node: int):
+        return self._dispatch[self.program.kinds[node]](node)
+
+    def generic_visit(self, node: int):
+        raise NotImplementedError(f"Método de visita não implementado para o nó: {KIND_NAMES[self.program.kinds[node]]}")
+
+
+_OP_SOMA = TokenType.OP_SOMA.value
+_OP_SUB = TokenType.OP_SUB.value
+_OP_MULT = TokenType.OP_MULT.value
+_OP_DIV = TokenType.OP_DIV.value
+_COMPARISONS = {
+    TokenType.IGUAL.value: lambda left, right: left == right,
+    TokenType.DIFERENTE.value: lambda left, right: left != right,
+    TokenType.MENOR.value: lambda left, right: left < right,
+    TokenType.MAIOR.value: lambda left, right: left > right,
+    TokenType.MENOR_IGUAL.value: lambda left, right: left <= right,
+    TokenType.MAIOR_IGUAL.value: lambda left, right: left >= right,
+}
+_OPERATOR_TEXT = {
+    _OP_SOMA: '+', _OP_SUB: '-', _OP_MULT: '*', _OP_DIV: '/',
+    TokenType.IGUAL.value: '==', TokenType.DIFERENTE.value: '!=', TokenType.MENOR.value: '<',
+    TokenType.MAIOR.value: '>', TokenType.MENOR_IGUAL.value: '<=', TokenType.MAIOR_IGUAL.value: '>=',
+}
+
+
+class ArenaInterpreter(ArenaVisitor, Interpreter):
+    """Executa um `ArenaProgram` com a mesma semântica e as mesmas mensagens de `Interpreter`."""
+
+    def __init__(self, events=None, program: ArenaProgram = None):
+        Interpreter.__init__(self, events)
+        ArenaVisitor.__init__(self, program)
+
+    def interpret(self, program):
+        """Aceita um `ArenaProgram` ou um `Program` (convertido antes de executar)."""
+        if isinstance(program, Program):
+            program = ArenaProgram.from_program(program)
+        ArenaVisitor.__init__(self, program)
+        self.interpret_statements(program.statements)
+
+    def _error(self, message, node=None):
+        if node is None:
+            super()._error(message)
+        line, column = self.program.position(node)
+        raise Exception(f"Erro de Execução: Linha {line}, coluna {column}: {message}")
+
+    def _name(self, node):
+        return self.program.constants[self.program.a[node]]
+
+    # --- Declarações ---
+    def visit_VarDeclaration(self, node):
+        name = self._name(node)
+        value = self.visit(self.program.b[node])
+        self.environment.define(name, value)
+        if self.simulation_output:
+            self.events.emit((events.VAR, name, value))
+
+    def visit_AssignmentStatement(self, node):
+        name = self._name(node)
+        if not self.environment.exists(name):
+            self._error(f"Variável '{name}' não declarada antes de ser atribuída.", node)
+        value = self.visit(self.program.b[node])
+        self.environment.assign(name, value)
+        if self.simulation_output:
+            self.events.emit((events.SET, name, value))
+
+    # O movimento, o giro e as validações são os do `Interpreter`; os erros
+    # recebem o índice do nó no lugar do token (ver `_error`)
+    def visit_MoveStatement(self, node):
+        steps_node = self.program.a[node]
+        steps = self.visit(steps_node)
+        self._check_steps(steps, None, steps_node)
+        self._move_robot(TokenType(self.program.ops[node]), steps, node)
+
+    def visit_RotateStatement(self, node):
+        self._rotate_robot(TokenType(self.program.ops[node]))
+
+    def visit_PickUpStatement(self, node):
+        self._pick_up_object(node)
+
+    def visit_DropStatement(self, node):
+        Interpreter.visit_DropStatement(self, None)
+
+    def visit_PrintStatement(self, node):
+        value = self.visit(self.program.a[node])
+        self.events.emit((events.PRINT, value))
+
+    def visit_IfStatement(self, node):
+        program = self.program
+        if self._condition_is_true(node):
+            block = program.block(program.b[node])
+        elif program.c[node] >= 0:
+            block = program.block(program.c[node])
+        else:
+            return
+        for statement in block:
+            self.visit(statement)
+
+    def visit_RepeatStatement(self, node):
+        body = self.program.block(self.program.b[node])
+        for _ in range(self._repeat_count(node)):
+            for statement in body:
+                self.visit(statement)
+
+    def _condition_is_true(self, node) -> bool:
+        condition_node = self.program.a[node]
+        return self._is_true(self.visit(condition_node), None, condition_node)
+
+    def _repeat_count(self, node) -> int:
+        times_node = self.program.a[node]
+        return self._check_repeat_count(self.visit(times_node), None, times_node)
+
+    # --- Expressões ---
+    def visit_NumberLiteral(self, node):
+        program = self.program
+        if program.b[node]:
+            return program.constants[program.a[node]]
+        return program.a[node]
+
+    def visit_StringLiteral(self, node):
+        return self._name(node)
+
+    def visit_Identifier(self, node):
+        name = self._name(node)
+        if name == "robot_x":
+            return self.robot_x
+        if name == "robot_y":
+            return self.robot_y
+        if name == "robot_direction":
+            return self.robot_direction
+        if name == "has_object":
+            return 1 if self.has_object else 0
+        try:
+            return self.environment.get(name)
+        except ValueError as e:
+            self._error(str(e), node)
+
+    def visit_BinaryExpression(self, node):
+        program = self.program
+        left_val = self.visit(program.a[node])
+        right_val = self.visit(program.b[node])
+        op = program.ops[node]
+        if op == _OP_SOMA:
+            if isinstance(left_val, str) or isinstance(right_val, str):
+                return str(left_val) + str(right_val)
+            return left_val + right_val
+        elif op == _OP_SUB:
+            return left_val - right_val
+        elif op == _OP_MULT:
+            return left_val * right_val
+        elif op == _OP_DIV:
+            if right_val == 0:
+                self._error("Divisão por zero.", node)
+            return left_val // right_val
+        comparison = _COMPARISONS.get(op)
+        if comparison is None:
+            self._error(f"Operador binário desconhecido: {_OPERATOR_TEXT.get(op, op)}", node)
+        return comparison(left_val, right_val)
+
+    def visit_UnaryExpression(self, node):
+        right_val = self.visit(self.program.a[node])
+        if self.program.ops[node] == _OP_SUB:
+            return -right_val
+        return +right_val
@@ -1,5 +1,7 @@
 # --- Classe Base para Nós da AST ---
 class ASTNode:
+    __slots__ = ('token',)
+
     def __init__(self, token=None):
         self.token = token # Opcional: armazena o token que gerou este nó
 
@@ -18,9 +20,15 @@ class ASTNode:
 
 # --- Nodos de Expressões ---
 class Expression(ASTNode):
-    pass
+    __slots__ = ('static_type',)
+
+    def __init__(self, token=None):
+        super().__init__(token)
+        self.static_type = None # Tipos possíveis do valor (ver `src/typechecker.py`)
 
 class BinaryExpression(Expression):
+    __slots__ = ('left', 'operator', 'right')
+
     def __init__(self, left: Expression, operator_token, right: Expression):
         super().__init__(operator_token)
         self.left = left
@@ -31,6 +39,8 @@ class BinaryExpression(Expression):
         return f"({repr(self.left)} {self.operator.value} {repr(self.right)})"
 
 class UnaryExpression(Expression):
+    __slots__ = ('operator', 'right')
+
     def __init__(self, operator_token, right: Expression):
         super().__init__(operator_token)
         self.operator = operator_token
@@ -40,6 +50,8 @@ class UnaryExpression(Expression):
         return f"({self.operator.value}{repr(self.right)})"
 
 class NumberLiteral(Expression):
+    __slots__ = ('value',)
+
     def __init__(self, token):
         super().__init__(token)
         self.value = int(token.value)
@@ -48,6 +60,8 @@ class NumberLiteral(Expression):
         return f"{self.value}"
 
 class StringLiteral(Expression):
+    __slots__ = ('value',)
+
     def __init__(self, token):
         super().__init__(token)
         self.value = token.value
@@ -55,44 +69,69 @@ class StringLiteral(Expression):
     def __repr__(self):
         return f"'{self.value}'"
 
+class BooleanLiteral(Expression):
+    """Resultado de uma comparação calculada em tempo de análise (ver `src/optimizer.py`)."""
+    __slots__ = ('value',)
+
+    def __init__(self, token, value: bool):
+        super().__init__(token)
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.value}"
+
 class Identifier(Expression):
+    __slots__ = ('name', 'slot')
+
     def __init__(self, token):
         super().__init__(token)
         self.name = token.value
+        self.slot = None # Índice da variável ou do estado do robô (ver `src/resolver.py`)
 
     def __repr__(self):
         return f"ID('{self.name}')"
 
 # --- Nodos de Declarações (Statements) ---
 class Statement(ASTNode):
-    pass
+    __slots__ = ()
 
 class Program(ASTNode):
+    __slots__ = ('statements', 'slot_names')
+
     def __init__(self, statements: list[Statement]):
         self.statements = statements
+        self.slot_names = None # Nome da variável de cada índice, após `resolve`
 
     def __repr__(self):
         return "\n".join(repr(s) for s in self.statements)
 
 class VarDeclaration(Statement):
+    __slots__ = ('name', 'value', 'slot')
+
     def __init__(self, name_token, value: Expression):
         super().__init__(name_token)
         self.name = name_token
         self.value = value
+        self.slot = None
 
     def __repr__(self):
         return f"VAR {self.name.value} = {repr(self.value)};"
 
 class AssignmentStatement(Statement):
+    __slots__ = ('name', 'value', 'slot')
+
     def __init__(self, name_token, value: Expression):
         super().__init__(name_token)
         self.name = name_token
         self.value = value
+        self.slot = None
 
     def __repr__(self):
         return f"SET {self.name.value} = {repr(self.value)};"
 
 class MoveStatement(Statement):
+    __slots__ = ('direction', 'steps')
+
     def __init__(self, direction_token, steps: Expression):
         super().__init__(direction_token)
         self.direction = direction_token
@@ -102,6 +141,8 @@ class MoveStatement(Statement):
         return f"MOVER {self.direction.value} {repr(self.steps)};"
 
 class RotateStatement(Statement):
+    __slots__ = ('direction',)
+
     def __init__(self, direction_token):
         super().__init__(direction_token)
         self.direction = direction_token
@@ -110,6 +151,8 @@ class RotateStatement(Statement):
         return f"GIRAR {self.direction.value};"
 
 class PickUpStatement(Statement):
+    __slots__ = ()
+
     def __init__(self, token=None):
         super().__init__(token)
 
@@ -117,6 +160,8 @@ class PickUpStatement(Statement):
         return "PEGAR;"
 
 class DropStatement(Statement):
+    __slots__ = ()
+
     def __init__(self, token=None):
         super().__init__(token)
 
@@ -124,6 +169,8 @@ class DropStatement(Statement):
         return "SOLTAR;"
 
 class PrintStatement(Statement):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expression):
         super().__init__()
         self.expression = expression
@@ -132,6 +179,8 @@ class PrintStatement(Statement):
         return f"IMPRIMIR {repr(self.expression)};"
 
 class IfStatement(Statement):
+    __slots__ = ('condition', 'then_block', 'else_block')
+
     def __init__(self, condition: Expression, then_block: list[Statement], else_block: list[Statement] = None):
         super().__init__()
         self.condition = condition
@@ -146,6 +195,8 @@ class IfStatement(Statement):
         return f"SE ({repr(self.condition)}) ENTAO {then_str}{else_str}"
 
 class RepeatStatement(Statement):
+    __slots__ = ('times', 'body')
+
     def __init__(self, times: Expression, body: list[Statement]):
         super().__init__()
         self.times = times
@@ -155,10 +206,84 @@ class RepeatStatement(Statement):
         body_str = "{" + "; ".join(repr(s) for s in self.body) + "}"
         return f"REPETIR {repr(self.times)} VEZES {body_str}"
 
+class MotionBlock(Statement):
+    """Sequência de MOVER/GIRAR cujo efeito pode ser calculado em forma fechada (ver `src/motion.py`).
+
+    Com `times`, equivale a `REPETIR times VEZES { statements }`; sem, às
+    próprias declarações em sequência. As declarações originais são mantidas
+    para reproduzir os eventos passo a passo quando a saída da simulação está ligada.
+    """
+    __slots__ = ('statements', 'times', 'depth')
+
+    def __init__(self, statements: list[Statement], times: Expression = None, depth: int = 0):
+        super().__init__()
+        self.statements = statements
+        self.times = times
+        self.depth = depth # Níveis de laços aninhados, incluindo este
+
+    def __repr__(self):
+        body_str = "{" + "; ".join(repr(s) for s in self.statements) + "}"
+        if self.times is None:
+            return f"MOVIMENTO {body_str}"
+        return f"MOVIMENTO {repr(self.times)} VEZES {body_str}"
+
+class CachedExpression(Expression):
+    """Expressão cujo valor é guardado no cache `index` e reaproveitado até o próximo `ClearCache` (ver `src/licm.py`)."""
+    __slots__ = ('expression', 'index')
+
+    def __init__(self, expression: Expression, index: int):
+        super().__init__(expression.token)
+        self.expression = expression
+        self.index = index
+
+    def __repr__(self):
+        return f"CACHE{self.index}[{repr(self.expression)}]"
+
+class ClearCache(Statement):
+    """Esvazia os caches `indexes` de `CachedExpression` (ver `src/licm.py`)."""
+    __slots__ = ('indexes',)
+
+    def __init__(self, indexes: tuple):
+        super().__init__()
+        self.indexes = tuple(indexes)
+
+    def __repr__(self):
+        return f"LIMPAR_CACHE {list(self.indexes)}"
+
 # --- Bloco de comandos (para SE/SENAO/REPETIR) ---
 class Block(ASTNode):
+    __slots__ = ('statements',)
+
     def __init__(self, statements: list[Statement]):
         self.statements = statements
     
     def __repr__(self):
-        return "{\n" + "\n".join(f"  {repr(s)}" for s in self.statements) + "\n}"
\ No newline at end of file
+        return "{\n" + "\n".join(f"  {repr(s)}" for s in self.statements) + "\n}"
+
+# --- Percurso ---
+def children(node) -> tuple:
+    """Filhos de um nó, na ordem do código-fonte (declarações dos blocos incluídas)."""
+    node_type = type(node)
+    if node_type is BinaryExpression:
+        return (node.left, node.right)
+    if node_type is UnaryExpression:
+        return (node.right,)
+    if node_type is VarDeclaration or node_type is AssignmentStatement:
+        return (node.value,)
+    if node_type is MoveStatement:
+        return (node.steps,)
+    if node_type is PrintStatement:
+        return (node.expression,)
+    if node_type is IfStatement:
+        return (node.condition, *node.then_block, *(node.else_block or ()))
+    if node_type is RepeatStatement:
+        return (node.times, *node.body)
+    if node_type is Program:
+        return tuple(node.statements)
+    if node_type is MotionBlock:
+        if node.times is None:
+            return tuple(node.statements)
+        return (node.times, *node.statements)
+    if node_type is CachedExpression:
+        return (node.expression,)
+    return ()
@@ -0,0 +1,172 @@
+"""Execução em lote de muitos scripts `.robo`, distribuída entre processos.
+
+`run_batch` executa cada arquivo do começo ao fim (análise léxica e
+sintática, otimização, análise semântica e execução) em um processo de um
+`ProcessPoolExecutor`. Os arquivos são enviados aos processos em blocos
+(`chunksize`), para diluir o custo de comunicação quando há milhares de
+arquivos pequenos.
+
+Cada execução produz um registro compacto, uma tupla com os campos de
+`FIELDS`: arquivo, situação (`STATUSES`), mensagem e posição do erro, estado
+final do robô e tempos de cada etapa. A saída da simulação é descartada (os
+eventos vão para um `NullSink`), então os registros são tudo o que volta dos
+processos. `write_json` e `write_csv` gravam o resumo do lote.
+"""
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from src.events import NullSink
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import Optimizer
+from src.parser import Parser
+from src.resolver import resolve
+from src.typechecker import check_types
+
+# Campos de um registro, na ordem da tupla. Os tempos são em segundos;
+# `parse_time` inclui a otimização e as análises semânticas
+FIELDS = ("file", "status", "error", "line", "column", "x", "y", "direction", "has_object",
+          "lex_time", "parse_time", "run_time")
+
+# Situação de uma execução: "ok" ou a etapa em que ela parou
+STATUSES = ("ok", "erro_arquivo", "erro_lexico", "erro_sintatico", "erro_semantico", "erro_tipo", "erro_execucao")
+
+_POSITION = re.compile(r"[Ll]inha (\d+)(?:, coluna (\d+))?")
+
+
+def find_scripts(paths) -> list[str]:
+    """Arquivos `.robo` de `paths` (arquivos ou diretórios, percorridos recursivamente), em ordem."""
+    scripts = []
+    for path in paths:
+        if not os.path.isdir(path):
+            scripts.append(path)
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories[:] = sorted(name for name in subdirectories if not name.startswith("__"))
+            scripts.extend(os.path.join(directory, name) for name in sorted(files) if name.endswith(".robo"))
+    return scripts
+
+
+def error_position(message: str) -> tuple:
+    """Linha e coluna citadas em uma mensagem de erro (None quando não há)."""
+    match = _POSITION.search(message)
+    if match is None:
+        return None, None
+    return int(match[1]), None if match[2] is None else int(match[2])
+
+
+def run_program(ast, engine=Interpreter, optimize: bool = True, licm: bool = True) -> tuple:
+    """Otimiza, analisa e executa `ast`, sem saída.
+
+    Retorna `(situação, erro, estado final, tempo de análise, tempo de
+    execução)`; o estado é None se a execução não começou.
+    """
+    start = time.perf_counter()
+    if optimize:
+        ast = Optimizer(licm=licm).optimize(ast)
+    errors = resolve(ast)
+    if errors:
+        return "erro_semantico", errors[0], None, time.perf_counter() - start, 0.0
+    errors = check_types(ast)
+    check_time = time.perf_counter() - start
+    if errors:
+        return "erro_tipo", errors[0], None, check_time, 0.0
+
+    interpreter = engine(NullSink())
+    start = time.perf_counter()
+    status, error = "ok", None
+    try:
+        interpreter.interpret(ast)
+    except Exception as e:
+        status, error = "erro_execucao", str(e)
+    run_time = time.perf_counter() - start
+    state = (interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction, interpreter.has_object)
+    return status, error, state, check_time, run_time
+
+
+def run_file(path: str, engine=Interpreter, optimize: bool = True, licm: bool = True) -> tuple:
+    """Executa um script, sem saída; retorna o seu registro (ver `FIELDS`)."""
+    def record(status, error, state=None, lex_time=0.0, parse_time=0.0, run_time=0.0):
+        position = (None, None) if error is None else error_position(error)
+        return (path, status, error, *position, *(state or (None,) * 4), lex_time, parse_time, run_time)
+
+    try:
+        with open(path, "r") as file:
+            source = file.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return record("erro_arquivo", str(e))
+
+    start = time.perf_counter()
+    try:
+        tokens = Lexer(source).tokenize()
+    except Exception as e:
+        return record("erro_lexico", str(e), lex_time=time.perf_counter() - start)
+    lex_time = time.perf_counter() - start
+    start = time.perf_counter()
+    try:
+        ast = Parser(tokens).parse()
+    except Exception as e:
+        return record("erro_sintatico", str(e), lex_time=lex_time, parse_time=time.perf_counter() - start)
+    parse_time = time.perf_counter() - start
+
+    status, error, state, check_time, run_time = run_program(ast, engine, optimize, licm)
+    return record(status, error, state, lex_time, parse_time + check_time, run_time)
+
+
+def run_batch(paths: list, engine=Interpreter, jobs: int = None, chunksize: int = None,
+              optimize: bool = True, licm: bool = True):
+    """Executa os scripts `paths` em `jobs` processos; gera os registros na ordem de `paths`.
+
+    Com `jobs == 1`, os scripts rodam no próprio processo.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    run = partial(run_file, engine=engine, optimize=optimize, licm=licm)
+    if jobs == 1 or len(paths) <= 1:
+        yield from map(run, paths)
+        return
+    chunksize = chunksize or max(len(paths) // (jobs * 4), 1)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(run, paths, chunksize=chunksize)
+
+
+def record_dict(record: tuple) -> dict:
+    """Registro como dicionário: {campo: valor, ...}."""
+    return dict(zip(FIELDS, record))
+
+
+def summarize(records: list, elapsed: float = None) -> dict:
+    """Totais do lote: número de arquivos, contagem por situação e tempos somados."""
+    counts = {status: 0 for status in STATUSES}
+    for record in records:
+        counts[record[1]] += 1
+    summary = {
+        "files": len(records),
+        "ok": counts["ok"],
+        "failed": len(records) - counts["ok"],
+        "statuses": {status: count for status, count in counts.items() if count},
+        "lex_time": sum(record[9] for record in records),
+        "parse_time": sum(record[10] for record in records),
+        "run_time": sum(record[11] for record in records),
+    }
+    if elapsed is not None:
+        summary["elapsed"] = elapsed
+    return summary
+
+
+def write_json(records: list, stream, elapsed: float = None):
+    """Grava `{"summary": ..., "records": [...]}` em `stream`."""
+    json.dump({"summary": summarize(records, elapsed), "records": [record_dict(record) for record in records]},
+              stream, ensure_ascii=False, indent=1)
+    stream.write("\n")
+
+
+def write_csv(records: list, stream):
+    """Grava os registros em `stream` como CSV, com os nomes de `FIELDS` no cabeçalho."""
+    writer = csv.writer(stream)
+    writer.writerow(FIELDS)
+    writer.writerows(records)
@@ -0,0 +1,257 @@
+"""Compilação da AST para bytecode, executado por `src/vm.py`.
+
+O código é uma lista plana de inteiros em pares `(opcode, argumento)`; o
+argumento é 0 quando a instrução não usa. A instrução `i` começa em
+`code[2 * i]` e o token que a gerou (usado nas mensagens de erro) está em
+`tokens[i]`. Os saltos apontam para posições em `code`.
+
+* Expressões empilham valores (`LOAD_*`) e os combinam (`ADD`, `LT`, ...);
+  uma soma cujo tipo inferido é inteiro (ver `src/typechecker.py`) usa
+  `ADD_INT`, sem o teste de concatenação.
+* `SE`/`SENAO` viram `JUMP_IF_FALSE` e `JUMP`.
+* `REPETIR` vira `REPEAT fim` (tira o número de repetições da pilha e o põe
+  na pilha de contadores) e `REPEAT_NEXT início` no fim do corpo.
+* Movimentos com passos literais usam `MOVE_FRENTE_N`/`MOVE_TRAS_N`, com os
+  passos no próprio argumento. Um `MotionBlock` (ver `src/motion.py`) vira
+  `MOTION` seguido do laço com as declarações originais; com a saída da
+  simulação desligada, `MOTION` aplica o efeito em forma fechada e zera o
+  número de repetições, pulando o laço.
+* Uma `CachedExpression` (ver `src/licm.py`) vira `LOAD_CACHE fim`, a
+  expressão e `STORE_CACHE índice`: com o valor no cache, `LOAD_CACHE` o
+  empilha e salta para `fim`, logo após o `STORE_CACHE`. `ClearCache` vira
+  `CLEAR_CACHE`, com a tupla de índices nas constantes.
+
+A compilação usa uma pilha explícita, sem recursão.
+"""
+from src.ast_nodes import (
+    Program, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral, BooleanLiteral,
+    Identifier, VarDeclaration, AssignmentStatement, MoveStatement, RotateStatement,
+    PickUpStatement, DropStatement, PrintStatement, IfStatement, RepeatStatement, MotionBlock,
+    CachedExpression, ClearCache
+)
+from src.lexer import TokenType
+from src.typechecker import INT
+
+OPCODE_NAMES = (
+    'LOAD_CONST', 'LOAD_NAME', 'LOAD_ROBOT',
+    'ADD', 'ADD_INT', 'SUB', 'MUL', 'DIV', 'EQ', 'NE', 'LT', 'GT', 'LE', 'GE', 'NEG', 'POS',
+    'DEFINE', 'CHECK_NAME', 'STORE',
+    'MOVE_FRENTE', 'MOVE_TRAS', 'MOVE_FRENTE_N', 'MOVE_TRAS_N', 'TURN_RIGHT', 'TURN_LEFT',
+    'PICKUP', 'DROP', 'PRINT',
+    'JUMP', 'JUMP_IF_FALSE', 'REPEAT', 'REPEAT_NEXT', 'MOTION',
+    'LOAD_CACHE', 'STORE_CACHE', 'CLEAR_CACHE',
+)
+(LOAD_CONST, LOAD_NAME, LOAD_ROBOT,
+ ADD, ADD_INT, SUB, MUL, DIV, EQ, NE, LT, GT, LE, GE, NEG, POS,
+ DEFINE, CHECK_NAME, STORE,
+ MOVE_FRENTE, MOVE_TRAS, MOVE_FRENTE_N, MOVE_TRAS_N, TURN_RIGHT, TURN_LEFT,
+ PICKUP, DROP, PRINT,
+ JUMP, JUMP_IF_FALSE, REPEAT, REPEAT_NEXT, MOTION,
+ LOAD_CACHE, STORE_CACHE, CLEAR_CACHE) = range(len(OPCODE_NAMES))
+
+# Argumento de LOAD_ROBOT
+ROBOT_STATE = ("robot_x", "robot_y", "robot_direction", "has_object")
+
+_BINARY_OPCODES = {
+    TokenType.OP_SOMA: ADD, TokenType.OP_SUB: SUB, TokenType.OP_MULT: MUL, TokenType.OP_DIV: DIV,
+    TokenType.IGUAL: EQ, TokenType.DIFERENTE: NE, TokenType.MENOR: LT, TokenType.MAIOR: GT,
+    TokenType.MENOR_IGUAL: LE, TokenType.MAIOR_IGUAL: GE,
+}
+_UNARY_OPCODES = {TokenType.OP_SUB: NEG, TokenType.OP_SOMA: POS}
+
+_JUMPS = frozenset((JUMP, JUMP_IF_FALSE, REPEAT, REPEAT_NEXT, LOAD_CACHE))
+
+
+class Bytecode:
+    __slots__ = ('code', 'constants', 'names', 'tokens')
+
+    def __init__(self):
+        self.code = []
+        self.constants = [] # Valores de LOAD_CONST e MotionBlocks de MOTION
+        self.names = []     # Nomes das variáveis
+        self.tokens = []    # Token de cada instrução (ou None)
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+class Compiler:
+    def __init__(self):
+        self.bytecode = Bytecode()
+        self._constant_index = {}
+        self._name_index = {}
+
+    def compile(self, statements) -> Bytecode:
+        """Compila as declarações, em ordem, para o bytecode (acumulando chamadas sucessivas)."""
+        # Itens da pilha: nós da AST ou ações (função, argumentos...) executadas na ordem
+        stack = [*reversed(statements)]
+        while stack:
+            item = stack.pop()
+            if type(item) is tuple:
+                item[0](*item[1:])
+            else:
+                stack.extend(reversed(self._node(item)))
+        return self.bytecode
+
+    def emit(self, opcode, argument=0, token=None) -> int:
+        """Acrescenta uma instrução; retorna sua posição em `code`."""
+        code = self.bytecode.code
+        code.append(opcode)
+        code.append(argument)
+        self.bytecode.tokens.append(token)
+        return len(code) - 2
+
+    def _patch(self, label):
+        """Faz o salto em `label[0]` apontar para a posição atual."""
+        self.bytecode.code[label[0] + 1] = len(self.bytecode.code)
+
+    def _emit_to(self, label, opcode, token=None):
+        """Emite um salto; guarda sua posição em `label` para `_patch`."""
+        label[0] = self.emit(opcode, 0, token)
+
+    def _mark(self, label):
+        label[0] = len(self.bytecode.code)
+
+    def _emit_back(self, opcode, label, token=None):
+        self.emit(opcode, label[0], token)
+
+    def _node(self, node) -> list:
+        """Itens (nós e ações) que geram o código de `node`, na ordem."""
+        node_type = type(node)
+        emit = self.emit
+        if node_type is NumberLiteral or node_type is StringLiteral or node_type is BooleanLiteral:
+            emit(LOAD_CONST, self._constant(node.value), node.token)
+            return []
+        if node_type is Identifier:
+            if node.name in ROBOT_STATE:
+                emit(LOAD_ROBOT, ROBOT_STATE.index(node.name), node.token)
+            else:
+                emit(LOAD_NAME, self._name(node.name), node.token)
+            return []
+        if node_type is BinaryExpression:
+            opcode = _BINARY_OPCODES.get(node.operator.type)
+            if opcode is None:
+                raise Exception(f"Operador binário desconhecido: {node.operator.value}")
+            if opcode == ADD and node.static_type == INT:
+                opcode = ADD_INT
+            return [node.left, node.right, (emit, opcode, 0, node.operator)]
+        if node_type is UnaryExpression:
+            opcode = _UNARY_OPCODES.get(node.operator.type)
+            if opcode is None:
+                raise Exception(f"Operador unário desconhecido: {node.operator.value}")
+            return [node.right, (emit, opcode, 0, node.operator)]
+        if node_type is CachedExpression:
+            done = [0]
+            return [(self._emit_to, done, LOAD_CACHE), node.expression, (emit, STORE_CACHE, node.index),
+                    (self._patch, done)]
+        if node_type is ClearCache:
+            emit(CLEAR_CACHE, self._constant(node.indexes))
+            return []
+        if node_type is VarDeclaration:
+            return [node.value, (emit, DEFINE, self._name(node.name.value), node.name)]
+        if node_type is AssignmentStatement:
+            name = self._name(node.name.value)
+            emit(CHECK_NAME, name, node.name)
+            return [node.value, (emit, STORE, name, node.name)]
+        if node_type is MoveStatement:
+            frente = node.direction.type == TokenType.FRENTE
+            if type(node.steps) is NumberLiteral and node.steps.value >= 0: # Passos válidos já na compilação
+                emit(MOVE_FRENTE_N if frente else MOVE_TRAS_N, node.steps.value, node.steps.token)
+                return []
+            return [node.steps, (emit, MOVE_FRENTE if frente else MOVE_TRAS, 0, node.steps.token)]
+        if node_type is RotateStatement:
+            emit(TURN_RIGHT if node.direction.type == TokenType.DIREITA else TURN_LEFT, 0, node.token)
+            return []
+        if node_type is PickUpStatement:
+            emit(PICKUP, 0, node.token)
+            return []
+        if node_type is DropStatement:
+            emit(DROP, 0, node.token)
+            return []
+        if node_type is PrintStatement:
+            return [node.expression, (emit, PRINT)]
+        if node_type is IfStatement:
+            skip_then = [0]
+            if not node.else_block:
+                return [node.condition, (self._emit_to, skip_then, JUMP_IF_FALSE, node.condition.token),
+                        *node.then_block, (self._patch, skip_then)]
+            skip_else = [0]
+            return [node.condition, (self._emit_to, skip_then, JUMP_IF_FALSE, node.condition.token),
+                    *node.then_block, (self._emit_to, skip_else, JUMP), (self._patch, skip_then),
+                    *node.else_block, (self._patch, skip_else)]
+        if node_type is RepeatStatement:
+            return self._loop(node.times, node.body)
+        if node_type is MotionBlock:
+            if node.times is None:
+                emit(LOAD_CONST, self._constant(1))
+                emit(MOTION, self._constant(node))
+                return self._loop(None, node.statements)
+            return [node.times, (emit, MOTION, self._constant(node)), *self._loop(None, node.statements, node.times.token)]
+        if node_type is Program:
+            return list(node.statements)
+        raise NotImplementedError(f"Compilação não implementada para o nó: {node_type.__name__}")
+
+    def _loop(self, times, body, token=None) -> list:
+        """`times` (se houver), `REPEAT fim`, corpo, `REPEAT_NEXT início`."""
+        loop_exit = [0]
+        body_start = [0]
+        items = []
+        if times is not None:
+            items.append(times)
+            token = times.token
+        items.append((self._emit_to, loop_exit, REPEAT, token))
+        items.append((self._mark, body_start))
+        items.extend(body)
+        items.append((self._emit_back, REPEAT_NEXT, body_start))
+        items.append((self._patch, loop_exit))
+        return items
+
+    def _constant(self, value) -> int:
+        key = (type(value), value) if not isinstance(value, MotionBlock) else (MotionBlock, id(value))
+        index = self._constant_index.get(key)
+        if index is None:
+            index = self._constant_index[key] = len(self.bytecode.constants)
+            self.bytecode.constants.append(value)
+        return index
+
+    def _name(self, name) -> int:
+        index = self._name_index.get(name)
+        if index is None:
+            index = self._name_index[name] = len(self.bytecode.names)
+            self.bytecode.names.append(name)
+        return index
+
+
+def compile_program(program: Program) -> Bytecode:
+    """Compila um `Program` (ou uma lista de declarações) para bytecode."""
+    statements = program.statements if isinstance(program, Program) else program
+    return Compiler().compile(statements)
+
+
+def disassemble(bytecode: Bytecode) -> str:
+    """Listagem legível do bytecode: posição, linha:coluna, instrução e argumento."""
+    lines = []
+    code = bytecode.code
+    targets = {code[pc + 1] for pc in range(0, len(code), 2) if code[pc] in _JUMPS}
+    for pc in range(0, len(code), 2):
+        opcode, argument = code[pc], code[pc + 1]
+        token = bytecode.tokens[pc // 2]
+        position = f"{token.line}:{token.column}" if token else ""
+        marker = ">>" if pc in targets else ""
+        text = f"{marker:>2} {pc:>5} {position:>8}  {OPCODE_NAMES[opcode]:<14}"
+        if opcode == LOAD_CONST:
+            text += f"{argument:>5} ({bytecode.constants[argument]!r})"
+        elif opcode in (LOAD_NAME, DEFINE, CHECK_NAME, STORE):
+            text += f"{argument:>5} ({bytecode.names[argument]})"
+        elif opcode == LOAD_ROBOT:
+            text += f"{argument:>5} ({ROBOT_STATE[argument]})"
+        elif opcode in _JUMPS:
+            text += f"{argument:>5} (para {argument})"
+        elif opcode == MOTION:
+            text += f"{argument:>5} ({len(bytecode.constants[argument].statements)} declarações)"
+        elif opcode == CLEAR_CACHE:
+            text += f"{argument:>5} {bytecode.constants[argument]!r}"
+        elif opcode in (MOVE_FRENTE_N, MOVE_TRAS_N, STORE_CACHE):
+            text += f"{argument:>5}"
+        lines.append(text.rstrip())
+    return "\n".join(lines)
@@ -0,0 +1,292 @@
+"""Cache em disco das ASTs já analisadas.
+
+Como o `__pycache__` do Python, cada script ganha, ao lado dele, um diretório
+`__roboscache__` com a AST serializada. A entrada é identificada pelo hash
+SHA-256 do código-fonte junto com a versão do interpretador e do formato, de
+modo que qualquer mudança no script ou no interpretador gera uma nova chave.
+
+Formato de uma entrada: `MAGIC` seguido de `marshal.dumps((FORMAT_VERSION,
+__version__, nomes dos TokenType, ops))` comprimido com zlib, onde `ops` é a
+AST em pós-ordem, achatada em uma lista de inteiros e strings (filhos antes
+dos pais). A reconstrução usa uma pilha, sem recursão, e funciona para qualquer
+profundidade de aninhamento.
+
+As escritas são atômicas (arquivo temporário + `os.replace`) e o diretório é
+limitado a `max_bytes`: as entradas usadas há mais tempo (pelo `mtime`, que é
+atualizado a cada leitura) são removidas primeiro.
+"""
+import gc
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import zlib
+
+from src import __version__
+from src.ast_nodes import (
+    Program, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral,
+    Identifier, VarDeclaration, AssignmentStatement, MoveStatement, RotateStatement,
+    PickUpStatement, DropStatement, PrintStatement, IfStatement, RepeatStatement
+)
+from src.lexer import Token, TokenType
+
+CACHE_DIR_NAME = "__roboscache__"
+CACHE_SUFFIX = ".rsc"
+MAGIC = b"RSC\0"
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_TYPE_NAMES = tuple(token_type.name for token_type in TokenType)
+_TYPE_INDEX = {token_type: index for index, token_type in enumerate(TokenType)}
+
+# Marcadores dos nós em `ops`. Nós com token são seguidos por
+# (tipo, valor, linha, coluna); os demais, pelo número de filhos.
+(_NUMBER, _STRING, _IDENTIFIER, _BINARY, _UNARY, _VAR, _SET, _MOVE, _ROTATE,
+ _PICKUP, _DROP, _PRINT, _IF, _REPEAT, _PROGRAM) = range(15)
+
+
+def cache_dir_for(path: str) -> str:
+    """Diretório de cache de um script: `__roboscache__` ao lado do arquivo."""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+class ASTCache:
+    # Subclasses guardam outros artefatos no mesmo diretório trocando o sufixo,
+    # o prefixo da chave e a (de)serialização (ver `src/codegen.py`)
+    suffix = CACHE_SUFFIX
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key_prefix(self) -> str:
+        return f"{__version__}\0{FORMAT_VERSION}\0"
+
+    def key(self, source_code: str) -> str:
+        """Chave da entrada: hash do código-fonte e das versões do interpretador e do formato."""
+        digest = hashlib.sha256(self.key_prefix().encode())
+        digest.update(source_code.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, source_code: str) -> str:
+        return os.path.join(self.directory, self.key(source_code) + self.suffix)
+
+    def load(self, source_code: str):
+        """Retorna o `Program` em cache para o código-fonte, ou None se não houver."""
+        path = self.path(source_code)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        program = self.loads(data)
+        if program is not None:
+            try:
+                os.utime(path) # Marca a entrada como usada recentemente (LRU)
+            except OSError:
+                pass
+        return program
+
+    def store(self, source_code: str, program: Program) -> bool:
+        """Grava a AST do código-fonte; retorna False se não foi possível (sem lançar erros)."""
+        try:
+            data = self.dumps(program)
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, self.path(source_code))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, ValueError):
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o diretório caber em `max_bytes`."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(self.suffix):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    def dumps(self, program: Program) -> bytes:
+        return _dumps(program)
+
+    def loads(self, data: bytes):
+        return _loads(data)
+
+
+# --- Serialização ---
+def dump_program(program: Program) -> bytes:
+    """AST (não otimizada) no formato compacto das entradas, por exemplo para enviá-la a outro processo."""
+    return _dumps(program)
+
+
+def load_program(data: bytes):
+    """Inverso de `dump_program`; retorna None se `data` for inválido ou de outra versão."""
+    return _loads(data)
+
+
+def _dumps(program: Program) -> bytes:
+    """Serializa a AST em pós-ordem, sem recursão."""
+    ops = []
+    emit = ops.extend
+    types = _TYPE_INDEX
+    intern = sys.intern # Valores repetidos viram referências no marshal
+    stack = [(program, False)]
+    while stack:
+        node, children_done = stack.pop()
+        node_type = type(node)
+        if children_done:
+            if node_type is IfStatement:
+                emit((_IF, len(node.then_block), -1 if node.else_block is None else len(node.else_block)))
+            elif node_type is RepeatStatement:
+                emit((_REPEAT, len(node.body)))
+            elif node_type is PrintStatement:
+                ops.append(_PRINT)
+            elif node_type is Program:
+                emit((_PROGRAM, len(node.statements)))
+            else:
+                token = node.token
+                emit((_TAGS[node_type], types[token.type], intern(token.value), token.line, token.column))
+            continue
+        stack.append((node, True))
+        if node_type is BinaryExpression:
+            children = (node.left, node.right)
+        elif node_type is UnaryExpression:
+            children = (node.right,)
+        elif node_type is VarDeclaration or node_type is AssignmentStatement:
+            children = (node.value,)
+        elif node_type is MoveStatement:
+            children = (node.steps,)
+        elif node_type is PrintStatement:
+            children = (node.expression,)
+        elif node_type is IfStatement:
+            children = [node.condition, *node.then_block, *(node.else_block or ())]
+        elif node_type is RepeatStatement:
+            children = [node.times, *node.body]
+        elif node_type is Program:
+            children = node.statements
+        elif node_type in _TAGS:
+            continue
+        else:
+            raise ValueError(f"Nó não suportado pelo cache: {node_type.__name__}")
+        stack.extend((child, False) for child in reversed(children))
+    return MAGIC + zlib.compress(marshal.dumps((FORMAT_VERSION, __version__, _TYPE_NAMES, ops)), 1)
+
+
+def _loads(data: bytes):
+    """Reconstrói o `Program` de uma entrada; retorna None se ela for inválida ou de outra versão."""
+    if not data.startswith(MAGIC):
+        return None
+    try:
+        format_version, version, type_names, ops = marshal.loads(zlib.decompress(data[len(MAGIC):]))
+        if format_version != FORMAT_VERSION or version != __version__:
+            return None
+        types = [TokenType[name] for name in type_names]
+        # A AST não tem ciclos: desligar o coletor evita varreduras a cada
+        # milhar de nós criados
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return _rebuild(ops, types)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    except (ValueError, TypeError, EOFError, KeyError, IndexError, zlib.error):
+        return None
+
+
+def _rebuild(ops, types) -> Program:
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    i = 0
+    n = len(ops)
+    while i < n:
+        tag = ops[i]
+        if tag <= _DROP:
+            token = Token(types[ops[i + 1]], ops[i + 2], ops[i + 3], ops[i + 4])
+            i += 5
+            if tag == _NUMBER:
+                push(NumberLiteral(token))
+            elif tag == _IDENTIFIER:
+                push(Identifier(token))
+            elif tag == _BINARY:
+                right = pop()
+                push(BinaryExpression(pop(), token, right))
+            elif tag == _STRING:
+                push(StringLiteral(token))
+            elif tag == _MOVE:
+                push(MoveStatement(token, pop()))
+            elif tag == _ROTATE:
+                push(RotateStatement(token))
+            elif tag == _SET:
+                push(AssignmentStatement(token, pop()))
+            elif tag == _VAR:
+                push(VarDeclaration(token, pop()))
+            elif tag == _UNARY:
+                push(UnaryExpression(token, pop()))
+            elif tag == _PICKUP:
+                push(PickUpStatement(token))
+            else:
+                push(DropStatement(token))
+        elif tag == _PRINT:
+            push(PrintStatement(pop()))
+            i += 1
+        elif tag == _IF:
+            then_count, else_count = ops[i + 1], ops[i + 2]
+            i += 3
+            else_block = None
+            if else_count >= 0:
+                else_block = stack[len(stack) - else_count:]
+                del stack[len(stack) - else_count:]
+            then_block = stack[len(stack) - then_count:]
+            del stack[len(stack) - then_count:]
+            push(IfStatement(pop(), then_block, else_block))
+        elif tag == _REPEAT:
+            count = ops[i + 1]
+            i += 2
+            body = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            push(RepeatStatement(pop(), body))
+        elif tag == _PROGRAM:
+            count = ops[i + 1]
+            i += 2
+            statements = stack[len(stack) - count:]
+            del stack[len(stack) - count:]
+            push(Program(statements))
+        else:
+            raise ValueError(f"Marcador inválido: {tag}")
+    program, = stack
+    if type(program) is not Program:
+        raise ValueError("Entrada sem Program na raiz")
+    return program
+
+
+_TAGS = {
+    NumberLiteral: _NUMBER, StringLiteral: _STRING, Identifier: _IDENTIFIER,
+    BinaryExpression: _BINARY, UnaryExpression: _UNARY, VarDeclaration: _VAR,
+    AssignmentStatement: _SET, MoveStatement: _MOVE, RotateStatement: _ROTATE,
+    PickUpStatement: _PICKUP, DropStatement: _DROP,
+}
@@ -0,0 +1,376 @@
+"""Motor de execução por closures.
+
+`ClosureInterpreter` transforma cada nó da AST, uma única vez, em uma função
+Python sem argumentos já especializada para aquele nó: uma soma vira
+`lambda: left() + right()` (com a regra de concatenação de strings), um
+`MOVER FRENTE` guarda a tabela de deslocamentos de FRENTE, um `REPETIR`
+chama diretamente as closures do corpo. A execução não passa mais pelo
+`getattr` de `Interpreter.visit` nem pelas comparações com `TokenType`.
+
+O estado do robô, os eventos e as mensagens de erro são os de `Interpreter`.
+A construção das closures usa uma pilha explícita; a execução de blocos
+aninhados, como no `Interpreter`, usa a pilha de chamadas do Python.
+"""
+from itertools import repeat
+
+from src.ast_nodes import (
+    Program, Statement, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral,
+    BooleanLiteral, Identifier, VarDeclaration, AssignmentStatement, MoveStatement,
+    RotateStatement, PickUpStatement, DropStatement, PrintStatement, IfStatement,
+    RepeatStatement, MotionBlock, CachedExpression, ClearCache, children
+)
+from src.events import VAR, SET, MOVE, TURN, PRINT
+from src.interpreter import Interpreter
+from src.lexer import TokenType
+from src.motion import HEADINGS, HEADING_INDEX, MOVE_STEPS, TURNS, motion_effect
+from src.typechecker import INT, NUMERIC_TYPES
+
+
+def _noop():
+    pass
+
+
+class ClosureInterpreter(Interpreter):
+    def __init__(self, events=None):
+        super().__init__(events)
+        self._builders = {
+            NumberLiteral: self._literal, StringLiteral: self._literal, BooleanLiteral: self._literal,
+            Identifier: self._identifier, BinaryExpression: self._binary, UnaryExpression: self._unary,
+            VarDeclaration: self._var, AssignmentStatement: self._set, MoveStatement: self._move,
+            RotateStatement: self._rotate, PickUpStatement: self._pick_up, DropStatement: self._drop,
+            PrintStatement: self._print, IfStatement: self._if, RepeatStatement: self._repeat,
+            MotionBlock: self._motion, CachedExpression: self._cached, ClearCache: self._clear_cache,
+            Program: self._program,
+        }
+
+    def interpret(self, program: Program):
+        self.compile(program)()
+
+    def visit(self, node):
+        # Declarações avulsas (modo --stream) também são compiladas; as
+        # expressões continuam com o Interpreter (usado por `motion_effect`)
+        if isinstance(node, Statement):
+            return self.compile(node)()
+        return super().visit(node)
+
+    def visit_Program(self, node: Program):
+        self.compile(node)()
+
+    def compile(self, root):
+        """Closure que executa `root` (um `Program`, uma declaração ou uma expressão)."""
+        builders = self._builders
+        results = [] # Closures dos nós já compilados, filhos antes dos pais
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children(node)))
+                continue
+            builder = builders.get(type(node))
+            if builder is None:
+                raise NotImplementedError(f"Compilação não implementada para o nó: {type(node).__name__}")
+            results.append(builder(node, results))
+        return results.pop()
+
+    # --- Expressões ---
+    def _literal(self, node, results):
+        value = node.value
+        return lambda: value
+
+    def _identifier(self, node, results):
+        name = node.name
+        if name == "robot_x":
+            return lambda: self.robot_x
+        if name == "robot_y":
+            return lambda: self.robot_y
+        if name == "robot_direction":
+            return lambda: self.robot_direction
+        if name == "has_object":
+            return lambda: 1 if self.has_object else 0
+        environment = self.environment
+        values = environment.values
+        token = node.token
+
+        def load():
+            try:
+                return values[name]
+            except KeyError:
+                pass
+            try:
+                return environment.get(name)
+            except ValueError as e:
+                self._error(str(e), token)
+        return load
+
+    def _binary(self, node, results):
+        right = results.pop()
+        left = results.pop()
+        op_type = node.operator.type
+        if type(node.right) is NumberLiteral and op_type != TokenType.OP_DIV:
+            return self._binary_constant(op_type, left, node.right.value, node.operator, node.static_type)
+        if op_type == TokenType.OP_SOMA:
+            if node.static_type == INT: # Soma de inteiros (tipo inferido, ver src/typechecker.py)
+                return lambda: left() + right()
+            if type(node.left) is StringLiteral or type(node.right) is StringLiteral:
+                return lambda: str(left()) + str(right())
+
+            def add():
+                left_val = left()
+                right_val = right()
+                if isinstance(left_val, str) or isinstance(right_val, str):
+                    return str(left_val) + str(right_val)
+                return left_val + right_val
+            return add
+        if op_type == TokenType.OP_SUB:
+            return lambda: left() - right()
+        if op_type == TokenType.OP_MULT:
+            return lambda: left() * right()
+        if op_type == TokenType.OP_DIV:
+            operator = node.operator
+
+            def divide():
+                left_val = left()
+                right_val = right()
+                if right_val == 0:
+                    self._error("Divisão por zero.", operator)
+                return left_val // right_val
+            return divide
+        if op_type == TokenType.IGUAL:
+            return lambda: left() == right()
+        if op_type == TokenType.DIFERENTE:
+            return lambda: left() != right()
+        if op_type == TokenType.MENOR:
+            return lambda: left() < right()
+        if op_type == TokenType.MAIOR:
+            return lambda: left() > right()
+        if op_type == TokenType.MENOR_IGUAL:
+            return lambda: left() <= right()
+        if op_type == TokenType.MAIOR_IGUAL:
+            return lambda: left() >= right()
+        operator = node.operator
+        return lambda: self._error(f"Operador binário desconhecido: {operator.value}", operator)
+
+    def _binary_constant(self, op_type, left, value, operator, static_type=None):
+        """Operação com um inteiro literal à direita (`x + 1`, `n < 10`)."""
+        if op_type == TokenType.OP_SOMA:
+            if static_type == INT:
+                return lambda: left() + value
+            text = str(value)
+
+            def add():
+                left_val = left()
+                if isinstance(left_val, str):
+                    return left_val + text
+                return left_val + value
+            return add
+        if op_type == TokenType.OP_SUB:
+            return lambda: left() - value
+        if op_type == TokenType.OP_MULT:
+            return lambda: left() * value
+        if op_type == TokenType.IGUAL:
+            return lambda: left() == value
+        if op_type == TokenType.DIFERENTE:
+            return lambda: left() != value
+        if op_type == TokenType.MENOR:
+            return lambda: left() < value
+        if op_type == TokenType.MAIOR:
+            return lambda: left() > value
+        if op_type == TokenType.MENOR_IGUAL:
+            return lambda: left() <= value
+        if op_type == TokenType.MAIOR_IGUAL:
+            return lambda: left() >= value
+        return lambda: self._error(f"Operador binário desconhecido: {operator.value}", operator)
+
+    def _unary(self, node, results):
+        right = results.pop()
+        op_type = node.operator.type
+        if op_type == TokenType.OP_SUB:
+            return lambda: -right()
+        if op_type == TokenType.OP_SOMA:
+            return lambda: +right()
+        operator = node.operator
+        return lambda: self._error(f"Operador unário desconhecido: {operator.value}", operator)
+
+    def _cached(self, node, results):
+        expression = results.pop()
+        index = node.index
+        cache = self.expression_cache
+
+        def cached():
+            try:
+                return cache[index]
+            except KeyError:
+                value = cache[index] = expression()
+                return value
+        return cached
+
+    # --- Declarações ---
+    def _clear_cache(self, node, results):
+        indexes = node.indexes
+        pop = self.expression_cache.pop
+
+        def clear_cache():
+            for index in indexes:
+                pop(index, None)
+        return clear_cache
+
+    def _var(self, node, results):
+        value_of = results.pop()
+        name = node.name.value
+        define = self.environment.define
+
+        def var():
+            value = value_of()
+            define(name, value)
+            if self.simulation_output:
+                self.events.emit((VAR, name, value))
+        return var
+
+    def _set(self, node, results):
+        value_of = results.pop()
+        name = node.name.value
+        token = node.name
+        environment = self.environment
+
+        def assign():
+            if not environment.exists(name):
+                self._error(f"Variável '{name}' não declarada antes de ser atribuída.", token)
+            value = value_of()
+            environment.assign(name, value)
+            if self.simulation_output:
+                self.events.emit((SET, name, value))
+        return assign
+
+    def _move(self, node, results):
+        steps_of = results.pop()
+        direction = node.direction.type
+        step_table = MOVE_STEPS[direction]
+        label = "FRENTE" if direction == TokenType.FRENTE else "TRAS"
+        token = node.steps.token
+        # Passos literais não negativos dispensam a validação a cada execução;
+        # com o tipo inferido inteiro, só o sinal é verificado
+        checked = type(node.steps) is NumberLiteral and node.steps.value >= 0
+        typed = node.steps.static_type in NUMERIC_TYPES
+
+        def move():
+            steps = steps_of()
+            if not checked and ((not typed and not isinstance(steps, int)) or steps < 0):
+                self._error(f"Número de passos inválido: {steps}. Deve ser um inteiro positivo.", token)
+            old_x, old_y = self.robot_x, self.robot_y
+            step_x, step_y = step_table[self.robot_direction]
+            self.robot_x = old_x + step_x * steps
+            self.robot_y = old_y + step_y * steps
+            if self.simulation_output:
+                self.events.emit((MOVE, label, steps, old_x, old_y, self.robot_x, self.robot_y))
+        return move
+
+    def _rotate(self, node, results):
+        turn = TURNS[node.direction.type]
+        label = "DIREITA" if node.direction.type == TokenType.DIREITA else "ESQUERDA"
+
+        def rotate():
+            old_direction = self.robot_direction
+            self.robot_direction = turn[old_direction]
+            if self.simulation_output:
+                self.events.emit((TURN, label, old_direction, self.robot_direction))
+        return rotate
+
+    def _pick_up(self, node, results):
+        return lambda: Interpreter.visit_PickUpStatement(self, node)
+
+    def _drop(self, node, results):
+        return lambda: Interpreter.visit_DropStatement(self, node)
+
+    def _print(self, node, results):
+        expression = results.pop()
+        return lambda: self.events.emit((PRINT, expression()))
+
+    def _if(self, node, results):
+        else_block = _block(_pop(results, len(node.else_block or ())))
+        then_block = _block(_pop(results, len(node.then_block)))
+        condition = results.pop()
+        token = node.condition.token
+        if node.condition.static_type in NUMERIC_TYPES:
+            def if_statement():
+                if condition():
+                    then_block()
+                else:
+                    else_block()
+            return if_statement
+
+        def if_statement():
+            value = condition()
+            if not isinstance(value, int): # bool é subclasse de int
+                self._error(f"Condição do 'SE' deve ser avaliada como booleano ou inteiro (0 para falso): {value}", token)
+            if value:
+                then_block()
+            else:
+                else_block()
+        return if_statement
+
+    def _repeat(self, node, results):
+        body = _block(_pop(results, len(node.body)))
+        return self._loop(results.pop(), body, node.times.token, node.times.static_type in NUMERIC_TYPES)
+
+    def _loop(self, times_of, body, token, typed=False):
+        def repeat_statement():
+            times = times_of()
+            if (not typed and not isinstance(times, int)) or times < 0:
+                self._error(f"Número de repetições inválido: {times}. Deve ser um inteiro não negativo.", token)
+            for _ in repeat(None, times):
+                body()
+        return repeat_statement
+
+    def _motion(self, node, results):
+        body = _block(_pop(results, len(node.statements)))
+        if node.times is None:
+            times_of = lambda: 1
+            token = None
+        else:
+            times_of = results.pop()
+            token = node.times.token
+        statements = node.statements
+
+        def motion_block():
+            times = times_of()
+            if not isinstance(times, int) or times < 0:
+                self._error(f"Número de repetições inválido: {times}. Deve ser um inteiro não negativo.", token)
+            if not self.simulation_output:
+                effect = motion_effect(statements, times, HEADING_INDEX[self.robot_direction], self.visit)
+                if effect is not None:
+                    dx, dy, heading = effect
+                    self.robot_x += dx
+                    self.robot_y += dy
+                    self.robot_direction = HEADINGS[heading]
+                    return
+            # Passo a passo: os mesmos eventos e, se houver, o mesmo erro no mesmo ponto
+            for _ in repeat(None, times):
+                body()
+        return motion_block
+
+    def _program(self, node, results):
+        return _block(_pop(results, len(node.statements)))
+
+
+def _pop(results, count) -> list:
+    """Retira as `count` últimas closures de `results`."""
+    if not count:
+        return []
+    block = results[-count:]
+    del results[-count:]
+    return block
+
+
+def _block(statements):
+    """Closure que executa as closures de um bloco em ordem."""
+    if not statements:
+        return _noop
+    if len(statements) == 1:
+        return statements[0]
+    statements = tuple(statements)
+
+    def block():
+        for statement in statements:
+            statement()
+    return block
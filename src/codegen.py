@@ -0,0 +1,490 @@
+"""Compilação antecipada (AOT) de programas RoboScript para código Python.
+
+`generate` traduz um `Program` para o código-fonte de uma função Python
+`__robo_main__`, e `compile_program` o compila com `compile()`:
+
+* variáveis viram variáveis locais (`v0_lado`, `v1_n`, ...), inicializadas
+  com `_UNDEF` (ou com o valor que já estiver no ambiente);
+* o estado do robô fica em locais (`robot_x`, `robot_y`, `heading` -- índice
+  da direção em `HEADINGS` -- e `has_object`), gravados de volta no
+  interpretador ao final, mesmo em caso de erro;
+* `REPETIR` vira `for _ in range(n)` e `SE`/`SENAO` vira `if`/`else`;
+* as expressões viram expressões Python. Um tipo conhecido em tempo de
+  compilação (dos literais e operadores ou, para variáveis, inferido por
+  `src/typechecker.py`) dispensa verificações: `+` entre inteiros é a soma do Python, a
+  condição de um `SE` que é uma comparação não é validada, passos literais não
+  são validados.
+
+Cada verificação que pode gerar um erro de execução ocupa uma linha própria
+do código gerado; `line_map` associa essa linha à linha e à coluna do token no
+`.robo`, e `_error` (chamada nessa linha) monta a mesma mensagem de
+`Interpreter._error`. A ordem das verificações é a mesma da execução pela
+árvore: uma subexpressão é copiada para uma variável temporária quando algo
+à sua direita precisa de uma linha própria.
+
+Os caches de `CachedExpression`/`ClearCache` (ver `src/licm.py`) viram
+locais `_k0`, `_k1`, ...: `if _k0 is _UNDEF: _k0 = ...`.
+
+`MotionBlock`s rodam passo a passo (a forma fechada de `src/motion.py` avalia
+as expressões da AST, que o código gerado não guarda). Programas com mais
+aninhamento do que o compilador do Python aceita rodam pelo `StackInterpreter`.
+
+`CodeCache` guarda o código compilado em `__roboscache__`, de modo que as
+execuções seguintes pulam as análises léxica e sintática e a geração de
+código.
+"""
+import marshal
+import sys
+
+from src import __version__
+from src.ast_nodes import (
+    Program, Statement, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral,
+    BooleanLiteral, Identifier, VarDeclaration, AssignmentStatement, MoveStatement,
+    RotateStatement, PickUpStatement, DropStatement, PrintStatement, IfStatement,
+    RepeatStatement, MotionBlock, CachedExpression, ClearCache, children
+)
+from src.cache import ASTCache, MAGIC
+from src.events import VAR, SET, MOVE, TURN, PICK_UP, DROP, PRINT
+from src.lexer import Token, TokenType
+from src.motion import HEADINGS, HEADING_INDEX, MOVE_STEPS
+from src.stack_interpreter import StackInterpreter
+from src.typechecker import INT, BOOL, STR, NUMERIC
+
+CODE_SUFFIX = ".rpc"
+CODE_FORMAT_VERSION = 2
+FUNCTION_NAME = "__robo_main__"
+
+# Limites do compilador do Python: blocos `for`/`try` aninhados (20) e
+# níveis de indentação (100)
+MAX_LOOP_NESTING = 16
+MAX_NESTING = 90
+# Profundidade máxima de parênteses de uma expressão gerada antes de usar temporárias
+_MAX_INLINE_DEPTH = 40
+
+# Tipos estáticos
+_INT, _STR, _BOOL, _UNKNOWN = "int", "str", "bool", None
+_NUMERIC = (_INT, _BOOL)
+# Tipos inferidos por `src/typechecker.py` (`Expression.static_type`)
+_STATIC_TYPES = {INT: _INT, NUMERIC: _INT, BOOL: _BOOL, STR: _STR}
+
+_COMPARISONS = {
+    TokenType.IGUAL: "==", TokenType.DIFERENTE: "!=", TokenType.MENOR: "<",
+    TokenType.MAIOR: ">", TokenType.MENOR_IGUAL: "<=", TokenType.MAIOR_IGUAL: ">=",
+}
+
+
+class _TooDeep(Exception):
+    """O programa tem mais aninhamento do que o código Python gerado suporta."""
+
+
+_COMPILE_ERRORS = (_TooDeep, SyntaxError, RecursionError, MemoryError)
+
+
+class GeneratedProgram:
+    __slots__ = ('source', 'code', 'line_map')
+
+    def __init__(self, source: str, code, line_map: dict):
+        self.source = source       # Código-fonte Python gerado
+        self.code = code           # Objeto de código do módulo (define `__robo_main__`)
+        self.line_map = line_map   # Linha do código gerado -> (linha, coluna) no .robo
+
+
+class _Generator:
+    def __init__(self):
+        self.lines = []
+        self.line_map = {}
+        self.names = {} # Nome da variável RoboScript -> nome da local Python
+        self.temporaries = 0
+        self.caches = set() # Índices das CachedExpressions usadas
+        self.indent = 1
+
+    # --- Emissão ---
+    def emit(self, text, token=None):
+        self.lines.append("    " * self.indent + text)
+        if token is not None:
+            self.line_map[len(self.lines)] = (token.line, token.column)
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f"_t{self.temporaries}"
+
+    def local(self, name) -> str:
+        local = self.names.get(name)
+        if local is None:
+            suffix = f"_{name}" if name.isascii() and name.isidentifier() else ""
+            local = self.names[name] = f"v{len(self.names)}{suffix}"
+        return local
+
+    # --- Declarações ---
+    def block(self, statements, declared, depth, loops):
+        """Emite as declarações; retorna as variáveis certamente declaradas ao final."""
+        if depth > MAX_NESTING or loops > MAX_LOOP_NESTING:
+            raise _TooDeep
+        if not statements:
+            self.emit("pass")
+        for statement in statements:
+            declared = self.statement(statement, declared, depth, loops)
+        return declared
+
+    def statement(self, node, declared, depth, loops):
+        node_type = type(node)
+        emit = self.emit
+        if node_type is VarDeclaration:
+            name = node.name.value
+            local = self.local(name)
+            value, _ = self.expression(node.value, declared)
+            emit(f"_v = {value}")
+            emit(f"if {local} is not _UNDEF: _redeclared({name!r})")
+            emit(f"{local} = _v")
+            emit(f"if out: _emit(({VAR!r}, {name!r}, _v))")
+            return declared | {name}
+        if node_type is AssignmentStatement:
+            name = node.name.value
+            local = self.local(name)
+            if name not in declared:
+                emit(f"if {local} is _UNDEF: _error({_message(f'Variável {name!r} não declarada antes de ser atribuída.')})",
+                     node.name)
+            value, _ = self.expression(node.value, declared)
+            emit(f"{local} = {value}")
+            emit(f"if out: _emit(({SET!r}, {name!r}, {local}))")
+            return declared | {name}
+        if node_type is MoveStatement:
+            label = "FRENTE" if node.direction.type == TokenType.FRENTE else "TRAS"
+            if type(node.steps) is NumberLiteral and node.steps.value >= 0:
+                steps = repr(node.steps.value)
+            else:
+                value, value_type = self.expression(node.steps, declared)
+                emit(f"_s = {value}")
+                emit(("if _s < 0: " if value_type in _NUMERIC else "if not isinstance(_s, int) or _s < 0: ") +
+                     "_error(f\"Número de passos inválido: {_s}. Deve ser um inteiro positivo.\")", node.steps.token)
+                steps = "_s"
+            emit("_ox = robot_x; _oy = robot_y")
+            emit(f"robot_x += _{label}_X[heading] * {steps}; robot_y += _{label}_Y[heading] * {steps}")
+            emit(f"if out: _emit(({MOVE!r}, {label!r}, {steps}, _ox, _oy, robot_x, robot_y))")
+            return declared
+        if node_type is RotateStatement:
+            label, turn = ("DIREITA", 1) if node.direction.type == TokenType.DIREITA else ("ESQUERDA", 3)
+            emit(f"_h = heading; heading = (heading + {turn}) % 4")
+            emit(f"if out: _emit(({TURN!r}, {label!r}, _HEADINGS[_h], _HEADINGS[heading]))")
+            return declared
+        if node_type is PickUpStatement:
+            emit("if has_object:")
+            emit(f"    if out: _emit(({PICK_UP!r}, robot_x, robot_y, False))")
+            emit("else:")
+            emit("    has_object = True")
+            emit(f"    if out: _emit(({PICK_UP!r}, robot_x, robot_y, True))")
+            return declared
+        if node_type is DropStatement:
+            emit("if not has_object:")
+            emit(f"    if out: _emit(({DROP!r}, robot_x, robot_y, False))")
+            emit("else:")
+            emit("    has_object = False")
+            emit(f"    if out: _emit(({DROP!r}, robot_x, robot_y, True))")
+            return declared
+        if node_type is PrintStatement:
+            value, _ = self.expression(node.expression, declared)
+            emit(f"_emit(({PRINT!r}, {value}))")
+            return declared
+        if node_type is IfStatement:
+            condition, condition_type = self.expression(node.condition, declared)
+            if condition_type not in _NUMERIC:
+                emit(f"_c = {condition}")
+                emit("if not isinstance(_c, int): _error(f\"Condição do 'SE' deve ser avaliada como booleano "
+                     "ou inteiro (0 para falso): {_c}\")", node.condition.token)
+                condition = "_c"
+            emit(f"if {condition}:")
+            self.indent += 1
+            then_declared = self.block(node.then_block, declared, depth + 1, loops)
+            self.indent -= 1
+            else_declared = declared
+            if node.else_block:
+                emit("else:")
+                self.indent += 1
+                else_declared = self.block(node.else_block, declared, depth + 1, loops)
+                self.indent -= 1
+            return then_declared & else_declared
+        if node_type is RepeatStatement or node_type is MotionBlock:
+            body = node.body if node_type is RepeatStatement else node.statements
+            if node.times is None:
+                times = "1"
+            elif type(node.times) is NumberLiteral and node.times.value >= 0:
+                times = repr(node.times.value)
+            else:
+                value, value_type = self.expression(node.times, declared)
+                times = self.temporary()
+                emit(f"{times} = {value}")
+                check = f"{times} < 0" if value_type in _NUMERIC else f"not isinstance({times}, int) or {times} < 0"
+                emit(f"if {check}: _error(f\"Número de repetições inválido: "
+                     f"{{{times}}}. Deve ser um inteiro não negativo.\")", node.times.token)
+            emit(f"for _ in range({times}):")
+            self.indent += 1
+            body_declared = self.block(body, declared, depth + 1, loops + 1)
+            self.indent -= 1
+            # O corpo pode não executar nenhuma vez
+            return body_declared if times.isdigit() and int(times) > 0 else declared
+        if node_type is ClearCache:
+            emit(" = ".join(f"_k{index}" for index in node.indexes) + " = _UNDEF")
+            return declared
+        raise NotImplementedError(f"Geração de código não implementada para o nó: {node_type.__name__}")
+
+    # --- Expressões ---
+    def expression(self, root, declared):
+        """Expressão Python equivalente a `root` e seu tipo estático (ou None).
+
+        Pode emitir linhas antes (verificações e temporárias). Percorre a
+        expressão em pós-ordem com uma pilha explícita.
+        """
+        results = [] # (código, tipo, profundidade de parênteses); 0 = nome ou literal
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            node_type = type(node)
+            if not children_done and node_type in (BinaryExpression, UnaryExpression):
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children(node)))
+                continue
+
+            if node_type is NumberLiteral:
+                results.append((repr(node.value) if node.value >= 0 else f"({node.value!r})", _INT, 0))
+            elif node_type is StringLiteral:
+                results.append((repr(node.value), _STR, 0))
+            elif node_type is BooleanLiteral:
+                results.append((repr(node.value), _BOOL, 0))
+            elif node_type is Identifier:
+                results.append(self.identifier(node, declared, results))
+            elif node_type is CachedExpression:
+                results.append(self.cached(node, declared, results))
+            elif node_type is UnaryExpression:
+                code, value_type, depth = results.pop()
+                operator = "-" if node.operator.type == TokenType.OP_SUB else "+"
+                result_type = _INT if value_type in _NUMERIC else _UNKNOWN
+                results.append(self.inline(f"({operator}{code})", result_type, depth + 1, results))
+            else:
+                right = results.pop()
+                left = results.pop()
+                results.append(self.binary(node, left, right, results))
+        code, value_type, _ = results.pop()
+        return code, value_type
+
+    def identifier(self, node, declared, results):
+        name = node.name
+        if name == "robot_x" or name == "robot_y":
+            return name, _INT, 0
+        if name == "robot_direction":
+            return "_HEADINGS[heading]", _STR, 1
+        if name == "has_object":
+            return "(1 if has_object else 0)", _INT, 1
+        local = self.local(name)
+        if name not in declared:
+            self.flush(results)
+            self.emit(f"if {local} is _UNDEF: _error({_message(f'Variável {name!r} não definida.')})", node.token)
+        return local, _STATIC_TYPES.get(node.static_type, _UNKNOWN), 0
+
+    def cached(self, node, declared, results):
+        """Calcula a expressão só se o cache `_k{índice}` estiver vazio."""
+        if self.indent > MAX_NESTING:
+            raise _TooDeep
+        self.flush(results)
+        cache = f"_k{node.index}"
+        self.caches.add(node.index)
+        self.emit(f"if {cache} is _UNDEF:")
+        self.indent += 1
+        code, value_type = self.expression(node.expression, declared)
+        self.emit(f"{cache} = {code}")
+        self.indent -= 1
+        return cache, value_type, 0
+
+    def binary(self, node, left, right, results):
+        left_code, left_type, left_depth = left
+        right_code, right_type, right_depth = right
+        depth = max(left_depth, right_depth) + 1
+        op_type = node.operator.type
+        if op_type == TokenType.OP_DIV:
+            # A verificação de divisão por zero vem depois dos dois operandos
+            results.append(left)
+            results.append(right)
+            self.flush(results)
+            right_code = results.pop()[0]
+            left_code = results.pop()[0]
+            self.emit(f"if {right_code} == 0: _error(\"Divisão por zero.\")", node.operator)
+            return self.inline(f"({left_code} // {right_code})", _INT if left_type in _NUMERIC and right_type in _NUMERIC else _UNKNOWN, 1, results)
+        if op_type == TokenType.OP_SOMA:
+            if left_type in _NUMERIC and right_type in _NUMERIC:
+                return self.inline(f"({left_code} + {right_code})", _INT, depth, results)
+            if left_type == _STR and right_type == _STR:
+                return self.inline(f"({left_code} + {right_code})", _STR, depth, results)
+            if left_type == _STR or right_type == _STR:
+                return self.inline(f"(str({left_code}) + str({right_code}))", _STR, depth, results)
+            return self.inline(f"_add({left_code}, {right_code})", _UNKNOWN, depth, results)
+        if op_type == TokenType.OP_SUB or op_type == TokenType.OP_MULT:
+            operator = "-" if op_type == TokenType.OP_SUB else "*"
+            if left_type in _NUMERIC and right_type in _NUMERIC:
+                result_type = _INT
+            elif op_type == TokenType.OP_MULT and (left_type, right_type) in ((_STR, _INT), (_INT, _STR)):
+                result_type = _STR
+            else:
+                result_type = _UNKNOWN
+            return self.inline(f"({left_code} {operator} {right_code})", result_type, depth, results)
+        return self.inline(f"({left_code} {_COMPARISONS[op_type]} {right_code})", _BOOL, depth, results)
+
+    def inline(self, code, value_type, depth, results):
+        """Resultado de uma operação; vira temporária se a expressão ficar funda demais."""
+        if depth <= _MAX_INLINE_DEPTH:
+            return code, value_type, depth
+        self.flush(results)
+        temporary = self.temporary()
+        self.emit(f"{temporary} = {code}")
+        return temporary, value_type, 0
+
+    def flush(self, results):
+        """Calcula em temporárias as operações pendentes, que executam antes da próxima linha emitida."""
+        for index, (code, value_type, depth) in enumerate(results):
+            if depth:
+                temporary = self.temporary()
+                self.emit(f"{temporary} = {code}")
+                results[index] = (temporary, value_type, 0)
+
+
+def _message(text: str) -> str:
+    return repr(text)
+
+
+def generate(program) -> tuple:
+    """Código-fonte Python de `program` (um `Program` ou uma declaração) e o mapa de linhas.
+
+    Lança `_TooDeep` se o aninhamento passar dos limites do Python.
+    """
+    statements = program.statements if isinstance(program, Program) else [program]
+    generator = _Generator()
+    generator.indent = 2
+    generator.block(statements, frozenset(), 0, 0)
+    body = generator.lines
+    line_map = generator.line_map
+    header = [f"def {FUNCTION_NAME}(rt):"]
+    header.append("    robot_x = rt.robot_x; robot_y = rt.robot_y; has_object = rt.has_object")
+    header.append("    heading = _HEADING_INDEX[rt.robot_direction]; out = rt.simulation_output")
+    header.append("    _values = rt.environment.values; _emit = rt.events.emit")
+    for name, local in generator.names.items():
+        header.append(f"    {local} = _values.get({name!r}, _UNDEF)")
+    if generator.caches:
+        header.append("    " + " = ".join(f"_k{index}" for index in sorted(generator.caches)) + " = _UNDEF")
+    header.append("    try:")
+    footer = ["    finally:",
+              "        rt.robot_x = robot_x; rt.robot_y = robot_y; rt.has_object = has_object",
+              "        rt.robot_direction = _HEADINGS[heading]"]
+    for name, local in generator.names.items():
+        footer.append(f"        if {local} is not _UNDEF: _values[{name!r}] = {local}")
+    offset = len(header)
+    line_map = {line + offset: position for line, position in line_map.items()}
+    return "\n".join(header + body + footer) + "\n", line_map
+
+
+def compile_program(program) -> GeneratedProgram:
+    """Gera e compila o código Python de `program`."""
+    source, line_map = generate(program)
+    return GeneratedProgram(source, compile(source, "<robo>", "exec"), line_map)
+
+
+def generate_code(program):
+    """`compile_program(program)`, ou None se o programa for aninhado demais para o Python."""
+    try:
+        return compile_program(program)
+    except _COMPILE_ERRORS:
+        return None
+
+
+# --- Execução ---
+_UNDEF = object() # Variável ainda não declarada
+
+
+def _add(left, right):
+    if isinstance(left, str) or isinstance(right, str):
+        return str(left) + str(right)
+    return left + right
+
+
+def _redeclared(name):
+    raise Exception(f"Erro: Variável '{name}' já declarada neste escopo.")
+
+
+_RUNTIME = {
+    "_UNDEF": _UNDEF, "_add": _add, "_redeclared": _redeclared,
+    "_HEADINGS": HEADINGS, "_HEADING_INDEX": HEADING_INDEX,
+    "_FRENTE_X": tuple(MOVE_STEPS[TokenType.FRENTE][heading][0] for heading in HEADINGS),
+    "_FRENTE_Y": tuple(MOVE_STEPS[TokenType.FRENTE][heading][1] for heading in HEADINGS),
+    "_TRAS_X": tuple(MOVE_STEPS[TokenType.TRAS][heading][0] for heading in HEADINGS),
+    "_TRAS_Y": tuple(MOVE_STEPS[TokenType.TRAS][heading][1] for heading in HEADINGS),
+}
+
+
+class AOTInterpreter(StackInterpreter):
+    """Executa programas compilados para Python, com o estado e as mensagens de `Interpreter`."""
+
+    def __init__(self, events=None):
+        super().__init__(events)
+        self._fallback = False # Executando pelo StackInterpreter (aninhamento demais)
+
+    def interpret(self, program: Program):
+        self.visit(program)
+
+    def visit(self, node):
+        # Declarações avulsas (modo --stream) também são compiladas
+        if not self._fallback and isinstance(node, (Program, Statement)):
+            return self.run(node)
+        return super().visit(node)
+
+    def run(self, root):
+        """Compila e executa `root`; se não for possível compilá-lo, usa o `StackInterpreter`."""
+        generated = generate_code(root)
+        if generated is None:
+            self._fallback = True
+            try:
+                return super().visit(root)
+            finally:
+                self._fallback = False
+        return self.execute(generated)
+
+    def execute(self, generated: GeneratedProgram):
+        line_map = generated.line_map
+
+        def error(message):
+            line, column = line_map[sys._getframe(1).f_lineno]
+            self._error(message, Token(None, None, line, column))
+
+        namespace = dict(_RUNTIME, _error=error)
+        exec(generated.code, namespace)
+        namespace[FUNCTION_NAME](self)
+
+
+class CodeCache(ASTCache):
+    """Cache do código compilado (`GeneratedProgram`) em `__roboscache__`.
+
+    Objetos de código dependem da versão do Python, que entra na chave junto
+    com as do interpretador e do formato. `optimized` e `licm` separam as
+    entradas geradas com e sem o otimizador e o reaproveitamento de expressões.
+    """
+    suffix = CODE_SUFFIX
+
+    def __init__(self, directory: str, optimized: bool = True, licm: bool = True, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.optimized = optimized
+        self.licm = licm
+
+    def key_prefix(self) -> str:
+        return (f"{__version__}\0{CODE_FORMAT_VERSION}\0{sys.implementation.cache_tag}\0"
+                f"{self.optimized}\0{self.licm}\0")
+
+    def dumps(self, generated: GeneratedProgram) -> bytes:
+        return MAGIC + marshal.dumps((CODE_FORMAT_VERSION, __version__, sys.implementation.cache_tag,
+                                      generated.source, generated.code, generated.line_map))
+
+    def loads(self, data: bytes):
+        if not data.startswith(MAGIC):
+            return None
+        try:
+            format_version, version, cache_tag, source, code, line_map = marshal.loads(data[len(MAGIC):])
+        except (ValueError, TypeError, EOFError):
+            return None
+        if (format_version, version, cache_tag) != (CODE_FORMAT_VERSION, __version__, sys.implementation.cache_tag):
+            return None
+        return GeneratedProgram(source, code, line_map)
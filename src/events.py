@@ -0,0 +1,160 @@
+"""Eventos da simulação e seus destinos (sinks).
+
+Os motores não formatam nem imprimem nada: cada `VAR`, `SET`, `MOVER`,
+`GIRAR`, `PEGAR`, `SOLTAR` e `IMPRIMIR` produz um evento, uma tupla
+`(tipo, dados...)`, entregue ao `emit` do sink do interpretador
+(`Interpreter.events`). A formatação só acontece no sink que a consome:
+
+* `TextSink`: o texto de sempre (`[Simulação] ...`, `[IMPRIMIR] ...`);
+* `NDJSONSink`: um objeto JSON por linha, com os campos de `FIELDS`;
+* `MemorySink`: guarda as tuplas em `events`;
+* `NullSink`: descarta tudo;
+* `TeeSink`: repassa os eventos a vários sinks (por exemplo, o texto e o
+  gravador de trajetória de `src/trajectory.py`).
+
+Um sink com `simulation = False` recebe só os eventos de `IMPRIMIR`; os
+motores nem criam os demais (e os `MotionBlock`s rodam em forma fechada, ver
+`src/motion.py`).
+
+A escrita é acumulada em memória e feita em blocos grandes no `stream`
+(`sys.stdout` por padrão); `flush` esvazia o acúmulo, e deve ser chamado antes
+de qualquer outra escrita no mesmo `stream`.
+"""
+import json
+import sys
+
+# Tipos de evento
+VAR = "VAR"
+SET = "SET"
+MOVE = "MOVER"
+TURN = "GIRAR"
+PICK_UP = "PEGAR"
+DROP = "SOLTAR"
+PRINT = "IMPRIMIR"
+
+# Campos de cada tipo de evento, na ordem da tupla (depois do tipo)
+FIELDS = {
+    VAR: ("name", "value"),
+    SET: ("name", "value"),
+    MOVE: ("direction", "steps", "from_x", "from_y", "x", "y"),
+    TURN: ("direction", "from", "to"),
+    PICK_UP: ("x", "y", "done"),  # `done` é falso se o robô já segurava um objeto
+    DROP: ("x", "y", "done"),     # `done` é falso se o robô não segurava nenhum objeto
+    PRINT: ("value",),
+}
+
+_KEYS = {kind: ("event", *fields) for kind, fields in FIELDS.items()}
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+# Linhas acumuladas antes de uma escrita no `stream`
+BUFFER_LINES = 4096
+
+
+def format_event(event: tuple) -> str:
+    """Texto do evento, como a simulação sempre imprimiu (sem a quebra de linha)."""
+    kind = event[0]
+    if kind == PRINT:
+        return f"[IMPRIMIR] {event[1]}"
+    if kind == MOVE:
+        _, direction, steps, old_x, old_y, x, y = event
+        return f"[Simulação] Robo moveu {direction} {steps} passos. Posicao: ({old_x},{old_y}) -> ({x},{y})"
+    if kind == TURN:
+        return f"[Simulação] Robo girou {event[1]}. Direção: {event[2]} -> {event[3]}"
+    if kind == VAR or kind == SET:
+        return f"[Simulação] {kind} '{event[1]}' = {event[2]}"
+    if kind == PICK_UP:
+        if not event[3]:
+            return "[Simulação] Robo já está segurando um objeto."
+        return f"[Simulação] Robo PEGOU um objeto na posicao ({event[1]},{event[2]})."
+    if kind == DROP:
+        if not event[3]:
+            return "[Simulação] Robo não está segurando nenhum objeto para SOLTAR."
+        return f"[Simulação] Robo SOLTOU um objeto na posicao ({event[1]},{event[2]})."
+    raise ValueError(f"Tipo de evento desconhecido: {kind}")
+
+
+def event_dict(event: tuple) -> dict:
+    """Evento como dicionário: {"event": tipo, campo: valor, ...}."""
+    return dict(zip(_KEYS[event[0]], event))
+
+
+class EventSink:
+    """Destino dos eventos; as subclasses implementam `emit`."""
+    simulation = True # Recebe os eventos da simulação (senão, só os de IMPRIMIR)
+
+    def emit(self, event: tuple):
+        raise NotImplementedError
+
+    def flush(self):
+        """Escreve o que estiver acumulado."""
+
+
+class NullSink(EventSink):
+    """Descarta todos os eventos."""
+    simulation = False
+
+    def emit(self, event: tuple):
+        pass
+
+
+class MemorySink(EventSink):
+    """Guarda as tuplas dos eventos em `events`, sem formatá-las."""
+
+    def __init__(self, simulation: bool = True):
+        self.simulation = simulation
+        self.events = []
+        self.emit = self.events.append
+
+
+class TextSink(EventSink):
+    """Escreve os eventos como texto, uma linha por evento."""
+
+    def __init__(self, stream=None, simulation: bool = True, buffer_lines: int = BUFFER_LINES):
+        self.stream = stream # None: o `sys.stdout` do momento da escrita
+        self.simulation = simulation
+        self.buffer_lines = buffer_lines # 0: escreve cada linha assim que é produzida
+        self._lines = []
+
+    def format(self, event: tuple) -> str:
+        return format_event(event)
+
+    def emit(self, event: tuple):
+        lines = self._lines
+        lines.append(self.format(event))
+        if len(lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        lines = self._lines
+        if lines:
+            lines.append("")
+            (self.stream or sys.stdout).write("\n".join(lines))
+            lines.clear()
+
+
+class NDJSONSink(TextSink):
+    """Escreve os eventos como JSON, um objeto por linha (NDJSON)."""
+
+    def format(self, event: tuple) -> str:
+        return _encode(event_dict(event))
+
+
+class TeeSink(EventSink):
+    """Repassa cada evento aos `sinks`; os da simulação, só aos que os recebem."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+        self.simulation = any(sink.simulation for sink in sinks)
+        self._simulation_sinks = tuple(sink for sink in sinks if sink.simulation)
+
+    def emit(self, event: tuple):
+        for sink in self.sinks if event[0] == PRINT else self._simulation_sinks:
+            sink.emit(event)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+
+# Sinks de `--events` em main.py
+SINKS = {"text": TextSink, "ndjson": NDJSONSink, "null": NullSink}
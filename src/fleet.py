@@ -0,0 +1,405 @@
+"""Execução vetorizada do mesmo programa em uma frota de robôs (NumPy).
+
+`FleetInterpreter` roda um `Program` para N robôs de uma vez. O estado de
+cada robô fica em arrays do NumPy indexados pelo número do robô: posições
+`x`/`y`, direção `heading` (índice em `HEADINGS`) e `has_object`; cada
+variável do programa é um array com o valor de cada robô.
+
+As declarações são executadas para um conjunto de robôs ativos (um array de
+índices): `MOVER`/`GIRAR`/`PEGAR`/`SOLTAR` e as expressões viram operações
+sobre arrays. Um `SE` divide os robôs pela condição de cada um e executa cada
+bloco só para os robôs do seu lado; um `REPETIR` com número de repetições
+diferente entre os robôs continua enquanto algum ainda tiver voltas.
+
+Um erro de execução para só o robô que o produziu (a mensagem fica em
+`errors`, a mesma do `Interpreter`); os demais seguem. Diferenças em relação
+ao `Interpreter`:
+
+* não há eventos: `IMPRIMIR` avalia a expressão (e seus erros), sem imprimir;
+* os inteiros têm 64 bits (operações que passam do limite dão a volta);
+  literais e valores maiores que isso ficam em arrays de objetos do Python.
+
+Valores que não são inteiros ou booleanos (textos, e variáveis que mudam de
+tipo entre os robôs) ficam em arrays de objetos e são calculados elemento a
+elemento, com a semântica do `Interpreter`.
+"""
+import numpy as np
+
+from src.ast_nodes import (
+    BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral, BooleanLiteral, Identifier,
+    VarDeclaration, AssignmentStatement, MoveStatement, RotateStatement, PickUpStatement, DropStatement,
+    PrintStatement, IfStatement, RepeatStatement, MotionBlock, CachedExpression, ClearCache, children
+)
+from src.lexer import TokenType
+from src.motion import HEADINGS, HEADING_INDEX, MOVE_STEPS
+
+_HEADING_NAMES = np.array(HEADINGS, dtype=object)
+# Deslocamento de um passo para cada índice de direção: (dx, dy)
+_STEP_X = {direction: np.array([steps[heading][0] for heading in HEADINGS], dtype=np.int64)
+           for direction, steps in MOVE_STEPS.items()}
+_STEP_Y = {direction: np.array([steps[heading][1] for heading in HEADINGS], dtype=np.int64)
+           for direction, steps in MOVE_STEPS.items()}
+# Quartos de volta à direita de cada GIRAR
+_TURN = {TokenType.DIREITA: 1, TokenType.ESQUERDA: 3}
+
+_NUMERIC = (np.dtype(np.int64), np.dtype(bool))
+
+
+def _error_message(message, token) -> str:
+    """Mensagem de erro no formato de `Interpreter._error`."""
+    line_info = f"Linha {token.line}, coluna {token.column}: " if token else ""
+    return f"Erro de Execução: {line_info}{message}"
+
+
+def _constant(value, size: int):
+    """Array com `size` cópias de um valor de literal."""
+    if isinstance(value, bool):
+        return np.full(size, value, dtype=bool)
+    if isinstance(value, int):
+        try:
+            return np.full(size, value, dtype=np.int64)
+        except OverflowError:
+            pass
+    array = np.empty(size, dtype=object)
+    array[:] = [value] * size
+    return array
+
+
+def _integers(array):
+    """Inteiros e booleanos como int64 (para as operações aritméticas)."""
+    return array.astype(np.int64) if array.dtype == bool else array
+
+
+def _scalar_binary(op_type, left, right):
+    """Operação binária sobre dois valores, como em `Interpreter.visit_BinaryExpression`."""
+    if op_type == TokenType.OP_SOMA:
+        if isinstance(left, str) or isinstance(right, str):
+            return str(left) + str(right)
+        return left + right
+    if op_type == TokenType.OP_SUB:
+        return left - right
+    if op_type == TokenType.OP_MULT:
+        return left * right
+    if op_type == TokenType.OP_DIV:
+        return left // right
+    if op_type == TokenType.IGUAL:
+        return left == right
+    if op_type == TokenType.DIFERENTE:
+        return left != right
+    if op_type == TokenType.MENOR:
+        return left < right
+    if op_type == TokenType.MAIOR:
+        return left > right
+    if op_type == TokenType.MENOR_IGUAL:
+        return left <= right
+    return left >= right
+
+
+_ARRAY_BINARY = {
+    TokenType.OP_SOMA: np.add,
+    TokenType.OP_SUB: np.subtract,
+    TokenType.OP_MULT: np.multiply,
+    TokenType.OP_DIV: np.floor_divide,
+    TokenType.IGUAL: np.equal,
+    TokenType.DIFERENTE: np.not_equal,
+    TokenType.MENOR: np.less,
+    TokenType.MAIOR: np.greater,
+    TokenType.MENOR_IGUAL: np.less_equal,
+    TokenType.MAIOR_IGUAL: np.greater_equal,
+}
+_ARITHMETIC = frozenset((TokenType.OP_SOMA, TokenType.OP_SUB, TokenType.OP_MULT, TokenType.OP_DIV))
+
+
+class FleetInterpreter:
+    """Executa um programa para `size` robôs, com o estado de todos em arrays do NumPy.
+
+    `x`, `y`, `direction` e `has_object` dão o estado inicial: um valor para
+    todos os robôs ou uma sequência com um valor por robô.
+    """
+
+    def __init__(self, size: int, x=0, y=0, direction="NORTE", has_object=False):
+        self.size = size
+        self.x = np.array(np.broadcast_to(np.asarray(x, dtype=np.int64), size))
+        self.y = np.array(np.broadcast_to(np.asarray(y, dtype=np.int64), size))
+        if isinstance(direction, str):
+            direction = [direction]
+        headings = np.array([HEADING_INDEX[name] for name in direction], dtype=np.int8)
+        self.heading = np.array(np.broadcast_to(headings if len(headings) > 1 else headings[0], size))
+        self.has_object = np.array(np.broadcast_to(np.asarray(has_object, dtype=bool), size))
+        # Variáveis: nome -> [valores, declarada], arrays com um elemento por robô
+        self.variables = {}
+        # Robôs ainda em execução e a mensagem de erro dos que pararam
+        self.alive = np.ones(size, dtype=bool)
+        self.errors = [None] * size
+        self.failures = 0
+        # Declarações executadas, somadas sobre os robôs (passos de robô)
+        self.steps = 0
+
+    # --- Estado ---
+    def state(self, robot: int) -> tuple:
+        """Estado `(x, y, direção, segurando objeto)` de um robô."""
+        return (int(self.x[robot]), int(self.y[robot]), HEADINGS[self.heading[robot]],
+                bool(self.has_object[robot]))
+
+    def value(self, name: str, robot: int):
+        """Valor da variável `name` para um robô (KeyError se ele não a declarou)."""
+        entry = self.variables.get(name)
+        if entry is None or not entry[1][robot]:
+            raise KeyError(name)
+        value = entry[0][robot]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def _fail(self, robots, message):
+        """Para os `robots` ainda em execução com a mensagem `message` (texto ou função do robô)."""
+        alive = self.alive
+        robots = robots[alive[robots]]
+        if not len(robots):
+            return
+        alive[robots] = False
+        errors = self.errors
+        for robot in robots.tolist():
+            errors[robot] = message if isinstance(message, str) else message(robot)
+        self.failures += len(robots)
+
+    def _survivors(self, robots, *arrays):
+        """`robots` (e os arrays alinhados a eles) sem os que pararam com erro."""
+        keep = self.alive[robots]
+        if keep.all():
+            return (robots, *arrays) if arrays else robots
+        return (robots[keep], *(array[keep] for array in arrays)) if arrays else robots[keep]
+
+    # --- Execução ---
+    def interpret(self, program):
+        self.run(program.statements, np.flatnonzero(self.alive))
+
+    def run(self, statements, robots):
+        """Executa `statements` para os `robots` (índices); retorna os que continuam em execução."""
+        for statement in statements:
+            if not len(robots):
+                break
+            failures = self.failures
+            self._statement(statement, robots)
+            if self.failures != failures:
+                robots = self._survivors(robots)
+        return robots
+
+    def _statement(self, node, robots):
+        node_type = type(node)
+        self.steps += len(robots)
+        if node_type is VarDeclaration:
+            value = self._evaluate(node.value, robots)
+            robots, value = self._survivors(robots, value)
+            name = node.name.value
+            entry = self.variables.get(name)
+            if entry is not None:
+                declared = entry[1][robots]
+                if declared.any():
+                    self._fail(robots[declared], f"Erro: Variável '{name}' já declarada neste escopo.")
+                    robots, value = robots[~declared], value[~declared]
+            self._store(name, robots, value)
+        elif node_type is AssignmentStatement:
+            name = node.name.value
+            entry = self.variables.get(name)
+            undeclared = np.ones(len(robots), dtype=bool) if entry is None else ~entry[1][robots]
+            if undeclared.any():
+                message = _error_message(f"Variável '{name}' não declarada antes de ser atribuída.", node.name)
+                self._fail(robots[undeclared], message)
+                robots = robots[~undeclared]
+            value = self._evaluate(node.value, robots)
+            robots, value = self._survivors(robots, value)
+            self._store(name, robots, value)
+        elif node_type is MoveStatement:
+            steps = self._count(node.steps, robots, "Número de passos inválido: {}. Deve ser um inteiro positivo.")
+            robots, steps = self._survivors(robots, steps)
+            direction = node.direction.type
+            headings = self.heading[robots]
+            self.x[robots] += _STEP_X[direction][headings] * steps
+            self.y[robots] += _STEP_Y[direction][headings] * steps
+        elif node_type is RotateStatement:
+            self.heading[robots] = (self.heading[robots] + _TURN[node.direction.type]) % 4
+        elif node_type is PickUpStatement:
+            self.has_object[robots] = True
+        elif node_type is DropStatement:
+            self.has_object[robots] = False
+        elif node_type is PrintStatement:
+            self._evaluate(node.expression, robots)
+        elif node_type is IfStatement:
+            condition = self._condition(node.condition, robots)
+            robots, condition = self._survivors(robots, condition)
+            self.run(node.then_block, robots[condition])
+            if node.else_block:
+                self.run(node.else_block, robots[~condition])
+        elif node_type is RepeatStatement:
+            self._repeat(node.times, node.body, robots)
+        elif node_type is MotionBlock:
+            if node.times is None:
+                self.run(node.statements, robots)
+            else:
+                self._repeat(node.times, node.statements, robots)
+        elif node_type is not ClearCache: # As CachedExpressions são sempre recalculadas
+            raise Exception(f"Declaração não suportada pela frota: {node_type.__name__}")
+
+    def _repeat(self, times, body, robots):
+        remaining = self._count(times, robots, "Número de repetições inválido: {}. Deve ser um inteiro não negativo.")
+        while len(robots):
+            keep = (remaining > 0) & self.alive[robots]
+            if not keep.all():
+                robots, remaining = robots[keep], remaining[keep]
+                if not len(robots):
+                    break
+            self.run(body, robots)
+            remaining = remaining - 1
+
+    def _store(self, name, robots, value):
+        entry = self.variables.get(name)
+        if entry is None:
+            values = np.empty(self.size, dtype=value.dtype) if value.dtype == object else np.zeros(self.size, value.dtype)
+            entry = self.variables[name] = [values, np.zeros(self.size, dtype=bool)]
+        values, declared = entry
+        if values.dtype != value.dtype: # Tipos diferentes entre os robôs: valores do Python
+            values = entry[0] = values.astype(object)
+            value = value.astype(object)
+        values[robots] = value
+        declared[robots] = True
+
+    def _count(self, expression, robots, message):
+        """Número de passos ou de repetições de cada robô (int64); os inválidos param com erro."""
+        counts = self._evaluate(expression, robots)
+        if counts.dtype in _NUMERIC:
+            counts = _integers(counts)
+            invalid = counts < 0
+        else:
+            values = counts.tolist()
+            invalid = np.array([not isinstance(value, int) or value < 0 for value in values], dtype=bool)
+        if invalid.any():
+            values = counts.tolist()
+            positions = {robot: position for position, robot in enumerate(robots.tolist())}
+            self._fail(robots[invalid], lambda robot: _error_message(
+                message.format(values[positions[robot]]), expression.token))
+            counts = np.where(invalid, 0, counts)
+        if counts.dtype == object:
+            try:
+                counts = counts.astype(np.int64)
+            except OverflowError:
+                raise Exception("Valor grande demais para a frota (inteiros de 64 bits).") from None
+        return counts
+
+    def _condition(self, expression, robots):
+        """Condição de um SE para cada robô (array de booleanos)."""
+        condition = self._evaluate(expression, robots)
+        if condition.dtype in _NUMERIC:
+            return condition != 0
+        values = condition.tolist()
+        invalid = np.array([not isinstance(value, int) for value in values], dtype=bool)
+        if invalid.any():
+            positions = {robot: position for position, robot in enumerate(robots.tolist())}
+            self._fail(robots[invalid], lambda robot: _error_message(
+                "Condição do 'SE' deve ser avaliada como booleano ou inteiro (0 para falso): "
+                f"{values[positions[robot]]}", expression.token))
+        return np.array([not bad and value != 0 for bad, value in zip(invalid.tolist(), values)], dtype=bool)
+
+    # --- Expressões ---
+    def _evaluate(self, root, robots):
+        """Valor de `root` para cada um dos `robots` (array alinhado a eles).
+
+        Robôs que param com erro durante a avaliação ficam com um valor
+        qualquer; o chamador os remove com `_survivors`.
+        """
+        results = []
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            node_type = type(node)
+            if node_type is CachedExpression:
+                stack.append((node.expression, False))
+                continue
+            if not children_done and (node_type is BinaryExpression or node_type is UnaryExpression):
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children(node)))
+                continue
+            if node_type is BinaryExpression:
+                right = results.pop()
+                results.append(self._binary(node, results.pop(), right, robots))
+            elif node_type is UnaryExpression:
+                results.append(self._unary(node, results.pop(), robots))
+            elif node_type is Identifier:
+                results.append(self._identifier(node, robots))
+            elif node_type in (NumberLiteral, StringLiteral, BooleanLiteral):
+                results.append(_constant(node.value, len(robots)))
+            else:
+                raise Exception(f"Expressão não suportada pela frota: {node_type.__name__}")
+        return results.pop()
+
+    def _identifier(self, node, robots):
+        name = node.name
+        if name == "robot_x":
+            return self.x[robots]
+        if name == "robot_y":
+            return self.y[robots]
+        if name == "robot_direction":
+            return _HEADING_NAMES[self.heading[robots]]
+        if name == "has_object":
+            return self.has_object[robots].astype(np.int64)
+        entry = self.variables.get(name)
+        if entry is None:
+            self._fail(robots, _error_message(f"Variável '{name}' não definida.", node.token))
+            return np.zeros(len(robots), dtype=np.int64)
+        values, declared = entry
+        declared = declared[robots]
+        if not declared.all():
+            self._fail(robots[~declared], _error_message(f"Variável '{name}' não definida.", node.token))
+        return values[robots]
+
+    def _binary(self, node, left, right, robots):
+        op_type = node.operator.type
+        if left.dtype in _NUMERIC and right.dtype in _NUMERIC:
+            if op_type in _ARITHMETIC:
+                left, right = _integers(left), _integers(right)
+                if op_type == TokenType.OP_DIV:
+                    zero = right == 0
+                    if zero.any():
+                        self._fail(robots[zero], _error_message("Divisão por zero.", node.operator))
+                        right = np.where(zero, 1, right)
+            return _ARRAY_BINARY[op_type](left, right)
+        # Caminho geral: elemento a elemento, com a semântica do Interpreter
+        result = np.empty(len(robots), dtype=object)
+        failed = []
+        for position, (a, b) in enumerate(zip(left.tolist(), right.tolist())):
+            try:
+                if op_type == TokenType.OP_DIV and b == 0:
+                    raise Exception(_error_message("Divisão por zero.", node.operator))
+                result[position] = _scalar_binary(op_type, a, b)
+            except Exception as e:
+                failed.append((position, str(e)))
+                result[position] = 0
+        self._fail_each(robots, failed)
+        return result
+
+    def _unary(self, node, right, robots):
+        op_type = node.operator.type
+        if right.dtype in _NUMERIC:
+            right = _integers(right)
+            return -right if op_type == TokenType.OP_SUB else right
+        result = np.empty(len(robots), dtype=object)
+        failed = []
+        for position, value in enumerate(right.tolist()):
+            try:
+                result[position] = -value if op_type == TokenType.OP_SUB else +value
+            except Exception as e:
+                failed.append((position, str(e)))
+                result[position] = 0
+        self._fail_each(robots, failed)
+        return result
+
+    def _fail_each(self, robots, failed):
+        """Para cada robô de `failed` (posição em `robots`, mensagem) com a sua mensagem."""
+        if failed:
+            messages = {int(robots[position]): message for position, message in failed}
+            self._fail(robots[[position for position, _ in failed]], messages.__getitem__)
+
+
+def run_fleet(program, size: int, **state) -> FleetInterpreter:
+    """Executa `program` para `size` robôs; retorna o `FleetInterpreter` com o estado final."""
+    fleet = FleetInterpreter(size, **state)
+    fleet.interpret(program)
+    return fleet
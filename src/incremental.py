@@ -0,0 +1,163 @@
+"""Sessão incremental de análise léxica e sintática.
+
+Usada por editores e ajustes ao vivo: a cada edição de texto, só as linhas das
+declarações de nível superior afetadas são reanalisadas; as demais declarações
+(e seus tokens) são reaproveitadas, com linhas e posições deslocadas.
+
+Uma região reanalisada sempre começa e termina em início de linha (logo após
+uma quebra de linha que o Lexer conta), onde o estado do lexer é conhecido.
+Quando a edição muda a estrutura fora da região (por exemplo, abre uma string
+ou um bloco que só fecha mais adiante), a sessão refaz a análise completa, de
+modo que o resultado é sempre igual ao de `Parser(Lexer(source).tokenize()).parse()`.
+"""
+from bisect import bisect_right
+
+from src.ast_nodes import Program
+from src.lexer import Lexer, Token, TokenType
+from src.parser import Parser
+
+
+class IncrementalSession:
+    """Mantém os tokens e as declarações de nível superior de um código-fonte."""
+
+    def __init__(self, source_code: str):
+        self.source = source_code
+        self.tokens = []        # list[Token], terminando com EOF
+        self.offsets = []       # Posição na fonte de cada token
+        self.statements = []    # Declarações de nível superior (Program.statements)
+        self.first_tokens = []  # Índice do primeiro token de cada declaração
+        self.line_starts = []   # Início da linha do primeiro token de cada declaração
+        self.program = None
+        self.rebuild()
+
+    def rebuild(self) -> Program:
+        """Reanalisa todo o código-fonte."""
+        self.program = None
+        tokens, offsets, _ = self._lex(self.source, 0, 1)
+        statements, first_tokens = self._parse(tokens)
+        self.tokens, self.offsets = tokens, offsets
+        self.statements, self.first_tokens = statements, first_tokens
+        self.line_starts = [self._line_start(index) for index in first_tokens]
+        self.program = Program(self.statements)
+        return self.program
+
+    def edit(self, start: int, end: int, replacement: str) -> Program:
+        """Substitui `source[start:end]` por `replacement` e atualiza a AST.
+
+        Erros léxicos ou sintáticos do novo código-fonte são lançados como na
+        análise completa; a sessão guarda a fonte editada e volta a fazer a
+        análise completa na próxima edição.
+        """
+        if not 0 <= start <= end <= len(self.source):
+            raise ValueError(f"Intervalo de edição inválido: [{start}, {end}).")
+        old_source = self.source
+        self.source = old_source[:start] + replacement + old_source[end:]
+        if self.program is None or not self.statements or not self._reparse_region(start, end, replacement):
+            self.rebuild()
+        return self.program
+
+    # --- Reanálise de uma região ---
+    def _reparse_region(self, start, end, replacement) -> bool:
+        """Tenta reanalisar só as declarações afetadas; retorna False se for preciso refazer tudo."""
+        n = len(self.statements)
+        delta = len(replacement) - (end - start)
+        first, last = self._affected_statements(start, end)
+
+        region_start = self.line_starts[first] if first > 0 else 0
+        is_tail = last == n - 1
+        old_region_end = len(self.source) - delta if is_tail else self.line_starts[last + 1]
+        first_token = self.first_tokens[first] if first > 0 else 0
+        after_token = len(self.tokens) if is_tail else self.first_tokens[last + 1]
+        region_line = self.tokens[first_token].line if first > 0 else 1
+
+        region = self.source[region_start:old_region_end + delta]
+        try:
+            tokens, offsets, lexer = self._lex(region, region_start, region_line)
+        except Exception:
+            return False
+        if not is_tail:
+            if lexer.column != 1:
+                return False # A edição juntou a última linha da região com a seguinte
+            tokens.pop() # EOF da região; o EOF da fonte é reaproveitado
+            offsets.pop()
+            tokens.append(Token(TokenType.EOF, '', lexer.line, lexer.column))
+        try:
+            statements, first_tokens = self._parse(tokens)
+        except Exception:
+            return False
+        if not is_tail:
+            tokens.pop()
+
+        # Desloca os tokens reaproveitados depois da região
+        if not is_tail:
+            line_delta = lexer.line - self.tokens[after_token].line
+            if line_delta:
+                for token in self.tokens[after_token:]:
+                    token.line += line_delta
+        if delta:
+            self.offsets[after_token:] = [offset + delta for offset in self.offsets[after_token:]]
+            self.line_starts[last + 1:] = [offset + delta for offset in self.line_starts[last + 1:]]
+        token_delta = len(tokens) - (after_token - first_token)
+        if token_delta:
+            self.first_tokens[last + 1:] = [index + token_delta for index in self.first_tokens[last + 1:]]
+
+        self.tokens[first_token:after_token] = tokens
+        self.offsets[first_token:after_token] = offsets
+        first_tokens = [index + first_token for index in first_tokens]
+        self.first_tokens[first:last + 1] = first_tokens
+        self.line_starts[first:last + 1] = [self._line_start(index) for index in first_tokens]
+        self.statements[first:last + 1] = statements
+        self.program = Program(self.statements)
+        return True
+
+    def _affected_statements(self, start, end) -> tuple[int, int]:
+        """Índices da primeira e da última declaração cujas linhas tocam a edição.
+
+        O intervalo é ampliado enquanto uma declaração vizinha compartilhar
+        linha com ele, para que a região comece e termine em início de linha.
+        """
+        line_starts = self.line_starts
+        first = max(bisect_right(line_starts, start) - 1, 0)
+        last = max(bisect_right(line_starts, end) - 1, first)
+        while first > 0 and self._last_offset(first - 1) >= line_starts[first]:
+            first -= 1
+        while last + 1 < len(line_starts) and self._last_offset(last) >= line_starts[last + 1]:
+            last += 1
+        return first, last
+
+    def _last_offset(self, statement_index) -> int:
+        """Posição na fonte (antes da edição) do último token da declaração."""
+        if statement_index + 1 < len(self.first_tokens):
+            return self.offsets[self.first_tokens[statement_index + 1] - 1]
+        return self.offsets[-2]
+
+    def _line_start(self, token_index) -> int:
+        """Posição na fonte em que começa a linha do token."""
+        return self.offsets[token_index] - self.tokens[token_index].column + 1
+
+    # --- Análise léxica e sintática de um trecho ---
+    @staticmethod
+    def _lex(text, base_offset, line):
+        """Analisa `text`, que começa em início de linha na posição `base_offset` da fonte."""
+        lexer = Lexer(text, line)
+        tokens = []
+        offsets = []
+        for token_type, value, pos, token_line, column in lexer._scan():
+            tokens.append(Token(token_type, value, token_line, column))
+            offsets.append(base_offset + pos)
+        tokens.append(Token(TokenType.EOF, '', lexer.line, lexer.column))
+        offsets.append(base_offset + len(text))
+        return tokens, offsets, lexer
+
+    @staticmethod
+    def _parse(tokens):
+        """Analisa os tokens, retornando as declarações e o índice do primeiro token de cada uma."""
+        parser = Parser(tokens)
+        statements = []
+        first_tokens = []
+        first = 0
+        for statement in parser.iter_statements():
+            statements.append(statement)
+            first_tokens.append(first)
+            first = parser.current_token_index
+        return statements, first_tokens
@@ -1,27 +1,65 @@
 from src.ast_nodes import (
     Program, Statement, Expression, BinaryExpression, UnaryExpression,
-    NumberLiteral, StringLiteral, Identifier, VarDeclaration, AssignmentStatement,
+    NumberLiteral, StringLiteral, BooleanLiteral, Identifier, VarDeclaration, AssignmentStatement,
     MoveStatement, RotateStatement, PickUpStatement, DropStatement,
-    PrintStatement, IfStatement, RepeatStatement, Block
+    PrintStatement, IfStatement, RepeatStatement, MotionBlock, Block, CachedExpression, ClearCache
 )
 from src.lexer import TokenType
 from src.environment import Environment
+from src.events import VAR, SET, MOVE, TURN, PICK_UP, DROP, PRINT, TextSink
+from src.motion import HEADINGS, HEADING_INDEX, MOVE_STEPS, motion_effect
+from src.resolver import ROBOT_ACCESSORS, UNSET
+from src.typechecker import INT, NUMERIC_TYPES
 
 class Interpreter:
-    def __init__(self):
+    def __init__(self, events=None):
         self.environment = Environment()
         # Estado do robô (simulado)
         self.robot_x = 0
         self.robot_y = 0
         self.robot_direction = "NORTE" # NORTE, LESTE, SUL, OESTE
         self.has_object = False
+        # Destino dos eventos (ver src/events.py); por padrão, o texto de
+        # sempre, escrito no sys.stdout assim que produzido
+        self.events = TextSink(buffer_lines=0) if events is None else events
+        # Produz os eventos da simulação; desligada, os MotionBlocks rodam em
+        # forma fechada (ver src/motion.py)
+        self.simulation_output = self.events.simulation
+        # Valores das variáveis por índice durante a execução de um programa
+        # resolvido (ver src/resolver.py); None usa o Environment
+        self.slots = None
+        # Valores das CachedExpressions já calculadas, por índice (ver src/licm.py)
+        self.expression_cache = {}
+        # Objetos e obstáculos (ver src/world.py); sem mundo, o robô anda
+        # livremente e PEGAR/SOLTAR só mudam `has_object`
+        self.world = None
 
     def _error(self, message, token=None):
         line_info = f"Linha {token.line}, coluna {token.column}: " if token else ""
         raise Exception(f"Erro de Execução: {line_info}{message}")
 
     def interpret(self, program: Program):
-        for statement in program.statements:
+        names = program.slot_names
+        if names is None:
+            self.interpret_statements(program.statements)
+            return
+        values = self.environment.values
+        self.slots = slots = [values.get(name, UNSET) for name in names]
+        try:
+            self.interpret_statements(program.statements)
+        finally:
+            self.slots = None
+            for name, value in zip(names, slots):
+                if value is not UNSET:
+                    values[name] = value
+
+    def interpret_statements(self, statements):
+        """Executa as declarações na ordem em que o iterável as produz.
+
+        Aceita um gerador (por exemplo, `StreamParser.iter_statements()`), de
+        modo que cada declaração roda assim que termina de ser analisada.
+        """
+        for statement in statements:
             self.visit(statement)
 
     def visit(self, node):
@@ -46,10 +84,26 @@ class Interpreter:
         # Permite que variáveis sejam inicializadas com strings também
         # if not isinstance(value, int):
         #     self._error(f"Variável '{node.name.value}' deve ser inicializada com um número inteiro.", node.name)
-        self.environment.define(node.name.value, value)
-        print(f"[Simulação] VAR '{node.name.value}' = {value}")
+        slots = self.slots
+        if slots is not None and node.slot is not None:
+            if slots[node.slot] is not UNSET:
+                raise Exception(f"Erro: Variável '{node.name.value}' já declarada neste escopo.")
+            slots[node.slot] = value
+        else:
+            self.environment.define(node.name.value, value)
+        if self.simulation_output:
+            self.events.emit((VAR, node.name.value, value))
 
     def visit_AssignmentStatement(self, node: AssignmentStatement):
+        slots = self.slots
+        if slots is not None and node.slot is not None:
+            if slots[node.slot] is UNSET:
+                self._error(f"Variável '{node.name.value}' não declarada antes de ser atribuída.", node.name)
+            value = self.visit(node.value)
+            slots[node.slot] = value
+            if self.simulation_output:
+                self.events.emit((SET, node.name.value, value))
+            return
         if not self.environment.exists(node.name.value):
             self._error(f"Variável '{node.name.value}' não declarada antes de ser atribuída.", node.name)
         value = self.visit(node.value)
@@ -57,69 +111,106 @@ class Interpreter:
         # if not isinstance(value, int):
         #     self._error(f"Valor atribuído a '{node.name.value}' deve ser um número inteiro.", node.name)
         self.environment.assign(node.name.value, value)
-        print(f"[Simulação] SET '{node.name.value}' = {value}")
+        if self.simulation_output:
+            self.events.emit((SET, node.name.value, value))
 
     def visit_MoveStatement(self, node: MoveStatement):
         steps = self.visit(node.steps)
-        if not isinstance(steps, int) or steps < 0:
-            self._error(f"Número de passos inválido: {steps}. Deve ser um inteiro positivo.", node.steps.token)
+        self._check_steps(steps, node.steps.static_type, node.steps.token)
+        self._move_robot(node.direction.type, steps, node.direction)
+
+    def _check_steps(self, steps, static_type, token):
+        """Valida o número de passos de um MOVER."""
+        # Com o tipo inferido (ver src/typechecker.py), só o sinal é verificado
+        if (static_type not in NUMERIC_TYPES and not isinstance(steps, int)) or steps < 0:
+            self._error(f"Número de passos inválido: {steps}. Deve ser um inteiro positivo.", token)
+
+    def _move_robot(self, direction: TokenType, steps: int, token=None):
+        """Move o robô `steps` passos (já validados) para FRENTE ou TRAS; `token` localiza os erros."""
+        if self.world is not None:
+            self._move_in_world(direction, steps, token)
+            return
 
         old_x, old_y = self.robot_x, self.robot_y
-        if node.direction.type == TokenType.FRENTE:
+        if direction == TokenType.FRENTE:
             if self.robot_direction == "NORTE": self.robot_y += steps
             elif self.robot_direction == "LESTE": self.robot_x += steps
             elif self.robot_direction == "SUL": self.robot_y -= steps
             elif self.robot_direction == "OESTE": self.robot_x -= steps
-            print(f"[Simulação] Robo moveu FRENTE {steps} passos. Posicao: ({old_x},{old_y}) -> ({self.robot_x},{self.robot_y})")
-        elif node.direction.type == TokenType.TRAS:
+            if self.simulation_output:
+                self.events.emit((MOVE, "FRENTE", steps, old_x, old_y, self.robot_x, self.robot_y))
+        elif direction == TokenType.TRAS:
             if self.robot_direction == "NORTE": self.robot_y -= steps
             elif self.robot_direction == "LESTE": self.robot_x -= steps
             elif self.robot_direction == "SUL": self.robot_y += steps
             elif self.robot_direction == "OESTE": self.robot_x -= steps
-            print(f"[Simulação] Robo moveu TRAS {steps} passos. Posicao: ({old_x},{old_y}) -> ({self.robot_x},{self.robot_y})")
-        
+            if self.simulation_output:
+                self.events.emit((MOVE, "TRAS", steps, old_x, old_y, self.robot_x, self.robot_y))
+
+    def _move_in_world(self, direction: TokenType, steps: int, token=None):
+        """MOVER em um mundo: o robô para antes do primeiro obstáculo do caminho, com erro."""
+        step_x, step_y = MOVE_STEPS[direction][self.robot_direction]
+        old_x, old_y = self.robot_x, self.robot_y
+        free = self.world.free_steps(old_x, old_y, step_x, step_y, steps)
+        self.robot_x = old_x + step_x * free
+        self.robot_y = old_y + step_y * free
+        if self.simulation_output and (free or free == steps):
+            label = "FRENTE" if direction == TokenType.FRENTE else "TRAS"
+            self.events.emit((MOVE, label, free, old_x, old_y, self.robot_x, self.robot_y))
+        if free < steps:
+            self._error(f"Caminho bloqueado por obstáculo na posição "
+                        f"({self.robot_x + step_x},{self.robot_y + step_y}).", token)
+
     def visit_RotateStatement(self, node: RotateStatement):
+        self._rotate_robot(node.direction.type)
+
+    def _rotate_robot(self, direction: TokenType):
+        """Gira o robô para a DIREITA ou para a ESQUERDA."""
         old_direction = self.robot_direction
         directions = ["NORTE", "LESTE", "SUL", "OESTE"]
         current_idx = directions.index(self.robot_direction)
 
-        if node.direction.type == TokenType.DIREITA:
+        if direction == TokenType.DIREITA:
             self.robot_direction = directions[(current_idx + 1) % 4]
-            print(f"[Simulação] Robo girou DIREITA. Direção: {old_direction} -> {self.robot_direction}")
-        elif node.direction.type == TokenType.ESQUERDA:
+            if self.simulation_output:
+                self.events.emit((TURN, "DIREITA", old_direction, self.robot_direction))
+        elif direction == TokenType.ESQUERDA:
             self.robot_direction = directions[(current_idx - 1 + 4) % 4]
-            print(f"[Simulação] Robo girou ESQUERDA. Direção: {old_direction} -> {self.robot_direction}")
+            if self.simulation_output:
+                self.events.emit((TURN, "ESQUERDA", old_direction, self.robot_direction))
 
     def visit_PickUpStatement(self, node: PickUpStatement):
+        self._pick_up_object(node.token if node else None)
+
+    def _pick_up_object(self, token=None):
+        """PEGAR; com um mundo, retira o objeto da posição do robô (`token` localiza o erro)."""
         if self.has_object:
-            print("[Simulação] Robo já está segurando um objeto.")
+            if self.simulation_output:
+                self.events.emit((PICK_UP, self.robot_x, self.robot_y, False))
         else:
+            if self.world is not None and not self.world.take(self.robot_x, self.robot_y):
+                self._error(f"Nenhum objeto para PEGAR na posição ({self.robot_x},{self.robot_y}).", token)
             self.has_object = True
-            print(f"[Simulação] Robo PEGOU um objeto na posicao ({self.robot_x},{self.robot_y}).")
+            if self.simulation_output:
+                self.events.emit((PICK_UP, self.robot_x, self.robot_y, True))
 
     def visit_DropStatement(self, node: DropStatement):
         if not self.has_object:
-            print("[Simulação] Robo não está segurando nenhum objeto para SOLTAR.")
+            if self.simulation_output:
+                self.events.emit((DROP, self.robot_x, self.robot_y, False))
         else:
             self.has_object = False
-            print(f"[Simulação] Robo SOLTOU um objeto na posicao ({self.robot_x},{self.robot_y}).")
+            if self.world is not None:
+                self.world.put(self.robot_x, self.robot_y)
+            if self.simulation_output:
+                self.events.emit((DROP, self.robot_x, self.robot_y, True))
 
     def visit_PrintStatement(self, node: PrintStatement):
         value = self.visit(node.expression)
-        print(f"[IMPRIMIR] {value}")
+        self.events.emit((PRINT, value))
 
     def visit_IfStatement(self, node: IfStatement):
-        condition_result = self.visit(node.condition)
-        # Em RoboScript, 0 é falso, qualquer outro inteiro é verdadeiro. Ou podemos forçar booleanos.
-        if isinstance(condition_result, bool): # Se sua expressão de comparação já retornar bool
-            condition_is_true = condition_result
-        elif isinstance(condition_result, int): # Se expressões retornam int
-            condition_is_true = condition_result != 0
-        else:
-            self._error(f"Condição do 'SE' deve ser avaliada como booleano ou inteiro (0 para falso): {condition_result}", node.condition.token)
-
-
-        if condition_is_true:
+        if self._condition_is_true(node):
             for statement in node.then_block:
                 self.visit(statement)
         elif node.else_block:
@@ -127,14 +218,57 @@ class Interpreter:
                 self.visit(statement)
 
     def visit_RepeatStatement(self, node: RepeatStatement):
-        times = self.visit(node.times)
-        if not isinstance(times, int) or times < 0:
-            self._error(f"Número de repetições inválido: {times}. Deve ser um inteiro não negativo.", node.times.token)
-        
-        for _ in range(times):
+        for _ in range(self._repeat_count(node)):
             for statement in node.body:
                 self.visit(statement)
 
+    def visit_MotionBlock(self, node: MotionBlock):
+        times = 1 if node.times is None else self._repeat_count(node)
+        # Com um mundo, cada passo precisa consultar os obstáculos
+        if not self.simulation_output and self.world is None:
+            effect = motion_effect(node.statements, times, HEADING_INDEX[self.robot_direction], self.visit)
+            if effect is not None:
+                dx, dy, heading = effect
+                self.robot_x += dx
+                self.robot_y += dy
+                self.robot_direction = HEADINGS[heading]
+                return
+        # Passo a passo: os mesmos eventos e, se houver, o mesmo erro no mesmo ponto
+        for _ in range(times):
+            for statement in node.statements:
+                self.visit(statement)
+
+    def visit_ClearCache(self, node: ClearCache):
+        cache = self.expression_cache
+        for index in node.indexes:
+            cache.pop(index, None)
+
+    def _condition_is_true(self, node: IfStatement) -> bool:
+        """Avalia a condição de um SE."""
+        return self._is_true(self.visit(node.condition), node.condition.static_type, node.condition.token)
+
+    def _is_true(self, condition_result, static_type, token) -> bool:
+        """Valor de verdade do resultado da condição de um SE."""
+        if static_type in NUMERIC_TYPES:
+            return condition_result != 0
+        # Em RoboScript, 0 é falso, qualquer outro inteiro é verdadeiro. Ou podemos forçar booleanos.
+        if isinstance(condition_result, bool): # Se sua expressão de comparação já retornar bool
+            return condition_result
+        elif isinstance(condition_result, int): # Se expressões retornam int
+            return condition_result != 0
+        else:
+            self._error(f"Condição do 'SE' deve ser avaliada como booleano ou inteiro (0 para falso): {condition_result}", token)
+
+    def _repeat_count(self, node: RepeatStatement) -> int:
+        """Avalia o número de repetições de um REPETIR."""
+        return self._check_repeat_count(self.visit(node.times), node.times.static_type, node.times.token)
+
+    def _check_repeat_count(self, times, static_type, token) -> int:
+        """Valida o número de repetições de um REPETIR."""
+        if (static_type not in NUMERIC_TYPES and not isinstance(times, int)) or times < 0:
+            self._error(f"Número de repetições inválido: {times}. Deve ser um inteiro não negativo.", token)
+        return times
+
     # --- Métodos de Visita para Expressões (Expressions) ---
     def visit_NumberLiteral(self, node: NumberLiteral):
         return node.value
@@ -142,7 +276,22 @@ class Interpreter:
     def visit_StringLiteral(self, node: StringLiteral):
         return node.value
 
+    def visit_BooleanLiteral(self, node: BooleanLiteral):
+        return node.value
+
     def visit_Identifier(self, node: Identifier):
+        # Identificadores resolvidos: estado do robô ou índice da variável
+        slot = node.slot
+        if slot is not None:
+            if slot < 0:
+                return ROBOT_ACCESSORS[slot](self)
+            slots = self.slots
+            if slots is not None:
+                value = slots[slot]
+                if value is UNSET:
+                    self._error(f"Variável '{node.name}' não definida.", node.token)
+                return value
+
         # Primeiro, verifica se é uma variável de estado do robô
         if node.name == "robot_x":
             return self.robot_x
@@ -168,6 +317,8 @@ class Interpreter:
 
         # Lógica para concatenação de strings com o operador '+'
         if op_type == TokenType.OP_SOMA:
+            if node.static_type == INT: # Soma de inteiros (tipo inferido)
+                return left_val + right_val
             if isinstance(left_val, str) or isinstance(right_val, str):
                 # Se um dos operandos for string, converte o outro para string e concatena
                 return str(left_val) + str(right_val)
@@ -197,6 +348,13 @@ class Interpreter:
         else:
             self._error(f"Operador binário desconhecido: {node.operator.value}", node.operator)
 
+    def visit_CachedExpression(self, node: CachedExpression):
+        try:
+            return self.expression_cache[node.index]
+        except KeyError:
+            value = self.expression_cache[node.index] = self.visit(node.expression)
+            return value
+
     def visit_UnaryExpression(self, node: UnaryExpression):
         right_val = self.visit(node.right)
         op_type = node.operator.type
@@ -1,3 +1,4 @@
+import re
 from enum import Enum, auto
 
 # --- Definição dos Tipos de Tokens ---
@@ -51,6 +52,8 @@ class TokenType(Enum):
 
 # --- Classe Token ---
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')
+
     def __init__(self, type: TokenType, value: str, line: int, column: int):
         self.type = type
         self.value = value
@@ -63,15 +66,56 @@ class Token:
     def __repr__(self):
         return self.__str__()
 
+# --- Expressão regular mestre do Lexer ---
+# Cada alternativa nomeada corresponde a uma classe léxica, ordenadas pela
+# frequência em scripts típicos (comentário antes de '/'). `\s` e `\w` seguem exatamente `str.isspace()`
+# e `str.isalnum() or '_'`, usados pela versão caractere a caractere. NUMBER e
+# NAME capturam a palavra inteira; `_word_tokens` trata os casos raros em que
+# ela mistura dígitos e letras (ex.: '10abc').
+_TOKEN_REGEX = re.compile(r'''
+    (?P<NEWLINE>\n[^\S\n]*)
+  | (?P<WS>[^\S\n]+)
+  | (?P<NAME>[^\W\d]\w*)
+  | (?P<COMMENT>//[^\n]*)
+  | (?P<SYMBOL>==|!=|<=|>=|[-+*/=<>(){};,])
+  | (?P<NUMBER>\d\w*)
+  | (?P<STRING>"[^"]*")
+  | (?P<UNTERMINATED>")
+  | (?P<ERROR>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Operadores e símbolos reconhecidos pelo grupo SYMBOL
+_SYMBOLS = {
+    '+': TokenType.OP_SOMA,
+    '-': TokenType.OP_SUB,
+    '*': TokenType.OP_MULT,
+    '/': TokenType.OP_DIV,
+    '=': TokenType.IGUAL,
+    '==': TokenType.IGUAL,
+    '!=': TokenType.DIFERENTE,
+    '<': TokenType.MENOR,
+    '>': TokenType.MAIOR,
+    '<=': TokenType.MENOR_IGUAL,
+    '>=': TokenType.MAIOR_IGUAL,
+    '(': TokenType.PARENTESE_ESQ,
+    ')': TokenType.PARENTESE_DIR,
+    '{': TokenType.CHAVE_ESQ,
+    '}': TokenType.CHAVE_DIR,
+    ';': TokenType.PONTO_VIRGULA,
+    ',': TokenType.VIRGULA,
+}
+
 # --- Classe Lexer ---
 class Lexer:
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, line: int = 1):
         self.source = source_code
         self.position = 0
         self.current_char = self.source[self.position] if self.source else None
-        self.line = 1
+        self.line = line # Linha inicial (> 1 quando a fonte é um trecho de um arquivo maior)
         self.column = 1
         self.tokens = []
+        self.reader = None # Arquivo de onde a fonte é lida em blocos (ver `from_file`)
+        self.chunk_size = 0
 
         # Mapeamento de palavras-chave
         self.keywords = {
@@ -161,8 +205,147 @@ class Lexer:
         token_type = self.keywords.get(result.upper(), TokenType.IDENTIFICADOR)
         return Token(token_type, result, self.line, start_column)
 
+    @classmethod
+    def from_file(cls, file, chunk_size: int = 64 * 1024):
+        """Cria um Lexer que lê a fonte de um arquivo aberto, em blocos de `chunk_size` caracteres.
+
+        Use com `iter_tokens`: a memória ocupada fica limitada ao tamanho do
+        bloco (mais o maior token), independentemente do tamanho do arquivo.
+        """
+        lexer = cls('')
+        lexer.reader = file
+        lexer.chunk_size = chunk_size
+        return lexer
+
     def tokenize(self):
-        """Gera a lista de tokens a partir do código fonte."""
+        """Gera a lista de tokens a partir do código fonte.
+
+        Percorre a fonte com uma única expressão regular mestre (ver `_scan`),
+        recortando os lexemas por fatias da string. Linhas e colunas seguem as
+        mesmas regras da versão caractere a caractere: só quebras de linha fora
+        de strings avançam a linha.
+        """
+        append = self.tokens.append
+        for token_type, value, _, line, column in self._scan():
+            append(Token(token_type, value, line, column))
+        append(Token(TokenType.EOF, '', self.line, self.column))
+        return self.tokens
+
+    def iter_tokens(self):
+        """Gera os tokens um a um (terminando com EOF), sem montar a lista."""
+        for token_type, value, _, line, column in self._scan():
+            yield Token(token_type, value, line, column)
+        yield Token(TokenType.EOF, '', self.line, self.column)
+
+    def _scan(self):
+        """Gera tuplas (tipo, valor, posição, linha, coluna) para cada token, sem o EOF.
+
+        Ao terminar, `position`, `line` e `column` apontam para o fim da fonte;
+        em caso de erro, para o caractere problemático. Quando a fonte vem de
+        um arquivo (`from_file`), um token que chega ao fim do bloco lido pode
+        estar incompleto: o próximo bloco é lido e o token é analisado de novo.
+        """
+        source = self.source
+        symbols = _SYMBOLS
+        keywords = self.keywords
+        names = {} # Cache de lexema -> tipo (palavra-chave ou identificador)
+        line = self.line
+        line_start = self.position - self.column + 1 # Posição onde a linha atual começa
+        pos = self.position
+        base = 0 # Posição do início do buffer no arquivo (leitura em blocos)
+        reader = self.reader
+
+        while True:
+            for m in _TOKEN_REGEX.finditer(source, pos):
+                kind = m.lastgroup
+                if reader is not None and (m.end() == len(source) or kind == 'UNTERMINATED'):
+                    break # Token possivelmente incompleto: lê o próximo bloco
+                if kind == 'WS' or kind == 'COMMENT':
+                    continue
+                pos = m.start()
+                if kind == 'NEWLINE':
+                    line += 1
+                    line_start = pos + 1
+                elif kind == 'NAME':
+                    text = m.group()
+                    if text[0] > '\x7f' and not text[0].isalpha():
+                        for token in self._word_tokens(text, pos, line, line_start):
+                            yield token[0], token[1], base + token[2], token[3], token[4]
+                        continue
+                    token_type = names.get(text)
+                    if token_type is None:
+                        token_type = names[text] = keywords.get(text.upper(), TokenType.IDENTIFICADOR)
+                    yield token_type, text, base + pos, line, pos - line_start + 1
+                elif kind == 'SYMBOL':
+                    text = m.group()
+                    yield symbols[text], text, base + pos, line, pos - line_start + 1
+                elif kind == 'NUMBER':
+                    text = m.group()
+                    if not text.isdigit():
+                        for token in self._word_tokens(text, pos, line, line_start):
+                            yield token[0], token[1], base + token[2], token[3], token[4]
+                        continue
+                    yield TokenType.NUMERO_INTEIRO, text, base + pos, line, pos - line_start + 1
+                elif kind == 'STRING':
+                    yield TokenType.STRING, source[pos + 1:m.end() - 1], base + pos, line, pos - line_start + 1
+                elif kind == 'UNTERMINATED':
+                    self._sync(len(source), line, line_start)
+                    self._error("String não terminada. Esperava-se '\"'.")
+                else: # ERROR
+                    self._sync(pos, line, line_start)
+                    self._error(f"Caractere inesperado: '{source[pos]}'")
+            else:
+                if reader is None:
+                    break
+                m = None # Buffer vazio
+            # Recomeça do token interrompido, descartando o que já foi consumido
+            pos = m.start() if m is not None else len(source)
+            chunk = reader.read(self.chunk_size)
+            if not chunk:
+                reader = None # Fim do arquivo: o token pendente está completo
+                continue
+            source = self.source = source[pos:] + chunk
+            base += pos
+            line_start -= pos
+            pos = 0
+
+        self._sync(len(source), line, line_start)
+
+    def _word_tokens(self, text, pos, line, line_start):
+        """Divide uma palavra que começa com dígitos (`isdigit()`) em número e identificador.
+
+        Reproduz a versão caractere a caractere: o número consome todos os
+        caracteres com `isdigit()` (inclusive não decimais, como '²') e o resto
+        da palavra só é válido se começar por letra ou '_'.
+        """
+        split = 0
+        while split < len(text) and text[split].isdigit():
+            split += 1
+        tokens = []
+        if split:
+            tokens.append((TokenType.NUMERO_INTEIRO, text[:split], pos, line, pos - line_start + 1))
+        if split < len(text):
+            rest = text[split:]
+            if not (rest[0].isalpha() or rest[0] == '_'):
+                self._sync(pos + split, line, line_start)
+                self._error(f"Caractere inesperado: '{rest[0]}'")
+            token_type = self.keywords.get(rest.upper(), TokenType.IDENTIFICADOR)
+            tokens.append((token_type, rest, pos + split, line, pos + split - line_start + 1))
+        return tokens
+
+    def _sync(self, pos, line, line_start):
+        """Atualiza o estado do cursor (usado nas mensagens de erro e ao final)."""
+        self.position = pos
+        self.line = line
+        self.column = pos - line_start + 1
+        self.current_char = self.source[pos] if pos < len(self.source) else None
+
+    def tokenize_char_by_char(self):
+        """Implementação original, caractere a caractere.
+
+        Mantida como referência para os testes diferenciais e para o benchmark
+        de `benchmarks/bench_lexer.py`; `tokenize` produz exatamente a mesma saída.
+        """
         while self.current_char is not None:
             self._skip_whitespace()
             self._skip_comment() # Tentar pular comentário após pular espaços
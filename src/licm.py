@@ -0,0 +1,312 @@
+"""Reaproveitamento de expressões: código invariante em laços e subexpressões comuns.
+
+Uma expressão composta (operação binária ou unária) vira uma
+`CachedExpression`: na primeira execução seu valor é calculado e guardado em
+um cache; nas seguintes, é lido do cache, até um `ClearCache` esvaziá-lo.
+Como o cálculo continua acontecendo no ponto original, na primeira vez, os
+erros (divisão por zero, variável não definida, tipos incompatíveis) e sua
+ordem não mudam. As expressões não têm efeitos colaterais, então o valor só
+muda quando alguma variável lida é escrita (`VAR`/`SET`) ou o estado do robô
+lido muda (`MOVER`/`GIRAR` e `PEGAR`/`SOLTAR`).
+
+* Laços: uma expressão no corpo de um `REPETIR` que não lê nada escrito no
+  corpo é invariante; ela é guardada uma vez por execução do laço (o
+  `ClearCache` fica logo antes do `REPETIR`). Em laços aninhados, a expressão
+  é associada ao laço mais externo em que é invariante.
+* Blocos: uma expressão que aparece de novo no mesmo bloco, sem escrita do
+  que ela lê entre as ocorrências, é calculada uma vez (o `ClearCache` fica
+  no início do bloco, então vale para cada volta de um laço).
+
+`MotionBlock`s não são alterados (só seu número de repetições, avaliado fora
+dele). O percurso usa pilhas explícitas, sem recursão, e não modifica a AST
+recebida: os nós alterados são recriados.
+"""
+from src.ast_nodes import (
+    NumberLiteral, StringLiteral, BooleanLiteral, BinaryExpression, UnaryExpression, Identifier,
+    VarDeclaration, AssignmentStatement, MoveStatement, RotateStatement, PickUpStatement, DropStatement, PrintStatement,
+    IfStatement, RepeatStatement, MotionBlock, CachedExpression, ClearCache, children
+)
+
+_MOVE_WRITES = frozenset(("robot_x", "robot_y"))
+_ROTATE_WRITES = frozenset(("robot_direction",))
+_MOTION_WRITES = _MOVE_WRITES | _ROTATE_WRITES
+_OBJECT_WRITES = frozenset(("has_object",))
+_COMPOUND = (BinaryExpression, UnaryExpression)
+_LITERALS = (NumberLiteral, StringLiteral, BooleanLiteral)
+
+
+class LoopInvariantMotion:
+    def __init__(self):
+        self._next_index = 0 # Índices de cache únicos entre chamadas (modo --stream)
+
+    def transform(self, statements: list) -> list:
+        """Retorna `statements` com as expressões reaproveitáveis em `CachedExpression`s."""
+        self._reads = {}  # id(expressão) -> variáveis lidas
+        self._keys = {}   # id(expressão) -> número da estrutura (iguais para expressões iguais)
+        self._writes = {} # id(declaração) -> variáveis escritas
+        self._analyze(statements)
+
+        self._loops = []  # Laços abertos, do mais externo: {estrutura: índice do cache}
+        self._loop_writes = [] # Variáveis escritas em cada laço aberto, para a busca binária
+        self._blocks = [] # Blocos abertos: (disponíveis, contagem das estruturas, índices usados)
+        self._results = []
+        self._work = []
+        self._push_block(statements)
+        work = self._work
+        while work:
+            item = work.pop()
+            item[0](*item[1:])
+        return self._results.pop()
+
+    # --- Análise: variáveis lidas, escritas e estrutura das expressões ---
+    def _analyze(self, statements):
+        reads, keys, writes = self._reads, self._keys, self._writes
+        structures = {}
+        stack = [(statement, False) for statement in reversed(statements)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                if id(node) in reads or id(node) in writes: # Subárvore compartilhada
+                    continue
+                stack.append((node, True))
+                if type(node) is not MotionBlock:
+                    stack.extend((child, False) for child in reversed(children(node)))
+                elif node.times is not None:
+                    stack.append((node.times, False))
+                continue
+            node_type = type(node)
+            if node_type is Identifier:
+                reads[id(node)] = frozenset((node.name,))
+                keys[id(node)] = structures.setdefault((Identifier, node.name), len(structures))
+            elif node_type is BinaryExpression:
+                reads[id(node)] = reads[id(node.left)] | reads[id(node.right)]
+                structure = (BinaryExpression, node.operator.type, keys[id(node.left)], keys[id(node.right)])
+                keys[id(node)] = structures.setdefault(structure, len(structures))
+            elif node_type is UnaryExpression:
+                reads[id(node)] = reads[id(node.right)]
+                structure = (UnaryExpression, node.operator.type, keys[id(node.right)])
+                keys[id(node)] = structures.setdefault(structure, len(structures))
+            elif node_type in _LITERALS:
+                reads[id(node)] = frozenset()
+                keys[id(node)] = structures.setdefault((node_type, node.value), len(structures))
+            elif node_type is VarDeclaration or node_type is AssignmentStatement:
+                writes[id(node)] = frozenset((node.name.value,))
+            elif node_type is MoveStatement:
+                writes[id(node)] = _MOVE_WRITES
+            elif node_type is RotateStatement:
+                writes[id(node)] = _ROTATE_WRITES
+            elif node_type is MotionBlock:
+                writes[id(node)] = _MOTION_WRITES
+            elif node_type is PickUpStatement or node_type is DropStatement:
+                writes[id(node)] = _OBJECT_WRITES
+            elif node_type is IfStatement:
+                writes[id(node)] = self._block_writes((*node.then_block, *(node.else_block or ())))
+            elif node_type is RepeatStatement:
+                writes[id(node)] = self._block_writes(node.body)
+            elif node_type is CachedExpression:
+                reads[id(node)] = reads[id(node.expression)]
+                keys[id(node)] = keys[id(node.expression)]
+            else:
+                writes[id(node)] = frozenset()
+
+    def _block_writes(self, statements) -> frozenset:
+        written = set()
+        for statement in statements:
+            written |= self._writes[id(statement)]
+        return frozenset(written)
+
+    # --- Transformação ---
+    def _push_block(self, statements):
+        """Agenda a transformação de um bloco; o resultado é a lista de declarações."""
+        work = self._work
+        work.append((self._end_block, len(statements)))
+        for statement in reversed(statements):
+            work.append((self._invalidate, self._writes[id(statement)]))
+            work.append((self._statement, statement))
+        work.append((self._begin_block, statements))
+
+    def _begin_block(self, statements):
+        counts = {}
+        keys = self._keys
+        stack = []
+        for statement in statements:
+            stack.extend(_direct_expressions(statement))
+        while stack:
+            node = stack.pop()
+            if type(node) in _COMPOUND:
+                key = keys[id(node)]
+                counts[key] = counts.get(key, 0) + 1
+                stack.extend(children(node))
+        self._blocks.append(({}, counts, []))
+
+    def _end_block(self, count):
+        results = self._results
+        statements = []
+        if count:
+            for item in results[-count:]:
+                statements.extend(item)
+            del results[-count:]
+        _, _, indexes = self._blocks.pop()
+        if indexes:
+            statements.insert(0, ClearCache(indexes))
+        results.append(statements)
+
+    def _invalidate(self, written):
+        if written:
+            available = self._blocks[-1][0]
+            reads = self._reads
+            for key, (index, node) in list(available.items()):
+                if reads[id(node)] & written:
+                    del available[key]
+
+    def _statement(self, node):
+        work = self._work
+        node_type = type(node)
+        if node_type is VarDeclaration or node_type is AssignmentStatement:
+            work.append((self._rebuild, node, lambda value: node_type(node.name, value), 1))
+            work.append((self._expression, node.value, None))
+        elif node_type is MoveStatement:
+            work.append((self._rebuild, node, lambda steps: MoveStatement(node.direction, steps), 1))
+            work.append((self._expression, node.steps, None))
+        elif node_type is PrintStatement:
+            work.append((self._rebuild, node, PrintStatement, 1))
+            work.append((self._expression, node.expression, None))
+        elif node_type is IfStatement:
+            work.append((self._rebuild_if, node))
+            if node.else_block is not None:
+                self._push_block(node.else_block)
+            self._push_block(node.then_block)
+            work.append((self._expression, node.condition, None))
+        elif node_type is RepeatStatement:
+            work.append((self._exit_loop, node))
+            self._push_block(node.body)
+            work.append((self._enter_loop, node))
+            work.append((self._expression, node.times, None))
+        elif node_type is MotionBlock and node.times is not None:
+            work.append((self._rebuild, node, lambda times: MotionBlock(node.statements, times, node.depth), 1))
+            work.append((self._expression, node.times, None))
+        else:
+            self._results.append([node])
+
+    def _rebuild(self, node, build, count):
+        """Recria `node` com os `count` últimos resultados, se algum mudou."""
+        results = self._results
+        parts = results[-count:]
+        del results[-count:]
+        if all(new is old for new, old in zip(parts, children(node))):
+            results.append([node])
+        else:
+            results.append([build(*parts)])
+
+    def _rebuild_if(self, node):
+        results = self._results
+        else_block = None if node.else_block is None else results.pop()
+        then_block = results.pop()
+        condition = results.pop()
+        if condition is node.condition and then_block == node.then_block and else_block == node.else_block:
+            results.append([node])
+        else:
+            results.append([IfStatement(condition, then_block, else_block)])
+
+    def _enter_loop(self, node):
+        self._loops.append({})
+        self._loop_writes.append(self._writes[id(node)])
+
+    def _exit_loop(self, node):
+        results = self._results
+        body = results.pop()
+        times = results.pop()
+        indexes = self._loops.pop()
+        self._loop_writes.pop()
+        loop = node if times is node.times and body == node.body else RepeatStatement(times, body)
+        if indexes:
+            results.append([ClearCache(sorted(indexes.values())), loop])
+        else:
+            results.append([loop])
+
+    # --- Expressões ---
+    def _expression(self, node, covered):
+        """Transforma uma expressão; `covered` é o laço do `CachedExpression` mais próximo acima (ou None)."""
+        if type(node) not in _COMPOUND:
+            self._results.append(node)
+            return
+        key = self._keys[id(node)]
+        loop = self._invariant_loop(self._reads[id(node)])
+        if loop is not None and (covered is None or loop <= covered):
+            indexes = self._loops[loop]
+            index = indexes.get(key)
+            if index is not None: # Mesmo valor já guardado para este laço
+                self._results.append(CachedExpression(node, index))
+                return
+            index = indexes[key] = self._new_index()
+            self._push_children(node, loop, index)
+            return
+        available, counts, block_indexes = self._blocks[-1]
+        if covered is None and counts.get(key, 0) > 1 and self._reads[id(node)]:
+            shared = available.get(key)
+            if shared is not None: # Mesmo valor já calculado neste bloco
+                self._results.append(CachedExpression(node, shared[0]))
+                return
+            index = self._new_index()
+            available[key] = (index, node)
+            block_indexes.append(index)
+            self._push_children(node, None, index)
+            return
+        self._push_children(node, covered, None)
+
+    def _push_children(self, node, covered, index):
+        work = self._work
+        operands = children(node)
+        work.append((self._rebuild_expression, node, index))
+        for child in reversed(operands):
+            work.append((self._expression, child, covered))
+
+    def _rebuild_expression(self, node, index):
+        results = self._results
+        if type(node) is BinaryExpression:
+            right = results.pop()
+            left = results.pop()
+            if left is not node.left or right is not node.right:
+                node = BinaryExpression(left, node.operator, right)
+        else:
+            right = results.pop()
+            if right is not node.right:
+                node = UnaryExpression(node.operator, right)
+        results.append(node if index is None else CachedExpression(node, index))
+
+    def _invariant_loop(self, reads):
+        """Posição do laço aberto mais externo em que nada de `reads` é escrito, ou None."""
+        writes = self._loop_writes
+        if not reads or not writes or writes[-1] & reads:
+            return None
+        # Os laços internos escrevem um subconjunto do que os externos escrevem:
+        # busca binária pelo primeiro laço sem escrita do que é lido
+        low, high = 0, len(writes) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if writes[middle] & reads:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _new_index(self) -> int:
+        index = self._next_index
+        self._next_index += 1
+        return index
+
+
+def _direct_expressions(statement) -> tuple:
+    """Expressões avaliadas pela própria declaração (não as dos blocos aninhados)."""
+    statement_type = type(statement)
+    if statement_type is VarDeclaration or statement_type is AssignmentStatement:
+        return (statement.value,)
+    if statement_type is MoveStatement:
+        return (statement.steps,)
+    if statement_type is PrintStatement:
+        return (statement.expression,)
+    if statement_type is IfStatement:
+        return (statement.condition,)
+    if statement_type in (RepeatStatement, MotionBlock) and statement.times is not None:
+        return (statement.times,)
+    return ()
@@ -0,0 +1,194 @@
+"""Execução em forma fechada de sequências e laços que só movem o robô.
+
+Um trecho formado apenas por `MOVER` (com passos invariantes) e `GIRAR` tem
+efeito `(dx, dy, direção final)` que depende só da direção inicial. O
+`Optimizer` agrupa esses trechos em nós `MotionBlock`:
+
+* sequências de duas ou mais declarações de movimento seguidas
+  (`MOVER FRENTE 2; MOVER FRENTE 3;` equivale a mover 5 de uma vez);
+* `REPETIR` cujo corpo só tem declarações de movimento (inclusive outros
+  laços de movimento, até `MAX_DEPTH` níveis).
+
+Com a saída da simulação desligada (`Interpreter.simulation_output = False`),
+o `Interpreter` aplica o efeito composto sem executar o laço: como só `GIRAR`
+muda a direção, e sempre do mesmo número de quartos de volta por iteração, a
+direção no início de cada iteração é periódica (período 1, 2 ou 4), e
+`REPETIR n VEZES` custa O(1) no valor de `n`. Com a saída ligada, as
+declarações originais são executadas passo a passo e produzem os mesmos
+eventos de antes.
+
+Passos e repetições são avaliados uma única vez por bloco; se algum for
+inválido (ou gerar erro), o bloco é executado passo a passo para que o erro
+aconteça no mesmo ponto, com a mesma mensagem e o mesmo estado do robô.
+"""
+from src.ast_nodes import Identifier, MoveStatement, RotateStatement, MotionBlock, children
+from src.lexer import TokenType
+
+# Aninhamento máximo de laços em um MotionBlock (a composição é recursiva)
+MAX_DEPTH = 32
+
+HEADINGS = ("NORTE", "LESTE", "SUL", "OESTE")
+HEADING_INDEX = {heading: index for index, heading in enumerate(HEADINGS)}
+
+# (dx, dy) de um passo para cada direção do robô. TRAS em OESTE também
+# diminui x, como em `Interpreter.visit_MoveStatement`.
+_STEP = {
+    TokenType.FRENTE: ((0, 1), (1, 0), (0, -1), (-1, 0)),
+    TokenType.TRAS: ((0, -1), (-1, 0), (0, 1), (-1, 0)),
+}
+_TURN = {TokenType.DIREITA: 1, TokenType.ESQUERDA: 3}
+
+# As mesmas tabelas, indexadas pelo nome da direção (usadas pelos motores compilados)
+MOVE_STEPS = {direction: dict(zip(HEADINGS, steps)) for direction, steps in _STEP.items()}
+TURNS = {direction: {heading: HEADINGS[(index + turn) % 4] for index, heading in enumerate(HEADINGS)}
+         for direction, turn in _TURN.items()}
+
+# Variáveis de estado alteradas pelos movimentos
+_MOTION_STATE = frozenset(("robot_x", "robot_y", "robot_direction"))
+
+
+# --- Análise ---
+def is_invariant(expression) -> bool:
+    """True se o valor de `expression` não muda quando o robô se move ou gira."""
+    stack = [expression]
+    while stack:
+        node = stack.pop()
+        if type(node) is Identifier and node.name in _MOTION_STATE:
+            return False
+        stack.extend(children(node))
+    return True
+
+
+def _is_motion(statement) -> bool:
+    statement_type = type(statement)
+    if statement_type is RotateStatement:
+        return True
+    if statement_type is MoveStatement:
+        return is_invariant(statement.steps)
+    if statement_type is MotionBlock:
+        return statement.times is None or is_invariant(statement.times)
+    return False
+
+
+def fuse_motion(block: list) -> list:
+    """Agrupa as sequências de duas ou mais declarações de movimento de `block` em `MotionBlock`s."""
+    fused = []
+    run = []
+    for statement in (*block, None):
+        if type(statement) is MotionBlock and statement.times is None:
+            run.extend(statement.statements) # Sequência já agrupada (bloco de um SE eliminado)
+            continue
+        if statement is not None and _is_motion(statement):
+            run.append(statement)
+            continue
+        if len(run) > 1:
+            fused.append(MotionBlock(run, depth=max(_depth(item) for item in run)))
+        else:
+            fused.extend(run)
+        run = []
+        if statement is not None:
+            fused.append(statement)
+    return fused
+
+
+def motion_loop(times, body: list):
+    """`MotionBlock` equivalente a `REPETIR times VEZES { body }`, ou None se o corpo não for só de movimento.
+
+    `times` é avaliado uma vez, antes do laço, e não precisa ser invariante.
+    """
+    statements = []
+    for statement in body:
+        if type(statement) is MotionBlock and statement.times is None:
+            statements.extend(statement.statements)
+        elif _is_motion(statement):
+            statements.append(statement)
+        else:
+            return None
+    if not statements:
+        return None
+    depth = 1 + max(_depth(item) for item in statements)
+    if depth > MAX_DEPTH:
+        return None
+    return MotionBlock(statements, times, depth)
+
+
+def _depth(statement) -> int:
+    return statement.depth if type(statement) is MotionBlock else 0
+
+
+# --- Forma fechada ---
+class _Fallback(Exception):
+    """Algum passo ou repetição é inválido: o bloco deve rodar passo a passo."""
+
+
+def motion_effect(statements: list, times: int, heading: int, evaluate):
+    """Efeito `(dx, dy, direção final)` de executar `statements` `times` vezes a partir de `heading`.
+
+    `heading` é um índice em `HEADINGS`; `evaluate` calcula o valor de uma
+    expressão (por exemplo, `Interpreter.visit`). Retorna None se algum
+    passo ou repetição for inválido.
+    """
+    try:
+        return _Composer(evaluate).loop(statements, heading, times)
+    except _Fallback:
+        return None
+
+
+class _Composer:
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+        self.values = {} # id(expressão) -> valor (as expressões são invariantes)
+        self.effects = {} # (id(MotionBlock), direção) -> efeito
+
+    def count(self, expression) -> int:
+        """Valor de um número de passos ou de repetições; precisa ser um inteiro não negativo."""
+        key = id(expression)
+        if key in self.values:
+            return self.values[key]
+        try:
+            value = self.evaluate(expression)
+        except Exception:
+            raise _Fallback
+        if not isinstance(value, int) or value < 0:
+            raise _Fallback
+        self.values[key] = value
+        return value
+
+    def sequence(self, statements, heading):
+        dx = dy = 0
+        for statement in statements:
+            statement_type = type(statement)
+            if statement_type is MoveStatement:
+                step_x, step_y = _STEP[statement.direction.type][heading]
+                steps = self.count(statement.steps)
+                dx += step_x * steps
+                dy += step_y * steps
+            elif statement_type is RotateStatement:
+                heading = (heading + _TURN[statement.direction.type]) % 4
+            else: # MotionBlock aninhado
+                key = (id(statement), heading)
+                effect = self.effects.get(key)
+                if effect is None:
+                    if statement.times is None:
+                        effect = self.sequence(statement.statements, heading)
+                    else:
+                        effect = self.loop(statement.statements, heading, self.count(statement.times))
+                    self.effects[key] = effect
+                dx += effect[0]
+                dy += effect[1]
+                heading = effect[2]
+        return dx, dy, heading
+
+    def loop(self, statements, heading, times):
+        if times == 0:
+            return 0, 0, heading
+        first = self.sequence(statements, heading)
+        turn = (first[2] - heading) % 4 # Igual para qualquer direção inicial
+        period = 1 if turn == 0 else 2 if turn == 2 else 4
+        effects = [first]
+        for k in range(1, min(period, times)):
+            effects.append(self.sequence(statements, (heading + k * turn) % 4))
+        cycles, rest = divmod(times, period)
+        dx = cycles * sum(effect[0] for effect in effects) + sum(effect[0] for effect in effects[:rest])
+        dy = cycles * sum(effect[1] for effect in effects) + sum(effect[1] for effect in effects[:rest])
+        return dx, dy, (heading + times * turn) % 4
@@ -0,0 +1,172 @@
+"""Otimizações sobre a AST, aplicadas entre a análise sintática e a execução.
+
+* Dobra de constantes: operações aritméticas, comparações e concatenações
+  cujos operandos são literais viram um literal (`(10 * 4) / 2` -> `20`,
+  `"a" + "b"` -> `"ab"`, `1 == 1` -> `True`). O cálculo é feito pelo próprio
+  `Interpreter`, então o resultado é exatamente o da execução; operações que
+  gerariam erro (divisão por zero, tipos incompatíveis) não são dobradas e o
+  erro continua aparecendo na execução, com a mesma mensagem e posição.
+* Ramos mortos: um `SE` com condição constante é substituído pelas
+  declarações do bloco que seria executado (ou removido).
+* Laços vazios: `REPETIR` com número de repetições constante igual a 0, ou
+  com corpo vazio, é removido.
+* Movimentos: sequências de `MOVER`/`GIRAR` e laços que só movem o robô
+  viram `MotionBlock`s, executáveis em forma fechada (ver `src/motion.py`).
+* Expressões invariantes em laços e subexpressões repetidas em um bloco são
+  calculadas uma vez e reaproveitadas (ver `src/licm.py`; desligue com
+  `licm=False`).
+
+A AST original não é modificada: os nós alterados são recriados (o que também
+preserva as subárvores compartilhadas pelo hash-consing do `Parser`). O
+percurso usa uma pilha explícita, sem recursão.
+"""
+from src.ast_nodes import (
+    Program, Statement, BinaryExpression, UnaryExpression, NumberLiteral,
+    StringLiteral, BooleanLiteral, VarDeclaration, AssignmentStatement,
+    MoveStatement, PrintStatement, IfStatement, RepeatStatement, MotionBlock, children
+)
+from src.interpreter import Interpreter
+from src.lexer import Token, TokenType
+from src.licm import LoopInvariantMotion
+from src.motion import fuse_motion, motion_loop
+
+_LITERALS = (NumberLiteral, StringLiteral, BooleanLiteral)
+
+
+class Optimizer:
+    def __init__(self, licm: bool = True):
+        self._evaluator = Interpreter() # Avalia as operações sobre literais
+        self._licm = LoopInvariantMotion() if licm else None
+
+    def optimize(self, program: Program) -> Program:
+        """Retorna um novo `Program` otimizado."""
+        return Program(self.optimize_statement(program))
+
+    def optimize_statement(self, statement) -> list[Statement]:
+        """Otimiza uma declaração; retorna as declarações que a substituem (zero ou mais).
+
+        Aceita também um `Program`, retornando suas declarações otimizadas.
+        """
+        statements = self._optimize(statement)
+        return self._licm.transform(statements) if self._licm else statements
+
+    def _optimize(self, statement) -> list[Statement]:
+        results = [] # Expressões otimizadas ou listas de declarações, filhos antes dos pais
+        stack = [(statement, False)]
+        while stack:
+            node, children_done = stack.pop()
+            node_type = type(node)
+            if node_type is MotionBlock: # Já otimizado
+                results.append([node])
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children(node)))
+                continue
+
+            if node_type is BinaryExpression:
+                right = results.pop()
+                left = results.pop()
+                results.append(self._binary(node, left, right))
+            elif node_type is UnaryExpression:
+                results.append(self._unary(node, results.pop()))
+            elif node_type is VarDeclaration or node_type is AssignmentStatement:
+                value = results.pop()
+                results.append([node if value is node.value else node_type(node.name, value)])
+            elif node_type is MoveStatement:
+                steps = results.pop()
+                results.append([node if steps is node.steps else MoveStatement(node.direction, steps)])
+            elif node_type is PrintStatement:
+                expression = results.pop()
+                results.append([node if expression is node.expression else PrintStatement(expression)])
+            elif node_type is IfStatement:
+                else_block = None if node.else_block is None else fuse_motion(_pop_block(results, len(node.else_block)))
+                then_block = fuse_motion(_pop_block(results, len(node.then_block)))
+                results.append(self._if(node, results.pop(), then_block, else_block))
+            elif node_type is RepeatStatement:
+                body = fuse_motion(_pop_block(results, len(node.body)))
+                results.append(self._repeat(node, results.pop(), body))
+            elif node_type is Program:
+                results.append(fuse_motion(_pop_block(results, len(node.statements))))
+            elif isinstance(node, Statement):
+                results.append([node])
+            else: # Literais e identificadores
+                results.append(node)
+        return results.pop()
+
+    # --- Expressões ---
+    def _binary(self, node, left, right):
+        if type(left) in _LITERALS and type(right) in _LITERALS:
+            if not (node.operator.type == TokenType.OP_MULT
+                    and (type(left) is StringLiteral or type(right) is StringLiteral)):
+                folded = self._fold(BinaryExpression(left, node.operator, right), node.token)
+                if folded is not None:
+                    return folded
+        if left is node.left and right is node.right:
+            return node
+        return BinaryExpression(left, node.operator, right)
+
+    def _unary(self, node, right):
+        if type(right) in _LITERALS:
+            folded = self._fold(UnaryExpression(node.operator, right), node.token)
+            if folded is not None:
+                return folded
+        return node if right is node.right else UnaryExpression(node.operator, right)
+
+    def _fold(self, expression, token):
+        """Literal com o valor de `expression`, ou None se a avaliação gerar erro.
+
+        O literal fica com a posição do operador, que é a que os erros de
+        MOVER, SE e REPETIR sobre a expressão reportam.
+        """
+        try:
+            value = self._evaluator.visit(expression)
+        except Exception:
+            return None # O erro acontece na execução, com mensagem e posição originais
+        if isinstance(value, bool):
+            return BooleanLiteral(token, value)
+        if isinstance(value, int):
+            try:
+                text = str(value)
+            except ValueError: # Inteiro grande demais para virar texto
+                return None
+            return NumberLiteral(Token(TokenType.NUMERO_INTEIRO, text, token.line, token.column))
+        if isinstance(value, str):
+            return StringLiteral(Token(TokenType.STRING, value, token.line, token.column))
+        return None
+
+    # --- Declarações ---
+    def _if(self, node, condition, then_block, else_block) -> list[Statement]:
+        if type(condition) in _LITERALS and isinstance(condition.value, int): # bool é subclasse de int
+            if condition.value:
+                return then_block
+            return else_block or []
+        if condition is node.condition and then_block == node.then_block and else_block == node.else_block:
+            return [node]
+        return [IfStatement(condition, then_block, else_block)]
+
+    def _repeat(self, node, times, body) -> list[Statement]:
+        if type(times) in _LITERALS and isinstance(times.value, int) and times.value >= 0:
+            if times.value == 0 or not body:
+                return []
+        loop = motion_loop(times, body)
+        if loop is not None:
+            return [loop]
+        if times is node.times and body == node.body:
+            return [node]
+        return [RepeatStatement(times, body)]
+
+
+def _pop_block(results, count) -> list[Statement]:
+    """Junta as listas de declarações dos `count` últimos itens de `results`."""
+    block = []
+    if count:
+        for statements in results[-count:]:
+            block.extend(statements)
+        del results[-count:]
+    return block
+
+
+def optimize(program: Program, licm: bool = True) -> Program:
+    """Atalho para `Optimizer(licm).optimize(program)`."""
+    return Optimizer(licm).optimize(program)
@@ -0,0 +1,100 @@
+"""Análise léxica paralela para fontes RoboScript muito grandes.
+
+A fonte é dividida em trechos que terminam logo após uma quebra de linha e cada
+trecho é analisado por um `Lexer` em um processo separado. Os cortes são
+especulativos: um trecho que termina dentro de uma string gera o erro de
+"String não terminada", e um trecho cuja linha inicial não confere com a linha
+final do anterior (strings com quebras de linha não avançam a contagem) é
+reanalisado. Nos dois casos o restante da fonte volta a ser analisado em série,
+então o resultado é sempre idêntico ao do `Lexer` serial.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from src.lexer import Lexer, Token, TokenType
+
+# Abaixo deste tamanho (em caracteres) o custo de criar processos não compensa
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+# Tamanho mínimo de cada trecho enviado a um processo
+MIN_CHUNK_SIZE = 256 * 1024
+
+_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+def split_source(source: str, n_chunks: int) -> list[tuple[int, int, int]]:
+    """Divide a fonte em até `n_chunks` trechos (início, fim, linha inicial).
+
+    Cada corte é feito logo após um '\\n'. A linha inicial supõe que nenhuma
+    string atravessa o corte; `tokenize_parallel` verifica essa suposição.
+    """
+    chunk_size = max(len(source) // max(n_chunks, 1), 1)
+    chunks = []
+    start = 0
+    line = 1
+    while start < len(source):
+        end = source.find('\n', start + chunk_size)
+        end = len(source) if end == -1 else end + 1
+        chunks.append((start, end, line))
+        line += source.count('\n', start, end)
+        start = end
+    return chunks
+
+
+def _lex_chunk(job):
+    """Analisa um trecho em um processo trabalhador.
+
+    Retorna colunas compactas (tipos, valores, linhas, colunas) em vez de
+    objetos `Token`, que são caros de serializar entre processos.
+    """
+    text, line = job
+    lexer = Lexer(text, line)
+    try:
+        tokens = lexer.tokenize()
+    except Exception as e:
+        unterminated = lexer.current_char is None
+        return None, str(e), unterminated
+    eof = tokens.pop()
+    shared = {}
+    values = [shared.setdefault(t.value, t.value) for t in tokens]
+    types = array('B', [t.type.value for t in tokens])
+    lines = array('l', [t.line for t in tokens])
+    columns = array('l', [t.column for t in tokens])
+    return (types, values, lines, columns, eof.line, eof.column), None, False
+
+
+def tokenize_parallel(source: str, workers: int = None, threshold: int = PARALLEL_THRESHOLD,
+                      min_chunk_size: int = MIN_CHUNK_SIZE) -> list[Token]:
+    """Gera a mesma lista de tokens que `Lexer(source).tokenize()` usando vários processos.
+
+    Fontes menores que `threshold` caracteres (ou `workers == 1`) e fontes
+    vazias são analisadas diretamente pelo `Lexer` serial.
+    """
+    workers = workers or os.cpu_count() or 1
+    if len(source) < threshold or workers == 1 or not source:
+        return Lexer(source).tokenize()
+
+    n_chunks = min(workers * 4, max(len(source) // min_chunk_size, 1))
+    chunks = split_source(source, n_chunks)
+    jobs = [(source[start:end], line) for start, end, line in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_lex_chunk, jobs, chunksize=max(len(jobs) // (workers * 2), 1))
+
+        tokens = []
+        line = 1
+        for (start, end, expected_line), (columns, error, unterminated) in zip(chunks, results):
+            is_last = end == len(source)
+            if line != expected_line or (unterminated and not is_last):
+                # Corte especulativo inválido: uma string atravessa a quebra de
+                # linha. O restante é analisado em série a partir daqui, onde o
+                # estado do lexer é conhecido (início de linha, fora de string).
+                tokens.extend(Lexer(source[start:], line).tokenize())
+                return tokens
+            if error is not None:
+                raise Exception(error)
+            types, values, lines, cols, line, eof_column = columns
+            tokens.extend(map(Token, map(_TYPES.__getitem__, types), values, lines, cols))
+
+    tokens.append(Token(TokenType.EOF, '', line, eof_column))
+    return tokens
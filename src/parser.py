@@ -1,16 +1,27 @@
+from array import array
+
 from src.lexer import TokenType, Token
 from src.ast_nodes import (
     Program, Statement, Expression, BinaryExpression, UnaryExpression,
     NumberLiteral, StringLiteral, Identifier, VarDeclaration, AssignmentStatement,
     MoveStatement, RotateStatement, PickUpStatement, DropStatement,
-    PrintStatement, IfStatement, RepeatStatement, Block
+    PrintStatement, IfStatement, RepeatStatement, Block, children
 )
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: list[Token], hash_cons: bool = False):
         self.tokens = tokens
         self.current_token_index = 0
         self.current_token = self.tokens[self.current_token_index]
+        self._init_hash_cons(hash_cons)
+
+    def _init_hash_cons(self, hash_cons):
+        self.hash_cons = hash_cons
+        self._canonical = {} # Chave estrutural -> nó compartilhado
+        self._shared = set() # Nós que estão em `_canonical`
+        # Tabela lateral: nó que aparece mais de uma vez -> array('i') com
+        # (linha, coluna) de cada ocorrência, a primeira inclusive
+        self.positions = {}
 
     def _advance(self):
         """Avança para o próximo token."""
@@ -35,13 +46,47 @@ class Parser:
 
     def parse(self) -> Program:
         """Ponto de entrada do parser: retorna o nó raiz da AST (Program)."""
-        statements = []
+        return Program(list(self.iter_statements()))
+
+    def iter_statements(self):
+        """Gera as declarações de nível superior, uma de cada vez, à medida que são analisadas.
+
+        Após cada declaração gerada, `current_token_index` aponta para o primeiro
+        token da próxima.
+        """
         while self.current_token.type != TokenType.EOF:
-            statements.append(self._statement())
-        return Program(statements)
+            statement = self._statement()
+            yield self._intern_subtrees(statement) if self.hash_cons else statement
 
     def _statement(self) -> Statement:
-        """Analisa uma declaração."""
+        """Analisa uma declaração, inclusive os blocos aninhados de SE e REPETIR.
+
+        Os blocos abertos ficam em uma pilha explícita de quadros (em vez de
+        recursão), de modo que o aninhamento não esbarra no limite de recursão
+        do Python. Cada quadro é `[cabeçalho, bloco ENTAO, declarações]`.
+        """
+        frames = []
+        while True:
+            token_type = self.current_token.type
+            if token_type == TokenType.SE:
+                frames.append([self._if_header(), None, []])
+                continue
+            elif token_type == TokenType.REPETIR:
+                frames.append([self._repeat_header(), None, []])
+                continue
+            elif frames and token_type == TokenType.CHAVE_DIR:
+                self._eat(TokenType.CHAVE_DIR)
+                statement = self._close_block(frames)
+                if statement is None:
+                    continue # Abriu o bloco SENAO
+            else:
+                statement = self._simple_statement()
+            if not frames:
+                return statement
+            frames[-1][2].append(statement)
+
+    def _simple_statement(self) -> Statement:
+        """Analisa uma declaração sem bloco."""
         if self.current_token.type == TokenType.VAR:
             return self._var_declaration()
         elif self.current_token.type == TokenType.SET:
@@ -56,10 +101,6 @@ class Parser:
             return self._drop_statement()
         elif self.current_token.type == TokenType.IMPRIMIR:
             return self._print_statement()
-        elif self.current_token.type == TokenType.SE:
-            return self._if_statement()
-        elif self.current_token.type == TokenType.REPETIR:
-            return self._repeat_statement()
         else:
             self._error(f"Declaração inesperada: '{self.current_token.type.name}' na linha {self.current_token.line}, coluna {self.current_token.column}.")
 
@@ -121,99 +162,221 @@ class Parser:
         self._eat(TokenType.PONTO_VIRGULA)
         return PrintStatement(expr)
 
-    def _if_statement(self) -> IfStatement:
-        """SE (<condicao>) ENTAO { <bloco> } [SENAO { <bloco> }];"""
+    def _if_header(self):
+        """SE (<condicao>) ENTAO {   -- o bloco é fechado por `_close_block`."""
         self._eat(TokenType.SE)
         self._eat(TokenType.PARENTESE_ESQ)
         condition = self._expression() # A condição é uma expressão que será avaliada como booleana
         self._eat(TokenType.PARENTESE_DIR)
         self._eat(TokenType.ENTAO)
-        then_block = self._block()
-
-        else_block = None
-        if self.current_token.type == TokenType.SENAO:
-            self._eat(TokenType.SENAO)
-            else_block = self._block()
-
-        return IfStatement(condition, then_block, else_block)
+        self._eat(TokenType.CHAVE_ESQ)
+        return (TokenType.SE, condition)
 
-    def _repeat_statement(self) -> RepeatStatement:
-        """REPETIR <expr> VEZES { <bloco> };"""
+    def _repeat_header(self):
+        """REPETIR <expr> VEZES {   -- o bloco é fechado por `_close_block`."""
         self._eat(TokenType.REPETIR)
         times_expr = self._expression()
         self._eat(TokenType.VEZES)
-        body_block = self._block()
-        return RepeatStatement(times_expr, body_block)
-
-    def _block(self) -> list[Statement]:
-        """{ <statement>* }"""
         self._eat(TokenType.CHAVE_ESQ)
-        statements = []
-        while self.current_token.type != TokenType.CHAVE_DIR:
-            statements.append(self._statement())
-        self._eat(TokenType.CHAVE_DIR)
-        return statements
+        return (TokenType.REPETIR, times_expr)
 
+    def _close_block(self, frames):
+        """Fecha o bloco do quadro do topo, já consumido o '}'.
+
+        Retorna a declaração SE/REPETIR completa, ou None se o bloco fechado
+        era o ENTAO de um SE seguido de SENAO { (o quadro continua aberto).
+        """
+        frame = frames[-1]
+        (kind, expr), then_block, statements = frame
+        if kind == TokenType.REPETIR:
+            frames.pop()
+            return RepeatStatement(expr, statements)
+        if then_block is None and self.current_token.type == TokenType.SENAO:
+            self._eat(TokenType.SENAO)
+            self._eat(TokenType.CHAVE_ESQ)
+            frame[1], frame[2] = statements, []
+            return None
+        frames.pop()
+        if then_block is None:
+            return IfStatement(expr, statements, None)
+        return IfStatement(expr, then_block, statements)
 
     # --- Gramática para Expressões (Ordem de Precedência) ---
+    # expression     : comparison
+    # comparison     : additive ((== | != | < | > | <= | >=) additive)*
+    # additive       : multiplicative ((+ | -) multiplicative)*
+    # multiplicative : unary ((* | /) unary)*
+    # unary          : (+ | -) unary | primary
+    # primary        : NUMERO_INTEIRO | STRING | IDENTIFICADOR | (expression)
+    #
+    # A gramática acima é analisada sem recursão, por precedência de operadores
+    # (_BINARY_PRECEDENCE) e uma pilha explícita, de modo que expressões longas
+    # ou muito aninhadas não esbarram no limite de recursão do Python.
     def _expression(self) -> Expression:
-        """expression : comparison"""
-        return self._comparison()
-
-    def _comparison(self) -> Expression:
-        """comparison : additive ((== | != | < | > | <= | >=) additive)*"""
-        node = self._additive()
-        while self.current_token.type in (
-            TokenType.IGUAL, TokenType.DIFERENTE, TokenType.MENOR,
-            TokenType.MAIOR, TokenType.MENOR_IGUAL, TokenType.MAIOR_IGUAL
-        ):
-            op = self.current_token
-            self._advance()
-            node = BinaryExpression(node, op, self._additive())
-        return node
-
-    def _additive(self) -> Expression:
-        """additive : multiplicative ((+ | -) multiplicative)*"""
-        node = self._multiplicative()
-        while self.current_token.type in (TokenType.OP_SOMA, TokenType.OP_SUB):
-            op = self.current_token
-            self._advance()
-            node = BinaryExpression(node, op, self._multiplicative())
-        return node
-
-    def _multiplicative(self) -> Expression:
-        """multiplicative : unary ((* | /) unary)*"""
-        node = self._unary()
-        while self.current_token.type in (TokenType.OP_MULT, TokenType.OP_DIV):
-            op = self.current_token
+        """Analisa uma expressão e retorna a mesma árvore que a gramática descendente."""
+        precedences = _BINARY_PRECEDENCE
+        # Cada entrada: (precedência, token do operador, operando esquerdo).
+        # Operadores unários têm operando esquerdo None; '(' tem precedência 0.
+        stack = []
+        while True:
+            # Posição de operando: prefixos unários, '(' ou um primário
+            token = self.current_token
+            token_type = token.type
+            if token_type in _UNARY_OPERATORS:
+                stack.append((_UNARY_PRECEDENCE, token, None))
+                self._advance()
+                continue
+            if token_type == TokenType.PARENTESE_ESQ:
+                stack.append((0, token, None))
+                self._advance()
+                continue
+            if token_type == TokenType.NUMERO_INTEIRO:
+                node = NumberLiteral(token)
+            elif token_type == TokenType.STRING:
+                node = StringLiteral(token)
+            elif token_type == TokenType.IDENTIFICADOR:
+                node = Identifier(token)
+            else:
+                self._error(f"Erro sintático: Expressão primária inesperada: '{token.value}' na linha {token.line}, coluna {token.column}.")
             self._advance()
-            node = BinaryExpression(node, op, self._unary())
-        return node
 
-    def _unary(self) -> Expression:
-        """unary : (+ | -) unary | primary"""
-        if self.current_token.type in (TokenType.OP_SOMA, TokenType.OP_SUB):
-            op = self.current_token
-            self._advance()
-            return UnaryExpression(op, self._unary())
-        return self._primary()
-
-    def _primary(self) -> Expression:
-        """primary : NUMERO_INTEIRO | STRING | IDENTIFICADOR | (expression)"""
-        token = self.current_token
-        if token.type == TokenType.NUMERO_INTEIRO:
-            self._eat(TokenType.NUMERO_INTEIRO)
-            return NumberLiteral(token)
-        elif token.type == TokenType.STRING:
-            self._eat(TokenType.STRING)
-            return StringLiteral(token)
-        elif token.type == TokenType.IDENTIFICADOR:
-            self._eat(TokenType.IDENTIFICADOR)
-            return Identifier(token)
-        elif token.type == TokenType.PARENTESE_ESQ:
-            self._eat(TokenType.PARENTESE_ESQ)
-            expr = self._expression()
-            self._eat(TokenType.PARENTESE_DIR)
-            return expr
-        else:
-            self._error(f"Erro sintático: Expressão primária inesperada: '{token.value}' na linha {token.line}, coluna {token.column}.")
\ No newline at end of file
+            # Posição de operador: reduz a pilha até poder empilhar o operador
+            # binário seguinte, ou fecha parênteses até o fim da expressão
+            while True:
+                operator = self.current_token
+                precedence = precedences.get(operator.type)
+                if precedence is not None:
+                    while stack and stack[-1][0] >= precedence:
+                        node = _reduce(stack.pop(), node)
+                    stack.append((precedence, operator, node))
+                    self._advance()
+                    break
+                while stack and stack[-1][0]:
+                    node = _reduce(stack.pop(), node)
+                if not stack:
+                    return node
+                stack.pop() # '(' correspondente
+                self._eat(TokenType.PARENTESE_DIR)
+
+
+    # --- Hash-consing de subárvores idênticas ---
+    # Subárvores estruturalmente iguais passam a ser um único nó compartilhado.
+    # Só são compartilhadas subárvores cuja execução nunca produz um erro com
+    # posição (literais, variáveis de estado do robô, GIRAR/SOLTAR, IMPRIMIR e
+    # operações sobre elas), de modo que as mensagens de erro continuam
+    # apontando a ocorrência certa. MOVER e PEGAR nunca são compartilhados: com
+    # um mundo (ver src/world.py), um obstáculo ou uma célula vazia produzem um
+    # erro na posição da declaração. A expressão de que MOVER, SE e REPETIR
+    # reportam a posição só é substituída quando é um literal válido. A
+    # posição de cada ocorrência de um nó compartilhado fica em `positions`.
+    # Os nós compartilhados não devem ser modificados.
+    def _intern_subtrees(self, root):
+        """Substitui, em pós-ordem e sem recursão, as subárvores de `root` pelas compartilhadas."""
+        results = [] # Nós (já processados) dos filhos, na ordem em que aparecem
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            node_type = type(node)
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children(node)))
+                continue
+            key = None
+            if node_type is NumberLiteral or node_type is StringLiteral:
+                key = (node_type, node.value)
+            elif node_type is Identifier:
+                if node.name in _ROBOT_STATE:
+                    key = (node_type, node.name)
+            elif node_type is BinaryExpression:
+                node.right = right = results.pop()
+                node.left = left = results.pop()
+                operator = node.operator
+                if (left in self._shared and right in self._shared
+                        and (operator.type != TokenType.OP_DIV or type(right) is NumberLiteral and right.value != 0)):
+                    key = (node_type, operator.type, operator.value, id(left), id(right))
+            elif node_type is UnaryExpression:
+                node.right = right = results.pop()
+                if right in self._shared:
+                    key = (node_type, node.operator.type, node.operator.value, id(right))
+            elif node_type is RotateStatement:
+                key = (node_type, node.direction.type, node.direction.value)
+            elif node_type is DropStatement:
+                key = (node_type,)
+            elif node_type is PrintStatement:
+                node.expression = expression = results.pop()
+                if expression in self._shared:
+                    key = (node_type, id(expression))
+            elif node_type is MoveStatement:
+                steps = results.pop() # A posição de `steps` aparece nos erros: só troca literais válidos
+                if type(steps) is NumberLiteral and steps.value >= 0:
+                    node.steps = steps
+            elif node_type is VarDeclaration or node_type is AssignmentStatement:
+                node.value = results.pop()
+            elif node_type is IfStatement:
+                blocks = [node.then_block, node.else_block or []]
+                for block in reversed(blocks):
+                    if block:
+                        block[:] = results[-len(block):]
+                        del results[-len(block):]
+                results.pop() # Condição (posição usada nos erros)
+            elif node_type is RepeatStatement:
+                if node.body:
+                    node.body[:] = results[-len(node.body):]
+                    del results[-len(node.body):]
+                results.pop() # Número de repetições (posição usada nos erros)
+            results.append(node if key is None else self._intern(node, key))
+        return results.pop()
+
+    def _intern(self, node, key):
+        """Retorna o nó compartilhado para `key`, registrando a posição desta ocorrência."""
+        canonical = self._canonical.setdefault(key, node)
+        if canonical is node:
+            self._shared.add(node)
+        elif node.token is not None:
+            positions = self.positions.get(canonical)
+            if positions is None:
+                positions = self.positions[canonical] = array('i', (canonical.token.line, canonical.token.column))
+            positions.append(node.token.line)
+            positions.append(node.token.column)
+        return canonical
+
+# Precedência dos operadores binários (todos associativos à esquerda)
+_BINARY_PRECEDENCE = {
+    TokenType.IGUAL: 1, TokenType.DIFERENTE: 1, TokenType.MENOR: 1,
+    TokenType.MAIOR: 1, TokenType.MENOR_IGUAL: 1, TokenType.MAIOR_IGUAL: 1,
+    TokenType.OP_SOMA: 2, TokenType.OP_SUB: 2,
+    TokenType.OP_MULT: 3, TokenType.OP_DIV: 3,
+}
+_UNARY_OPERATORS = (TokenType.OP_SOMA, TokenType.OP_SUB)
+_UNARY_PRECEDENCE = 4
+
+def _reduce(entry, right):
+    """Aplica o operador da entrada da pilha ao operando direito."""
+    _, operator, left = entry
+    if left is None:
+        return UnaryExpression(operator, right)
+    return BinaryExpression(left, operator, right)
+
+
+# Variáveis de estado do robô: sempre definidas, nunca geram erro de execução
+_ROBOT_STATE = frozenset(("robot_x", "robot_y", "robot_direction", "has_object"))
+
+
+class StreamParser(Parser):
+    """Parser que consome os tokens de um iterador (por exemplo, `Lexer.iter_tokens()`).
+
+    Só o token atual fica em memória; combinado com `iter_statements`, permite
+    executar cada declaração de nível superior assim que ela é analisada.
+    """
+    def __init__(self, tokens, hash_cons: bool = False):
+        self._token_iter = iter(tokens)
+        self.tokens = None
+        self.current_token_index = 0
+        self.current_token = next(self._token_iter, Token(TokenType.EOF, '', -1, -1))
+        self._init_hash_cons(hash_cons)
+
+    def _advance(self):
+        """Avança para o próximo token do iterador."""
+        self.current_token_index += 1
+        self.current_token = next(self._token_iter, None) or Token(TokenType.EOF, '', -1, -1) # Sentinel EOF
+
@@ -0,0 +1,144 @@
+"""Resolução estática das variáveis, antes da execução.
+
+`Resolver.resolve` percorre o programa uma única vez e:
+
+* dá a cada variável um índice fixo (`slot`), gravado nos nós `Identifier`,
+  `VarDeclaration` e `AssignmentStatement`; `Program.slot_names` guarda o nome
+  de cada índice. O `Interpreter` então lê e grava as variáveis em uma lista,
+  sem consultar o `Environment` a cada acesso;
+* liga `robot_x`, `robot_y`, `robot_direction` e `has_object` a índices
+  negativos de `ROBOT_ACCESSORS`, dispensando as comparações de nomes;
+* encontra os erros que certamente acontecem quando a declaração é
+  alcançada: uso ou `SET` de uma variável sem nenhum `VAR` antes no programa
+  e `VAR` de uma variável já declarada em todos os caminhos até ali
+  (inclusive na segunda volta de um `REPETIR` com número literal de
+  repetições). Os demais casos continuam verificados durante a execução.
+
+O percurso usa uma pilha explícita, sem recursão.
+"""
+from operator import attrgetter
+
+from src.ast_nodes import (
+    Program, BinaryExpression, UnaryExpression, Identifier, VarDeclaration, AssignmentStatement,
+    MoveStatement, PrintStatement, IfStatement, RepeatStatement, MotionBlock, NumberLiteral, CachedExpression
+)
+
+# Índices (negativos) das variáveis de estado do robô em `ROBOT_ACCESSORS`
+ROBOT_SLOTS = {"robot_x": -4, "robot_y": -3, "robot_direction": -2, "has_object": -1}
+ROBOT_ACCESSORS = (
+    attrgetter("robot_x"),
+    attrgetter("robot_y"),
+    attrgetter("robot_direction"),
+    lambda interpreter: 1 if interpreter.has_object else 0,
+)
+
+UNSET = object() # Valor de um índice cuja variável ainda não foi declarada
+
+
+class Resolver:
+    def __init__(self):
+        self.slots = {}  # Nome da variável -> índice
+        self.errors = [] # Mensagens dos erros encontrados, na ordem do código
+        self._declared = set()   # Variáveis declaradas em todos os caminhos até aqui
+        self._seen = set()       # Variáveis com algum VAR antes deste ponto do código
+        self._declarations = {}  # Variável -> token do último VAR visto
+        self._states = []        # `_declared` salvo na entrada de SE e REPETIR
+
+    def resolve(self, program: Program) -> list:
+        """Resolve as variáveis de `program`; retorna as mensagens de erro (vazia se não houver)."""
+        # Itens da pilha: nós da AST ou ações (função, argumentos...) executadas na ordem
+        stack = [*reversed(program.statements)]
+        while stack:
+            item = stack.pop()
+            if type(item) is tuple:
+                item[0](*item[1:])
+            else:
+                stack.extend(reversed(self._node(item)))
+        program.slot_names = tuple(self.slots)
+        return self.errors
+
+    def _node(self, node) -> list:
+        """Itens (nós e ações) que resolvem `node`, na ordem de execução."""
+        node_type = type(node)
+        if node_type is Identifier:
+            slot = ROBOT_SLOTS.get(node.name)
+            if slot is None:
+                slot = self._slot(node.name)
+                if node.name not in self._seen:
+                    self._report(f"Variável '{node.name}' não definida.", node.token)
+            node.slot = slot
+            return []
+        if node_type is BinaryExpression:
+            return [node.left, node.right]
+        if node_type is UnaryExpression:
+            return [node.right]
+        if node_type is CachedExpression:
+            return [node.expression]
+        if node_type is VarDeclaration:
+            return [node.value, (self._declare, node)]
+        if node_type is AssignmentStatement:
+            name = node.name.value
+            node.slot = self._slot(name)
+            if name not in self._seen:
+                self._report(f"Variável '{name}' não declarada antes de ser atribuída.", node.name)
+            return [node.value]
+        if node_type is MoveStatement:
+            return [node.steps]
+        if node_type is PrintStatement:
+            return [node.expression]
+        if node_type is IfStatement:
+            return [node.condition, (self._branch,), *node.then_block, (self._else,),
+                    *(node.else_block or ()), (self._join,)]
+        if node_type is RepeatStatement or node_type is MotionBlock:
+            body = node.body if node_type is RepeatStatement else node.statements
+            times = 1 if node.times is None else node.times.value if type(node.times) is NumberLiteral else None
+            items = [] if node.times is None else [node.times]
+            return [*items, (self._branch,), *body, (self._loop_end, times)]
+        if node_type is Program:
+            return list(node.statements)
+        return [] # Literais, GIRAR, PEGAR, SOLTAR e LIMPAR_CACHE
+
+    def _slot(self, name) -> int:
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.slots)
+        return slot
+
+    def _report(self, message, token):
+        self.errors.append(f"Linha {token.line}, coluna {token.column}: {message}")
+
+    def _declare(self, node: VarDeclaration):
+        name = node.name.value
+        node.slot = self._slot(name)
+        if name in self._declared:
+            self._report(f"Variável '{name}' já declarada neste escopo.", node.name)
+        self._declared.add(name)
+        self._seen.add(name)
+        self._declarations[name] = node.name
+
+    # --- Fluxo: `_declared` em SE/SENAO e REPETIR ---
+    def _branch(self):
+        self._states.append(set(self._declared))
+
+    def _else(self):
+        entry = self._states[-1]
+        self._states[-1] = self._declared # Saída do bloco ENTAO
+        self._declared = set(entry)
+
+    def _join(self):
+        self._declared &= self._states.pop()
+
+    def _loop_end(self, times):
+        """`times` é o número literal de repetições, ou None se só é conhecido na execução."""
+        entry = self._states.pop()
+        if times is not None and times >= 2:
+            # O que o corpo certamente declara é declarado de novo na segunda volta
+            for name in sorted(self._declared - entry, key=self.slots.__getitem__):
+                self._report(f"Variável '{name}' já declarada neste escopo.", self._declarations[name])
+        if times is None or times <= 0:
+            self._declared = entry # O corpo pode não executar
+
+
+def resolve(program: Program) -> list:
+    """Resolve as variáveis de `program` (ver `Resolver`); retorna as mensagens de erro."""
+    return Resolver().resolve(program)
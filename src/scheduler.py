@@ -0,0 +1,209 @@
+"""Muitos robôs executando ao mesmo tempo em um laço do asyncio.
+
+`AsyncInterpreter` executa o programa de um robô como uma corrotina
+(`run`), que cede a vez a cada ação (`MOVER`, `GIRAR`, `PEGAR`, `SOLTAR`,
+`IMPRIMIR`). Os blocos de SE, REPETIR e `MotionBlock` são percorridos com uma
+pilha de quadros, como no `StackInterpreter` (os `MotionBlock`s rodam passo a
+passo, para que cada movimento seja uma ação). A memória de cada robô é só
+o seu estado, as suas variáveis e essa pilha, limitada pelo aninhamento do
+programa.
+
+`Scheduler` cria uma tarefa do asyncio por robô e controla a justiça entre
+eles (`fairness`):
+
+* `ROUND_ROBIN`: cada robô cede a vez após cada ação, então os robôs avançam
+  uma ação por rodada;
+* `TIME_SLICED`: um robô só cede a vez quando passou `time_slice` segundos
+  com ela, o que reduz as trocas quando as ações são rápidas.
+
+Cada robô pode ter um limite de ações (`budget`); ao atingi-lo, ele para com
+a situação `"limite"`. `Scheduler.cancel` cancela um robô (ou todos), e
+`Scheduler.run(timeout=...)` cancela os que não terminaram no prazo. Com um
+`world` (ver src/world.py), todos os robôs agem sobre o mesmo mundo. Como a
+execução é cooperativa, outras corrotinas do mesmo laço (por exemplo, o
+envio de telemetria) rodam entre as ações.
+"""
+import asyncio
+import time
+
+from src.ast_nodes import (
+    Program, MoveStatement, RotateStatement, PickUpStatement, DropStatement, PrintStatement,
+    IfStatement, RepeatStatement, MotionBlock
+)
+from src.events import NullSink
+from src.interpreter import Interpreter
+from src.resolver import UNSET
+
+ROUND_ROBIN = "round_robin"
+TIME_SLICED = "time_sliced"
+FAIRNESS = (ROUND_ROBIN, TIME_SLICED)
+
+# Fatia de tempo padrão do TIME_SLICED, em segundos
+TIME_SLICE = 0.001
+
+# Situação de um robô ao fim de `Scheduler.run`
+STATUSES = ("ok", "erro", "limite", "cancelado")
+
+_ACTIONS = (MoveStatement, RotateStatement, PickUpStatement, DropStatement, PrintStatement)
+
+
+class AsyncInterpreter(Interpreter):
+    """Interpretador de um robô que cede a vez a cada ação (ver `run`).
+
+    `interpret` executa o programa sozinho, até o fim, como os demais motores;
+    por padrão, os eventos vão para o `sys.stdout` como no `Interpreter`.
+    """
+
+    def __init__(self, events=None, name=None, budget: int = None):
+        super().__init__(events)
+        self.name = name
+        self.budget = budget # Máximo de ações (None: sem limite)
+        self.steps = 0 # Ações executadas
+        self.status = None # Uma de `STATUSES` ao fim da execução pelo Scheduler
+        self.error = None
+        self.task = None # Tarefa do asyncio, quando executado pelo Scheduler
+
+    def interpret(self, program: Program):
+        asyncio.run(self.run(program))
+
+    async def run(self, program: Program, scheduler=None):
+        """Executa `program`, cedendo a vez conforme a justiça do `scheduler` (a cada ação, sem ele).
+
+        Termina com `status = "limite"` ao atingir `budget` ações; os erros de
+        execução são propagados, como em `Interpreter.interpret`.
+        """
+        names = program.slot_names
+        if names is None:
+            await self._run(program.statements, scheduler)
+            return
+        values = self.environment.values
+        self.slots = slots = [values.get(name, UNSET) for name in names]
+        try:
+            await self._run(program.statements, scheduler)
+        finally:
+            self.slots = None
+            for name, value in zip(names, slots):
+                if value is not UNSET:
+                    values[name] = value
+
+    async def _run(self, block, scheduler):
+        visit = self.visit
+        budget = self.budget
+        time_sliced = scheduler is not None and scheduler.fairness == TIME_SLICED
+        frames = [[block, 0, 1]]
+        while frames:
+            frame = frames[-1]
+            block, index, remaining = frame
+            if index == len(block):
+                if remaining > 1: # Próxima iteração do REPETIR
+                    frame[1] = 0
+                    frame[2] = remaining - 1
+                else:
+                    frames.pop()
+                continue
+            frame[1] = index + 1
+            statement = block[index]
+            statement_type = type(statement)
+            if statement_type in _ACTIONS:
+                if self.steps == budget:
+                    self.status = "limite"
+                    return
+                visit(statement)
+                self.steps += 1
+                if scheduler is None:
+                    await asyncio.sleep(0)
+                elif not time_sliced or time.perf_counter() - scheduler.slice_start >= scheduler.time_slice:
+                    scheduler.switches += 1
+                    await asyncio.sleep(0)
+                    scheduler.slice_start = time.perf_counter()
+            elif statement_type is IfStatement:
+                if self._condition_is_true(statement):
+                    frames.append([statement.then_block, 0, 1])
+                elif statement.else_block:
+                    frames.append([statement.else_block, 0, 1])
+            elif statement_type is RepeatStatement:
+                times = self._repeat_count(statement)
+                if times and statement.body:
+                    frames.append([statement.body, 0, times])
+            elif statement_type is MotionBlock:
+                times = 1 if statement.times is None else self._repeat_count(statement)
+                if times:
+                    frames.append([statement.statements, 0, times])
+            else:
+                visit(statement)
+        self.status = "ok"
+
+
+class Scheduler:
+    """Executa os programas de muitos robôs como tarefas de um mesmo laço do asyncio."""
+
+    def __init__(self, fairness: str = ROUND_ROBIN, time_slice: float = TIME_SLICE, budget: int = None,
+                 world=None):
+        if fairness not in FAIRNESS:
+            raise Exception(f"Justiça desconhecida: '{fairness}'. Use {' ou '.join(FAIRNESS)}.")
+        self.fairness = fairness
+        self.time_slice = time_slice
+        self.budget = budget # Limite de ações padrão dos robôs
+        self.world = world # Mundo compartilhado pelos robôs (None: sem mundo)
+        self.robots = []
+        self.switches = 0 # Trocas de robô (vezes que um robô cedeu a vez)
+        self.slice_start = 0.0 # Início da vez do robô em execução (TIME_SLICED)
+        self._programs = []
+
+    def add(self, program: Program, events=None, name=None, budget: int = None,
+            x: int = 0, y: int = 0, direction: str = "NORTE", has_object: bool = False) -> AsyncInterpreter:
+        """Agenda um robô que executará `program` a partir do estado dado; os eventos são descartados por padrão."""
+        robot = AsyncInterpreter(NullSink() if events is None else events,
+                                 len(self.robots) if name is None else name,
+                                 self.budget if budget is None else budget)
+        robot.robot_x, robot.robot_y, robot.robot_direction, robot.has_object = x, y, direction, has_object
+        robot.world = self.world
+        self.robots.append(robot)
+        self._programs.append(program)
+        return robot
+
+    async def run(self, timeout: float = None) -> list:
+        """Executa os robôs agendados até todos terminarem (ou até `timeout` segundos); retorna os robôs."""
+        tasks = []
+        for robot, program in zip(self.robots, self._programs):
+            if robot.task is None:
+                robot.task = asyncio.create_task(self._drive(robot, program))
+                tasks.append(robot.task)
+        self._programs = [None] * len(self._programs) # Os robôs já iniciados não são recriados
+        self.slice_start = time.perf_counter()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        for robot in self.robots:
+            if robot.task is not None and robot.task.cancelled(): # Cancelado antes de começar
+                robot.status = "cancelado"
+        return self.robots
+
+    def cancel(self, robot: AsyncInterpreter = None):
+        """Cancela um robô (ou todos, sem `robot`); ele termina com a situação `"cancelado"`."""
+        for target in self.robots if robot is None else (robot,):
+            if target.task is not None:
+                target.task.cancel()
+
+    async def _drive(self, robot, program):
+        try:
+            await robot.run(program, self)
+        except asyncio.CancelledError:
+            robot.status = "cancelado"
+        except Exception as e:
+            robot.status = "erro"
+            robot.error = str(e)
+        finally:
+            robot.events.flush()
+
+
+def run_robots(programs, fairness: str = ROUND_ROBIN, time_slice: float = TIME_SLICE, budget: int = None,
+               timeout: float = None, world=None) -> list:
+    """Executa um robô para cada programa de `programs`, concorrentemente; retorna os robôs."""
+    scheduler = Scheduler(fairness, time_slice, budget, world)
+    for program in programs:
+        scheduler.add(program)
+    return asyncio.run(scheduler.run(timeout))
@@ -0,0 +1,50 @@
+"""Motor de execução com pilha explícita.
+
+`StackInterpreter` executa os blocos de SE e REPETIR com uma pilha de quadros
+`[bloco, índice, repetições restantes]` em vez de recursão no Python, de modo
+que o aninhamento de blocos não esbarra no limite de recursão e cada nível
+não paga a criação de quadros de chamada. As demais declarações e as
+expressões são executadas pelos mesmos métodos de `Interpreter`.
+"""
+from src.ast_nodes import Program, IfStatement, RepeatStatement
+from src.interpreter import Interpreter
+
+
+class StackInterpreter(Interpreter):
+    def visit_Program(self, node: Program):
+        self._run(node.statements)
+
+    def visit_IfStatement(self, node: IfStatement):
+        self._run((node,))
+
+    def visit_RepeatStatement(self, node: RepeatStatement):
+        self._run((node,))
+
+    def _run(self, block):
+        """Executa as declarações de `block`, entrando nos blocos aninhados pela pilha."""
+        visit = self.visit
+        frames = [[block, 0, 1]]
+        while frames:
+            frame = frames[-1]
+            block, index, remaining = frame
+            if index == len(block):
+                if remaining > 1: # Próxima iteração do REPETIR
+                    frame[1] = 0
+                    frame[2] = remaining - 1
+                else:
+                    frames.pop()
+                continue
+            frame[1] = index + 1
+            statement = block[index]
+            statement_type = type(statement)
+            if statement_type is IfStatement:
+                if self._condition_is_true(statement):
+                    frames.append([statement.then_block, 0, 1])
+                elif statement.else_block:
+                    frames.append([statement.else_block, 0, 1])
+            elif statement_type is RepeatStatement:
+                times = self._repeat_count(statement)
+                if times and statement.body:
+                    frames.append([statement.body, 0, times])
+            else:
+                visit(statement)
@@ -0,0 +1,136 @@
+"""Varredura de parâmetros: o mesmo programa com valores diferentes nos `VAR`.
+
+O programa é analisado uma única vez. Cada variante é um dicionário
+`{nome: valor}` que substitui o valor inicial da primeira declaração `VAR`
+de nível superior de cada nome (`apply_overrides`); as variantes vêm de uma
+grade (`grid`) ou de um CSV com uma coluna por variável (`read_csv`).
+
+`run_sweep` distribui as variantes entre processos, em blocos. Com `fork`
+disponível, os processos herdam a AST do processo principal sem cópia
+explícita; nos demais casos, recebem uma vez a forma compacta do cache
+(`src/cache.py`). Cada variante é otimizada, analisada e executada sem
+saída, como em `src/batch.py`, e os registros (campos de `FIELDS`) voltam
+assim que cada bloco termina, fora de ordem: o campo `variant` é a posição da
+variante na lista.
+"""
+import csv
+import itertools
+import multiprocessing
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.ast_nodes import Program, VarDeclaration, NumberLiteral, StringLiteral
+from src.batch import error_position, run_program
+from src.cache import dump_program, load_program
+from src.interpreter import Interpreter
+from src.lexer import Token, TokenType
+
+# Campos de um registro, na ordem da tupla; `run_time` em segundos
+FIELDS = ("variant", "status", "error", "line", "column", "x", "y", "direction", "has_object", "run_time")
+
+# Variantes enviadas de uma vez a cada processo
+CHUNK_VARIANTS = 16
+
+_INTEGER = re.compile(r"-?\d+")
+
+
+def parse_value(text: str):
+    """Valor de um parâmetro escrito como texto: inteiro, se for um, senão o próprio texto."""
+    text = text.strip()
+    return int(text) if _INTEGER.fullmatch(text) else text
+
+
+def read_csv(path) -> list[dict]:
+    """Variantes de um CSV: o cabeçalho dá os nomes das variáveis e cada linha, uma variante."""
+    with open(path, newline="") as file:
+        return [{name.strip(): parse_value(value) for name, value in row.items()} for row in csv.DictReader(file)]
+
+
+def grid(values: dict) -> list[dict]:
+    """Todas as combinações de `{nome: [valores]}`, uma variante por combinação."""
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def apply_overrides(program: Program, overrides: dict) -> Program:
+    """Novo `Program` com os valores de `overrides` nas primeiras declarações `VAR` de nível superior."""
+    remaining = dict(overrides)
+    statements = []
+    for statement in program.statements:
+        if type(statement) is VarDeclaration and statement.name.value in remaining:
+            value = remaining.pop(statement.name.value)
+            statement = VarDeclaration(statement.name, _literal(statement.name.value, value, statement.value.token))
+        statements.append(statement)
+    if remaining:
+        raise Exception(f"Variável '{next(iter(remaining))}' não declarada no nível superior do programa.")
+    return Program(statements)
+
+
+def _literal(name, value, token):
+    """Literal com `value`, na posição do valor original (usada pelas mensagens de erro)."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return NumberLiteral(Token(TokenType.NUMERO_INTEIRO, str(value), token.line, token.column))
+    if isinstance(value, str):
+        return StringLiteral(Token(TokenType.STRING, value, token.line, token.column))
+    raise Exception(f"Valor inválido para '{name}': {value!r}. Use um inteiro ou um texto.")
+
+
+def run_variant(program: Program, overrides: dict, engine=Interpreter, optimize: bool = True,
+                licm: bool = True, index: int = 0) -> tuple:
+    """Executa uma variante, sem saída; retorna o seu registro (ver `FIELDS`)."""
+    try:
+        ast = apply_overrides(program, overrides)
+    except Exception as e:
+        return (index, "erro_parametro", str(e), None, None, None, None, None, None, 0.0)
+    status, error, state, _, run_time = run_program(ast, engine, optimize, licm)
+    position = (None, None) if error is None else error_position(error)
+    return (index, status, error, *position, *(state or (None,) * 4), run_time)
+
+
+# --- Processos ---
+_worker = None # (programa, motor, otimizar, licm) de cada processo
+
+
+def _init_worker(program, data, engine, optimize, licm):
+    global _worker
+    _worker = (load_program(data) if program is None else program, engine, optimize, licm)
+
+
+def _run_chunk(chunk):
+    program, engine, optimize, licm = _worker
+    return [run_variant(program, overrides, engine, optimize, licm, index) for index, overrides in chunk]
+
+
+def run_sweep(program: Program, variants, engine=Interpreter, jobs: int = None,
+              chunksize: int = CHUNK_VARIANTS, optimize: bool = True, licm: bool = True):
+    """Executa `program` para cada variante de `variants` em `jobs` processos.
+
+    Gera os registros à medida que os blocos terminam (fora de ordem). As
+    variantes são consumidas aos poucos: no máximo `2 * jobs` blocos ficam
+    pendentes. Com `jobs == 1`, as variantes rodam no próprio processo, em ordem.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    numbered = enumerate(variants)
+    if jobs == 1:
+        for index, overrides in numbered:
+            yield run_variant(program, overrides, engine, optimize, licm, index)
+        return
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Os argumentos do initializer são herdados pelo fork, sem serialização
+        context = multiprocessing.get_context("fork")
+        initargs = (program, None, engine, optimize, licm)
+    else:
+        context = None
+        initargs = (None, dump_program(program), engine, optimize, licm)
+    chunks = iter(lambda: list(itertools.islice(numbered, chunksize)), [])
+    with ProcessPoolExecutor(jobs, mp_context=context, initializer=_init_worker, initargs=initargs) as pool:
+        pending = {pool.submit(_run_chunk, chunk) for chunk in itertools.islice(chunks, 2 * jobs)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(_run_chunk, chunk))
+                yield from future.result()
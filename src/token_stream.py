@@ -0,0 +1,140 @@
+"""Representação compacta da sequência de tokens.
+
+Em vez de um objeto `Token` por token, `TokenStream` guarda apenas o tipo
+(1 byte) e a posição inicial na fonte (8 bytes) em dois `array`s paralelos. O
+valor é recortado da fonte quando pedido e a linha/coluna só é calculada quando
+alguém precisa dela (mensagens de erro), por busca binária em um índice de
+inícios de linha construído sob demanda.
+"""
+import re
+from array import array
+from bisect import bisect_right
+
+from src.lexer import Lexer, TokenType, _SYMBOLS, _TOKEN_REGEX
+
+_TYPES = [None] * (max(t.value for t in TokenType) + 1)
+for _token_type in TokenType:
+    _TYPES[_token_type.value] = _token_type
+
+# Valores fixos, compartilhados por todos os tokens do mesmo tipo. IGUAL fica de
+# fora porque pode ser '=' ou '=='.
+_FIXED_VALUES = {
+    token_type.value: text for text, token_type in _SYMBOLS.items()
+    if token_type is not TokenType.IGUAL
+}
+_FIXED_VALUES[TokenType.EOF.value] = ''
+
+_KEYWORD_VALUES = {keyword: keyword for keyword in Lexer('').keywords}
+
+
+class StreamToken:
+    """Visão leve de um token de um `TokenStream`, com a mesma interface de `Token`."""
+    __slots__ = ('type', 'stream', 'index')
+
+    def __init__(self, type: TokenType, stream: "TokenStream", index: int):
+        self.type = type
+        self.stream = stream
+        self.index = index
+
+    @property
+    def value(self) -> str:
+        return self.stream.value(self.index)
+
+    @property
+    def line(self) -> int:
+        return self.stream.position(self.index)[0]
+
+    @property
+    def column(self) -> int:
+        return self.stream.position(self.index)[1]
+
+    def __str__(self):
+        return f"Token(Type: {self.type.name}, Value: '{self.value}', Line: {self.line}, Col: {self.column})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TokenStream:
+    """Sequência de tokens armazenada em `array`s; pode ser passada diretamente ao `Parser`."""
+
+    def __init__(self, source_code: str):
+        self.source = source_code
+        self.types = array('B')
+        self.starts = array('q')
+        self._line_starts = None # Construído na primeira consulta de linha/coluna
+
+        types_append = self.types.append
+        starts_append = self.starts.append
+        for token_type, _, pos, _, _ in Lexer(source_code)._scan():
+            types_append(token_type.value)
+            starts_append(pos)
+        types_append(TokenType.EOF.value)
+        starts_append(len(source_code))
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> StreamToken:
+        if index < 0:
+            index += len(self.types)
+        return StreamToken(_TYPES[self.types[index]], self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield StreamToken(_TYPES[self.types[index]], self, index)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos buffers de tokens (sem contar a fonte)."""
+        size = len(self.types) * self.types.itemsize + len(self.starts) * self.starts.itemsize
+        if self._line_starts is not None:
+            size += len(self._line_starts) * self._line_starts.itemsize
+        return size
+
+    def value(self, index: int) -> str:
+        """Recorta da fonte o valor do token `index`."""
+        code = self.types[index]
+        fixed = _FIXED_VALUES.get(code)
+        if fixed is not None:
+            return fixed
+        m = _TOKEN_REGEX.match(self.source, self.starts[index])
+        text = m.group()
+        if code == TokenType.STRING.value:
+            return text[1:-1]
+        if code == TokenType.NUMERO_INTEIRO.value and not text.isdigit():
+            # Número colado a letras ('10abc') ou com dígitos não decimais ('²')
+            end = 0
+            while end < len(text) and text[end].isdigit():
+                end += 1
+            return text[:end]
+        return _KEYWORD_VALUES.get(text, text)
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Linha e coluna do token `index`, com as mesmas regras do `Lexer`."""
+        line_starts = self._line_starts
+        if line_starts is None:
+            line_starts = self._line_starts = self._build_line_index()
+        pos = self.starts[index]
+        line = bisect_right(line_starts, pos)
+        return line, pos - line_starts[line - 1] + 1
+
+    def _build_line_index(self) -> array:
+        """Posições onde cada linha começa. Quebras de linha dentro de strings
+        não contam, como no `Lexer`."""
+        source = self.source
+        inside_strings = set()
+        types = self.types.tobytes()
+        string_code = bytes([TokenType.STRING.value])
+        index = types.find(string_code)
+        while index != -1:
+            start = self.starts[index]
+            end = source.index('"', start + 1)
+            newline = source.find('\n', start, end)
+            while newline != -1:
+                inside_strings.add(newline)
+                newline = source.find('\n', newline + 1, end)
+            index = types.find(string_code, index + 1)
+        line_starts = array('q', [0])
+        line_starts.extend(m.end() for m in re.finditer('\n', source) if m.start() not in inside_strings)
+        return line_starts
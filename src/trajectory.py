@@ -0,0 +1,200 @@
+"""Gravação compacta da trajetória do robô em arquivo binário.
+
+`TrajectoryRecorder` é um sink de eventos (ver `src/events.py`) que guarda,
+para cada mudança do estado do robô, o delta `(dx, dy, giro, objeto)`:
+`giro` é o número de quartos de volta à direita (0 a 3) e `objeto` é +1 ao
+`PEGAR`, -1 ao `SOLTAR` e 0 nos demais casos. Deltas iguais seguidos viram um
+único registro com o número de repetições (run-length), de modo que
+`REPETIR 1000000 VEZES { MOVER FRENTE 1; }` ocupa um registro.
+
+Formato do arquivo (little-endian):
+
+* cabeçalho de `HEADER_SIZE` bytes: `MAGIC`, versão, e o estado inicial
+  (x, y, índice da direção em `HEADINGS`, segurando objeto);
+* registros de `RECORD_SIZE` bytes, quatro inteiros de 64 bits:
+  `count, dx, dy, code`, com `code = giro + 4 * (objeto + 1)`.
+
+Os registros têm tamanho fixo e ficam contíguos, então o arquivo pode ser
+mapeado em memória e lido sem cópia (`Trajectory`, `Trajectory.to_numpy`).
+Na gravação, eles se acumulam em um `array` e são escritos em blocos de
+`CHUNK_RECORDS`.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from src.events import EventSink, MOVE, TURN, PICK_UP, DROP
+from src.motion import HEADINGS, HEADING_INDEX
+
+MAGIC = b"RTRJ"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sH2xqqBB6x")
+_RECORD = struct.Struct("<qqqq")
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+# Registros acumulados antes de uma escrita no arquivo
+CHUNK_RECORDS = 8192
+
+# Campos de um registro, na ordem do arquivo (tipos do NumPy)
+RECORD_DTYPE = [("count", "<i8"), ("dx", "<i8"), ("dy", "<i8"), ("code", "<i8")]
+
+
+def _code(turn: int, grab: int) -> int:
+    return turn + 4 * (grab + 1)
+
+
+class TrajectoryRecorder(EventSink):
+    """Grava em `path` os deltas do estado do robô, a partir do estado `start`."""
+
+    def __init__(self, path, start=(0, 0, "NORTE", False), chunk_records: int = CHUNK_RECORDS):
+        x, y, direction, has_object = start
+        self.chunk_records = chunk_records
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, x, y, HEADING_INDEX[direction], bool(has_object)))
+        self._records = array("q") # count, dx, dy, code de cada registro ainda não escrito
+
+    def emit(self, event: tuple):
+        kind = event[0]
+        if kind == MOVE:
+            _, _, _, old_x, old_y, x, y = event
+            if x != old_x or y != old_y:
+                self._append(x - old_x, y - old_y, _code(0, 0))
+        elif kind == TURN:
+            turn = (HEADING_INDEX[event[3]] - HEADING_INDEX[event[2]]) % 4
+            if turn:
+                self._append(0, 0, _code(turn, 0))
+        elif (kind == PICK_UP or kind == DROP) and event[3]:
+            self._append(0, 0, _code(0, 1 if kind == PICK_UP else -1))
+
+    def _append(self, dx, dy, code):
+        records = self._records
+        if records and records[-3] == dx and records[-2] == dy and records[-1] == code:
+            records[-4] += 1 # Mesmo delta do registro anterior
+            return
+        try:
+            # Montado à parte: um `extend` interrompido deixaria parte do registro no acúmulo
+            record = array("q", (1, dx, dy, code))
+        except OverflowError:
+            raise Exception(f"Deslocamento grande demais para a trajetória: ({dx}, {dy}).") from None
+        records.extend(record)
+        if len(records) >= 4 * (self.chunk_records + 1):
+            # O último registro fica no acúmulo: ele ainda pode crescer
+            self._write(records[:-4])
+            del records[:-4]
+
+    def _write(self, records: array):
+        if sys.byteorder == "big":
+            records = array("q", records)
+            records.byteswap()
+        records.tofile(self._file)
+
+    def flush(self):
+        """Escreve todos os registros acumulados."""
+        if self._records:
+            self._write(self._records)
+            del self._records[:]
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Trajectory:
+    """Leitura de um arquivo de `TrajectoryRecorder`, mapeado em memória.
+
+    Os registros são decodificados sob demanda: `records()` itera os
+    registros run-length, `steps()` os deltas um a um e `states()` o estado
+    do robô após cada passo.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if size < HEADER_SIZE:
+                raise Exception(f"Arquivo de trajetória inválido: {path}")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, x, y, heading, has_object = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise Exception(f"Arquivo de trajetória inválido ou de outra versão: {path}")
+        self.start = (x, y, HEADINGS[heading], bool(has_object))
+        # Um registro incompleto no fim (gravação interrompida) é ignorado
+        self._end = HEADER_SIZE + (size - HEADER_SIZE) // RECORD_SIZE * RECORD_SIZE
+
+    def __len__(self):
+        return (self._end - HEADER_SIZE) // RECORD_SIZE
+
+    def records(self):
+        """Itera `(count, dx, dy, giro, objeto)` de cada registro."""
+        view = memoryview(self._map)[HEADER_SIZE:self._end]
+        try:
+            for count, dx, dy, code in _RECORD.iter_unpack(view):
+                yield count, dx, dy, code % 4, code // 4 - 1
+        finally:
+            view.release()
+
+    def steps(self):
+        """Itera `(dx, dy, giro, objeto)` de cada mudança de estado, expandindo as repetições."""
+        for count, dx, dy, turn, grab in self.records():
+            step = (dx, dy, turn, grab)
+            for _ in range(count):
+                yield step
+
+    def states(self):
+        """Itera o estado `(x, y, direção, segurando objeto)` após cada mudança."""
+        x, y, direction, has_object = self.start
+        heading = HEADING_INDEX[direction]
+        for dx, dy, turn, grab in self.steps():
+            x += dx
+            y += dy
+            heading = (heading + turn) % 4
+            if grab:
+                has_object = grab > 0
+            yield x, y, HEADINGS[heading], has_object
+
+    def final_state(self) -> tuple:
+        """Estado ao fim da trajetória, sem expandir as repetições."""
+        x, y, direction, has_object = self.start
+        heading = HEADING_INDEX[direction]
+        for count, dx, dy, turn, grab in self.records():
+            x += dx * count
+            y += dy * count
+            heading = (heading + turn * count) % 4
+            if grab:
+                has_object = grab > 0
+        return x, y, HEADINGS[heading], has_object
+
+    def to_numpy(self, expand: bool = False):
+        """Registros como array estruturado do NumPy (campos de `RECORD_DTYPE`), sem cópia.
+
+        Com `expand=True`, retorna as posições `(x, y)` após cada passo, um
+        array `n x 2` (requer que as coordenadas caibam em 64 bits).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise Exception("A exportação da trajetória requer o NumPy (pip install numpy).") from None
+        records = np.frombuffer(self._map, dtype=np.dtype(RECORD_DTYPE), count=len(self), offset=HEADER_SIZE)
+        if not expand:
+            return records
+        deltas = np.repeat(np.stack((records["dx"], records["dy"]), axis=1), records["count"], axis=0)
+        return np.cumsum(deltas, axis=0) + np.array(self.start[:2], dtype=np.int64)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
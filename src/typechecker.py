@@ -0,0 +1,161 @@
+"""Inferência estática de tipos.
+
+`TypeChecker.check` calcula, antes da execução, os tipos possíveis de cada
+expressão e grava-os em `Expression.static_type`, como uma combinação de bits
+`INT | BOOL | STR` (`ANY` quando pode ser qualquer um; 0 quando a expressão
+nunca produz valor, por exemplo uma variável nunca declarada).
+
+As variáveis são globais e seus valores só vêm de `VAR` e `SET`, então o tipo
+de uma variável é a união dos tipos de todas as expressões atribuídas a ela;
+como esses tipos dependem dos tipos das variáveis, o cálculo se repete até
+estabilizar.
+
+Com os tipos, a execução usa caminhos especializados quando o tipo é certo:
+`+` entre inteiros sem o teste de concatenação, condições de `SE`, passos de
+`MOVER` e repetições de `REPETIR` sem o teste de `isinstance`. Quando o tipo é
+incerto, o caminho genérico (com as verificações) continua valendo.
+
+Também são apontados os erros de tipo que certamente acontecem quando a
+expressão é alcançada, como `"a" - 1` ou `SE ("x")`.
+"""
+from src.ast_nodes import (
+    Program, BinaryExpression, UnaryExpression, NumberLiteral, StringLiteral,
+    BooleanLiteral, Identifier, VarDeclaration, AssignmentStatement, MoveStatement,
+    IfStatement, RepeatStatement, MotionBlock, CachedExpression, children
+)
+from src.lexer import TokenType
+
+INT = 1
+BOOL = 2
+STR = 4
+NUMERIC = INT | BOOL # bool é subclasse de int
+ANY = INT | BOOL | STR
+# Tipos de expressões que certamente produzem inteiros (ou booleanos)
+NUMERIC_TYPES = frozenset((INT, BOOL, NUMERIC))
+
+_ROBOT_TYPES = {"robot_x": INT, "robot_y": INT, "robot_direction": STR, "has_object": INT}
+_TYPE_NAMES = ((INT, "inteiro"), (BOOL, "booleano"), (STR, "texto"))
+
+_ORDERING = (TokenType.MENOR, TokenType.MAIOR, TokenType.MENOR_IGUAL, TokenType.MAIOR_IGUAL)
+
+
+def type_name(static_type: int) -> str:
+    """Nome legível de um tipo, por exemplo 'inteiro ou texto'."""
+    return " ou ".join(name for bit, name in _TYPE_NAMES if static_type & bit) or "nenhum"
+
+
+def _binary_result(op_type, left: int, right: int):
+    """Tipo do resultado de `left op right` para tipos simples; None se a operação falha."""
+    if op_type == TokenType.OP_SOMA:
+        return STR if left == STR or right == STR else INT
+    if op_type == TokenType.OP_SUB or op_type == TokenType.OP_DIV:
+        return INT if left & NUMERIC and right & NUMERIC else None
+    if op_type == TokenType.OP_MULT:
+        if left & NUMERIC and right & NUMERIC:
+            return INT
+        return STR if (left == STR and right & NUMERIC) or (right == STR and left & NUMERIC) else None
+    if op_type in _ORDERING:
+        return BOOL if (left & NUMERIC and right & NUMERIC) or left == right == STR else None
+    return BOOL # IGUAL, DIFERENTE
+
+
+def _combine(op_type, left: int, right: int):
+    """(tipo do resultado, se algum par de tipos simples falha)."""
+    result = 0
+    fails = False
+    for left_bit, _ in _TYPE_NAMES:
+        if not left & left_bit:
+            continue
+        for right_bit, _ in _TYPE_NAMES:
+            if right & right_bit:
+                bit = _binary_result(op_type, left_bit, right_bit)
+                if bit is None:
+                    fails = True
+                else:
+                    result |= bit
+    return result, fails
+
+
+class TypeChecker:
+    def __init__(self):
+        self.variables = {} # Nome da variável -> tipo (união das atribuições)
+        self.errors = []    # Mensagens dos erros encontrados, na ordem do código
+
+    def check(self, program: Program) -> list:
+        """Anota os tipos em `program`; retorna as mensagens de erro (vazia se não houver)."""
+        nodes = _post_order(program)
+        while self._infer(nodes, report=False):
+            pass
+        self._infer(nodes, report=True)
+        return self.errors
+
+    def _infer(self, nodes, report) -> bool:
+        """Calcula os tipos de `nodes` (filhos antes dos pais); retorna se alguma variável mudou."""
+        variables = self.variables
+        changed = False
+        for node in nodes:
+            node_type = type(node)
+            if node_type is NumberLiteral:
+                node.static_type = INT
+            elif node_type is StringLiteral:
+                node.static_type = STR
+            elif node_type is BooleanLiteral:
+                node.static_type = BOOL
+            elif node_type is Identifier:
+                robot_type = _ROBOT_TYPES.get(node.name)
+                node.static_type = robot_type if robot_type is not None else variables.get(node.name, 0)
+            elif node_type is BinaryExpression:
+                left, right = node.left.static_type, node.right.static_type
+                node.static_type, fails = _combine(node.operator.type, left, right)
+                if report and fails and left and right and not node.static_type:
+                    self._report(f"Operação '{node.operator.value}' inválida entre {type_name(left)} "
+                                 f"e {type_name(right)}.", node.operator)
+            elif node_type is UnaryExpression:
+                operand = node.right.static_type
+                node.static_type = INT if operand & NUMERIC else 0
+                if report and operand == STR:
+                    self._report(f"Operação '{node.operator.value}' inválida para {type_name(operand)}.", node.operator)
+            elif node_type is CachedExpression:
+                node.static_type = node.expression.static_type
+            elif node_type is VarDeclaration or node_type is AssignmentStatement:
+                name = node.name.value
+                old = variables.get(name, 0)
+                new = old | node.value.static_type
+                if new != old:
+                    variables[name] = new
+                    changed = True
+            elif report:
+                if node_type is MoveStatement:
+                    self._check_integer(node.steps, "O número de passos de 'MOVER'")
+                elif node_type is IfStatement:
+                    self._check_integer(node.condition, "A condição do 'SE'")
+                elif (node_type is RepeatStatement or node_type is MotionBlock) and node.times is not None:
+                    self._check_integer(node.times, "O número de repetições de 'REPETIR'")
+        return changed
+
+    def _check_integer(self, expression, description):
+        if expression.static_type == STR:
+            self._report(f"{description} deve ser inteiro ou booleano, não {type_name(STR)}.", expression.token)
+
+    def _report(self, message, token):
+        self.errors.append(f"Linha {token.line}, coluna {token.column}: {message}")
+
+
+def _post_order(root) -> list:
+    """Nós de `root` em pós-ordem (filhos antes dos pais), sem recursão."""
+    nodes = []
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            nodes.append(node)
+            continue
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children(node)))
+    return nodes
+
+
+def check_types(program: Program) -> list:
+    """Infere os tipos de `program` (ver `TypeChecker`); retorna as mensagens de erro."""
+    return TypeChecker().check(program)
+
@@ -0,0 +1,215 @@
+"""Máquina virtual de pilha para o bytecode de `src/bytecode.py`.
+
+`VirtualMachine` compila o programa e o executa em um único laço de
+despacho: o opcode é comparado com constantes locais, sem montar nomes de
+métodos nem chamar `getattr` por nó, e cada operador binário tem seu próprio
+opcode. O estado do robô, as mensagens de simulação e os erros (mensagem e
+posição) são os mesmos de `Interpreter`.
+"""
+from src.ast_nodes import Program, Statement
+from src.bytecode import (
+    LOAD_CONST, LOAD_NAME, ADD, ADD_INT, SUB, MUL, DIV, EQ, NE, LT, GT, LE, GE, NEG, POS,
+    DEFINE, CHECK_NAME, STORE, MOVE_FRENTE, MOVE_TRAS, MOVE_FRENTE_N, MOVE_TRAS_N,
+    TURN_RIGHT, TURN_LEFT, PICKUP, DROP, PRINT, JUMP, JUMP_IF_FALSE, REPEAT, REPEAT_NEXT, MOTION,
+    LOAD_CACHE, STORE_CACHE, CLEAR_CACHE, Bytecode, compile_program
+)
+from src import events
+from src.interpreter import Interpreter
+from src.lexer import TokenType
+from src.motion import HEADINGS, HEADING_INDEX, MOVE_STEPS, TURNS, motion_effect
+
+_FRENTE_STEP = MOVE_STEPS[TokenType.FRENTE]
+_TRAS_STEP = MOVE_STEPS[TokenType.TRAS]
+_RIGHT = TURNS[TokenType.DIREITA]
+_LEFT = TURNS[TokenType.ESQUERDA]
+
+
+class VirtualMachine(Interpreter):
+    def interpret(self, program: Program):
+        self.execute(compile_program(program))
+
+    def visit(self, node):
+        # Declarações avulsas (modo --stream) também são compiladas; as
+        # expressões continuam com o Interpreter (usado por `motion_effect`)
+        if isinstance(node, Statement):
+            return self.execute(compile_program([node]))
+        return super().visit(node)
+
+    def visit_Program(self, node: Program):
+        self.execute(compile_program(node))
+
+    def execute(self, bytecode: Bytecode):
+        """Executa o bytecode até o fim."""
+        code = bytecode.code
+        constants = bytecode.constants
+        names = bytecode.names
+        environment = self.environment
+        values = environment.values
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        counters = [] # Repetições restantes dos REPETIR em execução
+        cache = self.expression_cache
+        end = len(code)
+        pc = 0
+        while pc < end:
+            op = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+            if op == LOAD_CONST:
+                push(constants[arg])
+            elif op == LOAD_NAME:
+                name = names[arg]
+                if name in values:
+                    push(values[name])
+                else:
+                    try:
+                        push(environment.get(name))
+                    except ValueError as e:
+                        self._error(str(e), bytecode.tokens[(pc >> 1) - 1])
+            elif op == REPEAT_NEXT:
+                remaining = counters[-1] - 1
+                if remaining:
+                    counters[-1] = remaining
+                    pc = arg
+                else:
+                    counters.pop()
+            elif op == LOAD_CACHE:
+                index = code[arg - 1] # Argumento do STORE_CACHE que fecha a expressão
+                if index in cache:
+                    push(cache[index])
+                    pc = arg
+            elif op <= POS: # Operadores e LOAD_ROBOT
+                if op == ADD:
+                    right = pop()
+                    left = stack[-1]
+                    if type(left) is str or type(right) is str:
+                        stack[-1] = str(left) + str(right)
+                    else:
+                        stack[-1] = left + right
+                elif op == ADD_INT:
+                    right = pop()
+                    stack[-1] = stack[-1] + right
+                elif op == SUB:
+                    right = pop()
+                    stack[-1] = stack[-1] - right
+                elif op == MUL:
+                    right = pop()
+                    stack[-1] = stack[-1] * right
+                elif op == DIV:
+                    right = pop()
+                    if right == 0:
+                        self._error("Divisão por zero.", bytecode.tokens[(pc >> 1) - 1])
+                    stack[-1] = stack[-1] // right
+                elif op == LT:
+                    right = pop()
+                    stack[-1] = stack[-1] < right
+                elif op == GT:
+                    right = pop()
+                    stack[-1] = stack[-1] > right
+                elif op == EQ:
+                    right = pop()
+                    stack[-1] = stack[-1] == right
+                elif op == NE:
+                    right = pop()
+                    stack[-1] = stack[-1] != right
+                elif op == LE:
+                    right = pop()
+                    stack[-1] = stack[-1] <= right
+                elif op == GE:
+                    right = pop()
+                    stack[-1] = stack[-1] >= right
+                elif op == NEG:
+                    stack[-1] = -stack[-1]
+                elif op == POS:
+                    stack[-1] = +stack[-1]
+                elif arg == 0:
+                    push(self.robot_x)
+                elif arg == 1:
+                    push(self.robot_y)
+                elif arg == 2:
+                    push(self.robot_direction)
+                else:
+                    push(1 if self.has_object else 0)
+            elif op == JUMP_IF_FALSE:
+                condition = pop()
+                if not isinstance(condition, int): # bool é subclasse de int
+                    self._error(f"Condição do 'SE' deve ser avaliada como booleano ou inteiro (0 para falso): {condition}",
+                                bytecode.tokens[(pc >> 1) - 1])
+                if not condition:
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == REPEAT:
+                times = pop()
+                if not isinstance(times, int) or times < 0:
+                    self._error(f"Número de repetições inválido: {times}. Deve ser um inteiro não negativo.",
+                                bytecode.tokens[(pc >> 1) - 1])
+                if times:
+                    counters.append(times)
+                else:
+                    pc = arg
+            elif MOVE_FRENTE <= op <= MOVE_TRAS_N:
+                if op == MOVE_FRENTE or op == MOVE_TRAS:
+                    steps = pop()
+                    if not isinstance(steps, int) or steps < 0:
+                        self._error(f"Número de passos inválido: {steps}. Deve ser um inteiro positivo.",
+                                    bytecode.tokens[(pc >> 1) - 1])
+                else:
+                    steps = arg
+                frente = op == MOVE_FRENTE or op == MOVE_FRENTE_N
+                old_x, old_y = self.robot_x, self.robot_y
+                step_x, step_y = (_FRENTE_STEP if frente else _TRAS_STEP)[self.robot_direction]
+                self.robot_x = old_x + step_x * steps
+                self.robot_y = old_y + step_y * steps
+                if self.simulation_output:
+                    self.events.emit((events.MOVE, "FRENTE" if frente else "TRAS", steps, old_x, old_y,
+                                      self.robot_x, self.robot_y))
+            elif op == TURN_RIGHT or op == TURN_LEFT:
+                old_direction = self.robot_direction
+                if op == TURN_RIGHT:
+                    self.robot_direction = _RIGHT[old_direction]
+                    if self.simulation_output:
+                        self.events.emit((events.TURN, "DIREITA", old_direction, self.robot_direction))
+                else:
+                    self.robot_direction = _LEFT[old_direction]
+                    if self.simulation_output:
+                        self.events.emit((events.TURN, "ESQUERDA", old_direction, self.robot_direction))
+            elif op == STORE:
+                value = pop()
+                environment.assign(names[arg], value)
+                if self.simulation_output:
+                    self.events.emit((events.SET, names[arg], value))
+            elif op == CHECK_NAME:
+                if not environment.exists(names[arg]):
+                    self._error(f"Variável '{names[arg]}' não declarada antes de ser atribuída.",
+                                bytecode.tokens[(pc >> 1) - 1])
+            elif op == DEFINE:
+                value = pop()
+                environment.define(names[arg], value)
+                if self.simulation_output:
+                    self.events.emit((events.VAR, names[arg], value))
+            elif op == PRINT:
+                self.events.emit((events.PRINT, pop()))
+            elif op == PICKUP:
+                Interpreter.visit_PickUpStatement(self, None)
+            elif op == DROP:
+                Interpreter.visit_DropStatement(self, None)
+            elif op == MOTION:
+                times = stack[-1]
+                if not self.simulation_output and isinstance(times, int) and times >= 0:
+                    effect = motion_effect(constants[arg].statements, times,
+                                           HEADING_INDEX[self.robot_direction], self.visit)
+                    if effect is not None:
+                        dx, dy, heading = effect
+                        self.robot_x += dx
+                        self.robot_y += dy
+                        self.robot_direction = HEADINGS[heading]
+                        stack[-1] = 0 # O REPEAT seguinte pula o laço passo a passo
+            elif op == STORE_CACHE:
+                cache[arg] = stack[-1]
+            elif op == CLEAR_CACHE:
+                for index in constants[arg]:
+                    cache.pop(index, None)
+            else:
+                raise NotImplementedError(f"Opcode desconhecido: {op}")
@@ -0,0 +1,148 @@
+"""Mundo do robô: objetos e obstáculos em um índice espacial esparso.
+
+Só as células ocupadas são guardadas:
+
+* `objects` leva cada célula `(x, y)` ao número de objetos empilhados nela,
+  então `PEGAR` e `SOLTAR` consultam e alteram a posição do robô em O(1);
+* `obstacles` é o conjunto das células bloqueadas. Para o `MOVER`, os
+  obstáculos também ficam em listas ordenadas por linha e por coluna
+  (montadas na primeira consulta depois de uma mudança), e o primeiro
+  obstáculo do caminho é achado por busca binária (`free_steps`), em
+  O(log k) para k obstáculos na linha ou coluna, seja qual for o
+  comprimento do caminho.
+
+Um mundo é lido de um arquivo de texto com uma célula por linha
+(comentários com `//`, como no RoboScript):
+
+    objeto 2 1        // um objeto em (2,1)
+    objeto 0 5 3      // três objetos empilhados em (0,5)
+    obstaculo 4 0
+"""
+from bisect import bisect_left, bisect_right
+
+
+class World:
+    def __init__(self):
+        self.objects = {} # (x, y) -> número de objetos na célula
+        self.obstacles = set()
+        # Obstáculos por linha (y -> xs ordenados) e por coluna (x -> ys
+        # ordenados); None até a primeira consulta depois de uma mudança
+        self._rows = None
+        self._columns = None
+
+    # --- Objetos ---
+    def add_object(self, x: int, y: int, count: int = 1):
+        """Empilha `count` objetos na célula `(x, y)`."""
+        if count > 0:
+            cell = (x, y)
+            self.objects[cell] = self.objects.get(cell, 0) + count
+
+    def objects_at(self, x: int, y: int) -> int:
+        return self.objects.get((x, y), 0)
+
+    def take(self, x: int, y: int) -> bool:
+        """Retira um objeto da célula `(x, y)`; falso se ela estiver vazia."""
+        cell = (x, y)
+        count = self.objects.get(cell)
+        if not count:
+            return False
+        if count == 1:
+            del self.objects[cell]
+        else:
+            self.objects[cell] = count - 1
+        return True
+
+    def put(self, x: int, y: int):
+        """Coloca um objeto na célula `(x, y)`."""
+        cell = (x, y)
+        self.objects[cell] = self.objects.get(cell, 0) + 1
+
+    # --- Obstáculos ---
+    def add_obstacle(self, x: int, y: int):
+        self.obstacles.add((x, y))
+        self._rows = self._columns = None
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        return (x, y) in self.obstacles
+
+    def free_steps(self, x: int, y: int, dx: int, dy: int, steps: int) -> int:
+        """Passos livres a partir de `(x, y)`, na direção de um passo `(dx, dy)`, até `steps`.
+
+        É `steps` se o caminho estiver livre; senão, o número de células
+        antes do primeiro obstáculo.
+        """
+        if not self.obstacles or not steps:
+            return steps
+        if self._rows is None:
+            self._build_index()
+        if dy == 0:
+            line, position, delta = self._rows.get(y), x, dx
+        else:
+            line, position, delta = self._columns.get(x), y, dy
+        if line is None:
+            return steps
+        if delta > 0:
+            index = bisect_right(line, position)
+            if index < len(line) and line[index] <= position + steps:
+                return line[index] - position - 1
+        else:
+            index = bisect_left(line, position) - 1
+            if index >= 0 and line[index] >= position - steps:
+                return position - line[index] - 1
+        return steps
+
+    def _build_index(self):
+        rows, columns = {}, {}
+        for x, y in self.obstacles:
+            rows.setdefault(y, []).append(x)
+            columns.setdefault(x, []).append(y)
+        for line in rows.values():
+            line.sort()
+        for line in columns.values():
+            line.sort()
+        self._rows, self._columns = rows, columns
+
+    # --- Arquivos ---
+    @classmethod
+    def load(cls, path) -> "World":
+        """Lê um mundo do arquivo `path` (ver o formato no início do módulo)."""
+        with open(path) as file:
+            return cls._read(file)
+
+    @classmethod
+    def loads(cls, text: str) -> "World":
+        return cls._read(text.splitlines())
+
+    @classmethod
+    def _read(cls, lines) -> "World":
+        world = cls()
+        objects = world.objects
+        obstacles = world.obstacles
+        for number, line in enumerate(lines, 1):
+            fields = line.split("//", 1)[0].split()
+            if not fields:
+                continue
+            try:
+                kind = fields[0]
+                if kind == "objeto" and 3 <= len(fields) <= 4:
+                    cell = (int(fields[1]), int(fields[2]))
+                    count = int(fields[3]) if len(fields) == 4 else 1
+                    if count < 1:
+                        raise ValueError
+                    objects[cell] = objects.get(cell, 0) + count
+                    continue
+                if kind == "obstaculo" and len(fields) == 3:
+                    obstacles.add((int(fields[1]), int(fields[2])))
+                    continue
+            except ValueError:
+                pass
+            raise Exception(f"Mundo inválido, linha {number}: '{line.strip()}'. "
+                            f"Use 'objeto X Y [QUANTIDADE]' ou 'obstaculo X Y'.")
+        return world
+
+    def dump(self, path):
+        """Grava o mundo em `path`, no formato lido por `load`."""
+        with open(path, "w") as file:
+            file.writelines(f"objeto {x} {y} {count}\n" if count > 1 else f"objeto {x} {y}\n"
+                            for (x, y), count in self.objects.items())
+            file.writelines(f"obstaculo {x} {y}\n" for x, y in self.obstacles)
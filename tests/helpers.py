@@ -0,0 +1,46 @@
+"""Auxiliares compartilhados pelos testes dos motores de execução."""
+import glob
+import io
+from unittest.mock import patch
+
+from src.lexer import Lexer
+from src.parser import Parser
+
+
+def parse_code(code):
+    return Parser(Lexer(code).tokenize()).parse()
+
+# Executa o programa e retorna saída (com erro, se houver) e estado final
+def run(interpreter, program, simulation_output=True):
+    interpreter.simulation_output = simulation_output
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        try:
+            interpreter.interpret(program)
+        except Exception as e:
+            print(f"ERRO {e}")
+    state = (interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction,
+             interpreter.has_object, interpreter.environment.values)
+    return fake_stdout.getvalue(), state
+
+# Programas de exemplo e casos de erro comparados entre os motores
+CODES = [open(path).read() for path in sorted(glob.glob('exemplos/*.robo'))] + [
+    'IMPRIMIR 10 / 0;',
+    'VAR z = 0; IMPRIMIR 10 / z;',
+    'IMPRIMIR z + 1;',
+    'SET q = 1 / 0;',
+    'MOVER FRENTE 2 - 3;',
+    'VAR p = 0 - 1; MOVER TRAS p;',
+    'REPETIR "a" VEZES { }',
+    'SE ("x") ENTAO { }',
+    'VAR a = 1; VAR a = 2;',
+    'IMPRIMIR "a" - 1;',
+    'IMPRIMIR -"a";',
+    'VAR s = "a"; IMPRIMIR s + 1; IMPRIMIR 1 + s; IMPRIMIR s * 2; IMPRIMIR s == "a"; IMPRIMIR s - 1;',
+    'VAR s = "a" + 1 * -2; IMPRIMIR s; IMPRIMIR 1 < 2; IMPRIMIR (1 != 2) + 0; IMPRIMIR 2 + "b";',
+    'VAR n = 5; IMPRIMIR n + 1; IMPRIMIR n - 1; IMPRIMIR n * 2; IMPRIMIR n < 9; IMPRIMIR n >= 5; IMPRIMIR n != 5;',
+    'GIRAR ESQUERDA; MOVER TRAS 3; PEGAR; PEGAR; SOLTAR; SOLTAR; IMPRIMIR has_object;',
+    'SE (1 == 0) ENTAO { IMPRIMIR 1; } SE (0) ENTAO { } SENAO { IMPRIMIR robot_direction; }',
+    'VAR n = 0; REPETIR 3 VEZES { REPETIR 0 VEZES { SET n = n + 100; } REPETIR 2 VEZES { SET n = n + 1; } }',
+    'VAR n = 2; REPETIR n VEZES { MOVER FRENTE n; GIRAR DIREITA; MOVER TRAS 1 < 2; } IMPRIMIR robot_x * 10 + robot_y;',
+    'GIRAR ESQUERDA; REPETIR 6 VEZES { MOVER TRAS 2; } MOVER FRENTE 1; MOVER FRENTE x;',
+]
@@ -0,0 +1,92 @@
+import glob
+
+import pytest
+from src.arena import ArenaInterpreter, ArenaProgram, ArenaVisitor, BINARY, IF, NUMBER
+from src.events import MemorySink
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.world import World
+from tests.helpers import parse_code, run
+
+
+CODES = [open(path).read() for path in sorted(glob.glob('exemplos/*.robo'))] + [
+    'IMPRIMIR 10 / 0;',
+    'IMPRIMIR z;',
+    'SET q = 1;',
+    'MOVER FRENTE 2 - 3;',
+    'REPETIR "a" VEZES { }',
+    'SE ("x") ENTAO { }',
+    'VAR a = 1; VAR a = 2;',
+    'IMPRIMIR 99999999999999999999999 + 1;',
+    'VAR s = "a" + 1 * -2; IMPRIMIR s; IMPRIMIR 1 < 2; IMPRIMIR (1 != 2) + 0;',
+    'GIRAR ESQUERDA; MOVER TRAS 3; PEGAR; PEGAR; SOLTAR; SOLTAR; IMPRIMIR has_object;',
+    'SE (1 == 0) ENTAO { IMPRIMIR 1; } SE (0) ENTAO { } SENAO { IMPRIMIR robot_direction; }',
+]
+
+@pytest.mark.parametrize("code", CODES)
+def test_arena_interpreter_matches_interpreter(code):
+    program = parse_code(code)
+    assert run(ArenaInterpreter(), ArenaProgram.from_program(program)) == run(Interpreter(), program)
+
+def test_events_are_the_first_argument(capsys):
+    events = MemorySink()
+    ArenaInterpreter(events).interpret(parse_code('MOVER FRENTE 1; IMPRIMIR robot_y;'))
+    assert events.events == [("MOVER", "FRENTE", 1, 0, 0, 0, 1), ("IMPRIMIR", 1)]
+    assert capsys.readouterr().out == ""
+
+@pytest.mark.parametrize("code, world", [
+    ('MOVER FRENTE 1;\nPEGAR;', "objeto 0 2"),
+    ('MOVER FRENTE 1;\nGIRAR DIREITA;\nMOVER FRENTE 3;', "obstaculo 2 1"),
+])
+def test_world_errors_match_interpreter(code, world):
+    messages = []
+    for interpreter, program in ((ArenaInterpreter(MemorySink()), ArenaProgram.from_program(parse_code(code))),
+                                 (Interpreter(MemorySink()), parse_code(code))):
+        interpreter.world = World.loads(world)
+        with pytest.raises(Exception) as error:
+            interpreter.interpret(program)
+        messages.append(str(error.value))
+    assert messages[0] == messages[1] and "Linha " in messages[0]
+
+def test_arena_layout():
+    arena = ArenaProgram.from_program(parse_code('SE (x > 1) ENTAO { MOVER FRENTE 2; } SENAO { }'))
+    assert len(arena.statements) == 1
+    node = arena.statements[0]
+    assert arena.kinds[node] == IF
+    condition = arena.a[node]
+    assert arena.kinds[condition] == BINARY and arena.position(condition) == (1, 7)
+    assert arena.constants[arena.a[arena.a[condition]]] == 'x'
+    assert arena.kinds[arena.b[condition]] == NUMBER and arena.a[arena.b[condition]] == 1
+    assert len(arena.block(arena.b[node])) == 1 and len(arena.block(arena.c[node])) == 0
+    assert list(arena.walk()) == [node, condition, arena.a[condition], arena.b[condition],
+                                  *arena.block(arena.b[node]), arena.a[arena.block(arena.b[node])[0]]]
+    assert len(list(arena.walk())) == len(arena)
+
+@pytest.mark.parametrize("code, node", [
+    ('REPETIR 3 VEZES { MOVER FRENTE 1; GIRAR DIREITA; }', "MotionBlock"),
+    ('VAR a = 2; REPETIR 3 VEZES { IMPRIMIR a * 2 + 1; }', "ClearCache"),
+])
+def test_optimizer_nodes_are_rejected(code, node):
+    with pytest.raises(Exception, match=f"Nó do otimizador não suportado pela arena: {node}"):
+        ArenaInterpreter().interpret(optimize(parse_code(code)))
+
+def test_arena_deep_nesting():
+    depth = 5_000
+    arena = ArenaProgram.from_program(parse_code('REPETIR 1 VEZES {' * depth + 'PEGAR;' + '}' * depth))
+    assert len(arena) == 2 * depth + 1
+    assert sum(1 for _ in arena.walk()) == len(arena)
+
+def test_arena_visitor_dispatch():
+    class Counter(ArenaVisitor):
+        def __init__(self, program):
+            super().__init__(program)
+            self.moves = 0
+        def visit_MoveStatement(self, node):
+            self.moves += 1
+    arena = ArenaProgram.from_program(parse_code('MOVER FRENTE 1; MOVER TRAS 2;'))
+    counter = Counter(arena)
+    for statement in arena.statements:
+        counter.visit(statement)
+    assert counter.moves == 2
+    with pytest.raises(NotImplementedError, match="PickUpStatement"):
+        Counter(ArenaProgram.from_program(parse_code('PEGAR;'))).visit(0)
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+
+import pytest
+from src.batch import FIELDS, find_scripts, record_dict, run_batch, run_file, summarize, write_csv, write_json
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
+from src.interpreter import Interpreter
+from src.vm import VirtualMachine
+
+SCRIPTS = {
+    "ok.robo": 'VAR n = 3; REPETIR n VEZES { MOVER FRENTE 2; } GIRAR DIREITA; PEGAR; IMPRIMIR n;',
+    "lexico.robo": 'VAR a = 1;\nIMPRIMIR @;',
+    "sintatico.robo": 'MOVER 1;',
+    "semantico.robo": 'IMPRIMIR 1;\nIMPRIMIR q;',
+    "tipo.robo": 'IMPRIMIR "a" - 1;',
+    "execucao.robo": 'MOVER FRENTE 4;\nVAR z = 0;\nIMPRIMIR 10 / z;',
+}
+
+@pytest.fixture
+def corpus(tmp_path):
+    for name, code in SCRIPTS.items():
+        (tmp_path / name).write_text(code)
+    nested = tmp_path / "sub"
+    nested.mkdir()
+    (nested / "quadrado.robo").write_text('REPETIR 4 VEZES { MOVER FRENTE 1; GIRAR DIREITA; }')
+    (nested / "notas.txt").write_text('não é um script')
+    (tmp_path / "__roboscache__").mkdir()
+    (tmp_path / "__roboscache__" / "velho.robo").write_text('MOVER 1;')
+    return tmp_path
+
+def test_find_scripts(corpus):
+    scripts = find_scripts([str(corpus)])
+    assert [path[len(str(corpus)) + 1:] for path in scripts] == [
+        "execucao.robo", "lexico.robo", "ok.robo", "semantico.robo", "sintatico.robo", "tipo.robo",
+        "sub/quadrado.robo"]
+    assert find_scripts([str(corpus / "ok.robo")]) == [str(corpus / "ok.robo")]
+
+@pytest.mark.parametrize("engine", [Interpreter, VirtualMachine, ClosureInterpreter, AOTInterpreter],
+                         ids=["tree", "vm", "closure", "aot"])
+def test_records(corpus, engine):
+    records = {name: record_dict(run_file(str(corpus / name), engine)) for name in SCRIPTS}
+    assert {name: record["status"] for name, record in records.items()} == {
+        "ok.robo": "ok", "lexico.robo": "erro_lexico", "sintatico.robo": "erro_sintatico",
+        "semantico.robo": "erro_semantico", "tipo.robo": "erro_tipo", "execucao.robo": "erro_execucao"}
+    ok = records["ok.robo"]
+    assert (ok["error"], ok["x"], ok["y"], ok["direction"], ok["has_object"]) == (None, 0, 6, "LESTE", True)
+    assert (records["lexico.robo"]["line"], records["lexico.robo"]["column"]) == (2, 10)
+    assert records["sintatico.robo"]["line"] == 1
+    assert records["semantico.robo"]["line"] == 2
+    failed = records["execucao.robo"]
+    assert failed["error"] == "Erro de Execução: Linha 3, coluna 13: Divisão por zero."
+    assert (failed["line"], failed["column"], failed["x"], failed["y"]) == (3, 13, 0, 4)
+    assert all(record[field] >= 0 for record in records.values() for field in ("lex_time", "parse_time", "run_time"))
+
+def test_missing_file(tmp_path):
+    record = record_dict(run_file(str(tmp_path / "nada.robo")))
+    assert record["status"] == "erro_arquivo" and record["x"] is None
+
+def test_parallel_matches_serial(corpus):
+    scripts = find_scripts([str(corpus)]) * 3
+    strip = lambda records: [record[:9] for record in records] # Sem os tempos
+    serial = list(run_batch(scripts, jobs=1))
+    assert strip(run_batch(scripts, jobs=2, chunksize=2)) == strip(serial)
+    assert [record[0] for record in serial] == scripts
+
+def test_summary_and_output(corpus):
+    records = list(run_batch(find_scripts([str(corpus)]), jobs=1))
+    summary = summarize(records)
+    assert (summary["files"], summary["ok"], summary["failed"]) == (7, 2, 5)
+    assert summary["statuses"]["erro_execucao"] == 1
+
+    stream = io.StringIO()
+    write_json(records, stream, elapsed=1.5)
+    data = json.loads(stream.getvalue())
+    assert data["summary"]["elapsed"] == 1.5
+    assert data["records"] == [record_dict(record) for record in records]
+
+    stream = io.StringIO()
+    write_csv(records, stream)
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert tuple(rows[0]) == FIELDS and len(rows) == len(records) + 1
+    assert rows[1][:2] == [records[0][0], records[0][1]]
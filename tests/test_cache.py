@@ -0,0 +1,84 @@
+import glob
+import os
+
+import pytest
+from src import cache as cache_module
+from src.cache import ASTCache, CACHE_DIR_NAME, cache_dir_for
+from tests.helpers import parse_code
+
+
+def tokens_of(program):
+    """Tokens de todos os nós, em pré-ordem, para comparar posições além do repr."""
+    result = []
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        token = getattr(node, 'token', None)
+        if token is not None:
+            result.append((token.type, token.value, token.line, token.column))
+        for name in ('statements', 'condition', 'then_block', 'else_block', 'times', 'body',
+                     'value', 'steps', 'expression', 'left', 'right'):
+            child = getattr(node, name, None)
+            if child is not None and not isinstance(child, (int, str)):
+                stack.append(child)
+    return result
+
+@pytest.mark.parametrize("path", sorted(glob.glob('exemplos/*.robo')))
+def test_roundtrip_examples(tmp_path, path):
+    with open(path) as f:
+        code = f.read()
+    program = parse_code(code)
+    cache = ASTCache(str(tmp_path))
+    assert cache.load(code) is None
+    assert cache.store(code, program)
+    cached = cache.load(code)
+    assert repr(cached) == repr(program)
+    assert tokens_of(cached) == tokens_of(program)
+
+def test_roundtrip_deep_nesting_and_empty_blocks(tmp_path):
+    depth = 5_000
+    code = ('SE (1) ENTAO { } SENAO { } SE (a) ENTAO { PEGAR; } REPETIR 0 VEZES { }'
+            + 'REPETIR 1 VEZES {' * depth + 'IMPRIMIR -(1 + "x") * y;' + '}' * depth)
+    program = parse_code(code)
+    cache = ASTCache(str(tmp_path))
+    assert cache.store(code, program)
+    cached = cache.load(code)
+    assert tokens_of(cached) == tokens_of(program)
+    assert cached.statements[0].else_block == [] and cached.statements[1].else_block is None
+
+def test_key_depends_on_source_and_version(tmp_path, monkeypatch):
+    cache = ASTCache(str(tmp_path))
+    code = 'MOVER FRENTE 1;'
+    cache.store(code, parse_code(code))
+    assert cache.load(code + ' ') is None
+    monkeypatch.setattr(cache_module, '__version__', 'outra')
+    assert cache.load(code) is None
+
+def test_invalid_entries_are_misses(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    code = 'GIRAR DIREITA;'
+    cache.store(code, parse_code(code))
+    with open(cache.path(code), 'r+b') as f:
+        f.seek(6)
+        f.write(b'lixo')
+    assert cache.load(code) is None
+
+def test_writes_are_atomic_and_lru_bounded(tmp_path):
+    codes = [f'VAR v{i} = {i}; IMPRIMIR v{i} + 1;' for i in range(6)]
+    size = max(len(cache_module._dumps(parse_code(code))) for code in codes)
+    cache = ASTCache(str(tmp_path), max_bytes=size * 3)
+    for i, code in enumerate(codes[:3]):
+        cache.store(code, parse_code(code))
+        os.utime(cache.path(code), (i, i))
+    cache.load(codes[0]) # Entrada mais antiga passa a ser a mais recente
+    cache.store(codes[3], parse_code(codes[3]))
+    assert cache.load(codes[1]) is None # A usada há mais tempo foi removida
+    assert cache.load(codes[0]) is not None
+    assert all(name.endswith('.rsc') for name in os.listdir(tmp_path))
+    assert sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)) <= size * 3
+
+def test_cache_dir_next_to_script(tmp_path):
+    assert cache_dir_for(str(tmp_path / 'a.robo')) == str(tmp_path / CACHE_DIR_NAME)
@@ -0,0 +1,30 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from src.closures import ClosureInterpreter
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from tests.helpers import CODES, parse_code, run
+
+
+@pytest.mark.parametrize("code", CODES)
+def test_closures_match_interpreter(code):
+    program = parse_code(code)
+    expected = run(Interpreter(), program)
+    assert run(ClosureInterpreter(), program) == expected
+    assert run(ClosureInterpreter(), optimize(program)) == expected
+    assert run(ClosureInterpreter(), optimize(program), False) == run(Interpreter(), optimize(program), False)
+
+def test_program_is_compiled_once():
+    interpreter = ClosureInterpreter()
+    program = parse_code('VAR n = 0; REPETIR 1000 VEZES { SET n = n + 1; }')
+    with patch('sys.stdout', new=io.StringIO()), patch.object(Interpreter, 'visit', side_effect=AssertionError):
+        interpreter.interpret(program)
+    assert interpreter.environment.get('n') == 1000
+
+def test_statements_run_one_at_a_time():
+    interpreter = ClosureInterpreter()
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        interpreter.interpret_statements(parse_code('VAR n = 2; REPETIR n VEZES { MOVER FRENTE n; } IMPRIMIR robot_y;').statements)
+    assert fake_stdout.getvalue().endswith("[IMPRIMIR] 4\n")
@@ -0,0 +1,82 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from src.codegen import AOTInterpreter, CodeCache, CODE_SUFFIX, compile_program, generate, generate_code
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from tests.helpers import CODES, parse_code, run
+
+
+@pytest.mark.parametrize("code", CODES + [
+    'VAR n = 1; SE (n) ENTAO { VAR m = 2; } IMPRIMIR m;',
+    'VAR n = 0; SE (n) ENTAO { VAR m = 2; } IMPRIMIR m;',
+    'REPETIR 2 VEZES { IMPRIMIR k; VAR k = 1; }',
+    'REPETIR 2 VEZES { VAR k = 1; }',
+    'VAR d = 0; IMPRIMIR (1 - "a") + 1 / d;',
+    'VAR d = 0; IMPRIMIR "a" - (1 / d);',
+    'IMPRIMIR (1 - "a") + x;',
+    'VAR a = "x"; IMPRIMIR a + a; IMPRIMIR a * 3; IMPRIMIR -a;',
+    'MOVER FRENTE robot_x + 1; IMPRIMIR robot_direction + has_object;',
+])
+def test_aot_matches_interpreter(code):
+    program = parse_code(code)
+    expected = run(Interpreter(), program)
+    assert run(AOTInterpreter(), program) == expected
+    assert run(AOTInterpreter(), optimize(program)) == run(Interpreter(), optimize(program))
+    assert run(AOTInterpreter(), optimize(program), False) == run(Interpreter(), optimize(program), False)
+
+def test_errors_report_robo_positions():
+    code = 'VAR n = 1;\nREPETIR 2 VEZES {\n  MOVER FRENTE n;\n  SET n = n - 1 - 1;\n}'
+    output, _ = run(AOTInterpreter(), parse_code(code))
+    assert output.endswith("ERRO Erro de Execução: Linha 3, coluna 16: Número de passos inválido: -1. "
+                           "Deve ser um inteiro positivo.\n")
+
+def test_variables_are_python_locals():
+    source, line_map = generate(parse_code('VAR n = 0; REPETIR 10 VEZES { SET n = n + 1; }'))
+    assert "for _ in range(10):" in source
+    assert "v0_n = (v0_n + 1)" in source or "v0_n = _add(v0_n, 1)" in source
+    assert "_values" not in source.split("try:")[1].split("finally:")[0]
+    assert set(line_map.values()) <= {(1, 1), (1, 5)}
+
+def test_statements_run_one_at_a_time():
+    interpreter = AOTInterpreter()
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        interpreter.interpret_statements(parse_code('VAR n = 2; REPETIR n VEZES { MOVER FRENTE n; } IMPRIMIR robot_y;').statements)
+    assert fake_stdout.getvalue().endswith("[IMPRIMIR] 4\n")
+
+def test_too_deep_falls_back_to_stack_interpreter():
+    depth = 200
+    program = parse_code('VAR n = 0;' + 'REPETIR 1 VEZES {' * depth + 'SET n = n + 1;' + '}' * depth)
+    assert generate_code(program) is None
+    output, state = run(AOTInterpreter(), program)
+    assert state[4] == {'n': 1}
+    assert output.count("SET 'n'") == 1
+
+def test_code_cache_roundtrip(tmp_path):
+    code = 'VAR n = 0; REPETIR 3 VEZES { SET n = n + 2; MOVER FRENTE n; } IMPRIMIR n / 0;'
+    cache = CodeCache(str(tmp_path))
+    assert cache.load(code) is None
+    assert cache.store(code, compile_program(optimize(parse_code(code))))
+    assert cache.path(code).endswith(CODE_SUFFIX)
+    generated = cache.load(code)
+    assert generated is not None
+    interpreter = AOTInterpreter()
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        with pytest.raises(Exception, match="Linha 1, coluna 74: Divisão por zero."):
+            interpreter.execute(generated)
+    assert fake_stdout.getvalue() == run(Interpreter(), parse_code(code))[0].split("ERRO")[0]
+    assert interpreter.robot_y == 12
+
+def test_code_cache_keys(tmp_path):
+    code = 'IMPRIMIR 1;'
+    assert CodeCache(str(tmp_path)).path(code) != CodeCache(str(tmp_path), optimized=False).path(code)
+    cache = CodeCache(str(tmp_path))
+    cache.store(code, compile_program(parse_code(code)))
+    with open(cache.path(code), 'rb') as f:
+        data = f.read()
+    with open(cache.path(code), 'wb') as f:
+        f.write(data[:-5])
+    assert cache.load(code) is None
+    assert os.listdir(tmp_path) == [os.path.basename(cache.path(code))]
@@ -0,0 +1,101 @@
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+from src.arena import ArenaInterpreter
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
+from src.events import (
+    VAR, SET, MOVE, TURN, PICK_UP, DROP, PRINT, MemorySink, NDJSONSink, NullSink, TextSink, event_dict
+)
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.stack_interpreter import StackInterpreter
+from src.vm import VirtualMachine
+from tests.helpers import CODES, parse_code
+
+
+def collect(engine, program, simulation=True):
+    events = MemorySink(simulation)
+    try:
+        engine(events=events).interpret(program)
+    except Exception as e:
+        events.events.append(("ERRO", str(e)))
+    return events.events
+
+ENGINES = [StackInterpreter, VirtualMachine, ClosureInterpreter, AOTInterpreter, ArenaInterpreter]
+
+@pytest.mark.parametrize("code", CODES)
+@pytest.mark.parametrize("engine", ENGINES, ids=["stack", "vm", "closure", "aot", "arena"])
+def test_engines_emit_same_events(engine, code):
+    assert collect(engine, parse_code(code)) == collect(Interpreter, parse_code(code))
+    program = parse_code(code) if engine is ArenaInterpreter else optimize(parse_code(code))
+    assert collect(engine, program, False) == collect(Interpreter, parse_code(code), False)
+
+def test_event_tuples():
+    code = 'VAR a = 2; SET a = a + 1; MOVER FRENTE a; GIRAR DIREITA; PEGAR; PEGAR; SOLTAR; SOLTAR; IMPRIMIR a;'
+    assert collect(Interpreter, parse_code(code)) == [
+        (VAR, 'a', 2), (SET, 'a', 3), (MOVE, 'FRENTE', 3, 0, 0, 0, 3), (TURN, 'DIREITA', 'NORTE', 'LESTE'),
+        (PICK_UP, 0, 3, True), (PICK_UP, 0, 3, False), (DROP, 0, 3, True), (DROP, 0, 3, False), (PRINT, 3),
+    ]
+
+def test_quiet_sink_receives_only_prints():
+    code = 'VAR a = 2; MOVER FRENTE a; IMPRIMIR a; REPETIR 1000 VEZES { MOVER FRENTE 1; GIRAR DIREITA; }'
+    interpreter = Interpreter(MemorySink(simulation=False))
+    interpreter.interpret(optimize(parse_code(code)))
+    assert interpreter.events.events == [(PRINT, 2)]
+    assert (interpreter.robot_x, interpreter.robot_y) == (0, 2)
+
+@pytest.mark.parametrize("code", CODES)
+def test_text_sink_matches_default_output(code):
+    def output(events):
+        with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            try:
+                Interpreter(events).interpret(parse_code(code))
+            except Exception:
+                pass
+            if events is not None:
+                events.flush()
+        return fake_stdout.getvalue()
+    assert output(TextSink(buffer_lines=3)) == output(None)
+
+def test_text_sink_buffers_until_flush():
+    stream = io.StringIO()
+    events = TextSink(stream, buffer_lines=3)
+    events.emit((PRINT, 1))
+    events.emit((VAR, 'x', "a"))
+    assert stream.getvalue() == ""
+    events.emit((MOVE, 'TRAS', 2, 0, 0, 0, -2))
+    events.emit((TURN, 'ESQUERDA', 'NORTE', 'OESTE'))
+    assert stream.getvalue() == ("[IMPRIMIR] 1\n[Simulação] VAR 'x' = a\n"
+                                 "[Simulação] Robo moveu TRAS 2 passos. Posicao: (0,0) -> (0,-2)\n")
+    events.flush()
+    assert stream.getvalue().endswith("[Simulação] Robo girou ESQUERDA. Direção: NORTE -> OESTE\n")
+
+def test_default_sink_writes_immediately():
+    interpreter = Interpreter()
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        interpreter.visit(parse_code('IMPRIMIR "olá";').statements[0])
+        assert fake_stdout.getvalue() == "[IMPRIMIR] olá\n"
+
+def test_ndjson_sink():
+    stream = io.StringIO()
+    events = NDJSONSink(stream)
+    Interpreter(events).interpret(parse_code('VAR s = "ação"; PEGAR; IMPRIMIR s + 1;'))
+    events.flush()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines == [
+        {"event": "VAR", "name": "s", "value": "ação"},
+        {"event": "PEGAR", "x": 0, "y": 0, "done": True},
+        {"event": "IMPRIMIR", "value": "ação1"},
+    ]
+    assert event_dict((TURN, 'DIREITA', 'NORTE', 'LESTE')) == {
+        "event": "GIRAR", "direction": "DIREITA", "from": "NORTE", "to": "LESTE"}
+
+def test_null_sink():
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        interpreter = VirtualMachine(NullSink())
+        interpreter.interpret(parse_code('VAR a = 1; MOVER FRENTE 2; IMPRIMIR a;'))
+    assert fake_stdout.getvalue() == ""
+    assert interpreter.robot_y == 2
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.events import NullSink
+from src.fleet import FleetInterpreter, run_fleet
+from src.interpreter import Interpreter
+from src.motion import HEADINGS
+from src.optimizer import optimize
+from tests.helpers import CODES, parse_code
+
+
+def run_one(program, x, y, direction, has_object):
+    """Estado final, variáveis e erro de um `Interpreter` a partir do estado dado."""
+    interpreter = Interpreter(NullSink())
+    interpreter.robot_x, interpreter.robot_y = x, y
+    interpreter.robot_direction, interpreter.has_object = direction, has_object
+    error = None
+    try:
+        interpreter.interpret(program)
+    except Exception as e:
+        error = str(e)
+    state = (interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction, interpreter.has_object)
+    return state, dict(interpreter.environment.values), error
+
+def assert_matches_interpreter(program, size=12, seed=0):
+    rng = random.Random(seed)
+    xs = [rng.randint(-3, 3) for _ in range(size)]
+    ys = [rng.randint(-3, 3) for _ in range(size)]
+    directions = [rng.choice(HEADINGS) for _ in range(size)]
+    objects = [rng.random() < 0.5 for _ in range(size)]
+    fleet = run_fleet(program, size, x=xs, y=ys, direction=directions, has_object=objects)
+    for robot in range(size):
+        state, variables, error = run_one(program, xs[robot], ys[robot], directions[robot], objects[robot])
+        assert fleet.state(robot) == state
+        assert fleet.errors[robot] == error
+        for name, value in variables.items():
+            fleet_value = fleet.value(name, robot)
+            assert fleet_value == value and type(fleet_value) is type(value), name
+
+FLEET_CODES = [
+    # Condições e repetições diferentes para cada robô
+    'SE (robot_x > 0) ENTAO { MOVER FRENTE robot_x; GIRAR DIREITA; } SENAO { GIRAR ESQUERDA; PEGAR; }',
+    'VAR n = robot_y + 3; REPETIR n VEZES { MOVER FRENTE 1; SE (robot_y > 2) ENTAO { SOLTAR; } } IMPRIMIR n;',
+    'REPETIR robot_x + 3 VEZES { REPETIR robot_y + 3 VEZES { GIRAR DIREITA; MOVER TRAS 1; } }',
+    'VAR t = 0; SE (has_object) ENTAO { SET t = robot_direction; } SENAO { SET t = robot_x * 2; } IMPRIMIR t + 1;',
+    # Erros só em alguns robôs
+    'VAR d = 10 / robot_x; MOVER FRENTE 2; SET d = d + 1;',
+    'MOVER FRENTE robot_y; GIRAR DIREITA;',
+    'SE (robot_x > 0) ENTAO { VAR a = 1; } VAR a = 2; MOVER FRENTE a;',
+    'SE (robot_x > 0) ENTAO { VAR s = "x"; } SENAO { VAR s = 1; } VAR r = s + 1; IMPRIMIR s - 1; MOVER FRENTE 1;',
+    'SE (robot_x == 0) ENTAO { VAR q = robot_direction; } SE (q) ENTAO { PEGAR; }',
+    'VAR b = robot_x < 0; VAR c = b + b; VAR e = -b; VAR f = b == 1; MOVER FRENTE c;',
+]
+
+@pytest.mark.parametrize("code", CODES + FLEET_CODES)
+def test_fleet_matches_interpreter(code):
+    program = parse_code(code)
+    assert_matches_interpreter(program)
+    assert_matches_interpreter(optimize(program), seed=1)
+
+def test_random_programs():
+    rng = random.Random(21)
+    expressions = ['robot_x', 'robot_y + a', 'a * 2 - robot_x', 'has_object', 'a / (robot_y + 4)', 'a']
+    statements = ['SET a = {e};', 'MOVER FRENTE {e} * {e};', 'MOVER TRAS 1;', 'GIRAR DIREITA;',
+                  'GIRAR ESQUERDA;', 'PEGAR;', 'SOLTAR;', 'IMPRIMIR {e};']
+    for seed in range(100):
+        def block(depth):
+            parts = []
+            for _ in range(rng.randint(1, 4)):
+                roll = rng.random()
+                if depth < 3 and roll < 0.2:
+                    parts.append(f'REPETIR ({rng.choice(expressions)}) / 2 + 1 VEZES {{ {block(depth + 1)} }}')
+                elif depth < 3 and roll < 0.4:
+                    parts.append(f'SE ({rng.choice(expressions)} > 0) ENTAO {{ {block(depth + 1)} }} '
+                                 f'SENAO {{ {block(depth + 1)} }}')
+                else:
+                    parts.append(rng.choice(statements).format(e=rng.choice(expressions)))
+            return " ".join(parts)
+        code = f'VAR a = {rng.randint(0, 3)}; {block(0)}'
+        assert_matches_interpreter(optimize(parse_code(code)), size=8, seed=seed)
+
+def test_uniform_initial_state():
+    fleet = FleetInterpreter(3, x=5, direction="LESTE")
+    fleet.interpret(parse_code('MOVER FRENTE 2; GIRAR DIREITA; PEGAR;'))
+    assert [fleet.state(robot) for robot in range(3)] == [(7, 0, "SUL", True)] * 3
+    assert fleet.errors == [None] * 3
+
+def test_robot_steps_are_counted():
+    fleet = run_fleet(parse_code('REPETIR robot_x VEZES { MOVER FRENTE 1; }'), 3, x=[0, 1, 2])
+    # REPETIR para os 3 robôs e MOVER 0 + 1 + 2 vezes
+    assert fleet.steps == 3 + 3
+
+def test_stopped_robots_keep_their_state():
+    fleet = run_fleet(parse_code('MOVER FRENTE 1; VAR d = 1 / robot_x; MOVER FRENTE 1;'), 2, x=[0, 1])
+    assert fleet.state(0) == (0, 1, "NORTE", False) and fleet.state(1) == (1, 2, "NORTE", False)
+    assert fleet.errors[0] == "Erro de Execução: Linha 1, coluna 27: Divisão por zero."
+    with pytest.raises(KeyError):
+        fleet.value("d", 0)
@@ -0,0 +1,87 @@
+import glob
+import random
+import pytest
+from src.incremental import IncrementalSession
+from src.lexer import Lexer
+from src.parser import Parser
+
+def _full(code):
+    try:
+        tokens = Lexer(code).tokenize()
+        return [(t.type, t.value, t.line, t.column) for t in tokens], repr(Parser(tokens).parse())
+    except Exception as e:
+        return str(e)
+
+def _session_state(session):
+    return [(t.type, t.value, t.line, t.column) for t in session.tokens], repr(session.program)
+
+CODIGO = '''VAR passos = 3;
+VAR nome = "robo";
+MOVER FRENTE passos;
+REPETIR 2 VEZES {
+    GIRAR DIREITA; // comentário
+}
+IMPRIMIR nome + passos;
+'''
+
+# Edição de um VAR: só a declaração afetada é trocada; as demais são reaproveitadas
+def test_edit_reuses_unchanged_statements():
+    session = IncrementalSession(CODIGO)
+    before = list(session.statements)
+    start = CODIGO.index('3')
+    session.edit(start, start + 1, '42')
+    assert _session_state(session) == _full(session.source)
+    assert session.statements[0] is not before[0]
+    assert all(a is b for a, b in zip(session.statements[1:], before[1:]))
+    assert session.statements[0].value.value == 42
+
+# Inserir linhas desloca a numeração dos tokens reaproveitados
+def test_inserted_lines_shift_following_tokens():
+    session = IncrementalSession(CODIGO)
+    start = CODIGO.index('MOVER')
+    session.edit(start, start, 'GIRAR ESQUERDA;\n\n')
+    assert _session_state(session) == _full(session.source)
+    assert session.statements[-1].expression.token.line == 9
+
+# Abrir um bloco ou uma string que fecha mais adiante força a análise completa
+@pytest.mark.parametrize("old, new", [
+    ('}', ''),
+    ('GIRAR DIREITA;', 'SE (1) ENTAO {'),
+    ('"robo"', '"robo'),
+    ('MOVER FRENTE passos;', 'IMPRIMIR "a\nb";'),
+])
+def test_structural_edits_match_full_parse(old, new):
+    session = IncrementalSession(CODIGO)
+    start = CODIGO.index(old)
+    try:
+        session.edit(start, start + len(old), new)
+        result = _session_state(session)
+    except Exception as e:
+        result = str(e)
+    assert result == _full(session.source)
+
+# Após uma edição inválida, a sessão se recupera na edição seguinte
+def test_session_recovers_after_error():
+    session = IncrementalSession(CODIGO)
+    start = CODIGO.index(';')
+    with pytest.raises(Exception, match="Esperava-se 'PONTO_VIRGULA'"):
+        session.edit(start, start + 1, '')
+    session.edit(start, start, ';')
+    assert _session_state(session) == _full(CODIGO)
+
+# Edições aleatórias: o resultado deve ser sempre igual ao da análise completa
+def test_random_edits_match_full_parse():
+    base = ''.join(open(path).read() for path in sorted(glob.glob('exemplos/*.robo')))
+    snippets = ['VAR z = 3;\n', '}', '{', '"', '\n', ' ', 'MOVER FRENTE 2;', '// c\n', ';', '7', '']
+    rng = random.Random(42)
+    for _ in range(20):
+        session = IncrementalSession(base)
+        for _ in range(10):
+            start = rng.randint(0, len(session.source))
+            end = min(len(session.source), start + rng.choice([0, 1, 5, 20]))
+            try:
+                session.edit(start, end, rng.choice(snippets))
+                result = _session_state(session)
+            except Exception as e:
+                result = str(e)
+            assert result == _full(session.source)
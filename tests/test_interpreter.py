@@ -2,17 +2,25 @@ import pytest
 from src.lexer import Lexer
 from src.parser import Parser
 from src.interpreter import Interpreter
+from src.stack_interpreter import StackInterpreter
+from src.vm import VirtualMachine
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
 from unittest.mock import patch
 import io
 
+# Motores de execução dos testes parametrizados por `engine`
+ENGINES = [Interpreter, StackInterpreter, VirtualMachine, ClosureInterpreter, AOTInterpreter]
+ENGINE_IDS = ["tree", "stack", "vm", "closure", "aot"]
+
 # Helper para executar um código e retornar a saída (e o estado final do interpretador)
-def execute_code(code):
+def execute_code(code, engine=Interpreter):
     lexer = Lexer(code)
     tokens = lexer.tokenize()
     parser = Parser(tokens)
     ast = parser.parse()
     
-    interpreter = Interpreter()
+    interpreter = engine()
     
     # Captura a saída do print
     with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
@@ -157,4 +165,39 @@ def test_undefined_variable_error():
 def test_division_by_zero_error():
     code = 'IMPRIMIR 10 / 0;'
     with pytest.raises(Exception, match="Erro de Execução: .*Divisão por zero."):
-        execute_code(code)
\ No newline at end of file
+        execute_code(code)
+# Teste do modo de execução em fluxo: cada declaração roda assim que é produzida
+def test_interpret_statements_runs_as_statements_arrive():
+    from src.parser import StreamParser
+    code = 'MOVER FRENTE 2; MOVER FRENTE 3;'
+    interpreter = Interpreter()
+    positions = []
+    def statements():
+        for statement in StreamParser(Lexer(code).iter_tokens()).iter_statements():
+            positions.append(interpreter.robot_y) # Estado no momento em que a próxima chega
+            yield statement
+    with patch('sys.stdout', new=io.StringIO()):
+        interpreter.interpret_statements(statements())
+    assert positions == [0, 2]
+    assert interpreter.robot_y == 5
+
+# Teste de aninhamento profundo: parser e motores 'stack', 'vm' e 'aot' (que recorre ao 'stack') sem recursão por nível
+@pytest.mark.parametrize("engine", [StackInterpreter, VirtualMachine, AOTInterpreter], ids=["stack", "vm", "aot"])
+def test_deeply_nested_blocks(engine):
+    depth = 20_000 # Muito acima do limite de recursão do Python
+    code = 'VAR n = 0;' + 'SE (n == 0) ENTAO { REPETIR 1 VEZES {' * depth + 'SET n = n + 1;' + '} }' * depth
+    output, interpreter = execute_code(code, engine)
+    assert interpreter.environment.get('n') == 1
+    assert output.count("SET 'n'") == 1
+
+@pytest.mark.parametrize("engine", ENGINES, ids=ENGINE_IDS)
+def test_nested_repeat_counts(engine):
+    code = '''
+    VAR n = 0;
+    REPETIR 3 VEZES {
+        REPETIR 0 VEZES { SET n = n + 100; }
+        REPETIR 2 VEZES { SE (n > 3) ENTAO { SET n = n + 10; } SENAO { SET n = n + 1; } }
+    }
+    '''
+    _, interpreter = execute_code(code, engine)
+    assert interpreter.environment.get('n') == 1 + 1 + 1 + 1 + 10 + 10
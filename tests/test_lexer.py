@@ -81,3 +81,53 @@ def test_unterminated_string():
     lexer = Lexer(code)
     with pytest.raises(Exception, match=r'Erro léxico na linha \d+, coluna \d+: String não terminada\. Esperava-se \'"\'\.'):
         lexer.tokenize()
+
+# --- Testes diferenciais: tokenize (regex) x tokenize_char_by_char ---
+def _lex_result(code, char_by_char=False):
+    lexer = Lexer(code)
+    try:
+        tokens = lexer.tokenize_char_by_char() if char_by_char else lexer.tokenize()
+    except Exception as e:
+        return str(e)
+    return [(t.type, t.value, t.line, t.column) for t in tokens]
+
+@pytest.mark.parametrize("code", [
+    '',
+    '   \n\t  ',
+    'VAR x = 10; // comentário no fim',
+    '// só comentário',
+    'IMPRIMIR "linha 1\nlinha 2"; MOVER FRENTE 1;', # string com quebra de linha
+    'SE (a >= 1) ENTAO { SET a = a - 1; } SENAO { GIRAR esquerda; }',
+    'x==y!=z<=w>=v<u>t/s*r',
+    '10abc _x1 posição 12²3 ²b',
+    'VAR x = 1;\r\n\x0bMOVER\x0cTRAS 2;',
+    'VAR a = 1 ! 2;',
+    'VAR a = ½;',
+    'IMPRIMIR "aberta\n\n',
+])
+def test_regex_tokenizer_matches_char_by_char(code):
+    assert _lex_result(code) == _lex_result(code, char_by_char=True)
+
+def test_regex_tokenizer_matches_char_by_char_on_examples():
+    import glob
+    for path in glob.glob('exemplos/*.robo'):
+        with open(path) as f:
+            code = f.read()
+        assert _lex_result(code) == _lex_result(code, char_by_char=True), path
+
+# --- Leitura em blocos (Lexer.from_file + iter_tokens) ---
+@pytest.mark.parametrize("chunk_size", [1, 3, 16])
+def test_streaming_lexer_matches_tokenize(chunk_size):
+    import io
+    code = 'VAR a = 10; // comentário\nIMPRIMIR "multi\nlinha" + a;\nSE (a >= 10) ENTAO { GIRAR DIREITA; }'
+    streamed = Lexer.from_file(io.StringIO(code), chunk_size).iter_tokens()
+    expected = Lexer(code).tokenize()
+    assert [(t.type, t.value, t.line, t.column) for t in streamed] == \
+        [(t.type, t.value, t.line, t.column) for t in expected]
+
+def test_streaming_lexer_errors():
+    import io
+    tokens = Lexer.from_file(io.StringIO('MOVER FRENTE 1;\nIMPRIMIR "sem fim'), 4).iter_tokens()
+    assert next(tokens).type == TokenType.MOVER # Os tokens saem antes do erro
+    with pytest.raises(Exception, match=r"Erro léxico na linha 2, coluna 18: String não terminada"):
+        list(tokens)
@@ -0,0 +1,131 @@
+import random
+
+import pytest
+from src.ast_nodes import CachedExpression, ClearCache, RepeatStatement, children
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer, optimize
+from src.resolver import resolve
+from src.stack_interpreter import StackInterpreter
+from src.typechecker import check_types
+from src.vm import VirtualMachine
+from tests.helpers import CODES, parse_code, run
+
+
+def checked(program):
+    resolve(program)
+    check_types(program)
+    return program
+
+def cached_nodes(root):
+    nodes = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (CachedExpression, ClearCache)):
+            nodes.append(node)
+        stack.extend(children(node))
+    return nodes
+
+ENGINES = [Interpreter, StackInterpreter, VirtualMachine, ClosureInterpreter, AOTInterpreter]
+
+LOOP_CODES = [
+    'VAR a = 3; VAR b = 4; VAR s = 0; REPETIR 5 VEZES { SET s = s + a * b + (a * b) / 2; '
+    'REPETIR 2 VEZES { SET s = s + a * b - robot_x * 2; } SE (a * b > 10) ENTAO { IMPRIMIR a * b + s; } } IMPRIMIR s;',
+    # Escrita no corpo: a expressão não é invariante
+    'VAR a = 1; REPETIR 4 VEZES { IMPRIMIR a * 2; SET a = a + 1; IMPRIMIR a * 2; }',
+    # Movimento no corpo invalida as leituras do estado do robô
+    'VAR n = 2; REPETIR 3 VEZES { IMPRIMIR robot_x + n * 2; MOVER FRENTE n * 2; IMPRIMIR robot_x + n * 2; }',
+    'VAR d = 0; REPETIR 3 VEZES { IMPRIMIR robot_direction + d; GIRAR DIREITA; }',
+    'REPETIR 2 VEZES { IMPRIMIR has_object * 5; PEGAR; IMPRIMIR has_object * 5; SOLTAR; }',
+    # Subexpressões repetidas no mesmo bloco, com e sem escrita entre elas
+    'VAR x = 2; VAR y = 3; IMPRIMIR x * y + 1; IMPRIMIR x * y - 1; SET x = 5; IMPRIMIR x * y; IMPRIMIR (x * y) * (x * y);',
+    'VAR s = "a"; VAR n = 2; IMPRIMIR s * n + s; IMPRIMIR s * n; REPETIR n * 2 VEZES { IMPRIMIR s + n * 2; }',
+    # Erros dentro de expressões guardadas: mesma mensagem, posição e ordem
+    'VAR z = 0; REPETIR 3 VEZES { IMPRIMIR 1; IMPRIMIR 10 / z; }',
+    'VAR z = 0; REPETIR 0 VEZES { IMPRIMIR 10 / z; } IMPRIMIR 1;',
+    'VAR i = 0; REPETIR 3 VEZES { SE (i == 2) ENTAO { IMPRIMIR 6 / i - 6 / i; } SET i = i + 1; }',
+    'VAR n = 1; REPETIR 2 VEZES { SE (n) ENTAO { VAR m = n * 3; IMPRIMIR n * 3 + m; } }',
+    'VAR n = 1; REPETIR 2 VEZES { IMPRIMIR q * n; }',
+    'VAR s = "x"; REPETIR 2 VEZES { IMPRIMIR s - 1; }',
+    # Laços aninhados, com o número de repetições invariante
+    'VAR k = 2; VAR t = 0; REPETIR k * 2 VEZES { REPETIR k * 2 VEZES { REPETIR k + 1 VEZES { SET t = t + k * k; } } } IMPRIMIR t;',
+    'VAR k = 1; REPETIR 3 VEZES { REPETIR k VEZES { IMPRIMIR k * 10; } SET k = k + 1; }',
+    # Movimentos fundidos em MotionBlocks, com repetições invariantes
+    'VAR k = 2; REPETIR 3 VEZES { REPETIR k * 2 VEZES { MOVER FRENTE 1; GIRAR DIREITA; } IMPRIMIR robot_x + k * 2; }',
+]
+
+@pytest.mark.parametrize("code", CODES + LOOP_CODES)
+@pytest.mark.parametrize("engine", ENGINES, ids=["tree", "stack", "vm", "closure", "aot"])
+def test_licm_matches_unoptimized_interpreter(engine, code):
+    expected = run(Interpreter(), parse_code(code))
+    assert run(engine(), checked(optimize(parse_code(code)))) == expected
+    expected = run(Interpreter(), parse_code(code), False)
+    assert run(engine(), checked(optimize(parse_code(code))), False) == expected
+
+def test_random_programs():
+    rng = random.Random(18)
+    expressions = ['a * b', 'a + 1', 'b - a', 'a * b + c', '(a + 1) * 2', 'robot_x + a', 'c * 2', 'b / a']
+    statements = ['SET a = {e};', 'SET c = {e};', 'IMPRIMIR {e};', 'MOVER FRENTE 1;', 'GIRAR DIREITA;',
+                  'IMPRIMIR {e} + ({e});']
+    for _ in range(150):
+        def block(depth):
+            parts = []
+            for _ in range(rng.randint(1, 4)):
+                roll = rng.random()
+                if depth < 3 and roll < 0.25:
+                    parts.append(f'REPETIR {rng.randint(0, 3)} VEZES {{ {block(depth + 1)} }}')
+                elif depth < 3 and roll < 0.35:
+                    parts.append(f'SE ({rng.choice(expressions)} > 2) ENTAO {{ {block(depth + 1)} }}')
+                else:
+                    parts.append(rng.choice(statements).format(e=rng.choice(expressions)))
+            return " ".join(parts)
+        code = f'VAR a = {rng.randint(0, 3)}; VAR b = {rng.randint(0, 3)}; VAR c = 1; {block(0)}'
+        expected = run(Interpreter(), parse_code(code))
+        for engine in ENGINES:
+            assert run(engine(), checked(optimize(parse_code(code)))) == expected, code
+
+def test_invariant_expression_is_hoisted():
+    program = optimize(parse_code('VAR a = 2; VAR s = 0; REPETIR 3 VEZES { SET s = s + a * a; }'))
+    clear, loop = program.statements[2:]
+    assert type(clear) is ClearCache and type(loop) is RepeatStatement
+    cached = cached_nodes(loop)
+    assert [type(node) for node in cached] == [CachedExpression]
+    assert clear.indexes == (cached[0].index,)
+
+def test_written_variables_are_not_hoisted():
+    program = optimize(parse_code('VAR a = 2; REPETIR 3 VEZES { SET a = a * a; MOVER FRENTE 1; IMPRIMIR robot_x * 2; }'))
+    assert cached_nodes(program) == []
+
+def test_common_subexpressions_share_cache():
+    program = optimize(parse_code('VAR a = 2; IMPRIMIR a * a + 1; IMPRIMIR a * a - 1;'))
+    clear = program.statements[0] # No início do bloco
+    assert type(clear) is ClearCache
+    first, second = (node for node in cached_nodes(program) if type(node) is CachedExpression)
+    assert first.index == second.index == clear.indexes[0]
+
+def test_original_ast_is_not_modified():
+    program = parse_code('VAR a = 2; REPETIR 3 VEZES { IMPRIMIR a * a; }')
+    text = repr(program)
+    optimize(program)
+    assert repr(program) == text and cached_nodes(program) == []
+
+def test_can_be_disabled():
+    program = parse_code('VAR a = 2; REPETIR 3 VEZES { IMPRIMIR a * a; } IMPRIMIR a * a + a * a;')
+    assert cached_nodes(optimize(program, licm=False)) == []
+    assert cached_nodes(Optimizer(licm=False).optimize(program)) == []
+
+def test_stream_statements_use_distinct_indexes():
+    optimizer = Optimizer()
+    loop = parse_code('VAR a = 1; REPETIR 2 VEZES { IMPRIMIR a * 2; }').statements[1]
+    first = optimizer.optimize_statement(loop)
+    second = optimizer.optimize_statement(loop)
+    assert first[0].indexes != second[0].indexes
+
+def test_deep_nesting():
+    depth = 3000
+    code = 'VAR a = 2; ' + 'REPETIR 1 VEZES { ' * depth + 'IMPRIMIR a * a;' + ' }' * depth
+    expected = run(StackInterpreter(), parse_code(code))
+    for engine in (StackInterpreter, VirtualMachine, AOTInterpreter):
+        assert run(engine(), checked(optimize(parse_code(code)))) == expected
@@ -0,0 +1,112 @@
+import io
+import random
+from unittest.mock import patch
+
+import pytest
+from src.ast_nodes import MotionBlock, RepeatStatement
+from src.interpreter import Interpreter
+from src.motion import MAX_DEPTH
+from src.optimizer import optimize
+from src.stack_interpreter import StackInterpreter
+from tests.helpers import parse_code
+
+
+# Executa o programa e retorna (saída, estado final do robô); a mensagem de erro entra na saída
+def run(program, engine=Interpreter, simulation_output=True):
+    interpreter = engine()
+    interpreter.simulation_output = simulation_output
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        try:
+            interpreter.interpret(program)
+        except Exception as e:
+            print(f"ERRO {e}")
+    state = (interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction)
+    return fake_stdout.getvalue(), state
+
+def without_events(output):
+    return "".join(line for line in output.splitlines(True) if not line.startswith("[Simulação]"))
+
+PROGRAMS = [
+    'MOVER FRENTE 2; MOVER FRENTE 3;',
+    'REPETIR 1000 VEZES { MOVER FRENTE 1; GIRAR DIREITA; }',
+    'REPETIR 7 VEZES { MOVER TRAS 2; GIRAR ESQUERDA; MOVER FRENTE 1; }',
+    'GIRAR ESQUERDA; REPETIR 5 VEZES { MOVER TRAS 3; }', # TRAS em OESTE diminui x
+    'GIRAR DIREITA; REPETIR 9 VEZES { GIRAR DIREITA; GIRAR DIREITA; MOVER TRAS 1; MOVER FRENTE 4; }',
+    'VAR n = 3; REPETIR 4 VEZES { REPETIR n VEZES { MOVER FRENTE n * 2; } GIRAR DIREITA; } IMPRIMIR robot_x;',
+    'REPETIR 3 VEZES { MOVER FRENTE 1; REPETIR 5 VEZES { GIRAR ESQUERDA; MOVER TRAS 2; } } IMPRIMIR robot_y;',
+    'MOVER FRENTE 1; GIRAR DIREITA; PEGAR; MOVER FRENTE 2; MOVER TRAS 1; IMPRIMIR robot_x;',
+    'MOVER FRENTE 5; REPETIR robot_y VEZES { MOVER FRENTE 1; }',
+    'REPETIR 3 VEZES { MOVER FRENTE robot_y + 1; GIRAR DIREITA; }',
+    'SE (1) ENTAO { MOVER FRENTE 1; } MOVER FRENTE 2; GIRAR DIREITA;',
+    'REPETIR 0 VEZES { MOVER FRENTE x; } REPETIR 2 VEZES { REPETIR 0 VEZES { MOVER FRENTE y; } GIRAR DIREITA; }',
+    # Erros: o mesmo ponto, a mesma mensagem e o mesmo estado do robô
+    'REPETIR 10 VEZES { MOVER FRENTE 1; GIRAR DIREITA; MOVER FRENTE x; }',
+    'VAR n = 0 - 1; REPETIR 3 VEZES { MOVER FRENTE 2; MOVER TRAS n; }',
+    'VAR d = 0; REPETIR 3 VEZES { MOVER FRENTE 1; MOVER FRENTE 4 / d; }',
+    'VAR s = "a"; MOVER FRENTE 1; MOVER FRENTE s;',
+    'REPETIR 2 VEZES { MOVER FRENTE 1; REPETIR 0 - 1 VEZES { GIRAR DIREITA; } }',
+    'REPETIR 0 - 3 VEZES { MOVER FRENTE 1; }',
+]
+
+@pytest.mark.parametrize("engine", [Interpreter, StackInterpreter])
+@pytest.mark.parametrize("code", PROGRAMS)
+def test_same_events_and_state(code, engine):
+    program = parse_code(code)
+    expected_output, expected_state = run(program, engine)
+    optimized = optimize(program)
+    # Com a saída ligada, os eventos são produzidos passo a passo
+    assert run(optimized, engine) == (expected_output, expected_state)
+    # Sem os eventos, o efeito composto leva ao mesmo estado e aos mesmos erros
+    output, state = run(optimized, engine, simulation_output=False)
+    assert state == expected_state
+    assert output == without_events(expected_output)
+
+def test_motion_blocks_are_formed():
+    program = optimize(parse_code('''
+    MOVER FRENTE 2; MOVER FRENTE 3; PEGAR;
+    REPETIR 4 VEZES { REPETIR 10 VEZES { MOVER FRENTE 1; } GIRAR DIREITA; }
+    REPETIR 3 VEZES { MOVER FRENTE robot_x; }
+    REPETIR 3 VEZES { MOVER FRENTE 1; PEGAR; }
+    '''))
+    first, _, loop, variant, mixed = program.statements
+    assert type(first) is MotionBlock and first.times is None and len(first.statements) == 2
+    assert type(loop) is MotionBlock and loop.depth == 2
+    assert type(loop.statements[0]) is MotionBlock
+    assert type(variant) is RepeatStatement # Passos dependem da posição do robô
+    assert type(mixed) is RepeatStatement
+
+def test_nesting_limit():
+    code = 'REPETIR 1 VEZES { ' * (MAX_DEPTH + 1) + 'MOVER FRENTE 1; GIRAR DIREITA;' + ' }' * (MAX_DEPTH + 1)
+    program = optimize(parse_code(code))
+    outer = program.statements[0]
+    assert type(outer) is RepeatStatement
+    assert type(outer.body[0]) is MotionBlock and outer.body[0].depth == MAX_DEPTH
+    _, expected_state = run(parse_code(code), simulation_output=False)
+    assert run(program, simulation_output=False)[1] == expected_state
+
+def test_closed_form_is_constant_time():
+    # Passo a passo, 10^18 repetições não terminariam: o teste só termina em forma fechada
+    program = optimize(parse_code('REPETIR 1000000000000000000 VEZES { MOVER FRENTE 3; GIRAR DIREITA; MOVER TRAS 1; }'))
+    _, state = run(program, simulation_output=False)
+    # Período de 4 iterações, começando em NORTE, LESTE, SUL e OESTE (TRAS em OESTE diminui x)
+    cycles = 1000000000000000000 // 4
+    assert state == (cycles * (-1 + 3 - 1 - 3), cycles * (3 + 1 - 3 - 1), "NORTE")
+
+def test_random_programs():
+    rng = random.Random(12)
+    statements = ['MOVER FRENTE {n};', 'MOVER TRAS {n};', 'GIRAR DIREITA;', 'GIRAR ESQUERDA;', 'MOVER FRENTE k;']
+    for _ in range(200):
+        def block(depth):
+            parts = []
+            for _ in range(rng.randint(1, 4)):
+                if depth < 3 and rng.random() < 0.3:
+                    parts.append(f'REPETIR {rng.randint(0, 6)} VEZES {{ {block(depth + 1)} }}')
+                else:
+                    parts.append(rng.choice(statements).format(n=rng.randint(0, 5)))
+            return " ".join(parts)
+        code = f'VAR k = {rng.randint(0, 3)}; GIRAR {rng.choice(["DIREITA", "ESQUERDA"])}; {block(0)}'
+        program = parse_code(code)
+        expected_output, expected_state = run(program)
+        optimized = optimize(program)
+        assert run(optimized) == (expected_output, expected_state), code
+        assert run(optimized, simulation_output=False)[1] == expected_state, code
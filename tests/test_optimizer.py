@@ -0,0 +1,88 @@
+import glob
+import io
+from unittest.mock import patch
+
+import pytest
+from src.ast_nodes import BooleanLiteral, IfStatement, NumberLiteral, PrintStatement, StringLiteral
+from src.interpreter import Interpreter
+from src.optimizer import Optimizer, optimize
+from tests.helpers import parse_code
+
+
+# Executa a AST e retorna a saída, incluindo a mensagem de erro (se houver)
+def run(program):
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        try:
+            Interpreter().interpret(program)
+        except Exception as e:
+            print(f"ERRO {e}")
+    return fake_stdout.getvalue()
+
+@pytest.mark.parametrize("expr, expected_type, expected", [
+    ('(10 * 4) / 2', NumberLiteral, 20),
+    ('"a" + "b" + 1', StringLiteral, 'ab1'),
+    ('1 == 1', BooleanLiteral, True),
+    ('-(2 - 5) * +3', NumberLiteral, 9),
+    ('(1 != 2) + 0', NumberLiteral, 1),
+    ('"a" < "b"', BooleanLiteral, True),
+])
+def test_constant_folding(expr, expected_type, expected):
+    expression = optimize(parse_code(f'IMPRIMIR {expr};')).statements[0].expression
+    assert type(expression) is expected_type
+    assert expression.value == expected
+
+def test_partial_folding_keeps_variables():
+    program = optimize(parse_code('VAR x = 1; SET x = x + 2 * 3;'))
+    assert repr(program.statements[1]) == "SET x = (ID('x') + 6);"
+
+@pytest.mark.parametrize("code", [
+    'IMPRIMIR 1;\nIMPRIMIR (10 * 4) / (2 - 2);',
+    'MOVER FRENTE 2 - 5;',
+    'REPETIR 1 - 2 VEZES { PEGAR; }',
+    'SE ("a" + "b") ENTAO { PEGAR; }',
+    'IMPRIMIR "a" - 1;',
+    'IMPRIMIR 1 < "b";',
+    'IMPRIMIR "ab" * 2;',
+])
+def test_errors_keep_message_and_position(code):
+    assert run(optimize(parse_code(code))) == run(parse_code(code))
+
+def test_dead_branches_and_empty_loops():
+    code = '''
+    SE (1 == 1) ENTAO { IMPRIMIR "sim"; } SENAO { IMPRIMIR "não"; }
+    SE (0) ENTAO { IMPRIMIR "nunca"; }
+    SE (2 < 1) ENTAO { PEGAR; } SENAO { SE (robot_x > 0) ENTAO { SOLTAR; } }
+    REPETIR 0 VEZES { IMPRIMIR "nunca"; }
+    REPETIR 3 VEZES { SE (0) ENTAO { PEGAR; } }
+    REPETIR 2 VEZES { GIRAR DIREITA; PEGAR; }
+    '''
+    program = optimize(parse_code(code))
+    assert [type(s).__name__ for s in program.statements] == ['PrintStatement', 'IfStatement', 'RepeatStatement']
+    assert program.statements[0].expression.value == "sim"
+    assert run(program) == run(parse_code(code))
+
+def test_original_ast_is_not_modified():
+    program = parse_code('SE (1 == 1) ENTAO { IMPRIMIR 1 + 1; }')
+    before = repr(program)
+    optimize(program)
+    assert repr(program) == before
+    assert isinstance(program.statements[0], IfStatement)
+
+def test_optimize_statement_for_streaming():
+    optimizer = Optimizer()
+    statement = parse_code('SE (1) ENTAO { PEGAR; SOLTAR; }').statements[0]
+    assert [repr(s) for s in optimizer.optimize_statement(statement)] == ['PEGAR;', 'SOLTAR;']
+
+def test_deep_nesting():
+    depth = 5_000
+    program = optimize(parse_code('REPETIR 2 VEZES {' * depth + 'IMPRIMIR 1 + 1;' + '}' * depth))
+    node = program.statements[0]
+    for _ in range(depth - 1):
+        node = node.body[0]
+    assert isinstance(node.body[0], PrintStatement) and node.body[0].expression.value == 2
+
+def test_examples_run_the_same():
+    for path in glob.glob('exemplos/*.robo'):
+        with open(path) as f:
+            program = parse_code(f.read())
+        assert run(optimize(program)) == run(program), path
@@ -0,0 +1,61 @@
+import pytest
+from src.lexer import Lexer
+from src.parallel_lexer import tokenize_parallel, split_source
+
+def _as_tuples(tokens):
+    return [(t.type, t.value, t.line, t.column) for t in tokens]
+
+def _serial(code):
+    try:
+        return _as_tuples(Lexer(code).tokenize())
+    except Exception as e:
+        return str(e)
+
+def _parallel(code):
+    try:
+        return _as_tuples(tokenize_parallel(code, workers=2, threshold=0, min_chunk_size=40))
+    except Exception as e:
+        return str(e)
+
+PROGRAMA = '''// missão gerada
+VAR passos = 3;
+MOVER FRENTE passos;
+GIRAR DIREITA; // comentário com "aspas
+IMPRIMIR "texto com // barras";
+IMPRIMIR "string que atravessa
+varias
+linhas"; MOVER TRAS 2;
+REPETIR 2 VEZES {
+    SE (robot_x >= 1) ENTAO { GIRAR ESQUERDA; }
+}
+'''
+
+# Teste principal: saída idêntica ao lexer serial, token a token
+def test_parallel_matches_serial():
+    code = PROGRAMA * 20
+    assert len(split_source(code, 8)) > 1
+    assert _parallel(code) == _serial(code)
+
+def test_parallel_matches_serial_on_examples():
+    import glob
+    for path in glob.glob('exemplos/*.robo'):
+        with open(path) as f:
+            code = f.read()
+        assert _parallel(code * 5) == _serial(code * 5), path
+
+@pytest.mark.parametrize("code", [
+    PROGRAMA * 5 + 'VAR erro = #;\n' + PROGRAMA,  # erro léxico no meio
+    PROGRAMA * 5 + 'IMPRIMIR "nunca fecha;\n' + PROGRAMA.replace('"', ''),  # string não terminada
+    PROGRAMA * 5 + 'IMPRIMIR "\n' * 30 + '";\n',  # string longa cruzando vários cortes
+])
+def test_parallel_matches_serial_errors_and_long_strings(code):
+    assert _parallel(code) == _serial(code)
+
+# Abaixo do limite, usa o lexer serial diretamente
+def test_small_sources_fall_back_to_serial():
+    code = 'MOVER FRENTE 1;'
+    assert _as_tuples(tokenize_parallel(code)) == _serial(code)
+
+# Uma fonte vazia não gera trechos; o resultado é só o EOF do lexer serial
+def test_empty_source():
+    assert _as_tuples(tokenize_parallel("", workers=2, threshold=0)) == _serial("")
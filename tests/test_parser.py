@@ -1,6 +1,6 @@
 import pytest
 from src.lexer import Lexer, TokenType
-from src.parser import Parser
+from src.parser import Parser, StreamParser
 from src.ast_nodes import (
     Program, VarDeclaration, AssignmentStatement, NumberLiteral, Identifier,
     MoveStatement, RotateStatement, PrintStatement, BinaryExpression, StringLiteral,
@@ -104,4 +104,89 @@ def test_pickup_drop_parsing():
     ast = parse_code(code)
     assert len(ast.statements) == 2
     assert isinstance(ast.statements[0], PickUpStatement)
-    assert isinstance(ast.statements[1], DropStatement)
\ No newline at end of file
+    assert isinstance(ast.statements[1], DropStatement)
+
+# Teste do StreamParser: declarações geradas uma a uma a partir de um iterador de tokens
+def test_stream_parser_yields_statements_incrementally():
+    code = 'VAR x = 1; MOVER FRENTE x; REPETIR 2 VEZES { GIRAR DIREITA; }'
+    consumed = []
+    def tokens():
+        for token in Lexer(code).tokenize():
+            consumed.append(token)
+            yield token
+    statements = StreamParser(tokens()).iter_statements()
+    first = next(statements)
+    assert isinstance(first, VarDeclaration)
+    assert len(consumed) < 8 # Só leu até o início da próxima declaração
+    rest = list(statements)
+    assert [type(s) for s in rest] == [MoveStatement, RepeatStatement]
+    assert repr(Program([first] + rest)) == repr(parse_code(code))
+
+# --- Expressões: precedência, associatividade e aninhamento sem recursão ---
+@pytest.mark.parametrize("expr, expected", [
+    ('1 + 2 * 3', '(1 + (2 * 3))'),
+    ('1 - 2 - 3', '((1 - 2) - 3)'),
+    ('8 / 4 * 2', '((8 / 4) * 2)'),
+    ('-a * b', '((-ID(\'a\')) * ID(\'b\'))'),
+    ('a * - - b + c', '((ID(\'a\') * (-(-ID(\'b\')))) + ID(\'c\'))'),
+    ('(1 + 2) * 3', '((1 + 2) * 3)'),
+    ('a < b == c', '((ID(\'a\') < ID(\'b\')) == ID(\'c\'))'),
+    ('a + 1 >= b * 2', '((ID(\'a\') + 1) >= (ID(\'b\') * 2))'),
+    ('-(1 + 2)', '(-(1 + 2))'),
+    ('((("s")))', "'s'"),
+])
+def test_expression_trees(expr, expected):
+    assert repr(parse_code(f'IMPRIMIR {expr};').statements[0].expression) == expected
+
+def test_deeply_nested_expressions_do_not_recurse():
+    depth = 50_000
+    expr = parse_code('IMPRIMIR ' + '(' * depth + '1' + ')' * depth + ' + ' + '-' * depth + 'x;').statements[0].expression
+    assert isinstance(expr, BinaryExpression) and expr.left.value == 1
+    node = expr.right
+    for _ in range(depth):
+        node = node.right
+    assert isinstance(node, Identifier)
+
+@pytest.mark.parametrize("code, message", [
+    ('IMPRIMIR (1 + 2;', r"Esperava-se 'PARENTESE_DIR', mas encontrou 'PONTO_VIRGULA' \(';'\) na linha 1, coluna 16"),
+    ('IMPRIMIR 1 + ;', r"Expressão primária inesperada: ';' na linha 1, coluna 14"),
+    ('IMPRIMIR 1 2;', r"Esperava-se 'PONTO_VIRGULA', mas encontrou 'NUMERO_INTEIRO'"),
+])
+def test_expression_syntax_errors(code, message):
+    with pytest.raises(Exception, match=message):
+        parse_code(code)
+
+# --- Hash-consing de subárvores idênticas ---
+def test_hash_consing_shares_safe_subtrees_and_keeps_positions():
+    code = 'MOVER FRENTE 1;\nIMPRIMIR "x: " + robot_x;\nMOVER FRENTE 1;\nIMPRIMIR "x: " + robot_x;\nSET a = a + 1;\nSET a = a + 1;'
+    parser = Parser(Lexer(code).tokenize(), hash_cons=True)
+    ast = parser.parse()
+    assert repr(ast) == repr(parse_code(code))
+    move1, print1, move2, print2, set1, set2 = ast.statements
+    # MOVER e PEGAR reportam erros do mundo na própria posição: só os passos são compartilhados
+    assert move1 is not move2 and move1.steps is move2.steps and print1 is print2
+    assert list(parser.positions[move1.steps]) == [1, 14, 3, 14, 5, 13, 6, 13] # O literal 1 de todas as linhas
+    assert list(parser.positions[print1.expression]) == [2, 16, 4, 16]
+    # 'a' pode não estar definida: cada ocorrência mantém seu próprio nó (e posição do erro)
+    assert set1 is not set2 and set1.value.left is not set2.value.left
+    assert set1.value.right is set2.value.right
+
+@pytest.mark.parametrize("code", [
+    'IMPRIMIR 1 / 0; IMPRIMIR 1 / 0;',
+    'IMPRIMIR 4 / 2; IMPRIMIR 4 / 2;',
+    'SE (robot_direction) ENTAO { }\nSE (robot_direction) ENTAO { }',
+    'MOVER FRENTE robot_x - 1; MOVER FRENTE robot_x - 1;',
+    'REPETIR 2 VEZES { REPETIR -1 VEZES { } }\nREPETIR 2 VEZES { REPETIR -1 VEZES { } }',
+])
+def test_hash_consing_keeps_error_positions(code):
+    from src.interpreter import Interpreter
+    def run(hash_cons):
+        statements = Parser(Lexer(code).tokenize(), hash_cons=hash_cons).parse().statements
+        messages = []
+        for statement in statements:
+            try:
+                Interpreter().visit(statement)
+            except Exception as e:
+                messages.append(str(e))
+        return messages
+    assert run(True) == run(False)
@@ -0,0 +1,74 @@
+import io
+from unittest.mock import patch
+
+import pytest
+from src.environment import Environment
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.resolver import resolve
+from src.stack_interpreter import StackInterpreter
+from tests.helpers import CODES, parse_code, run
+
+
+def resolved(code):
+    program = parse_code(code)
+    resolve(program)
+    return program
+
+@pytest.mark.parametrize("code", CODES + [
+    'VAR n = 1; SE (n) ENTAO { VAR m = 2; } IMPRIMIR m;',
+    'VAR n = 0; SE (n) ENTAO { VAR m = 2; } IMPRIMIR m; SET m = 1;',
+    'REPETIR 2 VEZES { IMPRIMIR k; VAR k = 1; }',
+    'REPETIR 2 VEZES { VAR k = 1; }',
+    'VAR x = x + 1;',
+    'MOVER FRENTE robot_x + 1; IMPRIMIR robot_direction + has_object; PEGAR; IMPRIMIR has_object * robot_y;',
+])
+@pytest.mark.parametrize("engine", [Interpreter, StackInterpreter], ids=["tree", "stack"])
+def test_slots_match_environment(engine, code):
+    # Mesmo com erros estáticos, a execução do programa resolvido é a mesma
+    assert run(engine(), resolved(code)) == run(engine(), parse_code(code))
+    program = optimize(parse_code(code))
+    resolve(program)
+    assert run(engine(), program, False) == run(engine(), optimize(parse_code(code)), False)
+
+def test_slot_indexes():
+    program = resolved('VAR a = 1; VAR b = a; SET a = b + robot_x;')
+    assert program.slot_names == ('a', 'b')
+    declare_a, declare_b, assign = program.statements
+    assert (declare_a.slot, declare_b.slot, declare_b.value.slot, assign.slot) == (0, 1, 0, 0)
+    assert assign.value.left.slot == 1
+    assert assign.value.right.slot < 0
+
+def test_variables_are_not_looked_up_in_environment():
+    program = resolved('VAR n = 0; REPETIR 100 VEZES { SET n = n + 1; }')
+    interpreter = Interpreter()
+    with patch('sys.stdout', new=io.StringIO()), \
+         patch.object(Environment, 'get', side_effect=AssertionError), \
+         patch.object(Environment, 'exists', side_effect=AssertionError):
+        interpreter.interpret(program)
+    assert interpreter.environment.get('n') == 100
+
+@pytest.mark.parametrize("code, errors", [
+    ('VAR a = 1; IMPRIMIR a; SET a = 2;', []),
+    ('IMPRIMIR b;', ["Linha 1, coluna 10: Variável 'b' não definida."]),
+    ('SET c = 1;', ["Linha 1, coluna 5: Variável 'c' não declarada antes de ser atribuída."]),
+    ('VAR a = 1;\nVAR a = 2;', ["Linha 2, coluna 5: Variável 'a' já declarada neste escopo."]),
+    ('VAR x = x;', ["Linha 1, coluna 9: Variável 'x' não definida."]),
+    ('REPETIR 2 VEZES { VAR d = 0; }', ["Linha 1, coluna 23: Variável 'd' já declarada neste escopo."]),
+    ('REPETIR 1 VEZES { VAR d = 0; } VAR d = 1;', ["Linha 1, coluna 36: Variável 'd' já declarada neste escopo."]),
+    # Só erros certos: declarações que podem não ter executado ficam para a execução
+    ('VAR n = 2; REPETIR n VEZES { VAR d = 0; } VAR d = 1; IMPRIMIR d;', []),
+    ('SE (1) ENTAO { VAR m = 1; } IMPRIMIR m; VAR m = 2;', []),
+    ('SE (1) ENTAO { VAR m = 1; } SENAO { VAR m = 2; } VAR m = 3;', ["Linha 1, coluna 54: Variável 'm' já declarada neste escopo."]),
+    ('REPETIR 2 VEZES { IMPRIMIR k; VAR k = 1; }', ["Linha 1, coluna 28: Variável 'k' não definida.",
+                                                   "Linha 1, coluna 35: Variável 'k' já declarada neste escopo."]),
+])
+def test_static_errors(code, errors):
+    assert resolve(parse_code(code)) == errors
+
+def test_deeply_nested_program():
+    depth = 20_000
+    program = parse_code('VAR n = 0;' + 'SE (n == 0) ENTAO { REPETIR 1 VEZES {' * depth + 'SET n = n + 1;' + '} }' * depth)
+    assert resolve(program) == []
+    _, state = run(StackInterpreter(), program, False)
+    assert state[4] == {'n': 1}
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from src.events import MemorySink
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.resolver import resolve
+from src.scheduler import ROUND_ROBIN, TIME_SLICED, AsyncInterpreter, Scheduler, run_robots
+from tests.helpers import CODES, parse_code, run
+
+
+def collect(interpreter, program):
+    try:
+        interpreter.interpret(program)
+    except Exception as e:
+        return interpreter.events.events, str(e)
+    return interpreter.events.events, None
+
+@pytest.mark.parametrize("code", CODES)
+def test_async_interpreter_matches_interpreter(code):
+    assert run(AsyncInterpreter(), parse_code(code)) == run(Interpreter(), parse_code(code))
+    program = optimize(parse_code(code))
+    resolve(program)
+    assert run(AsyncInterpreter(), program) == run(Interpreter(), parse_code(code))
+    assert run(AsyncInterpreter(), program, False) == run(Interpreter(), parse_code(code), False)
+
+@pytest.mark.parametrize("fairness", [ROUND_ROBIN, TIME_SLICED])
+def test_scheduled_robots_match_interpreter(fairness):
+    scheduler = Scheduler(fairness, time_slice=0.0001)
+    expected = []
+    for code in CODES * 3:
+        program = optimize(parse_code(code))
+        scheduler.add(program, events=MemorySink())
+        expected.append(collect(Interpreter(MemorySink()), parse_code(code)))
+    robots = asyncio.run(scheduler.run())
+    for robot, (events, error) in zip(robots, expected):
+        assert robot.events.events == events
+        assert robot.error == error and robot.status == ("ok" if error is None else "erro")
+
+def test_round_robin_interleaves_actions():
+    events = MemorySink()
+    scheduler = Scheduler(ROUND_ROBIN)
+    for name in ("a", "b", "c"):
+        scheduler.add(parse_code(f'REPETIR 3 VEZES {{ IMPRIMIR "{name}"; }}'), events=events)
+    asyncio.run(scheduler.run())
+    assert "".join(event[1] for event in events.events) == "abcabcabc"
+    assert scheduler.switches == 9
+
+def test_time_sliced_runs_robot_until_slice_ends():
+    events = MemorySink()
+    scheduler = Scheduler(TIME_SLICED, time_slice=60)
+    for name in ("a", "b"):
+        scheduler.add(parse_code(f'REPETIR 3 VEZES {{ IMPRIMIR "{name}"; }}'), events=events)
+    asyncio.run(scheduler.run())
+    assert "".join(event[1] for event in events.events) == "aaabbb"
+    assert scheduler.switches == 0
+
+def test_step_budget():
+    scheduler = Scheduler(budget=5)
+    limited = scheduler.add(parse_code('VAR n = 0; REPETIR 10 VEZES { MOVER FRENTE 1; SET n = n + 1; }'))
+    free = scheduler.add(parse_code('REPETIR 10 VEZES { MOVER FRENTE 1; }'), budget=100)
+    short = scheduler.add(parse_code('MOVER FRENTE 1; GIRAR DIREITA;'))
+    asyncio.run(scheduler.run())
+    assert (limited.status, limited.steps, limited.robot_y, limited.environment.get("n")) == ("limite", 5, 5, 5)
+    assert (free.status, free.robot_y) == ("ok", 10)
+    assert (short.status, short.steps) == ("ok", 2)
+
+def test_cancellation_and_timeout():
+    async def main():
+        scheduler = Scheduler()
+        slow = scheduler.add(parse_code('REPETIR 1000000 VEZES { MOVER FRENTE 1; }'))
+        fast = scheduler.add(parse_code('MOVER FRENTE 1;'))
+        waiting = asyncio.ensure_future(scheduler.run())
+        await asyncio.sleep(0.01)
+        scheduler.cancel(slow)
+        await waiting
+        return slow, fast
+    slow, fast = asyncio.run(main())
+    assert slow.status == "cancelado" and 0 < slow.robot_y < 1000000
+    assert fast.status == "ok"
+
+    robots = run_robots([parse_code('REPETIR 1000000 VEZES { GIRAR DIREITA; }')] * 2, timeout=0.01)
+    assert [robot.status for robot in robots] == ["cancelado", "cancelado"]
+
+def test_cancel_before_start():
+    async def main():
+        scheduler = Scheduler()
+        robot = scheduler.add(parse_code('MOVER FRENTE 1;'))
+        waiting = asyncio.ensure_future(scheduler.run())
+        await asyncio.sleep(0) # As tarefas são criadas, mas ainda não rodaram
+        scheduler.cancel()
+        await waiting
+        return robot
+    robot = asyncio.run(main())
+    assert robot.status == "cancelado" and robot.robot_y == 0
+
+def test_other_coroutines_run_between_actions():
+    async def main():
+        scheduler = Scheduler()
+        robot = scheduler.add(parse_code('REPETIR 5 VEZES { MOVER FRENTE 1; }'))
+        positions = []
+        async def telemetry():
+            while robot.status is None:
+                positions.append(robot.robot_y)
+                await asyncio.sleep(0)
+        await asyncio.gather(scheduler.run(), telemetry())
+        return positions
+    assert asyncio.run(main())[:5] == [0, 1, 2, 3, 4]
+
+def test_initial_state_and_names():
+    scheduler = Scheduler()
+    robot = scheduler.add(parse_code('MOVER FRENTE 2;'), name="r1", x=3, y=4, direction="OESTE", has_object=True)
+    asyncio.run(scheduler.run())
+    assert (robot.name, robot.robot_x, robot.robot_y, robot.has_object) == ("r1", 1, 4, True)
+    with pytest.raises(Exception, match="Justiça desconhecida"):
+        Scheduler("aleatoria")
@@ -0,0 +1,80 @@
+import pytest
+from src.events import NullSink
+from src.interpreter import Interpreter
+from src import sweep
+from src.sweep import apply_overrides, grid, parse_value, read_csv, run_sweep, run_variant
+from src.vm import VirtualMachine
+from tests.helpers import parse_code
+
+SPIRAL = open('exemplos/espiral_recursiva.robo').read()
+
+
+def run_source(code):
+    """Estado final de um `Interpreter` executando o código-fonte (ou o erro)."""
+    interpreter = Interpreter(NullSink())
+    try:
+        interpreter.interpret(parse_code(code))
+    except Exception as e:
+        return str(e)
+    return interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction, interpreter.has_object
+
+def source_with(overrides):
+    code = SPIRAL
+    for name, value in overrides.items():
+        code = code.replace(f"VAR {name} = ", f"VAR {name} = {value}; VAR _{name} = ", 1)
+    return code
+
+def test_grid_and_values(tmp_path):
+    assert grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+    assert grid({}) == [{}]
+    assert [parse_value(text) for text in ("12", " -3 ", "abc", "1.5")] == [12, -3, "abc", "1.5"]
+    path = tmp_path / "variantes.csv"
+    path.write_text("tamanho_passo, num_giros\n5,2\n7,texto\n")
+    assert read_csv(path) == [{"tamanho_passo": 5, "num_giros": 2}, {"tamanho_passo": 7, "num_giros": "texto"}]
+
+def test_overrides_replace_first_top_level_declaration():
+    program = parse_code('VAR a = 1; SE (a) ENTAO { VAR b = 2; } VAR c = a + 1;')
+    changed = apply_overrides(program, {"a": 5, "c": "x"})
+    assert changed.statements[0].value.value == 5 and changed.statements[2].value.value == "x"
+    assert changed.statements[1] is program.statements[1]
+    assert program.statements[0].value.value == 1 # O original não muda
+    with pytest.raises(Exception, match="Variável 'b' não declarada no nível superior"):
+        apply_overrides(program, {"b": 1})
+    with pytest.raises(Exception, match="Valor inválido para 'a'"):
+        apply_overrides(program, {"a": 1.5})
+
+@pytest.mark.parametrize("engine", [Interpreter, VirtualMachine], ids=["tree", "vm"])
+def test_variants_match_edited_source(engine):
+    program = parse_code(SPIRAL)
+    for overrides in grid({"tamanho_passo": [0, 3, 10], "num_giros": [0, 5, -1]}):
+        record = run_variant(program, overrides, engine)
+        expected = run_source(source_with(overrides))
+        if isinstance(expected, str):
+            assert (record[1], record[2]) == ("erro_execucao", expected)
+        else:
+            assert record[1] == "ok" and record[5:9] == expected
+
+def test_errors_are_reported_per_variant():
+    program = parse_code(SPIRAL)
+    record = run_variant(program, {"num_giros": "muitos"}, index=7)
+    assert record[:5] == (7, "erro_tipo", record[2], 9, 9)
+    assert run_variant(program, {"outra": 1})[1] == "erro_parametro"
+
+def records_by_variant(records):
+    return {record[0]: record[:9] for record in records} # Sem o tempo
+
+def test_parallel_sweep_matches_serial():
+    program = parse_code(SPIRAL)
+    variants = grid({"tamanho_passo": range(-1, 12), "num_giros": [1, 4, "x"]})
+    serial = list(run_sweep(program, variants, jobs=1))
+    assert [record[0] for record in serial] == list(range(len(variants)))
+    parallel = list(run_sweep(program, iter(variants), jobs=2, chunksize=5))
+    assert len(parallel) == len(variants)
+    assert records_by_variant(parallel) == records_by_variant(serial)
+
+def test_serialized_program_without_fork(monkeypatch):
+    program = parse_code(SPIRAL)
+    variants = grid({"tamanho_passo": range(6)})
+    expected = records_by_variant(run_sweep(program, variants, jobs=1))
+    monkeypatch.setattr(sweep.multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    assert records_by_variant(run_sweep(program, variants, jobs=2, chunksize=2)) == expected
@@ -0,0 +1,59 @@
+import glob
+import pytest
+from src.lexer import Lexer
+from src.parser import Parser
+from src.token_stream import TokenStream
+
+def _as_tuples(tokens):
+    return [(t.type, t.value, t.line, t.column) for t in tokens]
+
+CODIGOS = [
+    'IMPRIMIR "Olá Mundo"; MOVER FRENTE 10;',
+    'VAR x = 5; SET x = (x + 2) * 3 / 4;\nSE (x == 2) ENTAO { girar esquerda; } SENAO { MOVER TRAS 1; }',
+    'IMPRIMIR "multi\nlinha"; MOVER FRENTE 1;\nGIRAR DIREITA;',
+    '10abc ²b // comentário\n',
+]
+
+# O stream compacto deve expor exatamente os mesmos tokens da lista do Lexer
+@pytest.mark.parametrize("code", CODIGOS)
+def test_stream_matches_lexer(code):
+    assert _as_tuples(TokenStream(code)) == _as_tuples(Lexer(code).tokenize())
+
+def test_stream_matches_lexer_on_examples():
+    for path in glob.glob('exemplos/*.robo'):
+        with open(path) as f:
+            code = f.read()
+        assert _as_tuples(TokenStream(code)) == _as_tuples(Lexer(code).tokenize()), path
+
+# O Parser roda diretamente sobre o stream
+def test_parser_runs_on_stream():
+    for path in glob.glob('exemplos/*.robo'):
+        with open(path) as f:
+            code = f.read()
+        expected = repr(Parser(Lexer(code).tokenize()).parse())
+        assert repr(Parser(TokenStream(code)).parse()) == expected, path
+
+# Linha/coluna calculadas sob demanda nas mensagens de erro
+def test_syntax_error_positions_from_stream():
+    code = 'VAR x = 1;\nIMPRIMIR "a\nb";\nMOVER FRENTE 1 GIRAR DIREITA;'
+    with pytest.raises(Exception) as expected:
+        Parser(Lexer(code).tokenize()).parse()
+    with pytest.raises(Exception) as actual:
+        Parser(TokenStream(code)).parse()
+    assert str(actual.value) == str(expected.value)
+    assert "na linha 3, coluna 16" in str(actual.value)
+
+def test_lexical_errors_match_lexer():
+    code = 'VAR x = 1;\nVAR y = #;'
+    with pytest.raises(Exception, match=r"Erro léxico na linha 2, coluna 9: Caractere inesperado: '#'"):
+        TokenStream(code)
+
+def test_line_index_is_lazy():
+    stream = TokenStream('MOVER FRENTE 1;\nGIRAR DIREITA;')
+    assert stream._line_starts is None
+    assert stream[4].line == 2
+    assert stream._line_starts is not None
+
+def test_stream_is_smaller_than_token_list():
+    stream = TokenStream('MOVER FRENTE 1;\n' * 1000)
+    assert stream.nbytes / len(stream) < 10
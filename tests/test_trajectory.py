@@ -0,0 +1,121 @@
+import io
+import os
+
+import pytest
+from src.closures import ClosureInterpreter
+from src.events import EventSink, TeeSink, TextSink, PRINT
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.trajectory import HEADER_SIZE, RECORD_SIZE, Trajectory, TrajectoryRecorder
+from src.vm import VirtualMachine
+from tests.helpers import CODES, parse_code
+
+
+def record(tmp_path, code, engine=Interpreter, **kwargs):
+    path = tmp_path / "trajetoria.rtj"
+    with TrajectoryRecorder(path, **kwargs) as recorder:
+        interpreter = engine(recorder)
+        try:
+            interpreter.interpret(optimize(parse_code(code)))
+        except Exception:
+            pass
+    return path, interpreter
+
+class StateSink(EventSink):
+    """Guarda o estado do robô após cada evento da simulação."""
+
+    def __init__(self):
+        self.interpreter = None
+        self.states = []
+
+    def emit(self, event):
+        if event[0] != PRINT:
+            interpreter = self.interpreter
+            self.states.append((interpreter.robot_x, interpreter.robot_y, interpreter.robot_direction,
+                                interpreter.has_object))
+
+def replay_states(code):
+    sink = StateSink()
+    sink.interpreter = interpreter = Interpreter(sink)
+    try:
+        interpreter.interpret(parse_code(code))
+    except Exception:
+        pass
+    return sink.states
+
+@pytest.mark.parametrize("code", CODES)
+def test_states_match_interpreter(tmp_path, code):
+    path, interpreter = record(tmp_path, code)
+    with Trajectory(path) as trajectory:
+        states = list(trajectory.states())
+        assert trajectory.final_state() == (interpreter.robot_x, interpreter.robot_y,
+                                            interpreter.robot_direction, interpreter.has_object)
+    # Eventos que não mudam o estado (MOVER 0, PEGAR segurando) não geram passos
+    replayed = replay_states(code)
+    expected = [state for previous, state in zip([(0, 0, "NORTE", False)] + replayed, replayed) if state != previous]
+    assert states == expected
+
+def test_repeated_moves_are_run_length_encoded(tmp_path):
+    code = 'REPETIR 100000 VEZES { MOVER FRENTE 1; } REPETIR 6 VEZES { GIRAR DIREITA; } PEGAR; SOLTAR; MOVER TRAS 2;'
+    path, interpreter = record(tmp_path, code, engine=VirtualMachine)
+    with Trajectory(path) as trajectory:
+        assert list(trajectory.records()) == [
+            (100000, 0, 1, 0, 0), (6, 0, 0, 1, 0), (1, 0, 0, 0, 1), (1, 0, 0, 0, -1), (1, 0, 2, 0, 0)]
+        assert trajectory.final_state() == (0, 100002, "SUL", False)
+        assert sum(1 for _ in trajectory.steps()) == 100009
+    assert os.path.getsize(path) == HEADER_SIZE + 5 * RECORD_SIZE
+
+def test_chunked_writes(tmp_path):
+    code = 'REPETIR 50 VEZES { MOVER FRENTE 1; GIRAR DIREITA; MOVER FRENTE 2; GIRAR ESQUERDA; }'
+    path, _ = record(tmp_path, code, engine=ClosureInterpreter, chunk_records=3)
+    with Trajectory(path) as trajectory:
+        assert len(trajectory) == 200
+        assert trajectory.final_state() == (100, 50, "NORTE", False)
+
+def test_start_state_and_truncated_file(tmp_path):
+    path = tmp_path / "t.rtj"
+    with TrajectoryRecorder(path, start=(3, -4, "SUL", True)) as recorder:
+        recorder.emit(("MOVER", "FRENTE", 2, 3, -4, 3, -6))
+        recorder.emit(("SOLTAR", 3, -6, True))
+    with open(path, "ab") as file:
+        file.write(b"\0" * 5) # Registro incompleto
+    with Trajectory(path) as trajectory:
+        assert trajectory.start == (3, -4, "SUL", True)
+        assert list(trajectory.states()) == [(3, -6, "SUL", True), (3, -6, "SUL", False)]
+
+def test_overflowing_delta_keeps_records_aligned(tmp_path):
+    path = tmp_path / "t.rtj"
+    with TrajectoryRecorder(path) as recorder:
+        recorder.emit(("MOVER", "FRENTE", 1, 0, 0, 0, 1))
+        with pytest.raises(Exception, match="Deslocamento grande demais"):
+            recorder.emit(("MOVER", "FRENTE", 2 ** 63, 0, 1, 0, 1 + 2 ** 63))
+        recorder.emit(("MOVER", "FRENTE", 3, 0, 1, 3, 1))
+    with Trajectory(path) as trajectory:
+        assert list(trajectory.states()) == [(0, 1, "NORTE", False), (3, 1, "NORTE", False)]
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "t.rtj"
+    path.write_bytes(b"RSC\0" + b"\0" * 40)
+    with pytest.raises(Exception, match="Arquivo de trajetória inválido"):
+        Trajectory(path)
+
+def test_tee_with_quiet_text(tmp_path):
+    path = tmp_path / "t.rtj"
+    stream = io.StringIO()
+    recorder = TrajectoryRecorder(path)
+    events = TeeSink(TextSink(stream, simulation=False), recorder)
+    Interpreter(events).interpret(parse_code('MOVER FRENTE 3; IMPRIMIR robot_y;'))
+    events.flush()
+    recorder.close()
+    assert stream.getvalue() == "[IMPRIMIR] 3\n"
+    with Trajectory(path) as trajectory:
+        assert list(trajectory.states()) == [(0, 3, "NORTE", False)]
+
+def test_numpy_export(tmp_path):
+    np = pytest.importorskip("numpy")
+    path, _ = record(tmp_path, 'REPETIR 3 VEZES { MOVER FRENTE 2; } GIRAR DIREITA; MOVER FRENTE 1;')
+    with Trajectory(path) as trajectory:
+        records = trajectory.to_numpy()
+        assert records["count"].tolist() == [3, 1, 1]
+        assert trajectory.to_numpy(expand=True).tolist() == [[0, 2], [0, 4], [0, 6], [0, 6], [1, 6]]
+        del records
@@ -0,0 +1,79 @@
+import pytest
+from src.bytecode import ADD, ADD_INT, compile_program
+from src.closures import ClosureInterpreter
+from src.codegen import AOTInterpreter, generate
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.resolver import resolve
+from src.stack_interpreter import StackInterpreter
+from src.typechecker import INT, BOOL, STR, NUMERIC, ANY, TypeChecker, check_types, type_name
+from src.vm import VirtualMachine
+from tests.helpers import CODES, parse_code, run
+
+
+def checked(code, optimized=False):
+    program = parse_code(code)
+    if optimized:
+        program = optimize(program)
+    resolve(program)
+    check_types(program)
+    return program
+
+ENGINES = [Interpreter, StackInterpreter, VirtualMachine, ClosureInterpreter, AOTInterpreter]
+
+@pytest.mark.parametrize("code", CODES + [
+    'VAR n = 1; SET n = "a"; IMPRIMIR n + 1; SE (n) ENTAO { }',
+    'VAR n = 1; VAR b = n < 2; IMPRIMIR b + b; SE (b) ENTAO { MOVER FRENTE b; } REPETIR b VEZES { IMPRIMIR -b; }',
+    'VAR n = 3; VAR m = n * 2 + n / 2 - 1; MOVER FRENTE m; REPETIR m VEZES { SET n = n + m; } SE (n) ENTAO { IMPRIMIR n; }',
+    'VAR s = "a"; SET s = s + 1; IMPRIMIR s * 2; IMPRIMIR s + s;',
+    'VAR n = 0 - 2; MOVER FRENTE n;',
+    'VAR n = 0 - 2; REPETIR n VEZES { }',
+])
+@pytest.mark.parametrize("engine", ENGINES, ids=["tree", "stack", "vm", "closure", "aot"])
+def test_typed_execution_matches_interpreter(engine, code):
+    assert run(engine(), checked(code)) == run(Interpreter(), parse_code(code))
+    assert run(engine(), checked(code, True), False) == run(Interpreter(), optimize(parse_code(code)), False)
+
+def test_inferred_types():
+    program = checked('VAR n = 1; VAR s = "a"; VAR b = n < 2; VAR x = n; SET x = b; VAR y = s; SET y = n;'
+                      'IMPRIMIR n + b; IMPRIMIR s + n; IMPRIMIR y + 1; IMPRIMIR s * n; IMPRIMIR -b;')
+    checker = TypeChecker()
+    checker.check(program)
+    assert checker.variables == {'n': INT, 's': STR, 'b': BOOL, 'x': NUMERIC, 'y': INT | STR}
+    types = [statement.expression.static_type for statement in program.statements[-5:]]
+    assert types == [INT, STR, INT | STR, STR, INT]
+
+def test_variable_types_reach_fixpoint():
+    # O tipo de `a` depende de `b`, atribuída depois
+    checker = TypeChecker()
+    checker.check(checked('VAR a = 1; VAR b = 2; REPETIR 2 VEZES { SET a = b; SET b = "x"; }'))
+    assert checker.variables == {'a': INT | STR, 'b': INT | STR}
+
+def test_specialized_paths():
+    program = checked('VAR n = 0; VAR s = "a"; SET n = n + 1; SET s = s + 1;')
+    opcodes = compile_program(program).code[::2]
+    assert ADD_INT in opcodes and ADD in opcodes
+    source, _ = generate(program)
+    assert "v0_n = (v0_n + 1)" in source
+    assert "v1_s = (v1_s + '1')" not in source and "str(v1_s)" in source
+
+@pytest.mark.parametrize("code, errors", [
+    ('VAR n = 1; IMPRIMIR n + "a"; IMPRIMIR n == "a";', []),
+    ('IMPRIMIR "a" - 1;', ["Linha 1, coluna 14: Operação '-' inválida entre texto e inteiro."]),
+    ('IMPRIMIR "a" * "b";', ["Linha 1, coluna 14: Operação '*' inválida entre texto e texto."]),
+    ('IMPRIMIR "a" < 1;', ["Linha 1, coluna 14: Operação '<' inválida entre texto e inteiro."]),
+    ('IMPRIMIR -"a";', ["Linha 1, coluna 10: Operação '-' inválida para texto."]),
+    ('SE ("x") ENTAO { }', ["Linha 1, coluna 5: A condição do 'SE' deve ser inteiro ou booleano, não texto."]),
+    ('MOVER FRENTE "x";', ["Linha 1, coluna 14: O número de passos de 'MOVER' deve ser inteiro ou booleano, não texto."]),
+    ('REPETIR "x" VEZES { }', ["Linha 1, coluna 9: O número de repetições de 'REPETIR' deve ser inteiro ou booleano, não texto."]),
+    # Tipos incertos ficam para a execução
+    ('VAR v = 1; SET v = "a"; IMPRIMIR v - 1; SE (v) ENTAO { }', []),
+    # Sem valor possível (variável nunca declarada): o erro é do resolvedor
+    ('IMPRIMIR x - 1;', []),
+])
+def test_type_errors(code, errors):
+    assert check_types(parse_code(code)) == errors
+
+def test_type_names():
+    assert type_name(INT) == "inteiro"
+    assert type_name(ANY) == "inteiro ou booleano ou texto"
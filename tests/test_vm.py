@@ -0,0 +1,89 @@
+import glob
+import io
+from unittest.mock import patch
+
+import pytest
+from src.bytecode import (
+    JUMP, JUMP_IF_FALSE, LOAD_CONST, MOTION, MOVE_FRENTE, MOVE_FRENTE_N, REPEAT, REPEAT_NEXT,
+    compile_program, disassemble
+)
+from src.interpreter import Interpreter
+from src.optimizer import optimize
+from src.vm import VirtualMachine
+from tests.helpers import parse_code, run
+
+
+def opcodes(bytecode):
+    return bytecode.code[::2]
+
+CODES = [open(path).read() for path in sorted(glob.glob('exemplos/*.robo'))] + [
+    'IMPRIMIR 10 / 0;',
+    'IMPRIMIR z;',
+    'SET q = 1 / 0;',
+    'MOVER FRENTE 2 - 3;',
+    'REPETIR "a" VEZES { }',
+    'SE ("x") ENTAO { }',
+    'VAR a = 1; VAR a = 2;',
+    'IMPRIMIR "a" - 1;',
+    'IMPRIMIR -"a";',
+    'IMPRIMIR 99999999999999999999999 + 1;',
+    'VAR s = "a" + 1 * -2; IMPRIMIR s; IMPRIMIR 1 < 2; IMPRIMIR (1 != 2) + 0; IMPRIMIR 2 + "b";',
+    'GIRAR ESQUERDA; MOVER TRAS 3; PEGAR; PEGAR; SOLTAR; SOLTAR; IMPRIMIR has_object;',
+    'SE (1 == 0) ENTAO { IMPRIMIR 1; } SE (0) ENTAO { } SENAO { IMPRIMIR robot_direction; }',
+    'VAR n = 0; REPETIR 3 VEZES { REPETIR 0 VEZES { SET n = n + 100; } REPETIR 2 VEZES { SET n = n + 1; } }',
+    'VAR n = 2; REPETIR n VEZES { MOVER FRENTE n; GIRAR DIREITA; MOVER TRAS 1 < 2; } IMPRIMIR robot_x * 10 + robot_y;',
+    'GIRAR ESQUERDA; REPETIR 6 VEZES { MOVER TRAS 2; } MOVER FRENTE 1; MOVER FRENTE x;',
+    'VAR i = 0; REPETIR 5 VEZES { SET i = i + 1; SE (i >= 3) ENTAO { SE (i <= 4) ENTAO { IMPRIMIR i; } } }',
+]
+
+@pytest.mark.parametrize("code", CODES)
+def test_vm_matches_interpreter(code):
+    program = parse_code(code)
+    expected = run(Interpreter(), program)
+    assert run(VirtualMachine(), program) == expected
+    assert run(VirtualMachine(), optimize(program)) == expected
+    assert run(VirtualMachine(), optimize(program), False) == run(Interpreter(), optimize(program), False)
+
+def test_jumps_and_loops():
+    bytecode = compile_program(parse_code(
+        'SE (x) ENTAO { PEGAR; } SENAO { SOLTAR; } REPETIR 3 VEZES { MOVER FRENTE 2; MOVER FRENTE x; }'))
+    code = bytecode.code
+    assert opcodes(bytecode).count(JUMP_IF_FALSE) == 1 and opcodes(bytecode).count(JUMP) == 1
+    jump_if_false = code.index(JUMP_IF_FALSE, 0)
+    assert code[code[jump_if_false + 1] - 2] == JUMP # O SENAO começa depois do salto do ENTAO
+    repeat = opcodes(bytecode).index(REPEAT) * 2
+    assert code[repeat - 2:repeat] == [LOAD_CONST, bytecode.constants.index(3)]
+    assert code[repeat + 2:repeat + 4] == [MOVE_FRENTE_N, 2] # Passos literais no argumento
+    assert MOVE_FRENTE in opcodes(bytecode)
+    assert code[code[repeat + 1] - 2:code[repeat + 1]] == [REPEAT_NEXT, repeat + 2]
+    assert bytecode.tokens[repeat // 2].line == 1
+
+def test_motion_blocks_compile_to_closed_form():
+    program = optimize(parse_code('REPETIR 1000000000 VEZES { MOVER FRENTE 1; GIRAR DIREITA; MOVER TRAS 2; }'))
+    assert MOTION in opcodes(compile_program(program))
+    vm = VirtualMachine()
+    vm.simulation_output = False
+    vm.interpret(program)
+    # A cada 4 repetições: x -2 +1 -2 -1 (TRAS em OESTE diminui x), y +1 +2 -1 -2
+    assert (vm.robot_x, vm.robot_y, vm.robot_direction) == (-1000000000, 0, "NORTE")
+
+def test_statements_run_one_at_a_time():
+    vm = VirtualMachine()
+    with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+        vm.interpret_statements(parse_code('VAR n = 2; REPETIR n VEZES { MOVER FRENTE n; } IMPRIMIR robot_y;').statements)
+    assert fake_stdout.getvalue().endswith("[IMPRIMIR] 4\n")
+
+def test_deep_nesting_compiles_without_recursion():
+    depth = 20_000
+    code = 'VAR n = 0;' + 'SE (n == 0) ENTAO { REPETIR 1 VEZES {' * depth + 'SET n = n + 1;' + '} }' * depth
+    _, state = run(VirtualMachine(), parse_code(code))
+    assert state[4] == {'n': 1}
+
+def test_disassemble():
+    listing = disassemble(compile_program(parse_code('VAR a = 1;\nREPETIR a VEZES {\n  MOVER FRENTE robot_x;\n}')))
+    lines = listing.splitlines()
+    assert "LOAD_CONST" in lines[0] and "(1)" in lines[0] and "1:9" in lines[0]
+    assert "DEFINE" in lines[1] and "(a)" in lines[1]
+    assert "REPEAT " in lines[3] and "2:9" in lines[3]
+    assert lines[4].startswith(">>") and "LOAD_ROBOT" in lines[4] and "(robot_x)" in lines[4]
+    assert "REPEAT_NEXT" in lines[6] and "(para 8)" in lines[6]
@@ -0,0 +1,132 @@
+import asyncio
+import random
+import re
+
+import pytest
+from src.events import MemorySink, NullSink
+from src.interpreter import Interpreter
+from src.lexer import Lexer
+from src.optimizer import optimize
+from src.parser import Parser
+from src.scheduler import AsyncInterpreter, Scheduler
+from src.stack_interpreter import StackInterpreter
+from src.world import World
+from tests.helpers import parse_code
+
+STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+def run_in_world(code, world, engine=Interpreter, events=None):
+    """Executa o código no mundo; retorna o estado final do robô e o erro (ou None)."""
+    interpreter = engine(MemorySink() if events is None else events)
+    interpreter.world = world
+    try:
+        interpreter.interpret(parse_code(code))
+    except Exception as e:
+        error = str(e)
+    else:
+        error = None
+    return (interpreter.robot_x, interpreter.robot_y, interpreter.has_object), error
+
+def scan_free_steps(world, x, y, dx, dy, steps):
+    """Passos livres, célula por célula."""
+    for step in range(1, steps + 1):
+        if world.is_blocked(x + dx * step, y + dy * step):
+            return step - 1
+    return steps
+
+def test_objects_stack_in_cells():
+    world = World()
+    world.add_object(1, 2, 2)
+    assert world.objects_at(1, 2) == 2 and world.objects_at(2, 1) == 0
+    assert world.take(1, 2) and world.take(1, 2) and not world.take(1, 2)
+    assert world.objects == {}
+    world.put(0, 0)
+    assert world.objects == {(0, 0): 1}
+
+def test_free_steps_matches_cell_scan():
+    generator = random.Random(7)
+    world = World()
+    for _ in range(300):
+        world.add_obstacle(generator.randint(-20, 20), generator.randint(-20, 20))
+    for _ in range(2000):
+        x, y = generator.randint(-25, 25), generator.randint(-25, 25)
+        dx, dy = generator.choice(STEPS)
+        steps = generator.randint(0, 50)
+        assert world.free_steps(x, y, dx, dy, steps) == scan_free_steps(world, x, y, dx, dy, steps)
+        if generator.random() < 0.05: # O índice é refeito depois de uma mudança
+            world.add_obstacle(generator.randint(-20, 20), generator.randint(-20, 20))
+
+def test_load_and_dump(tmp_path):
+    world = World.loads("// mundo\nobjeto 1 2\nobjeto -3 0 4 // pilha\n\nobstaculo 5 5\nobjeto 1 2\n")
+    assert world.objects == {(1, 2): 2, (-3, 0): 4}
+    assert world.obstacles == {(5, 5)}
+    path = tmp_path / "mundo.txt"
+    world.dump(path)
+    loaded = World.load(path)
+    assert (loaded.objects, loaded.obstacles) == (world.objects, world.obstacles)
+
+@pytest.mark.parametrize("line", ["objeto 1", "objeto a 1", "objeto 1 1 0", "parede 1 1", "obstaculo 1 1 2"])
+def test_invalid_world(line):
+    with pytest.raises(Exception, match=f"Mundo inválido, linha 2: '{line}'"):
+        World.loads(f"objeto 0 0\n{line}\n")
+
+def test_pick_up_and_drop_change_the_world():
+    world = World.loads("objeto 0 2")
+    state, error = run_in_world('MOVER FRENTE 2; PEGAR; MOVER FRENTE 1; SOLTAR; SOLTAR;', world)
+    assert (state, error) == ((0, 3, False), None)
+    assert world.objects == {(0, 3): 1}
+
+def test_pick_up_without_object_is_an_error():
+    world = World.loads("objeto 0 3")
+    state, error = run_in_world('MOVER FRENTE 2;\nPEGAR;', world)
+    assert error == "Erro de Execução: Linha 2, coluna 1: Nenhum objeto para PEGAR na posição (0,2)."
+    assert state == (0, 2, False) and world.objects == {(0, 3): 1}
+    # Sem mundo, PEGAR continua sempre pegando
+    assert run_in_world('PEGAR;', None) == ((0, 0, True), None)
+
+def test_move_stops_before_obstacle():
+    events = MemorySink()
+    world = World.loads("obstaculo 3 0")
+    state, error = run_in_world('GIRAR DIREITA; MOVER FRENTE 1; MOVER FRENTE 5;', world, events=events)
+    assert state == (2, 0, False)
+    assert error == "Erro de Execução: Linha 1, coluna 38: Caminho bloqueado por obstáculo na posição (3,0)."
+    assert events.events[-1] == ("MOVER", "FRENTE", 1, 1, 0, 2, 0)
+    # TRAS em OESTE também diminui x
+    assert run_in_world('GIRAR ESQUERDA; MOVER TRAS 4;', World.loads("obstaculo -9 0")) == ((-4, 0, False), None)
+
+@pytest.mark.parametrize("simulation", [True, False])
+@pytest.mark.parametrize("engine", [Interpreter, StackInterpreter, AsyncInterpreter])
+def test_engines_check_obstacles_in_loops(engine, simulation):
+    code = 'REPETIR 10 VEZES { MOVER FRENTE 2; GIRAR DIREITA; MOVER FRENTE 1; GIRAR ESQUERDA; }'
+    world = World.loads("obstaculo 4 9")
+    interpreter = engine(MemorySink() if simulation else NullSink())
+    interpreter.world = world
+    with pytest.raises(Exception, match=r"Linha 1, coluna 26: Caminho bloqueado por obstáculo na posição \(4,9\)"):
+        interpreter.interpret(optimize(parse_code(code))) # Com MotionBlock
+    assert (interpreter.robot_x, interpreter.robot_y) == (4, 8)
+
+def test_robots_share_the_world():
+    world = World.loads("objeto 0 1\nobjeto 0 2")
+    scheduler = Scheduler(world=world)
+    first = scheduler.add(parse_code('MOVER FRENTE 1; PEGAR;'))
+    second = scheduler.add(parse_code('MOVER FRENTE 1; PEGAR;'))
+    third = scheduler.add(parse_code('MOVER FRENTE 2; PEGAR;'))
+    asyncio.run(scheduler.run())
+    # O primeiro robô pega o objeto de (0,1) antes do segundo
+    assert [robot.status for robot in (first, second, third)] == ["ok", "erro", "ok"]
+    assert "Nenhum objeto para PEGAR na posição (0,1)" in second.error
+    assert world.objects == {}
+
+@pytest.mark.parametrize("code, world, message", [
+    ('MOVER FRENTE 1;\nGIRAR DIREITA;\nMOVER FRENTE 1;', "obstaculo 1 1",
+     "Linha 3, coluna 7: Caminho bloqueado por obstáculo na posição (1,1)."),
+    ('PEGAR;\nSOLTAR;\nMOVER FRENTE 1;\nPEGAR;', "objeto 0 0",
+     "Linha 4, coluna 1: Nenhum objeto para PEGAR na posição (0,1)."),
+])
+def test_hash_consing_keeps_world_error_positions(code, world, message):
+    # MOVER e PEGAR iguais não são compartilhados: o erro aponta a ocorrência certa
+    interpreter = Interpreter(MemorySink())
+    interpreter.world = World.loads(world)
+    with pytest.raises(Exception, match=re.escape(f"Erro de Execução: {message}")):
+        interpreter.interpret(Parser(Lexer(code).tokenize(), hash_cons=True).parse())